@@ -13,11 +13,15 @@
 # limitations under the License.
 # ==============================================================================
 """Python TF-Lite interpreter."""
+import collections
+import concurrent.futures
 import ctypes
 import enum
 import os
 import platform
 import sys
+import threading
+import time
 
 import numpy as np
 
@@ -1004,3 +1008,333 @@ class InterpreterWithCustomOps(Interpreter):
     """
     self._custom_op_registerers = custom_op_registerers or []
     super(InterpreterWithCustomOps, self).__init__(**kwargs)
+
+
+class _PoolRequest:
+  """A single request queued on an `InterpreterPool`."""
+
+  __slots__ = ('inputs', 'batch_key', 'batch_size', 'future', 'enqueue_time')
+
+  def __init__(self, inputs, batch_key, batch_size):
+    self.inputs = inputs
+    self.batch_key = batch_key
+    self.batch_size = batch_size
+    self.future = concurrent.futures.Future()
+    self.enqueue_time = time.monotonic()
+
+
+class _PoolRunner:
+  """Runs one interpreter of an `InterpreterPool` on a dictionary of inputs."""
+
+  def __init__(self, interpreter, inputs, outputs, subgraph_index):
+    # The pool owns the interpreter and never hands out numpy views into its
+    # tensors, so the wrapper is used directly without `_ensure_safe()`.
+    self._interpreter = interpreter
+    self._wrapper = interpreter._interpreter  # pylint: disable=protected-access
+    self._inputs = inputs
+    self._outputs = outputs
+    self._subgraph_index = subgraph_index
+    self._input_shapes = {}
+
+  def __call__(self, inputs):
+    resized = False
+    for name, value in inputs.items():
+      if self._input_shapes.get(name) != value.shape:
+        self._wrapper.ResizeInputTensor(
+            self._inputs[name], np.array(value.shape, dtype=np.int32), False,
+            self._subgraph_index)
+        self._input_shapes[name] = value.shape
+        resized = True
+    if resized:
+      self._wrapper.AllocateTensors(self._subgraph_index)
+    for name, value in inputs.items():
+      self._wrapper.SetTensor(self._inputs[name], value, self._subgraph_index)
+    self._wrapper.Invoke(self._subgraph_index)
+    return {
+        name: self._wrapper.GetTensor(index, self._subgraph_index)
+        for name, index in self._outputs.items()
+    }
+
+
+class InterpreterPool:
+  """Runs inference concurrently on a pool of interpreters for one model.
+
+  The interface provided by this class is experimental and therefore not
+  exposed as part of the public API.
+
+  All interpreters are built from the same model buffer, which is read once
+  and shared rather than copied. Each interpreter is owned by a worker thread;
+  `Invoke` releases the GIL, so the workers run in parallel. Requests are
+  dictionaries of numpy arrays whose first dimension is the batch dimension.
+  When `max_batch_size` is larger than 1, a worker concatenates queued requests
+  with the same input names, dtypes and non-batch dimensions into a single
+  invocation and splits the outputs back along the first dimension, so the
+  model must treat its first dimension as an independent batch dimension.
+
+  Example,
+  ```
+  with InterpreterPool(model_path, num_interpreters=4, max_batch_size=8,
+                       batch_timeout_ms=2, num_threads=1) as pool:
+    futures = [pool.submit({'input': x}) for x in examples]
+    results = [f.result()['output'] for f in futures]
+    print(pool.latency_stats())
+  ```
+  """
+
+  def __init__(self,
+               model_path=None,
+               model_content=None,
+               num_interpreters=None,
+               signature_key=None,
+               max_batch_size=1,
+               batch_timeout_ms=0,
+               stats_window=10000,
+               **interpreter_kwargs):
+    """Constructor.
+
+    Args:
+      model_path: Path to TF-Lite Flatbuffer file.
+      model_content: Content of model.
+      num_interpreters: Number of interpreters, and worker threads, in the
+        pool. Defaults to the number of CPUs.
+      signature_key: SignatureDef key used to name the inputs and outputs. If
+        None and the model has exactly one SignatureDef it is used; if the
+        model has no SignatureDef, the input and output tensor names of the
+        primary subgraph are used.
+      max_batch_size: Largest total batch dimension a worker assembles from
+        queued requests. Requests larger than this run on their own.
+      batch_timeout_ms: How long a worker holding a partial batch waits for
+        more compatible requests before invoking.
+      stats_window: Number of most recent requests kept for `latency_stats`.
+      **interpreter_kwargs: Forwarded to every `Interpreter`, e.g.
+        `num_threads` or `experimental_op_resolver_type`. Delegates cannot be
+        shared between interpreters and should not be passed.
+
+    Raises:
+      ValueError: If the arguments are invalid or the signature is unknown.
+    """
+    if model_path and not model_content:
+      with open(model_path, 'rb') as f:
+        model_content = f.read()
+    elif not model_content:
+      raise ValueError('`model_path` or `model_content` must be specified.')
+    elif model_path:
+      raise ValueError('Can\'t both provide `model_path` and `model_content`')
+    num_interpreters = num_interpreters or os.cpu_count() or 1
+    if num_interpreters < 1:
+      raise ValueError('num_interpreters must be positive, got %d' %
+                       num_interpreters)
+    if max_batch_size < 1:
+      raise ValueError('max_batch_size must be positive, got %d' %
+                       max_batch_size)
+
+    self._model_content = model_content
+    self._max_batch_size = max_batch_size
+    self._batch_timeout = batch_timeout_ms / 1000.
+    self._interpreters = [
+        Interpreter(model_content=model_content, **interpreter_kwargs)
+        for _ in range(num_interpreters)
+    ]
+    inputs, outputs, subgraph_index = self._resolve_signature(
+        self._interpreters[0], signature_key)
+    self._input_names = frozenset(inputs)
+
+    self._cond = threading.Condition()
+    self._queue = collections.deque()
+    self._closed = False
+    self._stats_lock = threading.Lock()
+    self._queue_latencies = collections.deque(maxlen=stats_window)
+    self._invoke_latencies = collections.deque(maxlen=stats_window)
+    self._num_requests = 0
+    self._num_batches = 0
+    self._workers = []
+    for i, interpreter in enumerate(self._interpreters):
+      runner = _PoolRunner(interpreter, inputs, outputs, subgraph_index)
+      worker = threading.Thread(
+          target=self._worker_loop,
+          args=(runner,),
+          name='InterpreterPool-%d' % i,
+          daemon=True)
+      worker.start()
+      self._workers.append(worker)
+
+  @staticmethod
+  def _resolve_signature(interpreter, signature_key):
+    """Returns input and output name to index maps and the subgraph index."""
+    signature_defs = interpreter._get_full_signature_list()  # pylint: disable=protected-access
+    if signature_key is None and len(signature_defs) == 1:
+      signature_key = next(iter(signature_defs))
+    if signature_key is None:
+      if signature_defs:
+        raise ValueError('signature_key must be provided for a model with '
+                         'several SignatureDefs: %s' % list(signature_defs))
+      inputs = {d['name']: d['index'] for d in interpreter.get_input_details()}
+      outputs = {
+          d['name']: d['index'] for d in interpreter.get_output_details()
+      }
+      return inputs, outputs, 0
+    if signature_key not in signature_defs:
+      raise ValueError('Invalid signature_key provided.')
+    signature_def = signature_defs[signature_key]
+    subgraph_index = interpreter._interpreter.GetSubgraphIndexFromSignature(  # pylint: disable=protected-access
+        signature_key)
+    return (dict(signature_def['inputs']), dict(signature_def['outputs']),
+            subgraph_index)
+
+  @property
+  def num_interpreters(self):
+    return len(self._interpreters)
+
+  def submit(self, inputs):
+    """Queues a request and returns a future for its outputs.
+
+    Args:
+      inputs: Dictionary from input name to numpy array. All arrays must have
+        the same size in their first dimension for the request to be batched
+        with others.
+
+    Returns:
+      A `concurrent.futures.Future` resolving to a dictionary from output name
+      to numpy array.
+
+    Raises:
+      ValueError: If the input names do not match the model.
+      RuntimeError: If the pool is closed.
+    """
+    if frozenset(inputs) != self._input_names:
+      raise ValueError('Expected inputs %s, got %s' %
+                       (sorted(self._input_names), sorted(inputs)))
+    inputs = {name: np.asarray(value) for name, value in inputs.items()}
+    batch_sizes = {v.shape[0] if v.ndim else None for v in inputs.values()}
+    if len(batch_sizes) == 1 and None not in batch_sizes:
+      batch_size = batch_sizes.pop()
+      batch_key = tuple(sorted(
+          (name, v.dtype.str, v.shape[1:]) for name, v in inputs.items()))
+    else:
+      # No common batch dimension; the request always runs on its own.
+      batch_size, batch_key = 1, None
+    request = _PoolRequest(inputs, batch_key, batch_size)
+    with self._cond:
+      if self._closed:
+        raise RuntimeError('InterpreterPool is closed.')
+      self._queue.append(request)
+      self._cond.notify_all()
+    return request.future
+
+  def run(self, inputs):
+    """Runs a request and blocks until its outputs are available."""
+    return self.submit(inputs).result()
+
+  def _next_batch(self):
+    """Waits for work and returns a list of compatible requests, or None."""
+    with self._cond:
+      while not self._queue and not self._closed:
+        self._cond.wait()
+      if not self._queue:
+        return None
+      first = self._queue.popleft()
+      batch = [first]
+      size = first.batch_size
+      if first.batch_key is None or size >= self._max_batch_size:
+        return batch
+      deadline = time.monotonic() + self._batch_timeout
+      while True:
+        remaining = collections.deque()
+        for request in self._queue:
+          if (request.batch_key == first.batch_key and
+              size + request.batch_size <= self._max_batch_size):
+            batch.append(request)
+            size += request.batch_size
+          else:
+            remaining.append(request)
+        self._queue = remaining
+        timeout = deadline - time.monotonic()
+        if size >= self._max_batch_size or timeout <= 0 or self._closed:
+          return batch
+        self._cond.wait(timeout)
+
+  def _worker_loop(self, runner):
+    while True:
+      batch = self._next_batch()
+      if batch is None:
+        return
+      self._run_batch(runner, batch)
+
+  def _run_batch(self, runner, batch):
+    """Invokes `runner` on the concatenated batch and resolves its futures."""
+    start = time.monotonic()
+    batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+    if not batch:
+      return
+    try:
+      if len(batch) == 1:
+        results = [runner(batch[0].inputs)]
+      else:
+        outputs = runner({
+            name: np.concatenate([r.inputs[name] for r in batch])
+            for name in batch[0].inputs
+        })
+        sizes = [r.batch_size for r in batch]
+        splits = np.cumsum(sizes)[:-1]
+        results = [{} for _ in batch]
+        for name, value in outputs.items():
+          if value.ndim == 0 or value.shape[0] != sum(sizes):
+            raise ValueError(
+                'Output %s with shape %s has no batch dimension of size %d; '
+                'use max_batch_size=1 for this model.' %
+                (name, value.shape, sum(sizes)))
+          for result, part in zip(results, np.split(value, splits)):
+            result[name] = part
+    except Exception as e:  # pylint: disable=broad-except
+      for request in batch:
+        request.future.set_exception(e)
+      return
+    end = time.monotonic()
+    with self._stats_lock:
+      self._num_requests += len(batch)
+      self._num_batches += 1
+      for request in batch:
+        self._queue_latencies.append(start - request.enqueue_time)
+        self._invoke_latencies.append(end - start)
+    for request, result in zip(batch, results):
+      request.future.set_result(result)
+
+  def latency_stats(self, percentiles=(50, 90, 99)):
+    """Returns latency percentiles over the most recent requests.
+
+    Args:
+      percentiles: Percentiles to report.
+
+    Returns:
+      A dictionary with `num_requests` and `num_batches` counted since the
+      pool was created, and `queue_ms` and `invoke_ms` dictionaries from
+      percentile to the time in milliseconds requests spent waiting for a
+      worker and in their batch's invocation respectively.
+    """
+    with self._stats_lock:
+      queue = np.array(self._queue_latencies, dtype=np.float64) * 1000.
+      invoke = np.array(self._invoke_latencies, dtype=np.float64) * 1000.
+      stats = {
+          'num_requests': self._num_requests,
+          'num_batches': self._num_batches,
+      }
+    for key, values in (('queue_ms', queue), ('invoke_ms', invoke)):
+      if values.size:
+        stats[key] = dict(zip(percentiles, np.percentile(values, percentiles)))
+      else:
+        stats[key] = {p: 0. for p in percentiles}
+    return stats
+
+  def close(self):
+    """Finishes the queued requests and stops the workers."""
+    with self._cond:
+      self._closed = True
+      self._cond.notify_all()
+    for worker in self._workers:
+      worker.join()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *unused_exc_info):
+    self.close()
@@ -306,6 +306,66 @@ class InterpreterTest(test_util.TensorFlowTestCase):
     increase_call.assert_called_once()
 
 
+class InterpreterPoolTest(test_util.TensorFlowTestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._model_path = resource_loader.get_path_to_datafile(
+        'testdata/permute_float.tflite')
+
+  def _inputs(self, n):
+    return np.arange(4 * n, dtype=np.float32).reshape(n, 4)
+
+  def testRun(self):
+    with interpreter_wrapper.InterpreterPool(
+        model_path=self._model_path, num_interpreters=2) as pool:
+      self.assertEqual(2, pool.num_interpreters)
+      result = pool.run({'input': np.array([[1., 2., 3., 4.]], np.float32)})
+    self.assertAllEqual([[4., 3., 2., 1.]], result['output'])
+
+  def testSharesModelContent(self):
+    with open(self._model_path, 'rb') as f:
+      model_content = f.read()
+    with interpreter_wrapper.InterpreterPool(
+        model_content=model_content, num_interpreters=3) as pool:
+      for interpreter in pool._interpreters:
+        self.assertIs(model_content, interpreter._model_content)
+
+  def testBatchesRequests(self):
+    with interpreter_wrapper.InterpreterPool(
+        model_path=self._model_path,
+        num_interpreters=1,
+        max_batch_size=8,
+        batch_timeout_ms=200) as pool:
+      inputs = [self._inputs(n) for n in (1, 3, 2, 1)]
+      futures = [pool.submit({'input': x}) for x in inputs]
+      for x, future in zip(inputs, futures):
+        self.assertAllEqual(x[:, ::-1], future.result()['output'])
+      stats = pool.latency_stats()
+    self.assertEqual(4, stats['num_requests'])
+    self.assertLess(stats['num_batches'], 4)
+    self.assertCountEqual([50, 90, 99], stats['queue_ms'].keys())
+    self.assertGreater(stats['invoke_ms'][99], 0.)
+
+  def testConcurrentSubmit(self):
+    with interpreter_wrapper.InterpreterPool(
+        model_path=self._model_path, num_interpreters=4,
+        max_batch_size=4) as pool:
+      inputs = [self._inputs(1) + i for i in range(64)]
+      futures = [pool.submit({'input': x}) for x in inputs]
+      for x, future in zip(inputs, futures):
+        self.assertAllEqual(x[:, ::-1], future.result()['output'])
+    self.assertEqual(64, pool.latency_stats()['num_requests'])
+
+  def testInvalidInputs(self):
+    with interpreter_wrapper.InterpreterPool(
+        model_path=self._model_path, num_interpreters=1) as pool:
+      with self.assertRaisesRegex(ValueError, 'Expected inputs'):
+        pool.submit({'x': self._inputs(1)})
+    with self.assertRaisesRegex(RuntimeError, 'closed'):
+      pool.submit({'input': self._inputs(1)})
+
+
 class InterpreterTestErrorPropagation(test_util.TensorFlowTestCase):
 
   # Model must have at least 7 bytes to hold model identifier
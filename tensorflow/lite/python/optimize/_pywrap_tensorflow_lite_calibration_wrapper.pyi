@@ -24,6 +24,8 @@ class CalibrationWrapper:
     def FeedTensor(self, arg0: object, arg1: str) -> object: ...
     @overload
     def FeedTensor(self, arg0: object) -> object: ...
+    def GetCalibrationStats(self) -> object: ...
+    def MergeCalibrationStats(self, arg0: object) -> object: ...
     @overload
     def Prepare(self, arg0: object, arg1: str) -> object: ...
     @overload
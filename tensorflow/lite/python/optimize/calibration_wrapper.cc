@@ -41,6 +41,7 @@ limitations under the License.
 #include <memory>
 #include <optional>
 #include <string>
+#include <tuple>
 #include <utility>
 #include <vector>
 // NOLINTEND
@@ -464,7 +465,12 @@ PyObject* CalibrationWrapper::FeedTensor(PyObject* input_value,
     }
   }
 
-  TFLITE_PY_CHECK(subgraph->Invoke());
+  // Release the GIL so that several wrappers can be fed in parallel.
+  TfLiteStatus status = kTfLiteOk;
+  Py_BEGIN_ALLOW_THREADS;
+  status = subgraph->Invoke();
+  Py_END_ALLOW_THREADS;
+  TFLITE_PY_CHECK(status);
   Py_RETURN_NONE;
 }
 
@@ -496,7 +502,12 @@ PyObject* CalibrationWrapper::FeedTensor(PyObject* input_value) {
     }
   }
 
-  TFLITE_PY_CHECK(interpreter_->Invoke());
+  // Release the GIL so that several wrappers can be fed in parallel.
+  TfLiteStatus status = kTfLiteOk;
+  Py_BEGIN_ALLOW_THREADS;
+  status = interpreter_->Invoke();
+  Py_END_ALLOW_THREADS;
+  TFLITE_PY_CHECK(status);
   Py_RETURN_NONE;
 }
 
@@ -695,6 +706,64 @@ PyObject* CalibrationWrapper::Calibrate() {
   return ConvertToPyString(result_buffer.data(), result_buffer.size());
 }
 
+PyObject* CalibrationWrapper::GetCalibrationStats() {
+  absl::flat_hash_map<std::tuple<int, int>,
+                      optimize::calibration::CalibrationReader::CalibrationStats>
+      stats;
+  TFLITE_PY_CHECK(reader_->GetTensorStatsAsMap(&stats));
+  std::unique_ptr<PyObject, PyDecrefDeleter> result(PyDict_New());
+  if (!result) {
+    return nullptr;
+  }
+  for (const auto& tensorid_stat : stats) {
+    std::unique_ptr<PyObject, PyDecrefDeleter> key(
+        Py_BuildValue("(ii)", std::get<0>(tensorid_stat.first),
+                      std::get<1>(tensorid_stat.first)));
+    std::unique_ptr<PyObject, PyDecrefDeleter> value(
+        Py_BuildValue("(dd)", static_cast<double>(tensorid_stat.second.min),
+                      static_cast<double>(tensorid_stat.second.max)));
+    if (!key || !value ||
+        PyDict_SetItem(result.get(), key.get(), value.get()) != 0) {
+      return nullptr;
+    }
+  }
+  return result.release();
+}
+
+PyObject* CalibrationWrapper::MergeCalibrationStats(PyObject* stats) {
+  TFLITE_PY_ENSURE_VALID_INTERPRETER();
+  if (!PyDict_Check(stats)) {
+    PyErr_Format(PyExc_ValueError,
+                 "Invalid calibration stats: expected stats to be a dict.");
+    return nullptr;
+  }
+  absl::flat_hash_map<std::tuple<int, int>,
+                      optimize::calibration::CalibrationReader::CalibrationStats>
+      stats_map;
+  PyObject* key;
+  PyObject* value;
+  Py_ssize_t pos = 0;
+  while (PyDict_Next(stats, &pos, &key, &value)) {
+    int subgraph_index, tensor_index;
+    optimize::calibration::CalibrationReader::CalibrationStats tensor_stats;
+    if (!PyArg_ParseTuple(key, "ii", &subgraph_index, &tensor_index) ||
+        !PyArg_ParseTuple(value, "ff", &tensor_stats.min, &tensor_stats.max)) {
+      return nullptr;
+    }
+    if (subgraph_index < 0 ||
+        subgraph_index >= interpreter_->subgraphs_size() || tensor_index < 0 ||
+        tensor_index >= interpreter_->subgraph(subgraph_index)->tensors_size()) {
+      PyErr_Format(PyExc_ValueError,
+                   "Invalid calibration stats: no tensor %d in subgraph %d.",
+                   tensor_index, subgraph_index);
+      return nullptr;
+    }
+    stats_map[{subgraph_index, tensor_index}] = tensor_stats;
+  }
+  TFLITE_PY_CHECK(reader_->MergeTensorStats(stats_map));
+  Py_RETURN_NONE;
+}
+
 PyObject* CalibrationWrapper::QuantizeModel(int input_py_type,
                                             int output_py_type,
                                             bool allow_float,
@@ -107,6 +107,15 @@ class CalibrationWrapper {
   // in the quantization field.
   PyObject* Calibrate();
 
+  // Returns the in-memory calibration results as a dict from
+  // (subgraph index, tensor index) to a (min, max) tuple.
+  PyObject* GetCalibrationStats();
+
+  // Merges calibration results in the format returned by
+  // GetCalibrationStats(), e.g. collected by another CalibrationWrapper of the
+  // same model, into the in-memory calibration results.
+  PyObject* MergeCalibrationStats(PyObject* stats);
+
  private:
   // CalibrationWrapper is not copyable or assignable. We avoid the use of
   // CalibrationWrapper() = delete here for SWIG compatibility.
@@ -13,6 +13,9 @@
 # limitations under the License.
 # ==============================================================================
 """Python wrapper for post training quantization with calibration."""
+import queue
+import threading
+
 import numpy as np
 
 from tensorflow.lite.python.convert_phase import Component
@@ -40,10 +43,49 @@ def add_intermediate_tensors(model_content):
   return _calibration_wrapper.AddIntermediateTensors(model_content)
 
 
+def _merge_calibration_stats(stats_list):
+  """Merges dicts from tensor id to (min, max) by taking the union of ranges."""
+  merged = {}
+  for stats in stats_list:
+    for key, (min_val, max_val) in stats.items():
+      if key in merged:
+        merged_min, merged_max = merged[key]
+        min_val, max_val = min(min_val, merged_min), max(max_val, merged_max)
+      merged[key] = (min_val, max_val)
+  return merged
+
+
+class _RangeConvergence:
+  """Tracks whether the calibration ranges stopped growing between checks."""
+
+  def __init__(self, tolerance):
+    self._tolerance = tolerance
+    self._previous = None
+
+  def update(self, stats):
+    """Returns True if no range grew by more than the tolerance since last."""
+    previous, self._previous = self._previous, stats
+    if previous is None or previous.keys() != stats.keys():
+      return False
+    for key, (min_val, max_val) in stats.items():
+      previous_min, previous_max = previous[key]
+      growth = max(previous_min - min_val, max_val - previous_max)
+      if growth > self._tolerance * max(max_val - min_val, 1e-12):
+        return False
+    return True
+
+
 class Calibrator:
   """Calibrates a floating point model and then quantizes it.
 
   This is an internal class, not a public interface.
+
+  With `num_workers` > 1 the representative dataset is sharded across that
+  many calibration interpreters running in parallel, whose min/max statistics
+  are merged exactly afterwards. With `early_stopping_tolerance` set,
+  calibration stops once `early_stopping_interval` consecutive samples grow no
+  tensor range by more than that fraction of the range. After calibrating,
+  `num_samples_used` holds the number of samples that were fed.
   """
 
   def __init__(
@@ -51,6 +93,9 @@ class Calibrator:
       model_content,
       custom_op_registerers_by_name=None,
       custom_op_registerers_by_func=None,
+      num_workers=1,
+      early_stopping_tolerance=None,
+      early_stopping_interval=100,
   ):
     """Constructor.
 
@@ -60,28 +105,49 @@ class Calibrator:
         pointer to a MutableOpResolver and register custom ops.
       custom_op_registerers_by_func: List of functions that take a pointer to a
         MutableOpResolver and register custom ops.
+      num_workers: Number of calibration interpreters fed in parallel.
+      early_stopping_tolerance: If not None, the relative growth of the tensor
+        ranges below which calibration stops early.
+      early_stopping_interval: Number of samples between two convergence
+        checks.
 
     Raises:
       ValueError: If the calibrator was unable to open the model.
     """
     if not model_content:
       raise ValueError("`model_content` must be specified.")
+    if num_workers < 1:
+      raise ValueError("`num_workers` must be positive, got %d." % num_workers)
+    if early_stopping_interval < 1:
+      raise ValueError(
+          "`early_stopping_interval` must be positive, got %d."
+          % early_stopping_interval
+      )
     if custom_op_registerers_by_name is None:
       custom_op_registerers_by_name = []
     if custom_op_registerers_by_func is None:
       custom_op_registerers_by_func = []
+    self._custom_op_registerers_by_name = custom_op_registerers_by_name
+    self._custom_op_registerers_by_func = custom_op_registerers_by_func
     try:
-      self._calibrator = _calibration_wrapper.CalibrationWrapper(
-          model_content,
-          custom_op_registerers_by_name,
-          custom_op_registerers_by_func,
-      )
+      self._calibrator = self._create_calibration_wrapper(model_content)
       self._model_content = model_content
     except Exception as e:
       raise ValueError("Failed to parse the model: %s." % e)
     if not self._calibrator:
       raise ValueError("Failed to parse the model.")
     self._interpreter = None
+    self._num_workers = num_workers
+    self._early_stopping_tolerance = early_stopping_tolerance
+    self._early_stopping_interval = early_stopping_interval
+    self.num_samples_used = 0
+
+  def _create_calibration_wrapper(self, model_content):
+    return _calibration_wrapper.CalibrationWrapper(
+        model_content,
+        self._custom_op_registerers_by_name,
+        self._custom_op_registerers_by_func,
+    )
 
   def _create_input_array_from_dict(self, signature_key, inputs):
     input_array = []
@@ -94,62 +160,153 @@ class Calibrator:
       input_array.append(inputs[input_name])
     return input_array
 
+  def _convert_sample(self, sample):
+    """Returns the signature key and the list of input values of a sample."""
+    if isinstance(sample, tuple):
+      if not isinstance(sample[1], dict):
+        raise ValueError(
+            "You need to provide either a dictionary with input "
+            "names and values in the second argument in the "
+            "tuple"
+        )
+      # Convert signature based inputs to the tensor index based data.
+      if self._interpreter is None:
+        self._interpreter = Interpreter(model_content=self._model_content)
+      signature_key = sample[0]
+      input_array = self._create_input_array_from_dict(
+          signature_key, sample[1]
+      )
+    elif isinstance(sample, dict):
+      # Convert signature based inputs to the tensor index based data.
+      if self._interpreter is None:
+        self._interpreter = Interpreter(model_content=self._model_content)
+      signature_key = None
+      input_array = self._create_input_array_from_dict(None, sample)
+    elif isinstance(sample, list):
+      signature_key = None
+      input_array = sample
+    else:
+      raise ValueError(
+          "You need to provide either a dictionary with input "
+          "names and values, a tuple with signature key and a "
+          "dictionary with input names and values, or an array "
+          "with input values in the order of input tensors of "
+          "the graph in the representative_dataset function. "
+          "Unsupported value from dataset: {}.".format(sample)
+      )
+    return signature_key, input_array
+
+  @staticmethod
+  def _prepare(calibrator, signature_key, input_array, resize_input):
+    """Allocates the tensors of `calibrator` for the given signature."""
+    if resize_input:
+      if signature_key is not None:
+        calibrator.Prepare([list(s.shape) for s in input_array], signature_key)
+      else:
+        calibrator.Prepare([list(s.shape) for s in input_array])
+    else:
+      if signature_key is not None:
+        calibrator.Prepare(signature_key)
+      else:
+        calibrator.Prepare()
+
+  @staticmethod
+  def _feed(calibrator, signature_key, input_array):
+    if signature_key is not None:
+      calibrator.FeedTensor(input_array, signature_key)
+    else:
+      calibrator.FeedTensor(input_array)
+
+  def _should_check_convergence(self):
+    return (
+        self._early_stopping_tolerance is not None
+        and self.num_samples_used % self._early_stopping_interval == 0
+    )
+
+  @staticmethod
+  def _converged(convergence, calibrators):
+    return convergence.update(
+        _merge_calibration_stats(c.GetCalibrationStats() for c in calibrators)
+    )
+
   def _feed_tensors(self, dataset_gen, resize_input):
     """Feed tensors to the calibrator."""
+    self.num_samples_used = 0
+    convergence = _RangeConvergence(self._early_stopping_tolerance)
+    if self._num_workers > 1:
+      self._feed_tensors_in_parallel(dataset_gen, resize_input, convergence)
+      return
     initialized = {}
 
     for sample in dataset_gen():
-      if isinstance(sample, tuple):
-        if not isinstance(sample[1], dict):
-          raise ValueError(
-              "You need to provide either a dictionary with input "
-              "names and values in the second argument in the "
-              "tuple"
-          )
-        # Convert signature based inputs to the tensor index based data.
-        if self._interpreter is None:
-          self._interpreter = Interpreter(model_content=self._model_content)
-        signature_key = sample[0]
-        input_array = self._create_input_array_from_dict(
-            signature_key, sample[1]
-        )
-      elif isinstance(sample, dict):
-        # Convert signature based inputs to the tensor index based data.
-        if self._interpreter is None:
-          self._interpreter = Interpreter(model_content=self._model_content)
-        signature_key = None
-        input_array = self._create_input_array_from_dict(None, sample)
-      elif isinstance(sample, list):
-        signature_key = None
-        input_array = sample
-      else:
-        raise ValueError(
-            "You need to provide either a dictionary with input "
-            "names and values, a tuple with signature key and a "
-            "dictionary with input names and values, or an array "
-            "with input values in the order of input tensors of "
-            "the graph in the representative_dataset function. "
-            "Unsupported value from dataset: {}.".format(sample)
-        )
-
+      signature_key, input_array = self._convert_sample(sample)
       if signature_key not in initialized:
         initialized[signature_key] = True
-        if resize_input:
-          if signature_key is not None:
-            self._calibrator.Prepare(
-                [list(s.shape) for s in input_array], signature_key
-            )
-          else:
-            self._calibrator.Prepare([list(s.shape) for s in input_array])
-        else:
-          if signature_key is not None:
-            self._calibrator.Prepare(signature_key)
-          else:
-            self._calibrator.Prepare()
-      if signature_key is not None:
-        self._calibrator.FeedTensor(input_array, signature_key)
-      else:
-        self._calibrator.FeedTensor(input_array)
+        self._prepare(self._calibrator, signature_key, input_array,
+                      resize_input)
+      self._feed(self._calibrator, signature_key, input_array)
+      self.num_samples_used += 1
+      if self._should_check_convergence() and self._converged(
+          convergence, [self._calibrator]
+      ):
+        break
+
+  def _feed_tensors_in_parallel(self, dataset_gen, resize_input, convergence):
+    """Feeds tensors to `num_workers` calibrators and merges their stats."""
+    calibrators = [self._calibrator] + [
+        self._create_calibration_wrapper(self._model_content)
+        for _ in range(self._num_workers - 1)
+    ]
+    # The dataset generator is consumed on this thread; workers take samples
+    # from a shared bounded queue, so a slow worker does not stall the others.
+    samples = queue.Queue(maxsize=2 * len(calibrators))
+    errors = []
+
+    def worker(calibrator):
+      initialized = set()
+      while True:
+        item = samples.get()
+        try:
+          if item is None:
+            return
+          if errors:
+            continue
+          signature_key, input_array = item
+          if signature_key not in initialized:
+            initialized.add(signature_key)
+            self._prepare(calibrator, signature_key, input_array, resize_input)
+          self._feed(calibrator, signature_key, input_array)
+        except Exception as e:  # pylint: disable=broad-except
+          errors.append(e)
+        finally:
+          samples.task_done()
+
+    threads = [
+        threading.Thread(target=worker, args=(c,), daemon=True)
+        for c in calibrators
+    ]
+    for thread in threads:
+      thread.start()
+    try:
+      for sample in dataset_gen():
+        if errors:
+          break
+        samples.put(self._convert_sample(sample))
+        self.num_samples_used += 1
+        if self._should_check_convergence():
+          # Let the workers drain the queue so their stats can be read.
+          samples.join()
+          if not errors and self._converged(convergence, calibrators):
+            break
+    finally:
+      for _ in threads:
+        samples.put(None)
+      for thread in threads:
+        thread.join()
+    if errors:
+      raise errors[0]
+    for calibrator in calibrators[1:]:
+      self._calibrator.MergeCalibrationStats(calibrator.GetCalibrationStats())
 
   @convert_phase(
       Component.OPTIMIZE_TFLITE_MODEL,
@@ -236,6 +236,85 @@ class CalibratorTest(test_util.TensorFlowTestCase, parameterized.TestCase):
     quantized_model = quantizer.calibrate(input_gen)
     self.assertIsNotNone(quantized_model)
 
+  def _tensor_ranges(self, calibrated_model):
+    model = flatbuffer_utils.convert_bytearray_to_object(calibrated_model)
+    ranges = {}
+    for subgraph_index, subgraph in enumerate(model.subgraphs):
+      for tensor_index, tensor in enumerate(subgraph.tensors):
+        if tensor.quantization is not None and tensor.quantization.min:
+          ranges[(subgraph_index, tensor_index)] = (
+              list(tensor.quantization.min),
+              list(tensor.quantization.max),
+          )
+    return ranges
+
+  def test_parallel_calibration_matches_serial(self):
+    model_path = resource_loader.get_path_to_datafile(
+        'test_data/mobilenet_like_model.bin'
+    )
+    float_model = open(model_path, 'rb').read()
+    inputs = [
+        np.random.RandomState(i).uniform(-1.0, 1.0, (1, 5, 5, 3))
+        for i in range(16)
+    ]
+
+    def input_gen():
+      for x in inputs:
+        yield [x.astype(np.float32)]
+
+    serial = _calibrator.Calibrator(float_model)
+    parallel = _calibrator.Calibrator(float_model, num_workers=3)
+    serial_ranges = self._tensor_ranges(serial.calibrate(input_gen))
+    parallel_ranges = self._tensor_ranges(parallel.calibrate(input_gen))
+    self.assertNotEmpty(serial_ranges)
+    self.assertEqual(serial_ranges, parallel_ranges)
+    self.assertEqual(16, serial.num_samples_used)
+    self.assertEqual(16, parallel.num_samples_used)
+
+  @parameterized.named_parameters(('Serial', 1), ('Parallel', 2))
+  def test_calibration_early_stopping(self, num_workers):
+    model_path = resource_loader.get_path_to_datafile(
+        'test_data/mobilenet_like_model.bin'
+    )
+    float_model = open(model_path, 'rb').read()
+    quantizer = _calibrator.Calibrator(
+        float_model,
+        num_workers=num_workers,
+        early_stopping_tolerance=0.0,
+        early_stopping_interval=5,
+    )
+
+    # Identical samples stop growing any range after the first one.
+    def input_gen():
+      for _ in range(1000):
+        yield [np.ones(shape=(1, 5, 5, 3), dtype=np.float32)]
+
+    quantized_model = quantizer.calibrate_and_quantize(
+        input_gen, dtypes.float32, dtypes.float32, False
+    )
+    self.assertIsNotNone(quantized_model)
+    self.assertEqual(10, quantizer.num_samples_used)
+
+  def test_parallel_calibration_propagates_errors(self):
+    model_path = resource_loader.get_path_to_datafile(
+        'test_data/mobilenet_like_model.bin'
+    )
+    float_model = open(model_path, 'rb').read()
+    quantizer = _calibrator.Calibrator(float_model, num_workers=2)
+
+    def input_gen():
+      for _ in range(10):
+        yield [np.ones(shape=(1, 2, 2, 3), dtype=np.float32)]
+
+    with self.assertRaisesRegex(ValueError, 'Size mismatch'):
+      quantizer.calibrate_and_quantize(
+          input_gen,
+          dtypes.float32,
+          dtypes.float32,
+          False,
+          resize_input=False,
+      )
+
   def test_add_intermediate_tensors(self):
     model_path = resource_loader.get_path_to_datafile(
         'test_data/mobilenet_like_model.bin'
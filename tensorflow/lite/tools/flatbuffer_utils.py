@@ -21,12 +21,14 @@ tensorflow/lite/schema/schema.fbs
 """
 
 import copy
+import mmap
 import random
 import re
 import struct
 import sys
 
 import flatbuffers
+import numpy as np
 
 from tensorflow.lite.python import schema_py_generated as schema_fb
 from tensorflow.lite.python import schema_util
@@ -435,11 +437,13 @@ def count_resource_variables(model):
   """Calculates the number of unique resource variables in a model.
 
   Args:
-    model: the input tflite model, either as bytearray or object.
+    model: the input tflite model, either as bytearray, object or `ModelView`.
 
   Returns:
     An integer number representing the number of unique resource variables.
   """
+  if isinstance(model, ModelView):
+    return _count_resource_variables_in_view(model)
   if not isinstance(model, schema_fb.ModelT):
     model = convert_bytearray_to_object(model)
   unique_shared_names = set()
@@ -453,3 +457,332 @@ def count_resource_variables(model):
       if builtin_code == schema_fb.BuiltinOperator.VAR_HANDLE:
         unique_shared_names.add(op.builtinOptions.sharedName)
   return len(unique_shared_names)
+
+
+# Little-endian numpy dtypes of the tensor types whose buffers hold fixed size
+# elements. Flatbuffers, including buffer contents, are always little-endian.
+_TENSOR_TYPE_TO_DTYPE = {
+    schema_fb.TensorType.FLOAT16: np.dtype('<f2'),
+    schema_fb.TensorType.FLOAT32: np.dtype('<f4'),
+    schema_fb.TensorType.FLOAT64: np.dtype('<f8'),
+    schema_fb.TensorType.INT8: np.dtype('i1'),
+    schema_fb.TensorType.UINT8: np.dtype('u1'),
+    schema_fb.TensorType.BOOL: np.dtype('?'),
+    schema_fb.TensorType.INT16: np.dtype('<i2'),
+    schema_fb.TensorType.UINT16: np.dtype('<u2'),
+    schema_fb.TensorType.INT32: np.dtype('<i4'),
+    schema_fb.TensorType.UINT32: np.dtype('<u4'),
+    schema_fb.TensorType.INT64: np.dtype('<i8'),
+    schema_fb.TensorType.UINT64: np.dtype('<u8'),
+    schema_fb.TensorType.COMPLEX64: np.dtype('<c8'),
+    schema_fb.TensorType.COMPLEX128: np.dtype('<c16'),
+}
+
+
+class ModelView(object):
+  """A lazy, zero-copy view of a TFLite flatbuffer.
+
+  Unlike `read_model`, which converts the whole flatbuffer into the object API,
+  a `ModelView` only decodes the tables that are accessed, and buffer contents
+  are numpy arrays sharing memory with the flatbuffer. Combined with
+  `read_model_view`, which memory-maps the file, this allows working with
+  models larger than the available RAM.
+
+  Weights are modified in place through the arrays returned by `buffer_data`.
+  The structure of the model (tensors, operators, strings, ...) is read-only;
+  see `write_stripped_model_view` for removing strings.
+  """
+
+  def __init__(self, model_buffer):
+    """Creates a view of `model_buffer`.
+
+    Args:
+      model_buffer: A buffer object (e.g. `bytes`, `bytearray` or `mmap.mmap`)
+        containing a TFLite flatbuffer. Buffer contents can only be modified if
+        it is writable.
+    """
+    self._model_buffer = model_buffer
+    self._model = schema_fb.Model.GetRootAsModel(model_buffer, 0)
+    self._buffer_types = None
+
+  @property
+  def model(self):
+    """The root `schema_fb.Model` table."""
+    return self._model
+
+  @property
+  def model_buffer(self):
+    """The underlying buffer object."""
+    return self._model_buffer
+
+  @property
+  def num_buffers(self):
+    return self._model.BuffersLength()
+
+  def buffer_data(self, index):
+    """Returns the contents of a buffer as a `np.uint8` array, or None.
+
+    The array shares memory with the model, and is only writable if the
+    underlying buffer is.
+
+    Args:
+      index: Index of the buffer in the model.
+    """
+    buf = self._model.Buffers(index)
+    if buf.Offset() > 1:
+      # Buffer contents stored after the flatbuffer, for models > 2GB.
+      return np.frombuffer(
+          self._model_buffer, dtype=np.uint8, count=buf.Size(),
+          offset=buf.Offset())
+    if buf.DataIsNone() or not buf.DataLength():
+      return None
+    return buf.DataAsNumpy()
+
+  def buffer_tensor_types(self, operator_inputs_only=False):
+    """Maps buffer indices to the `TensorType` of the first tensor using them.
+
+    Args:
+      operator_inputs_only: If True, only tensors that are operator inputs are
+        considered, like `randomize_weights` does.
+
+    Returns:
+      A dict from buffer index to `schema_fb.TensorType`.
+    """
+    if not operator_inputs_only and self._buffer_types is not None:
+      return self._buffer_types
+    buffer_types = {}
+    for i in range(self._model.SubgraphsLength()):
+      subgraph = self._model.Subgraphs(i)
+      if operator_inputs_only:
+        tensor_indices = set()
+        for j in range(subgraph.OperatorsLength()):
+          op = subgraph.Operators(j)
+          if op.InputsIsNone():
+            continue
+          tensor_indices.update(int(t) for t in op.InputsAsNumpy())
+        tensor_indices.discard(-1)
+      else:
+        tensor_indices = range(subgraph.TensorsLength())
+      for j in sorted(tensor_indices):
+        tensor = subgraph.Tensors(j)
+        buffer_types.setdefault(tensor.Buffer(), tensor.Type())
+    if not operator_inputs_only:
+      self._buffer_types = buffer_types
+    return buffer_types
+
+  def close(self):
+    """Closes the underlying buffer if it is a memory map.
+
+    Arrays returned by `buffer_data` must not be used afterwards.
+    """
+    self._model = None
+    if isinstance(self._model_buffer, mmap.mmap):
+      self._model_buffer.close()
+    self._model_buffer = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+
+def read_model_view(input_tflite_file, writable=False):
+  """Memory-maps a tflite model file as a `ModelView`.
+
+  Only the pages of the file that are accessed are read. Only local files are
+  supported.
+
+  Args:
+    input_tflite_file: Full path name to the input tflite file.
+    writable: If True, buffer contents can be modified in place. The changes
+      are copy-on-write: they are not written back to `input_tflite_file`, and
+      only modified pages use memory. Use `write_model_view` to save them.
+
+  Raises:
+    RuntimeError: If input_tflite_file path is invalid.
+    IOError: If input_tflite_file cannot be opened.
+
+  Returns:
+    A `ModelView` of the file. Close it, or use it as a context manager, to
+    release the memory map.
+  """
+  if not gfile.Exists(input_tflite_file):
+    raise RuntimeError('Input file not found at %r\n' % input_tflite_file)
+  with open(input_tflite_file, 'rb') as input_file_handle:
+    model_buffer = mmap.mmap(
+        input_file_handle.fileno(),
+        0,
+        access=mmap.ACCESS_COPY if writable else mmap.ACCESS_READ)
+  return ModelView(model_buffer)
+
+
+def write_model_view(model_view, output_tflite_file):
+  """Writes a `ModelView`, including in-place changes, to a file.
+
+  Args:
+    model_view: A `ModelView`.
+    output_tflite_file: Full path name to the output tflite file.
+  """
+  with gfile.GFile(output_tflite_file, 'wb') as output_file_handle:
+    output_file_handle.write(memoryview(model_view.model_buffer))
+
+
+def _buffer_typed_data(data, dtype):
+  """Reinterprets the uint8 `data` as `dtype`, ignoring trailing bytes."""
+  size = data.size - data.size % dtype.itemsize
+  return data[:size].view(dtype)
+
+
+def randomize_weights_view(model_view, random_seed=0, buffers_to_skip=None):
+  """Randomize weights in a writable `ModelView`, in place.
+
+  This is the vectorized equivalent of `randomize_weights`: float buffers get
+  values uniformly distributed in [-0.5, 0.5) and other buffers random bytes.
+  The generated values differ from those of `randomize_weights` for the same
+  seed.
+
+  Args:
+    model_view: The `ModelView` in which to randomize weights.
+    random_seed: The input to the random number generator (default value is 0).
+    buffers_to_skip: The list of buffer indices to skip. The weights in these
+      buffers are left unmodified.
+  """
+  rng = np.random.RandomState(random_seed)
+  buffers_to_skip = set(buffers_to_skip or ())
+  buffer_types = model_view.buffer_tensor_types(operator_inputs_only=True)
+  # Ignore index 0 as it's always None.
+  for i in range(1, model_view.num_buffers):
+    if i in buffers_to_skip:
+      continue
+    data = model_view.buffer_data(i)
+    if data is None:
+      continue
+    dtype = _TENSOR_TYPE_TO_DTYPE.get(buffer_types.get(i))
+    if dtype is not None and dtype.kind == 'f':
+      values = _buffer_typed_data(data, dtype)
+      values[:] = rng.uniform(-0.5, 0.5, values.size)
+    else:
+      data[:] = rng.randint(0, 256, data.size, dtype=np.uint8)
+
+
+def byte_swap_model_view(model_view, from_endiness, to_endiness):
+  """Byte swaps the buffers of a writable `ModelView` in place.
+
+  This is the vectorized equivalent of `byte_swap_tflite_model_obj`.
+
+  Args:
+    model_view: `ModelView` of from_endiness format.
+    from_endiness: The original endianness format of the buffers in model.
+    to_endiness: The destined endianness format of the buffers in model.
+  """
+  if model_view is None or from_endiness == to_endiness:
+    return
+  for i, tensor_type in model_view.buffer_tensor_types().items():
+    if i <= 0 or i >= model_view.num_buffers:
+      continue
+    data = model_view.buffer_data(i)
+    if data is None:
+      continue
+    if tensor_type == schema_fb.TensorType.STRING:
+      # Only the string count and offsets are swapped.
+      num_of_strings = int.from_bytes(data[0:4].tobytes(), from_endiness)
+      data = data[:4 * (num_of_strings + 2)]
+      itemsize = 4
+    elif tensor_type in _TENSOR_TYPE_TO_DTYPE:
+      itemsize = _TENSOR_TYPE_TO_DTYPE[tensor_type].itemsize
+      if _TENSOR_TYPE_TO_DTYPE[tensor_type].kind == 'c':
+        # Complex values are swapped per component.
+        itemsize //= 2
+    else:
+      continue
+    if itemsize > 1:
+      _buffer_typed_data(data, np.dtype('u%d' % itemsize)).byteswap(
+          inplace=True)
+
+
+def _count_resource_variables_in_view(model_view):
+  """`count_resource_variables` for a `ModelView`."""
+  model = model_view.model
+  var_handle_opcodes = set()
+  for i in range(model.OperatorCodesLength()):
+    builtin_code = schema_util.get_builtin_code_from_operator_code(
+        model.OperatorCodes(i))
+    if builtin_code == schema_fb.BuiltinOperator.VAR_HANDLE:
+      var_handle_opcodes.add(i)
+  if not var_handle_opcodes:
+    return 0
+  unique_shared_names = set()
+  for i in range(model.SubgraphsLength()):
+    subgraph = model.Subgraphs(i)
+    for j in range(subgraph.OperatorsLength()):
+      op = subgraph.Operators(j)
+      if op.OpcodeIndex() not in var_handle_opcodes:
+        continue
+      shared_name = None
+      table = op.BuiltinOptions()
+      if table is not None:
+        options = schema_fb.VarHandleOptions()
+        options.Init(table.Bytes, table.Pos)
+        shared_name = options.SharedName()
+      unique_shared_names.add(shared_name)
+  return len(unique_shared_names)
+
+
+# Buffer contents written after the flatbuffer are aligned to this many bytes.
+_BUFFER_ALIGNMENT = 16
+
+
+def write_stripped_model_view(model_view, output_tflite_file):
+  """Strips nonessential strings from a `ModelView` and writes it to a file.
+
+  See `strip_strings` for the strings that are removed. The structure of the
+  model is rebuilt without its buffer contents, which are then copied from the
+  view directly to the file. They are stored after the flatbuffer using the
+  `offset` and `size` fields of the buffers, as the converter does for models
+  larger than 2GB, so that the model is never held in memory as a whole.
+
+  Args:
+    model_view: A `ModelView`.
+    output_tflite_file: Full path name to the output tflite file.
+  """
+  model = schema_fb.ModelT.InitFromObj(model_view.model)
+  strip_strings(model)
+  for subgraph in model.subgraphs:
+    for op in subgraph.operators or ():
+      if op.largeCustomOptionsOffset:
+        op.customOptions = np.frombuffer(
+            model_view.model_buffer, dtype=np.uint8,
+            count=op.largeCustomOptionsSize,
+            offset=op.largeCustomOptionsOffset)
+        op.largeCustomOptionsOffset = 0
+        op.largeCustomOptionsSize = 0
+  contents = []
+  for i, buf in enumerate(model.buffers):
+    buf.data = None
+    buf.offset = 0
+    buf.size = 0
+    data = model_view.buffer_data(i)
+    if data is not None and data.size:
+      # A placeholder offset, so that the final offsets do not change the
+      # size of the flatbuffer.
+      buf.offset = 1
+      buf.size = data.size
+      contents.append((buf, data))
+
+  model_bytes = convert_object_to_bytearray(model)
+  position = len(model_bytes)
+  for buf, data in contents:
+    position += -position % _BUFFER_ALIGNMENT
+    buf.offset = position
+    position += data.size
+  if contents:
+    model_bytes = convert_object_to_bytearray(model)
+
+  with gfile.GFile(output_tflite_file, 'wb') as output_file_handle:
+    output_file_handle.write(model_bytes)
+    position = len(model_bytes)
+    for buf, data in contents:
+      output_file_handle.write(b'\0' * (buf.offset - position))
+      output_file_handle.write(memoryview(data))
+      position = buf.offset + data.size
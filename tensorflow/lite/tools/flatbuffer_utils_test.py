@@ -17,7 +17,11 @@ import copy
 import os
 import subprocess
 import sys
+import time
 
+import numpy as np
+
+from tensorflow.lite.python import schema_py_generated as schema_fb
 from tensorflow.lite.tools import flatbuffer_utils
 from tensorflow.lite.tools import test_utils
 from tensorflow.python.framework import test_util
@@ -249,5 +253,179 @@ class CountResourceVariablesTest(test_util.TensorFlowTestCase):
         flatbuffer_utils.count_resource_variables(initial_model), 1)
 
 
+def _write_mock_model(path, constant_type=None, constant_data=None):
+  """Writes the mock model, optionally changing its constant tensor."""
+  model = test_utils.build_mock_model()
+  if constant_type is not None:
+    model.subgraphs[0].tensors[1].type = constant_type
+  if constant_data is not None:
+    model.buffers[1].data = constant_data
+  flatbuffer_utils.write_model(model, path)
+  return path
+
+
+class ModelViewTest(test_util.TensorFlowTestCase):
+
+  def _model_path(self, **kwargs):
+    return _write_mock_model(
+        os.path.join(self.get_temp_dir(), 'model.tflite'), **kwargs)
+
+  def testBufferData(self):
+    path = self._model_path()
+    model = flatbuffer_utils.read_model(path)
+    with flatbuffer_utils.read_model_view(path) as view:
+      self.assertEqual(len(model.buffers), view.num_buffers)
+      self.assertIsNone(view.buffer_data(0))
+      self.assertAllEqual(model.buffers[1].data, view.buffer_data(1))
+      self.assertIsNone(view.buffer_data(2))
+      self.assertEqual({0: schema_fb.TensorType.FLOAT32,
+                        1: schema_fb.TensorType.UINT8,
+                        2: schema_fb.TensorType.FLOAT32},
+                       view.buffer_tensor_types())
+      # Views are read-only by default.
+      with self.assertRaises(ValueError):
+        view.buffer_data(1)[0] = 1
+
+  def testOperatorInputsSkipOperatorsWithoutInputs(self):
+    path = self._model_path()
+    with flatbuffer_utils.read_model_view(path) as view:
+      expected = view.buffer_tensor_types(operator_inputs_only=True)
+
+    model = test_utils.build_mock_model()
+    op = schema_fb.OperatorT()
+    op.opcodeIndex = model.subgraphs[0].operators[0].opcodeIndex
+    model.subgraphs[0].operators.insert(0, op)
+    path = os.path.join(self.get_temp_dir(), 'no_inputs.tflite')
+    flatbuffer_utils.write_model(model, path)
+    with flatbuffer_utils.read_model_view(path) as view:
+      # The operators after the one without inputs are still visited.
+      self.assertEqual(expected,
+                       view.buffer_tensor_types(operator_inputs_only=True))
+
+  def testRandomizeWeights(self):
+    path = self._model_path()
+    with flatbuffer_utils.read_model_view(path, writable=True) as view:
+      flatbuffer_utils.randomize_weights_view(view)
+      randomized = view.buffer_data(1).copy()
+      output_path = os.path.join(self.get_temp_dir(), 'randomized.tflite')
+      flatbuffer_utils.write_model_view(view, output_path)
+
+    self.assertNotAllEqual(np.arange(12, dtype=np.uint8), randomized)
+    # The input file is left unmodified.
+    self.assertAllEqual(
+        np.arange(12), flatbuffer_utils.read_model(path).buffers[1].data)
+    self.assertAllEqual(
+        randomized, flatbuffer_utils.read_model(output_path).buffers[1].data)
+
+  def testRandomizeFloatWeights(self):
+    path = self._model_path(constant_type=schema_fb.TensorType.FLOAT32)
+    with flatbuffer_utils.read_model_view(path, writable=True) as view:
+      flatbuffer_utils.randomize_weights_view(view, random_seed=3)
+      values = view.buffer_data(1).view('<f4')
+      self.assertAllInRange(values, -0.5, 0.5)
+
+  def testRandomizeSomeWeights(self):
+    path = self._model_path()
+    with flatbuffer_utils.read_model_view(path, writable=True) as view:
+      flatbuffer_utils.randomize_weights_view(
+          view, buffers_to_skip=[_SKIPPED_BUFFER_INDEX])
+      self.assertAllEqual(np.arange(12), view.buffer_data(1))
+
+  def testByteSwap(self):
+    path = self._model_path(constant_type=schema_fb.TensorType.INT32)
+    model = flatbuffer_utils.read_model(path)
+    flatbuffer_utils.byte_swap_tflite_model_obj(model, 'little', 'big')
+    with flatbuffer_utils.read_model_view(path, writable=True) as view:
+      flatbuffer_utils.byte_swap_model_view(view, 'little', 'big')
+      self.assertEqual(bytes(model.buffers[1].data),
+                       view.buffer_data(1).tobytes())
+      flatbuffer_utils.byte_swap_model_view(view, 'big', 'little')
+      self.assertAllEqual(np.arange(12), view.buffer_data(1))
+
+  def testCountResourceVariables(self):
+    with flatbuffer_utils.read_model_view(self._model_path()) as view:
+      self.assertEqual(1, flatbuffer_utils.count_resource_variables(view))
+
+  def testWriteStrippedModelView(self):
+    path = self._model_path()
+    output_path = os.path.join(self.get_temp_dir(), 'stripped.tflite')
+    with flatbuffer_utils.read_model_view(path) as view:
+      flatbuffer_utils.write_stripped_model_view(view, output_path)
+
+    model = flatbuffer_utils.read_model(output_path)
+    self.assertIsNone(model.description)
+    self.assertIsNone(model.signatureDefs)
+    self.assertIsNone(model.subgraphs[0].name)
+    for tensor in model.subgraphs[0].tensors:
+      self.assertIsNone(tensor.name)
+    self.assertAllEqual(np.arange(12), model.buffers[1].data)
+    with flatbuffer_utils.read_model_view(output_path) as view:
+      self.assertAllEqual(np.arange(12), view.buffer_data(1))
+      self.assertIsNone(view.buffer_data(2))
+
+
+class ModelViewBenchmark(test.Benchmark):
+  """Compares `ModelView` functions with their object API equivalents."""
+
+  def _report(self, name, fn, iters=3):
+    start = time.time()
+    for _ in range(iters):
+      fn()
+    self.report_benchmark(
+        iters=iters, wall_time=(time.time() - start) / iters, name=name)
+
+  def benchmarkModelView(self):
+    num_weights = 1 << 20
+    path = _write_mock_model(
+        os.path.join(test.get_temp_dir(), 'benchmark.tflite'),
+        constant_type=schema_fb.TensorType.FLOAT32,
+        constant_data=np.zeros(4 * num_weights, dtype=np.uint8))
+
+    def object_randomize():
+      model = flatbuffer_utils.read_model(path)
+      flatbuffer_utils.randomize_weights(model)
+
+    def view_randomize():
+      with flatbuffer_utils.read_model_view(path, writable=True) as view:
+        flatbuffer_utils.randomize_weights_view(view)
+
+    def object_byte_swap():
+      model = flatbuffer_utils.read_model(path)
+      flatbuffer_utils.byte_swap_tflite_model_obj(model, 'little', 'big')
+
+    def view_byte_swap():
+      with flatbuffer_utils.read_model_view(path, writable=True) as view:
+        flatbuffer_utils.byte_swap_model_view(view, 'little', 'big')
+
+    def object_strip_strings():
+      model = flatbuffer_utils.read_model(path)
+      flatbuffer_utils.strip_strings(model)
+      flatbuffer_utils.write_model(model, path + '.stripped')
+
+    def view_strip_strings():
+      with flatbuffer_utils.read_model_view(path) as view:
+        flatbuffer_utils.write_stripped_model_view(view, path + '.stripped')
+
+    def object_count_resource_variables():
+      flatbuffer_utils.count_resource_variables(
+          flatbuffer_utils.read_model(path))
+
+    def view_count_resource_variables():
+      with flatbuffer_utils.read_model_view(path) as view:
+        flatbuffer_utils.count_resource_variables(view)
+
+    for name, fn in [
+        ('object_randomize_weights', object_randomize),
+        ('view_randomize_weights', view_randomize),
+        ('object_byte_swap', object_byte_swap),
+        ('view_byte_swap', view_byte_swap),
+        ('object_strip_strings', object_strip_strings),
+        ('view_strip_strings', view_strip_strings),
+        ('object_count_resource_variables', object_count_resource_variables),
+        ('view_count_resource_variables', view_count_resource_variables),
+    ]:
+      self._report(name, fn)
+
+
 if __name__ == '__main__':
   test.main()
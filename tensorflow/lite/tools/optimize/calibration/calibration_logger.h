@@ -15,6 +15,7 @@ limitations under the License.
 #ifndef TENSORFLOW_LITE_TOOLS_OPTIMIZE_CALIBRATION_CALIBRATION_LOGGER_H_
 #define TENSORFLOW_LITE_TOOLS_OPTIMIZE_CALIBRATION_CALIBRATION_LOGGER_H_
 
+#include <algorithm>
 #include <limits>
 
 #include "absl/container/flat_hash_map.h"
@@ -30,6 +31,14 @@ class MinMax {
   TfLiteStatus Update(const float* values, size_t tensor_size,
                       ErrorReporter* error_reporter);
 
+  // Extends the range to include [min_val, max_val], e.g. to merge values
+  // observed by another logger.
+  void Merge(float min_val, float max_val) {
+    has_values_ = true;
+    min_ = std::min(min_, min_val);
+    max_ = std::max(max_, max_val);
+  }
+
   bool HasValues() const { return has_values_; }
 
   TfLiteStatus Get(float* min_val, float* max_val) const {
@@ -57,6 +66,14 @@ class Logger {
                                                error_reporter);
   }
 
+  // Extends the range of the tensor at |tensor_index| by a range observed
+  // elsewhere.
+  void MergeTensorValue(int subgraph_index, int tensor_index, float min_val,
+                        float max_val) {
+    std::tuple<int, int> key{subgraph_index, tensor_index};
+    tensor_id_to_stats_map_[key].Merge(min_val, max_val);
+  }
+
   // Returns a map from tensor_index -> observed min max values.
   const absl::flat_hash_map<std::tuple<int, int>, MinMax>&
   GetCalibrationValues() const {
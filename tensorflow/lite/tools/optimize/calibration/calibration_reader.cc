@@ -41,6 +41,22 @@ TfLiteStatus CalibrationReader::GetTensorStatsAsMap(
   return kTfLiteOk;
 }
 
+TfLiteStatus CalibrationReader::MergeTensorStats(
+    const absl::flat_hash_map<std::tuple<int, int>, CalibrationStats>&
+        tensor_id_to_stats_map) {
+  for (const auto& tensorid_stat : tensor_id_to_stats_map) {
+    int subgraph_index, tensor_index;
+    std::tie(subgraph_index, tensor_index) = tensorid_stat.first;
+    const CalibrationStats& stats = tensorid_stat.second;
+    if (stats.min > stats.max) {
+      return kTfLiteError;
+    }
+    logger_->MergeTensorValue(subgraph_index, tensor_index, stats.min,
+                              stats.max);
+  }
+  return kTfLiteOk;
+}
+
 TfLiteStatus CalibrationReader::AddCalibrationToModel(ModelT* model,
                                                       const bool update) const {
   if (!model || model->subgraphs.empty()) {
@@ -37,7 +37,7 @@ class CalibrationReader {
     float min;
     float max;
   };
-  explicit CalibrationReader(const Logger* logger) : logger_(logger) {}
+  explicit CalibrationReader(Logger* logger) : logger_(logger) {}
 
   // Gets a map from tensor index to recorded calibration values.
   virtual TfLiteStatus GetTensorStatsAsMap(
@@ -50,10 +50,18 @@ class CalibrationReader {
   // being overwritten.
   virtual TfLiteStatus AddCalibrationToModel(ModelT* model, bool update) const;
 
+  // Merges calibration values recorded elsewhere, e.g. by another interpreter
+  // calibrating the same model on a different part of the dataset. Merging
+  // min/max values is exact, so the result is the same as if all the samples
+  // had been fed to this interpreter.
+  virtual TfLiteStatus MergeTensorStats(
+      const absl::flat_hash_map<std::tuple<int, int>, CalibrationStats>&
+          tensor_id_to_stats_map);
+
   virtual ~CalibrationReader() {}
 
  private:
-  const Logger* logger_;
+  Logger* logger_;
 };
 
 }  // namespace calibration
@@ -16,6 +16,8 @@ limitations under the License.
 
 #include <fstream>
 #include <memory>
+#include <mutex>  // NOLINT
+#include <shared_mutex>  // NOLINT
 #include <string>
 #include <unordered_map>
 #include <unordered_set>
@@ -143,15 +145,18 @@ class GlobalCalibratorRegistry {
   // Get the |Calibrator| associated with given context, returns null if no
   // calibrator is associated with the given context.
   Calibrator* GetCalibrator(const TfLiteNode* node) const {
-    if (node_to_calibrator_.find(node) == node_to_calibrator_.cend()) {
+    std::shared_lock<std::shared_mutex> lock(mutex_);
+    auto it = node_to_calibrator_.find(node);
+    if (it == node_to_calibrator_.cend()) {
       return nullptr;
     }
-    return node_to_calibrator_.at(node);
+    return it->second;
   }
 
   // Removes the association between calibrator and context.
   // Note: This deletes the calibrator as well.
   void RemoveCalibrator(const TfLiteContext* context) {
+    std::unique_lock<std::shared_mutex> lock(mutex_);
     Calibrator* calibrator = calibrator_registry_.at(context).get();
     auto nodes = calibrator->GetNodesUnderCalibration();
     for (auto node : nodes) {
@@ -168,6 +173,7 @@ class GlobalCalibratorRegistry {
       const std::unordered_map<const TfLiteNode*, OperatorInfo>& node_to_opinfo,
       std::unique_ptr<LoggingOpResolver> logging_op_resolver,
       Calibrator** calibrator_ptr, ErrorReporter* reporter) {
+    std::unique_lock<std::shared_mutex> lock(mutex_);
     if (calibrator_registry_.find(context) != calibrator_registry_.cend()) {
       reporter->Report(
           "Failed to create calibrator, context already registered.");
@@ -184,6 +190,9 @@ class GlobalCalibratorRegistry {
   }
 
  private:
+  // Interpreters being calibrated may be invoked from several threads at
+  // once, e.g. when calibrating in parallel.
+  mutable std::shared_mutex mutex_;
   absl::flat_hash_map<const TfLiteContext*, std::unique_ptr<Calibrator>>
       calibrator_registry_;
   absl::flat_hash_map<const TfLiteNode*, Calibrator*> node_to_calibrator_;
@@ -337,7 +346,7 @@ string GetOpName(const tflite::OperatorCode& opcode) {
 // A |CalibrationReader| that owns the Calibrator.
 class Reader : public CalibrationReader {
  public:
-  Reader(const TfLiteContext* context, const Logger* logger)
+  Reader(const TfLiteContext* context, Logger* logger)
       : CalibrationReader(logger), context_(context) {}
 
   ~Reader() override { GetCalibratorRegistry()->RemoveCalibrator(context_); }
@@ -203,6 +203,54 @@ TEST(CalibratorTest, MultipleInvokes) {
   EXPECT_NEAR(stats.find({0, 6})->second.max, 9.0f, eps);
 }
 
+TEST(CalibratorTest, MergeTensorStats) {
+  auto model = ReadModel("multi_add.bin");
+  ASSERT_TRUE(model);
+  std::unique_ptr<Interpreter> interpreter;
+  std::unique_ptr<CalibrationReader> reader;
+  auto status = BuildLoggingInterpreter(
+      *model, ops::builtin::BuiltinOpResolver{}, &interpreter, &reader);
+  EXPECT_EQ(kTfLiteOk, status);
+  ASSERT_TRUE(interpreter);
+  ASSERT_TRUE(reader);
+  status = interpreter->AllocateTensors();
+  ASSERT_EQ(kTfLiteOk, status);
+
+  const size_t tensor_size = 1 * 8 * 8 * 3;
+  for (size_t i = 0; i < interpreter->inputs().size(); i++) {
+    TfLiteTensor* tensor = interpreter->tensor(interpreter->inputs()[i]);
+    for (size_t j = 0; j < tensor_size; j++) {
+      tensor->data.f[j] = i + 1;
+    }
+  }
+  status = interpreter->Invoke();
+  ASSERT_EQ(kTfLiteOk, status);
+
+  // Merge ranges as another interpreter of the same model could have
+  // recorded them: one extends tensor 0 on both sides, one is contained in
+  // the range of tensor 5.
+  absl::flat_hash_map<std::tuple<int, int>, CalibrationReader::CalibrationStats>
+      other_stats;
+  other_stats[{0, 0}] = {-1.0f, 3.0f};
+  other_stats[{0, 5}] = {6.0f, 6.0f};
+  EXPECT_EQ(kTfLiteOk, reader->MergeTensorStats(other_stats));
+
+  absl::flat_hash_map<std::tuple<int, int>, CalibrationReader::CalibrationStats>
+      stats;
+  status = reader->GetTensorStatsAsMap(&stats);
+  EXPECT_EQ(kTfLiteOk, status);
+  EXPECT_EQ(7, stats.size());
+  const float eps = 1e-6f;
+  EXPECT_NEAR(stats.find({0, 0})->second.min, -1.0f, eps);
+  EXPECT_NEAR(stats.find({0, 0})->second.max, 3.0f, eps);
+  EXPECT_NEAR(stats.find({0, 5})->second.min, 6.0f, eps);
+  EXPECT_NEAR(stats.find({0, 5})->second.max, 6.0f, eps);
+
+  other_stats.clear();
+  other_stats[{0, 1}] = {2.0f, 1.0f};
+  EXPECT_EQ(kTfLiteError, reader->MergeTensorStats(other_stats));
+}
+
 TEST(CalibratorTest, UpdateMinMax) {
   auto flatbuffer_model = ReadModel("multi_add.bin");
   ASSERT_TRUE(flatbuffer_model);
@@ -15,9 +15,11 @@
 """Python TF-Lite QuantizationDebugger."""
 import collections
 import csv
+import itertools
 import re
-from typing import (Any, Callable, Dict, IO, Iterable, List, Mapping, Optional,
-                    Sequence, Tuple)
+import statistics
+from typing import (Any, Callable, Dict, IO, Iterable, Iterator, List, Mapping,
+                    Optional, Sequence, Tuple)
 
 import numpy as np
 
@@ -42,6 +44,61 @@ _DEFAULT_LAYER_DEBUG_METRICS = {
 _NUMERIC_VERIFY_OP_NAME = 'NumericVerify'
 
 
+def _default_layer_debug_metrics(diffs: np.ndarray) -> Dict[str, float]:
+  """Computes all default layer debug metrics, sharing the centering pass."""
+  mean = np.mean(diffs)
+  variance = np.mean(np.square(diffs - mean))
+  return {
+      'num_elements': diffs.size,
+      'stddev': np.sqrt(variance),
+      'mean_error': mean,
+      'max_abs_error': np.max(np.abs(diffs)),
+      'mean_squared_error': variance + mean * mean,
+  }
+
+
+class _StreamingMean:
+  """Running mean and variance of per-sample values, ignoring NaNs.
+
+  Uses Welford's algorithm on arrays, so that the statistics of all layers and
+  metrics are updated with a few vectorized operations per sample.
+  """
+
+  def __init__(self, shape: Tuple[int, ...]) -> None:
+    self._count = np.zeros(shape, dtype=np.int64)
+    self._mean = np.zeros(shape, dtype=np.float64)
+    self._m2 = np.zeros(shape, dtype=np.float64)
+
+  def update(self, values: np.ndarray) -> None:
+    valid = ~np.isnan(values)
+    self._count += valid
+    delta = np.where(valid, values - self._mean, 0.)
+    self._mean += np.divide(
+        delta, self._count, out=np.zeros_like(delta), where=valid)
+    self._m2 += np.where(valid, delta * (values - self._mean), 0.)
+
+  def mean(self) -> np.ndarray:
+    return np.where(self._count > 0, self._mean, np.nan)
+
+  def confidence_interval(
+      self, confidence_level: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the normal-approximation interval bounds of the mean."""
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence_level / 2.)
+    with np.errstate(divide='ignore', invalid='ignore'):
+      sem = np.sqrt(self._m2 / (self._count - 1) / self._count)
+    sem = np.where(self._count > 1, sem, np.nan)
+    mean = self.mean()
+    return mean - z * sem, mean + z * sem
+
+
+class _DebugLayer(
+    collections.namedtuple(
+        '_DebugLayer',
+        ['name', 'index', 'float_index', 'quant_index', 'scale', 'zero_point'])
+):
+  """A NumericVerify output and the operands it compares."""
+
+
 def _get_quant_params(
     tensor_detail: Mapping[str, Any]) -> Optional[Tuple[float, int]]:
   """Returns first scale and zero point from tensor detail, if present."""
@@ -69,7 +126,10 @@ class QuantizationDebugOptions:
                    float]]] = None,
                denylisted_ops: Optional[List[str]] = None,
                denylisted_nodes: Optional[List[str]] = None,
-               fully_quantize: bool = False) -> None:
+               fully_quantize: bool = False,
+               debug_layers: Optional[List[str]] = None,
+               num_debug_samples: Optional[int] = None,
+               confidence_level: Optional[float] = None) -> None:
     """Initializes debugger options.
 
     Args:
@@ -95,9 +155,17 @@ class QuantizationDebugOptions:
       fully_quantize: Bool indicating whether to fully quantize the model.
         Besides model body, the input/output will be quantized as well.
         Corresponding to mlir_quantize's fully_quantize parameter.
+      debug_layers: a list of quantized tensor names (the `tensor_name` column
+        of `layer_statistics_dump`) to restrict layer statistics to. All
+        layers are debugged by default.
+      num_debug_samples: if set, only this many samples of the debug dataset
+        are used, which should then be shuffled.
+      confidence_level: if set, e.g. 0.95, confidence intervals of the layer
+        statistics are reported in `layer_statistics_confidence_intervals`.
 
     Raises:
-      ValueError: when there are duplicate keys
+      ValueError: when there are duplicate keys, or the sampling options are
+        invalid.
     """
     self.layer_debug_metrics = layer_debug_metrics
     self.model_debug_metrics = model_debug_metrics
@@ -116,6 +184,14 @@ class QuantizationDebugOptions:
     self.denylisted_nodes = denylisted_nodes
     self.fully_quantize = fully_quantize
 
+    if num_debug_samples is not None and num_debug_samples < 1:
+      raise ValueError('num_debug_samples must be positive.')
+    if confidence_level is not None and not 0. < confidence_level < 1.:
+      raise ValueError('confidence_level must be in (0, 1).')
+    self.debug_layers = debug_layers
+    self.num_debug_samples = num_debug_samples
+    self.confidence_level = confidence_level
+
 
 @tf_export.tf_export('lite.experimental.QuantizationDebugger')
 class QuantizationDebugger:
@@ -157,6 +233,9 @@ class QuantizationDebugger:
         results. in {layer_name: {metric_name: metric}} format.
       model_statistics: results of error metrics for difference between float
         and quantized models. in {metric_name: metric} format.
+      layer_statistics_confidence_intervals: confidence intervals of
+        `layer_statistics` when `confidence_level` is set in the debug
+        options. in {layer_name: {metric_name: (low, high)}} format.
     """
     self._data_gen = debug_dataset
     self._debug_options = debug_options or QuantizationDebugOptions()
@@ -226,6 +305,7 @@ class QuantizationDebugger:
       self._layer_debug_metrics.update(self._debug_options.layer_debug_metrics)
 
     self.layer_statistics = None
+    self.layer_statistics_confidence_intervals = None
     self.model_statistics = None
 
     self._metrics = metrics_stub.TFLiteMetrics()
@@ -329,6 +409,36 @@ class QuantizationDebugger:
     if self._debug_options.model_debug_metrics:
       self.model_statistics = self._collect_model_statistics()
 
+  def _debug_dataset(self) -> Iterable[Sequence[np.ndarray]]:
+    """Returns the debug dataset, limited to `num_debug_samples` samples."""
+    return itertools.islice(self._data_gen(),
+                            self._debug_options.num_debug_samples)
+
+  def _get_debug_layers(self) -> List[_DebugLayer]:
+    """Returns the NumericVerify outputs selected by `debug_layers`."""
+    debug_layers = self._debug_options.debug_layers
+    compare_directly = (
+        self._debug_options.layer_direct_compare_metrics is not None)
+    layers = []
+    for tensor_detail in self._get_numeric_verify_tensor_details():
+      name = tensor_detail['name']  # pytype: disable=unsupported-operands  # dynamic-method-lookup
+      if (debug_layers is not None and name not in debug_layers and
+          self._get_operand_name_and_index(name)[0] not in debug_layers):
+        continue
+      index = tensor_detail['index']  # pytype: disable=unsupported-operands  # dynamic-method-lookup
+      float_index = quant_index = scale = zero_point = None
+      if compare_directly:
+        op_detail = self._quant_interpreter._get_op_details(  # pylint: disable=protected-access
+            self._defining_op[index])
+        quant_index, float_index = op_detail['inputs']
+        quant_params = self._quant_interpreter._get_tensor_details(  # pylint: disable=protected-access
+            quant_index, subgraph_index=0)['quantization_parameters']
+        scale = quant_params['scales'][0]
+        zero_point = quant_params['zero_points'][0]
+      layers.append(
+          _DebugLayer(name, index, float_index, quant_index, scale, zero_point))
+    return layers
+
   def _collect_layer_statistics(self) -> Dict[str, Dict[str, float]]:
     """Collects layer statistics by applying layer debug metrics.
 
@@ -340,11 +450,36 @@ class QuantizationDebugger:
       aggregated per-layer statistics of NumericVerify results.
       {layer_name: {metric_name: metric}}
     """
-    layer_statistics = collections.defaultdict(
-        lambda: collections.defaultdict(list))
+    return dict(self._iter_layer_statistics())
+
+  def _iter_layer_statistics(
+      self) -> Iterator[Tuple[str, Dict[str, float]]]:
+    """Runs the debug dataset and yields the statistics of each layer.
+
+    Per-example metric values are folded into running means as they are
+    computed, so memory does not grow with the size of the dataset. Also sets
+    `layer_statistics_confidence_intervals` when requested.
+
+    Yields:
+      (layer_name, {metric_name: metric}) for each debugged layer.
+    """
+    layers = self._get_debug_layers()
+    direct_compare_metrics = (
+        self._debug_options.layer_direct_compare_metrics or {})
+    fused_metrics = {
+        name for name, metric_fn in self._layer_debug_metrics.items()
+        if _DEFAULT_LAYER_DEBUG_METRICS.get(name) is metric_fn
+    }
+    other_metrics = [(name, metric_fn)
+                     for name, metric_fn in self._layer_debug_metrics.items()
+                     if name not in fused_metrics]
+    metric_names = (
+        list(self._layer_debug_metrics) + list(direct_compare_metrics))
+    accumulator = _StreamingMean((len(layers), len(metric_names)))
+    values = np.empty((len(layers), len(metric_names)), dtype=np.float64)
 
     initialize = True
-    for tensor_data in self._data_gen():
+    for tensor_data in self._debug_dataset():
       self._set_input_tensors(self._quant_interpreter, tensor_data, initialize)
       initialize = False
 
@@ -352,36 +487,35 @@ class QuantizationDebugger:
       self._quant_interpreter.invoke()
 
       # Collect the statistics of this invoke result.
-      for tensor_detail in self._get_numeric_verify_tensor_details():
-        tensor_name = tensor_detail['name']  # pytype: disable=unsupported-operands  # dynamic-method-lookup
-        diffs = self._quant_interpreter.get_tensor(tensor_detail['index'])  # pytype: disable=unsupported-operands  # dynamic-method-lookup
-        for metric_name, metric_fn in self._layer_debug_metrics.items():
-          layer_statistics[tensor_name][metric_name].append(metric_fn(diffs))
-
-      if self._debug_options.layer_direct_compare_metrics is not None:
-        for tensor_detail in self._get_numeric_verify_tensor_details():
-          tensor_name = tensor_detail['name']  # pytype: disable=unsupported-operands  # dynamic-method-lookup
-          op_idx = self._defining_op[tensor_detail['index']]  # pytype: disable=unsupported-operands  # dynamic-method-lookup
-          op_detail = self._quant_interpreter._get_op_details(op_idx)  # pylint: disable=protected-access
-          q_idx, f_idx = op_detail['inputs']
-          quant_input_detail = self._quant_interpreter._get_tensor_details(  # pylint: disable=protected-access
-              q_idx, subgraph_index=0)
-          for (metric_name, metric_fn
-              ) in self._debug_options.layer_direct_compare_metrics.items():
-            layer_statistics[tensor_name][metric_name].append(
-                metric_fn(
-                    self._quant_interpreter.get_tensor(f_idx),
-                    self._quant_interpreter.get_tensor(q_idx),
-                    quant_input_detail['quantization_parameters']['scales'][0],
-                    quant_input_detail['quantization_parameters']['zero_points']
-                    [0]))
+      for i, layer in enumerate(layers):
+        diffs = self._quant_interpreter.get_tensor(layer.index)
+        layer_values = (
+            _default_layer_debug_metrics(diffs) if fused_metrics else {})
+        for metric_name, metric_fn in other_metrics:
+          layer_values[metric_name] = metric_fn(diffs)
+        if direct_compare_metrics:
+          float_values = self._quant_interpreter.get_tensor(layer.float_index)
+          quant_values = self._quant_interpreter.get_tensor(layer.quant_index)
+          for metric_name, metric_fn in direct_compare_metrics.items():
+            layer_values[metric_name] = metric_fn(float_values, quant_values,
+                                                  layer.scale,
+                                                  layer.zero_point)
+        values[i] = [layer_values[name] for name in metric_names]
+      accumulator.update(values)
 
     # Calculate final aggregated metrics for each layer.
-    for metrics in layer_statistics.values():
-      for metric_name in metrics:
-        metrics[metric_name] = np.nanmean(metrics[metric_name])
-
-    return layer_statistics
+    confidence_level = self._debug_options.confidence_level
+    if confidence_level is not None:
+      low, high = accumulator.confidence_interval(confidence_level)
+      self.layer_statistics_confidence_intervals = {
+          layer.name: {
+              name: (low[i, j], high[i, j])
+              for j, name in enumerate(metric_names)
+          } for i, layer in enumerate(layers)
+      }
+    means = accumulator.mean()
+    for i, layer in enumerate(layers):
+      yield layer.name, dict(zip(metric_names, means[i]))
 
   def _collect_model_statistics(self) -> Dict[str, float]:
     """Collects model output metrics.
@@ -401,7 +535,7 @@ class QuantizationDebugger:
     model_statistics = collections.defaultdict(list)
 
     initialize = True
-    for tensor_data in self._data_gen():
+    for tensor_data in self._debug_dataset():
       # Run quantized debug model and collect output results.
       self._set_input_tensors(self._quant_interpreter, tensor_data, initialize)
       self._quant_interpreter.invoke()
@@ -521,12 +655,34 @@ class QuantizationDebugger:
 
     return (float_tensor_name, int(tensor_idx))
 
+  def _layer_statistics_row(self, name: str,
+                            metrics: Mapping[str, float]) -> Dict[str, Any]:
+    """Returns the csv row of `layer_statistics_dump` for one layer."""
+    data = dict(metrics)
+    (data['tensor_name'], _) = self._get_operand_name_and_index(name)
+    data['tensor_idx'] = self._numeric_verify_op_details[name]['inputs'][0]
+    data['op_name'] = self._quant_interpreter._get_op_details(  # pylint: disable=protected-access
+        self._defining_op[data['tensor_idx']])['op_name']
+    details = self._quant_interpreter._get_tensor_details(  # pylint: disable=protected-access
+        data['tensor_idx'], subgraph_index=0)
+    data['scale'], data['zero_point'] = (
+        details['quantization_parameters']['scales'][0],
+        details['quantization_parameters']['zero_points'][0])
+    return data
+
   def layer_statistics_dump(self, file: IO[str]) -> None:
     """Dumps layer statistics into file, in csv format.
 
+    If the layer statistics have not been collected yet, they are collected
+    first, over the whole debug dataset, since the statistics of every layer
+    are only final after the last sample. If the collection fails, nothing is
+    written and `layer_statistics` stays unset.
+
     Args:
       file: file, or file-like object to write.
     """
+    if self.layer_statistics is None:
+      self.layer_statistics = self._collect_layer_statistics()
     # order of `fields` is the order of fields in csv.
     fields = ['op_name', 'tensor_idx'] + list(self._layer_debug_metrics.keys())
     if self._debug_options.layer_direct_compare_metrics is not None:
@@ -534,16 +690,5 @@ class QuantizationDebugger:
     fields += ['scale', 'zero_point', 'tensor_name']
     writer = csv.DictWriter(file, fields)
     writer.writeheader()
-    if self.layer_statistics:
-      for name, metrics in self.layer_statistics.items():
-        data = metrics.copy()
-        (data['tensor_name'], _) = self._get_operand_name_and_index(name)
-        data['tensor_idx'] = self._numeric_verify_op_details[name]['inputs'][0]
-        data['op_name'] = self._quant_interpreter._get_op_details(  # pylint: disable=protected-access
-            self._defining_op[data['tensor_idx']])['op_name']
-        details = self._quant_interpreter._get_tensor_details(  # pylint: disable=protected-access
-            data['tensor_idx'], subgraph_index=0)
-        data['scale'], data['zero_point'] = (
-            details['quantization_parameters']['scales'][0],
-            details['quantization_parameters']['zero_points'][0])
-        writer.writerow(data)
+    for name, metrics in self.layer_statistics.items():
+      writer.writerow(self._layer_statistics_row(name, metrics))
@@ -16,6 +16,7 @@
 
 import csv
 import io
+import itertools
 import re
 from unittest import mock
 
@@ -224,6 +225,99 @@ class QuantizationDebuggerTest(test_util.TensorFlowTestCase,
       else:
         self.assertAlmostEqual(value, float(actual_values[key]), places=5)
 
+  @test_util.run_v2_only
+  def test_layer_metrics_sampling(self):
+
+    def first_samples_gen():
+      return itertools.islice(_calibration_gen(), 3)
+
+    full_debugger = debugger.QuantizationDebugger(
+        quant_debug_model_content=QuantizationDebuggerTest.debug_model_float,
+        debug_dataset=first_samples_gen)
+    full_debugger.run()
+    self.assertIsNone(full_debugger.layer_statistics_confidence_intervals)
+
+    options = debugger.QuantizationDebugOptions(
+        num_debug_samples=3, confidence_level=0.95)
+    sampled_debugger = debugger.QuantizationDebugger(
+        quant_debug_model_content=QuantizationDebuggerTest.debug_model_float,
+        debug_dataset=_calibration_gen,
+        debug_options=options)
+    sampled_debugger.run()
+
+    self.assertEqual(full_debugger.layer_statistics.keys(),
+                     sampled_debugger.layer_statistics.keys())
+    for name, metrics in full_debugger.layer_statistics.items():
+      intervals = sampled_debugger.layer_statistics_confidence_intervals[name]
+      for key, value in metrics.items():
+        self.assertAlmostEqual(
+            value, sampled_debugger.layer_statistics[name][key], places=5)
+        low, high = intervals[key]
+        self.assertLessEqual(low, value + 1e-6)
+        self.assertGreaterEqual(high, value - 1e-6)
+
+  @test_util.run_v2_only
+  def test_debug_layers(self):
+    quant_debugger = debugger.QuantizationDebugger(
+        quant_debug_model_content=QuantizationDebuggerTest.debug_model_float,
+        debug_dataset=_calibration_gen,
+        debug_options=debugger.QuantizationDebugOptions(
+            debug_layers=['no_such_tensor']))
+    quant_debugger.run()
+    self.assertEmpty(quant_debugger.layer_statistics)
+
+    buffer = io.StringIO()
+    debugger.QuantizationDebugger(
+        quant_debug_model_content=QuantizationDebuggerTest.debug_model_float,
+        debug_dataset=_calibration_gen).layer_statistics_dump(buffer)
+    tensor_name = next(iter(csv.DictReader(buffer.getvalue().split())))[
+        'tensor_name']
+
+    quant_debugger = debugger.QuantizationDebugger(
+        quant_debug_model_content=QuantizationDebuggerTest.debug_model_float,
+        debug_dataset=_calibration_gen,
+        debug_options=debugger.QuantizationDebugOptions(
+            debug_layers=[tensor_name]))
+    quant_debugger.run()
+    self.assertLen(quant_debugger.layer_statistics, 1)
+
+  @test_util.run_v2_only
+  def test_layer_statistics_dump_collects_statistics(self):
+    quant_debugger = debugger.QuantizationDebugger(
+        quant_debug_model_content=QuantizationDebuggerTest.debug_model_float,
+        debug_dataset=_calibration_gen)
+    buffer = io.StringIO()
+    quant_debugger.layer_statistics_dump(buffer)
+
+    self.assertLen(quant_debugger.layer_statistics, 1)
+    rows = list(csv.DictReader(buffer.getvalue().split()))
+    self.assertLen(rows, 1)
+    metrics = next(iter(quant_debugger.layer_statistics.values()))
+    self.assertAlmostEqual(metrics['mean_error'], float(rows[0]['mean_error']),
+                           places=5)
+
+  @test_util.run_v2_only
+  def test_layer_statistics_dump_writes_nothing_on_dataset_error(self):
+
+    def failing_gen():
+      yield from itertools.islice(_calibration_gen(), 2)
+      raise RuntimeError('dataset failure')
+
+    quant_debugger = debugger.QuantizationDebugger(
+        quant_debug_model_content=QuantizationDebuggerTest.debug_model_float,
+        debug_dataset=failing_gen)
+    buffer = io.StringIO()
+    with self.assertRaisesRegex(RuntimeError, 'dataset failure'):
+      quant_debugger.layer_statistics_dump(buffer)
+    self.assertIsNone(quant_debugger.layer_statistics)
+    self.assertEmpty(buffer.getvalue())
+
+  def test_invalid_sampling_options_raise_ValueError(self):
+    with self.assertRaises(ValueError):
+      debugger.QuantizationDebugOptions(num_debug_samples=0)
+    with self.assertRaises(ValueError):
+      debugger.QuantizationDebugOptions(confidence_level=1.5)
+
   @parameterized.named_parameters(
       ('float_io', False),
       ('quantized_io', True),
@@ -15,13 +15,17 @@
 """Tests for tensorflow.python.data.experimental.ops.lookup_ops."""
 
 import os
+import tempfile
+import time
 
 from tensorflow.python import tf2
+from tensorflow.python.client import session
 from tensorflow.python.data.experimental.ops import lookup_ops
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import readers as reader_ops
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import lookup_ops as core_lookup_ops
 from tensorflow.python.ops import string_ops
@@ -148,5 +152,173 @@ class DatasetInitializerTest(test.TestCase):
     self.assertAllEqual([0, 1, 2], result)
 
 
+class ParallelTextFileInitializerTest(test.TestCase):
+
+  def getHashTable(self):
+    if tf2.enabled():
+      return core_lookup_ops.StaticHashTable
+    else:
+      return core_lookup_ops.StaticHashTableV1
+
+  def initialize_table(self, table):
+    if not tf2.enabled():
+      self.evaluate(table.initializer)
+
+  def _createVocabFile(self, basename, values):
+    vocabulary_file = os.path.join(self.get_temp_dir(), basename)
+    with open(vocabulary_file, "w") as f:
+      f.write("\n".join(values) + "\n")
+    return vocabulary_file
+
+  def test_whole_line_to_line_number(self):
+    vocabulary_file = self._createVocabFile(
+        "parallel_one_column.txt",
+        ("brain", "salad", "surgery", "tank", "emerson"))
+    init = lookup_ops.ParallelTextFileInitializer(
+        vocabulary_file,
+        dtypes.string,
+        core_lookup_ops.TextFileIndex.WHOLE_LINE,
+        dtypes.int64,
+        core_lookup_ops.TextFileIndex.LINE_NUMBER,
+        batch_size=2)
+    table = self.getHashTable()(init, -1)
+    self.initialize_table(table)
+
+    output = table.lookup(
+        constant_op.constant(
+            ["brain", "salad", "surgery", "tank", "emerson", "x"]))
+    self.assertAllEqual([0, 1, 2, 3, 4, -1], self.evaluate(output))
+    self.assertEqual(5, self.evaluate(table.size()))
+
+  def test_multi_column_matches_text_file_initializer(self):
+    vocabulary_file = self._createVocabFile(
+        "parallel_three_columns.txt",
+        ("0\tbrain\t1", "1\tsalad\t5", "2\tsurgery\t6"))
+    for cls in (core_lookup_ops.TextFileInitializer,
+                lookup_ops.ParallelTextFileInitializer):
+      init = cls(
+          vocabulary_file,
+          dtypes.string,
+          1,
+          dtypes.int32,
+          2,
+          value_index_offset=10)
+      table = self.getHashTable()(init, -1)
+      self.initialize_table(table)
+
+      output = table.lookup(constant_op.constant(["brain", "salad", "x"]))
+      self.assertAllEqual([11, 15, -1], self.evaluate(output))
+
+  def test_vocab_size_and_offset(self):
+    vocabulary_file = self._createVocabFile("parallel_vocab_size.txt",
+                                            ("42", "1", "-1000"))
+    init = lookup_ops.ParallelTextFileInitializer(
+        vocabulary_file,
+        dtypes.int64,
+        core_lookup_ops.TextFileIndex.WHOLE_LINE,
+        dtypes.int64,
+        core_lookup_ops.TextFileIndex.LINE_NUMBER,
+        vocab_size=2,
+        value_index_offset=3,
+        batch_size=1)
+    table = self.getHashTable()(init, -1)
+    self.initialize_table(table)
+
+    output = table.lookup(
+        constant_op.constant([42, 1, -1000], dtype=dtypes.int64))
+    self.assertAllEqual([3, 4, -1], self.evaluate(output))
+
+  def test_missing_column(self):
+    vocabulary_file = self._createVocabFile(
+        "parallel_missing_column.txt", ("0\tbrain", "1", "2\tsurgery"))
+    init = lookup_ops.ParallelTextFileInitializer(
+        vocabulary_file,
+        dtypes.string,
+        1,
+        dtypes.int64,
+        core_lookup_ops.TextFileIndex.LINE_NUMBER,
+        batch_size=2)
+    with self.assertRaisesRegex(errors.InvalidArgumentError,
+                                "Invalid number of columns"):
+      table = self.getHashTable()(init, -1)
+      self.initialize_table(table)
+
+  def test_vocab_size_too_large(self):
+    vocabulary_file = self._createVocabFile("parallel_vocab_size_large.txt",
+                                            ("brain", "salad"))
+    init = lookup_ops.ParallelTextFileInitializer(
+        vocabulary_file,
+        dtypes.string,
+        core_lookup_ops.TextFileIndex.WHOLE_LINE,
+        dtypes.int64,
+        core_lookup_ops.TextFileIndex.LINE_NUMBER,
+        vocab_size=3)
+    with self.assertRaisesRegex(errors.OpError, "expected to contain"):
+      table = self.getHashTable()(init, -1)
+      self.initialize_table(table)
+
+  def test_vocabulary_table_from_file(self):
+    vocabulary_file = self._createVocabFile("fallback.txt",
+                                            ("brain", "salad"))
+    binary_file = os.path.join(self.get_temp_dir(), "fallback.vocab")
+
+    table = lookup_ops.vocabulary_table_from_file(
+        vocabulary_file, binary_filename=binary_file)
+    self.assertIsInstance(table, core_lookup_ops.StaticHashTable)
+    self.initialize_table(table)
+    output = table.lookup(constant_op.constant(["salad", "brain", "x"]))
+    self.assertAllEqual([1, 0, -1], self.evaluate(output))
+
+    core_lookup_ops.convert_text_vocabulary(vocabulary_file, binary_file)
+    table = lookup_ops.vocabulary_table_from_file(
+        vocabulary_file, binary_filename=binary_file)
+    self.assertIsInstance(table, core_lookup_ops.MemmappedVocabularyTable)
+    output = table.lookup(constant_op.constant(["salad", "brain", "x"]))
+    self.assertAllEqual([1, 0, -1], self.evaluate(output))
+
+
+class VocabularyTableBenchmark(test.Benchmark):
+  """Benchmarks creating a table from a vocabulary and a first lookup."""
+
+  def _create_vocabulary(self, size=1000000):
+    text_file = os.path.join(tempfile.mkdtemp(), "vocab.txt")
+    with open(text_file, "w") as f:
+      f.write("\n".join("token_%d" % i for i in range(size)) + "\n")
+    binary_file = text_file + ".bin"
+    core_lookup_ops.convert_text_vocabulary(text_file, binary_file)
+    return text_file, binary_file
+
+  def _run_table(self, create_table, name, iters=5):
+    wall_times = []
+    for _ in range(iters):
+      with ops.Graph().as_default():
+        table = create_table()
+        output = table.lookup(constant_op.constant(["token_7", "x"]))
+        with session.Session() as sess:
+          start = time.time()
+          sess.run(core_lookup_ops.tables_initializer())
+          sess.run(output)
+          wall_times.append(time.time() - start)
+    self.report_benchmark(
+        iters=iters, wall_time=sum(wall_times) / iters, name=name)
+
+  def benchmark_vocabulary_table(self):
+    text_file, binary_file = self._create_vocabulary()
+    text_args = (text_file, dtypes.string,
+                 core_lookup_ops.TextFileIndex.WHOLE_LINE, dtypes.int64,
+                 core_lookup_ops.TextFileIndex.LINE_NUMBER)
+    self._run_table(
+        lambda: core_lookup_ops.StaticHashTableV1(
+            core_lookup_ops.TextFileInitializer(*text_args), -1), "text_file")
+    self._run_table(
+        lambda: core_lookup_ops.StaticHashTableV1(
+            lookup_ops.ParallelTextFileInitializer(*text_args), -1),
+        "parallel_text_file")
+    self._run_table(
+        lambda: core_lookup_ops.MemmappedVocabularyTable(
+            binary_file, dtypes.string, dtypes.int64, -1),
+        "memmapped_vocabulary")
+
+
 if __name__ == "__main__":
   test.main()
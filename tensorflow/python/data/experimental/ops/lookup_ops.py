@@ -15,9 +15,15 @@
 """Lookup operations."""
 
 from tensorflow.python.data.experimental.ops.cardinality import assert_cardinality
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.ops import readers
+from tensorflow.python.eager import context
+from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor
+from tensorflow.python.lib.io import file_io
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_experimental_dataset_ops as ged_ops
 from tensorflow.python.ops import lookup_ops
 from tensorflow.python.ops import math_ops
@@ -236,3 +242,165 @@ def index_table_from_dataset(dataset=None,
   return table_from_dataset(dataset.enumerate().map(lambda v, k: (k, v)),
                             num_oov_buckets, vocab_size, default_value,
                             hasher_spec, key_dtype, name)
+
+
+class ParallelTextFileInitializer(lookup_ops.TextFileInitializer):
+  """Table initializer that streams a text file and parses it in parallel.
+
+  Takes the same arguments as `tf.lookup.TextFileInitializer` and produces the
+  same table. The file is read by a `tf.data.TextLineDataset`, and batches of
+  `batch_size` lines are split and converted with vectorized ops by up to
+  `num_parallel_calls` threads while they are inserted into the table. Apart
+  from the table, only the batches in flight are held in memory.
+  """
+
+  def __init__(self,
+               filename,
+               key_dtype,
+               key_index,
+               value_dtype,
+               value_index,
+               vocab_size=None,
+               delimiter="\t",
+               name=None,
+               value_index_offset=0,
+               batch_size=4096,
+               num_parallel_calls=dataset_ops.AUTOTUNE):
+    """Constructs a table initializer that parses a text file in parallel.
+
+    Args:
+      filename: See `tf.lookup.TextFileInitializer`.
+      key_dtype: See `tf.lookup.TextFileInitializer`.
+      key_index: See `tf.lookup.TextFileInitializer`.
+      value_dtype: See `tf.lookup.TextFileInitializer`.
+      value_index: See `tf.lookup.TextFileInitializer`.
+      vocab_size: See `tf.lookup.TextFileInitializer`.
+      delimiter: See `tf.lookup.TextFileInitializer`.
+      name: See `tf.lookup.TextFileInitializer`.
+      value_index_offset: See `tf.lookup.TextFileInitializer`.
+      batch_size: The number of lines parsed at once.
+      num_parallel_calls: The number of batches parsed in parallel, or
+        `tf.data.AUTOTUNE`.
+
+    Raises:
+      ValueError: when the filename is empty, when the table key and value
+      data types do not match the expected data types, or when `batch_size`
+      is not positive.
+    """
+    if batch_size < 1:
+      raise ValueError(f"`batch_size` must be positive, received: {batch_size}")
+    self._batch_size = batch_size
+    self._num_parallel_calls = num_parallel_calls
+    super(ParallelTextFileInitializer, self).__init__(
+        filename,
+        key_dtype,
+        key_index,
+        value_dtype,
+        value_index,
+        vocab_size=vocab_size,
+        delimiter=delimiter,
+        name=name,
+        value_index_offset=value_index_offset)
+
+  def _dataset(self, filename):
+    """Returns a dataset of the (key, value) pairs of the text file."""
+    dataset = readers.TextLineDataset(filename)
+    if self._vocab_size is not None:
+      dataset = dataset.take(self._vocab_size)
+      dataset = dataset.apply(assert_cardinality(self._vocab_size))
+    dataset = dataset.batch(self._batch_size).enumerate()
+
+    def parse_batch(batch_index, lines):
+      line_numbers = batch_index * self._batch_size + math_ops.range(
+          array_ops.size(lines, out_type=dtypes.int64))
+      return lookup_ops._parse_text_vocabulary_lines(  # pylint: disable=protected-access
+          filename, lines, line_numbers, self.key_dtype, self._key_index,
+          self.value_dtype, self._value_index, self._delimiter, self._offset)
+
+    # The table does not depend on the order of insertion.
+    dataset = dataset.map(
+        parse_batch,
+        num_parallel_calls=self._num_parallel_calls,
+        deterministic=False)
+    return dataset.unbatch()
+
+  def initialize(self, table):
+    """Initializes the table from a text file parsed in parallel.
+
+    The returned operation fails if a line has fewer columns than `key_index`
+    or `value_index` need, or if the file has fewer than `vocab_size` lines.
+
+    Args:
+      table: The table to be initialized.
+
+    Returns:
+      The operation that initializes the table.
+
+    Raises:
+      TypeError: when the keys and values data types do not match the table
+      key and value data types.
+    """
+    lookup_ops.check_table_dtypes(table, self.key_dtype, self.value_dtype)
+    with ops.name_scope(self._name, "parallel_text_file_init",
+                        (table.resource_handle,)):
+      filename = ops.convert_to_tensor(
+          self._filename, dtypes.string, name="asset_filepath")
+      init_op = ged_ops.initialize_table_from_dataset(
+          table.resource_handle, self._dataset(filename)._variant_tensor)  # pylint: disable=protected-access
+    ops.add_to_collection(ops.GraphKeys.TABLE_INITIALIZERS, init_op)
+    if not context.executing_eagerly() and constant_op.is_constant(filename):
+      ops.add_to_collection(ops.GraphKeys.ASSET_FILEPATHS, filename)
+    return init_op
+
+
+def vocabulary_table_from_file(filename,
+                               key_dtype=dtypes.string,
+                               key_index=lookup_ops.TextFileIndex.WHOLE_LINE,
+                               value_dtype=dtypes.int64,
+                               value_index=lookup_ops.TextFileIndex.LINE_NUMBER,
+                               default_value=-1,
+                               vocab_size=None,
+                               delimiter="\t",
+                               value_index_offset=0,
+                               binary_filename=None,
+                               name=None):
+  """Returns a lookup table for a text vocabulary file.
+
+  If `binary_filename` names an existing binary vocabulary file, converted
+  from `filename` by `convert_text_vocabulary` with the same arguments, a
+  `MemmappedVocabularyTable` that maps it is returned. Its construction takes
+  constant time and its pages are shared between processes. Otherwise the
+  text file is loaded into a `StaticHashTable` by a
+  `ParallelTextFileInitializer`.
+
+  Args:
+    filename: The text vocabulary file. See `tf.lookup.TextFileInitializer`.
+    key_dtype: See `tf.lookup.TextFileInitializer`.
+    key_index: See `tf.lookup.TextFileInitializer`.
+    value_dtype: See `tf.lookup.TextFileInitializer`.
+    value_index: See `tf.lookup.TextFileInitializer`.
+    default_value: The value to use for keys missing from the vocabulary.
+    vocab_size: See `tf.lookup.TextFileInitializer`.
+    delimiter: See `tf.lookup.TextFileInitializer`.
+    value_index_offset: See `tf.lookup.TextFileInitializer`.
+    binary_filename: Optional binary vocabulary file converted from
+      `filename`.
+    name: A name for the operation (optional).
+
+  Returns:
+    A `MemmappedVocabularyTable` or a `StaticHashTable`.
+  """
+  if binary_filename and file_io.file_exists(binary_filename):
+    return lookup_ops.MemmappedVocabularyTable(
+        binary_filename, key_dtype, value_dtype, default_value, name=name)
+  initializer = ParallelTextFileInitializer(
+      filename,
+      key_dtype,
+      key_index,
+      value_dtype,
+      value_index,
+      vocab_size=vocab_size,
+      delimiter=delimiter,
+      name=name,
+      value_index_offset=value_index_offset)
+  return lookup_ops.StaticHashTableV1(initializer, default_value)
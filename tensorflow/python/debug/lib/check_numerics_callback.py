@@ -16,17 +16,25 @@
 
 import collections
 import threading
+import weakref
 
 import numpy as np
 
 from tensorflow.core.protobuf import debug_event_pb2
 from tensorflow.python.debug.lib import op_callbacks_common
 from tensorflow.python.debug.lib import source_utils
+from tensorflow.python.eager import function as function_lib
 from tensorflow.python.eager import monitoring
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import func_graph as func_graph_module
 from tensorflow.python.framework import op_callbacks
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import array_ops_stack
+from tensorflow.python.ops import control_flow_assert
 from tensorflow.python.ops import gen_debug_ops
+from tensorflow.python.ops import math_ops
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import compat
 from tensorflow.python.util import object_identity
@@ -85,6 +93,14 @@ SAFE_OPS = (
     b"Unpack",
 )
 
+# pylint:disable=protected-access
+# Name prefixes of the FuncGraphs of gradient functions, which are not built
+# through `tf.function` tracing and hence not passed to FUNC_GRAPH_TRANSFORMS.
+_DERIVED_FUNCTION_PREFIXES = (
+    function_lib._FORWARD_PREFIX,
+    function_lib._BACKWARD_PREFIX)
+# pylint:enable=protected-access
+
 _state = threading.local()
 
 _check_numerics_callback_create_counter = monitoring.Counter(
@@ -221,12 +237,39 @@ def _debug_summary(x):
           debug_event_pb2.TensorDebugMode.REDUCE_INF_NAN_THREE_SLOTS))
 
 
+def _all_finite(x):
+  return math_ops.reduce_all(math_ops.is_finite(x))
+
+
+def _is_fusable_graph(graph):
+  """Whether the checks in `graph` can be fused by `fuse_checks()`.
+
+  Only the FuncGraphs of `tf.function`s are passed to the FUNC_GRAPH_TRANSFORMS
+  once traced. Control-flow bodies are FuncGraph subclasses and gradient
+  functions are recognized by their names.
+
+  Args:
+    graph: The graph in which an op is created.
+
+  Returns:
+    A bool.
+  """
+  return (type(graph) is func_graph_module.FuncGraph and  # pylint: disable=unidiomatic-typecheck
+          not graph.name.startswith(_DERIVED_FUNCTION_PREFIXES))
+
+
 class CheckNumericsCallback(object):
   """Wrapper for the numerics-checking callback for thread locality."""
 
-  def __init__(self, stack_height_limit, path_length_limit):
+  def __init__(self, stack_height_limit, path_length_limit, fused=False):
     self._stack_height_limit = stack_height_limit
     self._path_length_limit = path_length_limit
+    self._fused = fused
+    # A map from the FuncGraph of a `tf.function` being traced to the list of
+    # (all-finite flag, error message) pairs of its float tensors. Used only in
+    # fused mode, where the flags are reduced into a single check by
+    # `fuse_checks()` once the graph is traced.
+    self._pending_fused_checks = weakref.WeakKeyDictionary()
     # A dict mapping Placeholder tensors to their instrumenting debug tensors.
     # Used only under V1 graph mode, where we can't rely on auto control
     # dependency to execute the debug tensors and hence need to attach the debug
@@ -250,6 +293,8 @@ class CheckNumericsCallback(object):
       return None
     if graph:
       # Under graph mode. Insert check_numerics op.
+      fused = (self._fused and not is_v1_graph_mode and
+               _is_fusable_graph(graph))
       instrumented_outputs = []
       if is_v1_graph_mode:
         for input_tensor in inputs:
@@ -259,6 +304,23 @@ class CheckNumericsCallback(object):
       for slot, output in enumerate(outputs):
         if (output.dtype.is_floating and
             (op_type_bytes, slot) not in IGNORE_OP_OUTPUTS):
+          message = get_check_numerics_error_message(
+              slot,
+              len(outputs),
+              op_type,
+              output,
+              inputs,
+              graph=graph,
+              traceback=output.op.traceback,
+              stack_height_limit=self._stack_height_limit,
+              path_length_limit=self._path_length_limit)
+          if fused:
+            # Only a cheap on-device reduction is added per tensor. The
+            # flags are checked together at the end of the function.
+            self._pending_fused_checks.setdefault(graph, []).append(
+                (_all_finite(output), message))
+            instrumented_outputs.append(output)
+            continue
           checked_output = array_ops.check_numerics_v2(
               # TF v2 has automatic control dependencies added to stateful async
               # ops, which allows us to run check_numerics asynchronously.
@@ -266,16 +328,7 @@ class CheckNumericsCallback(object):
               # tensors asynchronously from the op being checked and then
               # process the tensor summary with check_numerics.
               output if is_v1_graph_mode else _debug_summary(output),
-              get_check_numerics_error_message(
-                  slot,
-                  len(outputs),
-                  op_type,
-                  output,
-                  inputs,
-                  graph=graph,
-                  traceback=output.op.traceback,
-                  stack_height_limit=self._stack_height_limit,
-                  path_length_limit=self._path_length_limit))
+              message)
           _CHECK_NUMERICS_INPUT_LOOKUP[graph][checked_output.name] = output
           instrumented_outputs.append(self._get_output_tensor(
               op_type_bytes, output, checked_output, is_v1_graph_mode))
@@ -298,6 +351,34 @@ class CheckNumericsCallback(object):
                   stack_height_limit=self._stack_height_limit,
                   path_length_limit=self._path_length_limit))
 
+  def fuse_checks(self, func_graph):
+    """Fuse the pending checks of a traced `tf.function` into a single check.
+
+    Registered in FUNC_GRAPH_TRANSFORMS in fused mode. The all-finite flags of
+    the float tensors in `func_graph` are reduced into one boolean, which is
+    asserted once per function call. On failure, the error message of the
+    first offending tensor in op-creation order, including the stack trace of
+    its creation, is reported.
+
+    Args:
+      func_graph: A traced FuncGraph.
+    """
+    checks = self._pending_fused_checks.pop(func_graph, None)
+    if not checks:
+      return
+    all_finite_flags, messages = zip(*checks)
+    with func_graph.as_default(), ops.name_scope("fused_check_numerics"):
+      all_finite_flags = array_ops_stack.stack(all_finite_flags)
+      first_offending_index = math_ops.argmin(
+          math_ops.cast(all_finite_flags, dtypes.int32))
+      message = array_ops.gather(
+          constant_op.constant(messages), first_offending_index)
+      assert_op = control_flow_assert.Assert(
+          math_ops.reduce_all(all_finite_flags), [message], summarize=1)
+    # The function is already traced, so automatic control dependencies will
+    # not pick up the assertion.
+    func_graph.control_outputs.append(assert_op)
+
   def _get_output_tensor(self,
                          op_type,
                          tensor,
@@ -335,7 +416,8 @@ class CheckNumericsCallback(object):
 
 @tf_export("debugging.enable_check_numerics")
 def enable_check_numerics(stack_height_limit=30,
-                          path_length_limit=50):
+                          path_length_limit=50,
+                          fused=False):
   r"""Enable tensor numerics checking in an eager/graph unified fashion.
 
   The numerics checking mechanism will cause any TensorFlow eager execution or
@@ -430,11 +512,24 @@ def enable_check_numerics(stack_height_limit=30,
       Applicable only to ops in `tf.function`s (graphs).
     path_length_limit: Limit to the file path included in the printed stack
       trace. Applicable only to ops in `tf.function`s (graphs).
+    fused: If `True`, instead of checking every float tensor in a
+      `tf.function` with its own check op, reduce each tensor to a cheap
+      on-device "all finite" flag and check the flags together once per
+      function call. This avoids a device-to-host synchronization per tensor,
+      which makes it suitable for leaving on during long-running training.
+      The error is raised when the function call completes, rather than at
+      the offending op, and reports the first offending tensor with the stack
+      trace of its creation. Eager ops, gradient functions and control-flow
+      bodies are still checked per op.
   """
   if not hasattr(_state, "check_numerics_callback"):
     _state.check_numerics_callback = CheckNumericsCallback(
-        stack_height_limit, path_length_limit)
+        stack_height_limit, path_length_limit, fused=fused)
   op_callbacks.add_op_callback(_state.check_numerics_callback.callback)
+  if (fused and _state.check_numerics_callback.fuse_checks
+      not in function_lib.FUNC_GRAPH_TRANSFORMS):
+    function_lib.FUNC_GRAPH_TRANSFORMS.append(
+        _state.check_numerics_callback.fuse_checks)
 
   logging.info(
       "Enabled check-numerics callback in thread %s",
@@ -459,6 +554,10 @@ def disable_check_numerics():
     return
   try:
     op_callbacks.remove_op_callback(_state.check_numerics_callback.callback)
+    if (_state.check_numerics_callback.fuse_checks
+        in function_lib.FUNC_GRAPH_TRANSFORMS):
+      function_lib.FUNC_GRAPH_TRANSFORMS.remove(
+          _state.check_numerics_callback.fuse_checks)
     delattr(_state, "check_numerics_callback")
     logging.info(
         "Disabled check-numerics callback in thread %s",
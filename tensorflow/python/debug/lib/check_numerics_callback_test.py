@@ -123,6 +123,37 @@ class CheckNumericsCallbackTest(test_util.TensorFlowTestCase):
       self.assertEqual(call_kwargs["stack_height_limit"], 123)
       self.assertEqual(call_kwargs["path_length_limit"], 1200)
 
+  def testFusedModeAddsOneCheckPerFunction(self):
+    check_numerics_callback.enable_check_numerics(fused=True)
+
+    @def_function.function
+    def log_sum_squared(x, y):
+      return math_ops.square(math_ops.log(x + y))
+
+    x = constant_op.constant([1.0, 2.0])
+    y = constant_op.constant([3.0, 4.0])
+    self.assertAllClose(log_sum_squared(x, y), np.square(np.log([4.0, 6.0])))
+    op_types = [op.type for op in
+                log_sum_squared.get_concrete_function(x, y).graph
+                .get_operations()]
+    self.assertNotIn("CheckNumericsV2", op_types)
+    self.assertEqual(op_types.count("Assert"), 1)
+
+  def testDisableCheckNumericsRemovesFusedGraphTransform(self):
+    check_numerics_callback.enable_check_numerics(fused=True)
+    check_numerics_callback.disable_check_numerics()
+
+    @def_function.function
+    def add_fn(x, y):
+      return x + y
+
+    x = constant_op.constant(2.0)
+    y = constant_op.constant(3.0)
+    self.assertAllClose(add_fn(x, y), 5.0)
+    op_types = [op.type for op in
+                add_fn.get_concrete_function(x, y).graph.get_operations()]
+    self.assertNotIn("Assert", op_types)
+
 
 class CheckNumericsCallbackUnhealthyTest(test_util.TensorFlowTestCase):
   """Test for cases in which enable_check_numerics() catches infs or nans."""
@@ -224,6 +255,46 @@ class CheckNumericsCallbackUnhealthyTest(test_util.TensorFlowTestCase):
     self.assertTrue(re.search(r"Stack trace of op's creation", message))
     self.assertIn("divide_sum_with_diff", message)
 
+  def testFusedModeCatchesInfInFunction(self):
+    check_numerics_callback.enable_check_numerics(fused=True)
+
+    @def_function.function
+    def divide_sum_with_diff(x, y):
+      w1 = x + y
+      w2 = x - y
+      u = w1 / w2
+      return u * 2.0
+
+    x = constant_op.constant(2.0, dtype=dtypes.float64)
+    y = constant_op.constant(2.0, dtype=dtypes.float64)
+    message = self._assertRaisesInvalidArgumentErrorAndGetMessage(
+        lambda: divide_sum_with_diff(x, y))
+
+    # The first offending tensor is reported, not the Mul that consumes it.
+    self.assertTrue(re.search(r"graph op.*\"RealDiv\"", message))
+    self.assertNotIn("\"Mul\"", message)
+    self.assertTrue(re.search(r"dtype.*float64", message))
+    self.assertTrue(re.search(r"Stack trace of op's creation", message))
+    self.assertIn("divide_sum_with_diff", message)
+
+  @test_util.disable_xla(
+      "TODO(b/141100809): XLA has no way to assert inside of a kernel.")
+  def testFusedModeChecksControlFlowPerOp(self):
+    check_numerics_callback.enable_check_numerics(fused=True)
+
+    @def_function.function
+    def my_conditional(x):
+      if math_ops.less(math_ops.reduce_sum(x), 0.0):
+        return math_ops.log(x)
+      else:
+        return math_ops.log(-x)
+
+    x = constant_op.constant([1.0, 2.0, 3.0])
+    message = self._assertRaisesInvalidArgumentErrorAndGetMessage(
+        lambda: my_conditional(x))
+    self.assertTrue(re.search(r"graph op.*\"Log\"", message))
+    self.assertIn("my_conditional", message)
+
   @test_util.run_in_graph_and_eager_modes
   @test_util.disable_xla(
       "TODO(b/141100809): XLA has no way to assert inside of a kernel.")
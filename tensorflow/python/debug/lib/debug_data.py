@@ -15,6 +15,7 @@
 """Classes and functions to handle debug-dump data of TensorFlow Debugger."""
 
 import collections
+from concurrent import futures
 import glob
 import json
 import os
@@ -27,6 +28,7 @@ from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import types_pb2
 from tensorflow.core.util import event_pb2
 from tensorflow.python.debug.lib import debug_graphs
+from tensorflow.python.framework import errors
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
@@ -43,6 +45,57 @@ HASH_TAG = "hash"
 FETCHES_INFO_FILE_TAG = "fetches_info_"
 FEED_KEYS_INFO_FILE_TAG = "feed_keys_info_"
 
+# Number of tensors handed to each worker per round in a parallel
+# `DebugDumpDir.find()`. Bounds the work wasted after `first_n` is reached.
+_FIND_BATCH_SIZE_PER_WORKER = 8
+
+
+def _walk_in_parallel(tops, executor):
+  """Walks a number of directory trees, scanning subdirectories concurrently.
+
+  Each top directory is listed in the calling thread. The walks of its immediate
+  subdirectories are then submitted to `executor`, so that directory listings
+  on high-latency file systems overlap with each other.
+
+  Args:
+    tops: A list of directory paths to walk.
+    executor: A `concurrent.futures.Executor` or None. If None, the trees are
+      walked sequentially in the calling thread.
+
+  Returns:
+    A list of the same length as `tops`. Each item is a list of
+    `(dir_path, subdir_names, file_names)` tuples in the same order as
+    `gfile.Walk(top)` yields them.
+  """
+  if executor is None:
+    return [list(gfile.Walk(top)) for top in tops]
+
+  pending = []
+  for top in tops:
+    try:
+      children = gfile.ListDirectory(top)
+    except errors.NotFoundError:
+      pending.append(([], []))
+      continue
+    files = []
+    subdirs = []
+    for child in children:
+      if gfile.IsDirectory(os.path.join(top, child)):
+        subdirs.append(child)
+      else:
+        files.append(child)
+    subdir_walks = [
+        executor.submit(lambda path: list(gfile.Walk(path)),
+                        os.path.join(top, subdir)) for subdir in subdirs]
+    pending.append(([(top, subdirs, files)], subdir_walks))
+
+  walks = []
+  for walk, subdir_walks in pending:
+    for subdir_walk in subdir_walks:
+      walk.extend(subdir_walk.result())
+    walks.append(walk)
+  return walks
+
 
 def _glob(glob_pattern):
   if platform.system() == "Windows":
@@ -219,10 +272,11 @@ def has_inf_or_nan(datum, tensor):
     # arrays.
     return False
   elif (np.issubdtype(tensor.dtype, np.floating) or
-        np.issubdtype(tensor.dtype, np.complexfloating) or
-        np.issubdtype(tensor.dtype, np.integer)):
-    return np.any(np.isnan(tensor)) or np.any(np.isinf(tensor))
+        np.issubdtype(tensor.dtype, np.complexfloating)):
+    # A single pass over the data, instead of one for isnan and one for isinf.
+    return not np.all(np.isfinite(tensor))
   else:
+    # Integer, boolean and string tensors cannot hold nan or inf values.
     return False
 
 
@@ -322,8 +376,10 @@ class DebugTensorDatum:
     self._node_name = "/".join(path_components[1:-1] + [node_base_name])
 
     self._file_path = os.path.join(dump_root, debug_dump_rel_path)
-    self._dump_size_bytes = (gfile.Stat(self._file_path).length if
-                             gfile.Exists(self._file_path) else None)
+    # The size of the dump file is looked up lazily, so that indexing a dump
+    # root does not stat every file in it.
+    self._dump_size_bytes = None
+    self._dump_size_bytes_loaded = False
 
   def __str__(self):
     return "{DebugTensorDatum (%s) %s:%d @ %s @ %d}" % (self.device_name,
@@ -447,6 +503,12 @@ class DebugTensorDatum:
       If the dump file does not exist, None.
     """
 
+    if not self._dump_size_bytes_loaded:
+      try:
+        self._dump_size_bytes = gfile.Stat(self._file_path).length
+      except errors.NotFoundError:
+        self._dump_size_bytes = None
+      self._dump_size_bytes_loaded = True
     return self._dump_size_bytes
 
 
@@ -459,9 +521,17 @@ class DebugDumpDir:
 
   An instance of `DebugDumpDir` contains all `DebugTensorDatum` instances
   in a tfdbg dump root directory.
+
+  Opening a dump root only builds an index of the dump files from their paths:
+  neither the tensor values nor the sizes of the dump files are read until they
+  are asked for.
   """
 
-  def __init__(self, dump_root, partition_graphs=None, validate=True):
+  def __init__(self,
+               dump_root,
+               partition_graphs=None,
+               validate=True,
+               num_workers=None):
     """`DebugDumpDir` constructor.
 
     Args:
@@ -470,15 +540,25 @@ class DebugDumpDir:
           partition graphs executed by the TensorFlow runtime.
       validate: (`bool`) whether the dump files are to be validated against the
           partition graphs.
+      num_workers: (`int`) number of threads used to scan the directories under
+          the dump root. If None (default), uses the default number of threads
+          of `concurrent.futures.ThreadPoolExecutor`. If 1, the directories are
+          scanned sequentially in the calling thread.
 
     Raises:
       IOError: If dump_root does not exist as a directory.
       ValueError: If more than one core metadata file is found under the dump
-        root directory.
+        root directory, or if `num_workers` is not a positive integer.
     """
 
     if not gfile.IsDirectory(dump_root):
       raise IOError("Dump root directory %s does not exist" % dump_root)
+    if num_workers is not None and (
+        not isinstance(num_workers, int) or num_workers < 1):
+      raise ValueError(
+          "num_workers is expected to be None or a positive integer, "
+          "but got %r" % num_workers)
+    self._num_workers = num_workers
 
     self._core_metadata = []
 
@@ -505,18 +585,23 @@ class DebugDumpDir:
     self._watch_key_to_devices = {}
     self._watch_key_to_datum = {}
     self._watch_key_to_rel_time = {}
-    self._watch_key_to_dump_size_bytes = {}
-    for device_dir in device_dirs:
+    if self._num_workers == 1:
+      device_walks = _walk_in_parallel(device_dirs, None)
+    else:
+      with futures.ThreadPoolExecutor(
+          max_workers=self._num_workers) as executor:
+        device_walks = _walk_in_parallel(device_dirs, executor)
+    for device_dir, device_walk in zip(device_dirs, device_walks):
       device_name = device_path_to_device_name(device_dir)
       self._device_names.append(device_name)
-      self._load_device_dumps(device_name, device_dir)
+      self._load_device_dumps(device_name, device_walk)
     self._load_partition_graphs(partition_graphs, validate)
     self._calculate_t0()
 
     for device_name in self._device_names:
       self._create_tensor_watch_maps(device_name)
 
-  def _load_device_dumps(self, device_name, device_root):
+  def _load_device_dumps(self, device_name, device_walk):
     """Load `DebugTensorDatum` instances from the dump root of a given device.
 
     Populates a map {device_name: a list of `DebugTensorDatum`}, where the list
@@ -541,7 +626,8 @@ class DebugDumpDir:
 
     Args:
       device_name: (`str`) name of the device.
-      device_root: (`str`) dump root directory of the given device.
+      device_walk: The result of walking the dump root directory of the given
+        device, as a list of `(dir_path, subdir_names, file_names)` tuples.
 
     Raises:
       ValueError: If GraphDef for the device is not available.
@@ -551,7 +637,7 @@ class DebugDumpDir:
     self._debug_watches[device_name] = collections.defaultdict(
         lambda: collections.defaultdict(set))
 
-    for root, _, files in gfile.Walk(device_root):
+    for root, _, files in device_walk:
       for f in files:
         if _is_graph_file(f):
           self._dump_graph_file_paths[device_name] = os.path.join(root, f)
@@ -622,7 +708,8 @@ class DebugDumpDir:
 
     Create a map from watch key (tensor name + debug op) to `DebugTensorDatum`
     item. Also make a map from watch key to relative timestamp.
-    "relative" means (absolute timestamp - t0).
+    "relative" means (absolute timestamp - t0). Dump file sizes are not mapped
+    here, as looking them up requires a stat of every dump file.
 
     Args:
       device_name: (str) name of the device.
@@ -630,7 +717,6 @@ class DebugDumpDir:
 
     self._watch_key_to_datum[device_name] = {}
     self._watch_key_to_rel_time[device_name] = {}
-    self._watch_key_to_dump_size_bytes[device_name] = {}
     for datum in self._dump_tensor_data[device_name]:
       if datum.watch_key not in self._watch_key_to_devices:
         self._watch_key_to_devices[datum.watch_key] = {device_name}
@@ -641,14 +727,10 @@ class DebugDumpDir:
         self._watch_key_to_datum[device_name][datum.watch_key] = [datum]
         self._watch_key_to_rel_time[device_name][datum.watch_key] = [
             datum.timestamp - self._t0]
-        self._watch_key_to_dump_size_bytes[device_name][datum.watch_key] = [
-            datum.dump_size_bytes]
       else:
         self._watch_key_to_datum[device_name][datum.watch_key].append(datum)
         self._watch_key_to_rel_time[device_name][datum.watch_key].append(
             datum.timestamp - self._t0)
-        self._watch_key_to_dump_size_bytes[device_name][datum.watch_key].append(
-            datum.dump_size_bytes)
 
   def set_python_graph(self, python_graph):
     """Provide Python `Graph` object to the wrapper.
@@ -1413,7 +1495,8 @@ class DebugDumpDir:
            predicate,
            first_n=0,
            device_name=None,
-           exclude_node_names=None):
+           exclude_node_names=None,
+           num_workers=1):
     """Find dumped tensor data by a certain predicate.
 
     Args:
@@ -1434,6 +1517,11 @@ class DebugDumpDir:
       device_name: optional device name.
       exclude_node_names: Optional regular expression to exclude nodes with
         names matching the regular expression.
+      num_workers: (`int`) number of threads that load the tensors and evaluate
+        `predicate` on them. If greater than 1, `predicate` must be thread-safe
+        and may be evaluated on some tensors past the first `first_n` matches.
+        Predicates that spend most of their time in numpy, such as
+        `has_inf_or_nan`, benefit most from this.
 
     Returns:
       A list of all `DebugTensorDatum` objects in this `DebugDumpDir` object
@@ -1443,18 +1531,37 @@ class DebugDumpDir:
     if exclude_node_names:
       exclude_node_names = re.compile(exclude_node_names)
 
-    matched_data = []
+    data = []
     for device in (self._dump_tensor_data if device_name is None
                    else (self._dump_tensor_data[device_name],)):
       for datum in self._dump_tensor_data[device]:
         if exclude_node_names and exclude_node_names.match(datum.node_name):
           continue
+        data.append(datum)
 
-        if predicate(datum, datum.get_tensor()):
+    def evaluate(datum):
+      return predicate(datum, datum.get_tensor())
+
+    matched_data = []
+    if num_workers <= 1:
+      for datum in data:
+        if evaluate(datum):
           matched_data.append(datum)
 
           if first_n > 0 and len(matched_data) >= first_n:
             return matched_data
+      return matched_data
+
+    batch_size = num_workers * _FIND_BATCH_SIZE_PER_WORKER
+    with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+      for begin in range(0, len(data), batch_size):
+        batch = data[begin:begin + batch_size]
+        for datum, matched in zip(batch, executor.map(evaluate, batch)):
+          if matched:
+            matched_data.append(datum)
+
+            if first_n > 0 and len(matched_data) >= first_n:
+              return matched_data
 
     return matched_data
 
@@ -1593,7 +1700,8 @@ class DebugDumpDir:
           "Watch key \"%s\" does not exist in the debug dump of device %s" %
           (watch_key, device_name))
 
-    return self._watch_key_to_dump_size_bytes[device_name][watch_key]
+    return [datum.dump_size_bytes for datum in
+            self._watch_key_to_datum[device_name][watch_key]]
 
   def node_traceback(self, element_name):
     """Try to retrieve the Python traceback of node's construction.
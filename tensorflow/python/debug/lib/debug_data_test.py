@@ -21,7 +21,9 @@ import numpy as np
 
 from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import tensor_pb2
+from tensorflow.core.util import event_pb2
 from tensorflow.python.debug.lib import debug_data
+from tensorflow.python.framework import tensor_util
 from tensorflow.python.framework import test_util
 from tensorflow.python.lib.io import file_io
 from tensorflow.python.platform import gfile
@@ -143,6 +145,21 @@ class DebugTensorDatumTest(test_util.TensorFlowTestCase):
 
     self.assertIsNone(datum.dump_size_bytes)
 
+  def testDumpSizeBytesIsLoadedLazilyAndOnce(self):
+    dump_root = tempfile.mkdtemp()
+    debug_dump_rel_path = "node_foo_1_2_DebugIdentity_1472563253536385"
+    with open(os.path.join(dump_root, debug_dump_rel_path), "wb") as f:
+      f.write(b"spam")
+
+    with test.mock.patch.object(
+        gfile, "Stat", wraps=gfile.Stat) as stat:
+      datum = debug_data.DebugTensorDatum(dump_root, debug_dump_rel_path)
+      self.assertEqual(0, stat.call_count)
+      self.assertEqual(4, datum.dump_size_bytes)
+      self.assertEqual(4, datum.dump_size_bytes)
+      self.assertEqual(1, stat.call_count)
+    file_io.delete_recursively(dump_root)
+
 
 class DebugDumpDirTest(test_util.TensorFlowTestCase):
 
@@ -176,6 +193,21 @@ class DebugDumpDirTest(test_util.TensorFlowTestCase):
     open(os.path.join(
         gpu_1_dir, "node_foo_1_2_DebugIdentity_1472563253536387"), "wb")
 
+  def _writeTensorDumps(self, values_by_rel_path):
+    device_dir = os.path.join(
+        self._dump_root,
+        debug_data.METADATA_FILE_PREFIX + debug_data.DEVICE_TAG +
+        ",job_localhost,replica_0,task_0,cpu_0")
+    for rel_path, value in values_by_rel_path.items():
+      file_path = os.path.join(device_dir, rel_path)
+      if not os.path.isdir(os.path.dirname(file_path)):
+        os.makedirs(os.path.dirname(file_path))
+      event = event_pb2.Event()
+      event.summary.value.add().tensor.CopyFrom(
+          tensor_util.make_tensor_proto(value))
+      with open(file_path, "wb") as f:
+        f.write(event.SerializeToString())
+
   def testDebugDumpDir_nonexistentDumpRoot(self):
     with self.assertRaisesRegex(IOError, "does not exist"):
       debug_data.DebugDumpDir(tempfile.mkdtemp() + "_foo")
@@ -258,6 +290,56 @@ class DebugDumpDirTest(test_util.TensorFlowTestCase):
           self._dump_root,
           partition_graphs=[graph_cpu_0, graph_gpu_0, graph_gpu_1])
 
+  def testDebugDumpDir_parallelScanMatchesSequentialScan(self):
+    self._writeTensorDumps({
+        "ns1/ns2/node_a_0_DebugIdentity_1472563253536385":
+            np.array([1.0, 2.0]),
+        "ns1/node_b_0_DebugIdentity_1472563253536386": np.array([3.0, 4.0]),
+        "ns3/ns4/node_c_0_DebugIdentity_1472563253536387":
+            np.array([5.0, 6.0]),
+        "node_d_0_DebugIdentity_1472563253536388": np.array([7.0, 8.0]),
+    })
+
+    sequential = debug_data.DebugDumpDir(self._dump_root, num_workers=1)
+    parallel = debug_data.DebugDumpDir(self._dump_root, num_workers=4)
+    self.assertEqual(
+        ["ns1/ns2/node_a", "ns1/node_b", "ns3/ns4/node_c", "node_d"],
+        [datum.node_name for datum in parallel.dumped_tensor_data])
+    self.assertEqual(
+        [datum.file_path for datum in sequential.dumped_tensor_data],
+        [datum.file_path for datum in parallel.dumped_tensor_data])
+    self.assertEqual(sequential.t0, parallel.t0)
+    self.assertEqual(
+        sequential.get_dump_sizes_bytes("ns1/node_b", 0, "DebugIdentity"),
+        parallel.get_dump_sizes_bytes("ns1/node_b", 0, "DebugIdentity"))
+
+  def testDebugDumpDir_invalidNumWorkersLeadsToError(self):
+    with self.assertRaisesRegex(ValueError, r"num_workers .* positive"):
+      debug_data.DebugDumpDir(self._dump_root, num_workers=0)
+
+  def testFindWithMultipleWorkersPreservesTimestampOrder(self):
+    values = {}
+    bad_indices = (3, 17, 18, 40)
+    for i in range(50):
+      value = np.ones([4], dtype=np.float32)
+      if i in bad_indices:
+        value[i % 4] = np.inf if i % 2 else np.nan
+      values["node_%d_0_DebugIdentity_%d" % (i, 1472563253536385 + i)] = value
+    self._writeTensorDumps(values)
+    dump_dir = debug_data.DebugDumpDir(self._dump_root)
+
+    sequential = dump_dir.find(debug_data.has_inf_or_nan)
+    parallel = dump_dir.find(debug_data.has_inf_or_nan, num_workers=4)
+    self.assertEqual(["node_%d" % i for i in bad_indices],
+                     [datum.node_name for datum in parallel])
+    self.assertEqual([datum.file_path for datum in sequential],
+                     [datum.file_path for datum in parallel])
+
+    first_two = dump_dir.find(
+        debug_data.has_inf_or_nan, first_n=2, num_workers=4)
+    self.assertEqual(["node_3", "node_17"],
+                     [datum.node_name for datum in first_two])
+
   def testDebugDumpDir_emptyDumpDir(self):
     dump_dir = debug_data.DebugDumpDir(self._dump_root)
 
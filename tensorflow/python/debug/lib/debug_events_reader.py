@@ -15,9 +15,12 @@
 """Reader class for tfdbg v2 debug events."""
 
 import collections
+import io
 import os
 import threading
 
+import numpy as np
+
 from tensorflow.core.protobuf import debug_event_pb2
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import tensor_util
@@ -46,6 +49,7 @@ class DebugEventsReader:
   _GRAPHS_SUFFIX = ".graphs"
   _EXECUTION_SUFFIX = ".execution"
   _GRAPH_EXECUTION_TRACES_SUFFIX = ".graph_execution_traces"
+  _GRAPH_EXECUTION_TRACES_INDEX_SUFFIX = ".graph_execution_traces_index.npz"
 
   def __init__(self, dump_root):
     if not file_io.is_directory(dump_root):
@@ -71,6 +75,8 @@ class DebugEventsReader:
         compat.as_bytes(prefix + self._GRAPH_EXECUTION_TRACES_SUFFIX)
         for prefix in prefixes
     ]
+    self._graph_execution_traces_index_path = (
+        prefix + self._GRAPH_EXECUTION_TRACES_INDEX_SUFFIX)
     self._readers = dict()  # A map from file path to reader.
     # A map from file path to current reading offset.
     self._reader_offsets = dict()
@@ -312,6 +318,46 @@ class DebugEventsReader:
           offset)[0]
     return debug_event_pb2.DebugEvent.FromString(proto_string)
 
+  def graph_execution_traces_index_path(self):
+    """Path at which a `GraphExecutionTraceIndex` of this file set is saved."""
+    return self._graph_execution_traces_index_path
+
+  def graph_execution_traces_read_offsets(self):
+    """Get the offsets up to which the .graph_execution_traces files are read.
+
+    Returns:
+      A list of offsets, one per .graph_execution_traces file.
+    """
+    return [
+        self._reader_offsets.get(path, 0)
+        for path in self._graph_execution_traces_paths
+    ]
+
+  def set_graph_execution_traces_read_offsets(self, offsets):
+    """Resume reading the .graph_execution_traces files at given offsets.
+
+    Args:
+      offsets: A list of offsets, one per .graph_execution_traces file, e.g.,
+        as returned by `graph_execution_traces_read_offsets()`. Each offset
+        must be at a record boundary.
+
+    Raises:
+      ValueError: If the number of offsets does not match the number of files,
+        or an offset is beyond the end of its file.
+    """
+    if len(offsets) != len(self._graph_execution_traces_paths):
+      raise ValueError(
+          "Expected %d offsets, but got %d" %
+          (len(self._graph_execution_traces_paths), len(offsets)))
+    for path, offset in zip(self._graph_execution_traces_paths, offsets):
+      if offset > file_io.stat(compat.as_str(path)).length:
+        raise ValueError("Offset %d is beyond the end of file %s" %
+                         (offset, compat.as_str(path)))
+    for path, offset in zip(self._graph_execution_traces_paths, offsets):
+      self._get_reader(path)
+      with self._reader_read_locks[path]:
+        self._reader_offsets[path] = offset
+
   def close(self):
     with self._readers_lock:
       file_paths = list(self._readers.keys())
@@ -842,6 +888,208 @@ class GraphExecutionTrace(GraphExecutionTraceDigest):
     return output
 
 
+class GraphExecutionTraceIndex:
+  """Columnar index of the graph execution traces of a DebugEvent file set.
+
+  Each field of `GraphExecutionTraceDigest` is held in a numpy array, so that
+  ranges of traces can be selected by slicing and filtered with vectorized
+  comparisons instead of by materializing digest objects. The string fields
+  (`op_type`, `op_name` and `graph_id`) are stored as integer codes into
+  string tables.
+
+  The index can be saved to and loaded from a single .npz file together with
+  the offsets up to which the .graph_execution_traces files were read, so that
+  reopening a dump only needs to read the traces written since.
+  """
+
+  _NUMERIC_COLUMNS = (
+      ("wall_time", np.float64),
+      ("file_index", np.int32),
+      ("offset", np.int64),
+      ("output_slot", np.int32),
+  )
+  _STRING_COLUMNS = ("op_type", "op_name", "graph_id")
+  _INITIAL_CAPACITY = 1024
+
+  def __init__(self):
+    self._size = 0
+    self._columns = {
+        name: np.zeros(self._INITIAL_CAPACITY, dtype=dtype)
+        for name, dtype in self._NUMERIC_COLUMNS
+    }
+    self._columns.update({
+        name: np.zeros(self._INITIAL_CAPACITY, dtype=np.int32)
+        for name in self._STRING_COLUMNS
+    })
+    self._strings = {name: [] for name in self._STRING_COLUMNS}
+    self._string_codes = {name: dict() for name in self._STRING_COLUMNS}
+
+  def __len__(self):
+    return self._size
+
+  def _intern(self, name, value):
+    codes = self._string_codes[name]
+    code = codes.get(value)
+    if code is None:
+      code = len(self._strings[name])
+      self._strings[name].append(value)
+      codes[value] = code
+    return code
+
+  def append(self, wall_time, locator, op_type, op_name, output_slot,
+             graph_id):
+    """Append the digest fields of one graph execution trace."""
+    row = self._size
+    columns = self._columns
+    if row == len(columns["wall_time"]):
+      # Readers hold on to the old arrays, whose rows below `row` stay valid.
+      columns = {
+          name: np.concatenate([column, np.zeros_like(column)])
+          for name, column in columns.items()
+      }
+    columns["wall_time"][row] = wall_time
+    columns["file_index"][row], columns["offset"][row] = locator
+    columns["output_slot"][row] = output_slot
+    columns["op_type"][row] = self._intern("op_type", op_type)
+    columns["op_name"][row] = self._intern("op_name", op_name)
+    columns["graph_id"][row] = self._intern("graph_id", graph_id)
+    self._columns = columns
+    self._size = row + 1
+
+  def column(self, name, begin=None, end=None):
+    """Get a read-only view of a column.
+
+    Args:
+      name: One of "wall_time", "file_index", "offset", "output_slot", and the
+        string columns "op_type", "op_name" and "graph_id", whose values are
+        codes into `strings(name)`.
+      begin: Optional beginning index. Python-style negative indices are
+        supported.
+      end: Optional ending index. Python-style negative indices are supported.
+
+    Returns:
+      A 1D numpy array.
+    """
+    size = self._size
+    view = self._columns[name][:size][begin:end]
+    view.flags.writeable = False
+    return view
+
+  def strings(self, name):
+    """Get the string table of a string column, indexed by code."""
+    return tuple(self._strings[name])
+
+  def find(self, op_type=None, op_name=None, graph_id=None):
+    """Get the indices of the traces matching all of the given fields.
+
+    Args:
+      op_type: Optional op type to match.
+      op_name: Optional op name to match.
+      graph_id: Optional ID of the immediately-enclosing graph to match.
+
+    Returns:
+      A sorted 1D int64 numpy array of trace indices.
+    """
+    size = self._size
+    mask = np.ones(size, dtype=bool)
+    for name, value in (("op_type", op_type), ("op_name", op_name),
+                        ("graph_id", graph_id)):
+      if value is None:
+        continue
+      code = self._string_codes[name].get(value)
+      if code is None:
+        return np.zeros(0, dtype=np.int64)
+      mask &= self._columns[name][:size] == code
+    return np.flatnonzero(mask)
+
+  def digests(self, indices):
+    """Materialize `GraphExecutionTraceDigest`s for the given trace indices.
+
+    Args:
+      indices: A `range` or a sequence of trace indices.
+
+    Returns:
+      A list of `GraphExecutionTraceDigest` objects.
+    """
+    size = self._size
+    columns = self._columns
+    if isinstance(indices, range) and indices.step == 1:
+      selection = slice(indices.start, indices.stop)
+    else:
+      selection = np.asarray(indices, dtype=np.int64)
+    fields = [
+        columns[name][:size][selection].tolist()
+        for name in ("wall_time", "file_index", "offset", "op_type", "op_name",
+                     "output_slot", "graph_id")
+    ]
+    op_types = self._strings["op_type"]
+    op_names = self._strings["op_name"]
+    graph_ids = self._strings["graph_id"]
+    return [
+        GraphExecutionTraceDigest(wall_time, (file_index, offset),
+                                  op_types[op_type], op_names[op_name],
+                                  output_slot, graph_ids[graph_id])
+        for (wall_time, file_index, offset, op_type, op_name, output_slot,
+             graph_id) in zip(*fields)
+    ]
+
+  def save(self, path, tfdbg_run_id, read_offsets):
+    """Atomically write the index to a .npz file.
+
+    Args:
+      path: Path of the file to write.
+      tfdbg_run_id: Run ID of the file set, checked by `load()`.
+      read_offsets: Offsets up to which the .graph_execution_traces files have
+        been indexed.
+    """
+    size = self._size
+    arrays = {
+        name: column[:size] for name, column in self._columns.items()
+    }
+    arrays.update({
+        "strings_" + name: np.array(self._strings[name], dtype=np.str_)
+        for name in self._STRING_COLUMNS
+    })
+    arrays["tfdbg_run_id"] = np.array(tfdbg_run_id, dtype=np.str_)
+    arrays["read_offsets"] = np.array(read_offsets, dtype=np.int64)
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    file_io.atomic_write_string_to_file(path, buffer.getvalue())
+
+  @classmethod
+  def load(cls, path, tfdbg_run_id):
+    """Load an index written by `save()`.
+
+    Args:
+      path: Path of the file to read.
+      tfdbg_run_id: Expected run ID of the file set.
+
+    Returns:
+      A tuple of the `GraphExecutionTraceIndex` and the read offsets it was
+      saved with, or `None` if the file does not exist or belongs to another
+      run.
+    """
+    if not file_io.file_exists(path):
+      return None
+    with file_io.FileIO(path, "rb") as f:
+      arrays = np.load(io.BytesIO(f.read()), allow_pickle=False)
+      if str(arrays["tfdbg_run_id"]) != tfdbg_run_id:
+        return None
+      index = cls()
+      size = len(arrays["wall_time"])
+      capacity = max(size, cls._INITIAL_CAPACITY)
+      for name, column in index._columns.items():
+        index._columns[name] = np.zeros(capacity, dtype=column.dtype)
+        index._columns[name][:size] = arrays[name]
+      for name in cls._STRING_COLUMNS:
+        index._strings[name] = arrays["strings_" + name].tolist()
+        index._string_codes[name] = {
+            value: code for code, value in enumerate(index._strings[name])
+        }
+      index._size = size
+      return index, arrays["read_offsets"].tolist()
+
+
 def _parse_tensor_value(tensor_proto, return_list=False):
   """Helper method for reading a tensor value from a tensor proto.
 
@@ -924,12 +1172,18 @@ class DebugDataReader:
     - An object of this class incrementally reads data from files that belong to
       the tfdbg v2 DebugEvent file set. Calling `update()` triggers the reading
       from the last-successful reading positions in the files.
+    - Graph execution traces are held in a columnar
+      `GraphExecutionTraceIndex`. With `persist_index=True`, the index is
+      saved next to the file set when the reader is exited as a context
+      manager, or on demand through `save_index()`, and loaded again when the
+      dump is reopened, so that only newly written traces are read.
     - This object can be used as a context manager. Its `__exit__()` call
       closes the file readers cleanly.
   """
 
-  def __init__(self, dump_root):
+  def __init__(self, dump_root, persist_index=False):
     self._reader = DebugEventsReader(dump_root)
+    self._persist_index = persist_index
 
     # TODO(cais): Implement pagination for memory constraints.
     self._execution_digests = []
@@ -947,8 +1201,13 @@ class DebugDataReader:
     # A dict mapping id to DebuggedGraph objects.
     self._graph_by_id = dict()
     self._graph_op_digests = []
-    # TODO(cais): Implement pagination for memory constraints.
-    self._graph_execution_trace_digests = []
+    # A dict mapping op type to the GraphOpCreationDigests of that type.
+    self._graph_op_digests_by_type = collections.defaultdict(list)
+    self._graph_execution_trace_index = GraphExecutionTraceIndex()
+    # Whether a persisted index has been looked for.
+    self._index_loaded = False
+    # Whether the index has traces that have not been saved.
+    self._index_dirty = False
 
     self._monitors = []
 
@@ -1010,6 +1269,7 @@ class DebugDataReader:
             tuple(op_creation_proto.code_location.stack_frame_ids),
             input_names=tuple(op_creation_proto.input_names))
         self._graph_op_digests.append(op_digest)
+        self._graph_op_digests_by_type[op_digest.op_type].append(op_digest)
         debugged_graph = self._graph_by_id[op_creation_proto.graph_id]
         debugged_graph.add_op(op_digest)
         for dst_slot, input_name in enumerate(op_creation_proto.input_names):
@@ -1032,32 +1292,66 @@ class DebugDataReader:
         self._device_by_id[device_proto.device_id] = DebuggedDevice(
             device_proto.device_name, device_proto.device_id)
 
+  def _load_persisted_index(self):
+    """Resume from a persisted index of the graph execution traces, if any."""
+    self._index_loaded = True
+    # Monitors must see every trace, so they require reading from the start.
+    if self._monitors:
+      return
+    index_path = self._reader.graph_execution_traces_index_path()
+    try:
+      loaded = GraphExecutionTraceIndex.load(index_path,
+                                             self._reader.tfdbg_run_id())
+      if loaded is None:
+        return
+      index, read_offsets = loaded
+      self._reader.set_graph_execution_traces_read_offsets(read_offsets)
+    except (errors.OpError, IOError, KeyError, ValueError):
+      # A stale or unreadable index is rebuilt from the trace files.
+      return
+    self._graph_execution_trace_index = index
+
+  def save_index(self):
+    """Save the index of the graph execution traces next to the file set.
+
+    The whole index is written, so long-running readers should call this
+    sparingly rather than after every `update()`. Readers created with
+    `persist_index=True` call it on `__exit__()`. This is a no-op if no
+    traces have been read since the index was last saved or loaded.
+    """
+    if not self._index_dirty:
+      return
+    self._graph_execution_trace_index.save(
+        self._reader.graph_execution_traces_index_path(),
+        self._reader.tfdbg_run_id(),
+        self._reader.graph_execution_traces_read_offsets())
+    self._index_dirty = False
+
   def _load_graph_execution_traces(self):
     """Incrementally load the .graph_execution_traces file."""
+    if self._persist_index and not self._index_loaded:
+      self._load_persisted_index()
+    index = self._graph_execution_trace_index
+    num_traces = len(index)
     for i, traces_iter in enumerate(
         self._reader.graph_execution_traces_iterators()):
       for debug_event, offset in traces_iter:
-        self._graph_execution_trace_digests.append(
-            self._graph_execution_trace_digest_from_debug_event_proto(
-                debug_event, (i, offset)))
+        trace_proto = debug_event.graph_execution_trace
+        index.append(
+            debug_event.wall_time, (i, offset),
+            self._lookup_op_type(trace_proto.tfdbg_context_id,
+                                 trace_proto.op_name),
+            trace_proto.op_name, trace_proto.output_slot,
+            trace_proto.tfdbg_context_id)
         if self._monitors:
           graph_execution_trace = (
               self._graph_execution_trace_from_debug_event_proto(
                   debug_event, (i, offset)))
           for monitor in self._monitors:
             monitor.on_graph_execution_trace(
-                len(self._graph_execution_trace_digests) - 1,
-                graph_execution_trace)
-
-  def _graph_execution_trace_digest_from_debug_event_proto(
-      self, debug_event, locator):
-    trace_proto = debug_event.graph_execution_trace
-    op_name = trace_proto.op_name
-    op_type = self._lookup_op_type(trace_proto.tfdbg_context_id, op_name)
-    return GraphExecutionTraceDigest(
-        debug_event.wall_time, locator, op_type, op_name,
-        trace_proto.output_slot,
-        debug_event.graph_execution_trace.tfdbg_context_id)
+                len(index) - 1, graph_execution_trace)
+    if len(index) > num_traces:
+      self._index_dirty = True
 
   def _graph_execution_trace_from_debug_event_proto(self, debug_event, locator):
     """Convert a DebugEvent proto into a GraphExecutionTrace data object."""
@@ -1078,9 +1372,13 @@ class DebugDataReader:
     else:
       debug_tensor_value = _parse_tensor_value(
           trace_proto.tensor_proto, return_list=True)
+    op_name = trace_proto.op_name
+    digest = GraphExecutionTraceDigest(
+        debug_event.wall_time, locator,
+        self._lookup_op_type(trace_proto.tfdbg_context_id, op_name), op_name,
+        trace_proto.output_slot, trace_proto.tfdbg_context_id)
     return GraphExecutionTrace(
-        self._graph_execution_trace_digest_from_debug_event_proto(
-            debug_event, locator),
+        digest,
         graph_ids=graph_ids,
         tensor_debug_mode=trace_proto.tensor_debug_mode,
         debug_tensor_value=debug_tensor_value,
@@ -1189,8 +1487,7 @@ class DebugDataReader:
       A list of `GraphOpCreationDigest` objects.
     """
     if op_type is not None:
-      return [digest for digest in self._graph_op_digests
-              if digest.op_type == op_type]
+      return list(self._graph_op_digests_by_type.get(op_type, ()))
     else:
       return self._graph_op_digests
 
@@ -1209,19 +1506,29 @@ class DebugDataReader:
       If `digest`: a `list` of `GraphExecutionTraceDigest` objects.
       Else: a `list` of `GraphExecutionTrace` objects.
     """
-    digests = self._graph_execution_trace_digests
+    index = self._graph_execution_trace_index
+    indices = range(len(index))
     if begin is not None or end is not None:
       begin = begin or 0
-      end = end or len(digests)
-      digests = digests[begin:end]
+      end = end or len(indices)
+      indices = indices[begin:end]
+    digests = index.digests(indices)
     if digest:
       return digests
     else:
       return [self.read_graph_execution_trace(digest) for digest in digests]
 
+  def graph_execution_trace_index(self):
+    """Get the columnar `GraphExecutionTraceIndex` of the traces read so far.
+
+    Prefer this over `graph_execution_traces(digest=True)` to query large
+    numbers of traces, e.g., the wall times of all traces of an op type.
+    """
+    return self._graph_execution_trace_index
+
   def num_graph_execution_traces(self):
     """Get the number of graph execution traces read so far."""
-    return len(self._graph_execution_trace_digests)
+    return len(self._graph_execution_trace_index)
 
   def executions(self, digest=False, begin=None, end=None):
     """Get `Execution`s or `ExecutionDigest`s this reader has read so far.
@@ -1359,4 +1666,9 @@ class DebugDataReader:
 
   def __exit__(self, exception_type, exception_value, traceback):
     del exception_type, exception_value, traceback  # Unused
+    if self._persist_index:
+      try:
+        self.save_index()
+      except (errors.OpError, IOError):
+        pass  # E.g., a read-only dump root.
     self._reader.close()
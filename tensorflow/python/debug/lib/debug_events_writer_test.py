@@ -594,6 +594,124 @@ class DebugEventsWriterTest(dumping_callback_test_lib.DumpingCallbackTestBase,
     self.assertEqual(traces[0].op_name, "Op_%d" % expected_begin)
     self.assertEqual(traces[-1].op_name, "Op_%d" % (expected_end - 1))
 
+  def _writeGraphExecutionTraces(self, writer, begin, end):
+    for i in range(begin, end):
+      op_name = "Op%d" % i
+      graph_op_creation = debug_event_pb2.GraphOpCreation(
+          op_type="FooOp" if i % 2 else "BarOp", op_name=op_name,
+          graph_id="graph1")
+      writer.WriteGraphOpCreation(graph_op_creation)
+      trace = debug_event_pb2.GraphExecutionTrace(
+          op_name=op_name, output_slot=i % 3, tfdbg_context_id="graph1")
+      writer.WriteGraphExecutionTrace(trace)
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+  def testGraphExecutionTraceIndexColumnsAndFind(self):
+    writer = debug_events_writer.DebugEventsWriter(
+        self.dump_root, self.tfdbg_run_id, circular_buffer_size=-1)
+    writer.WriteDebuggedGraph(
+        debug_event_pb2.DebuggedGraph(graph_id="graph1", graph_name="graph1"))
+    self._writeGraphExecutionTraces(writer, 0, 10)
+    writer.Close()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      index = reader.graph_execution_trace_index()
+      self.assertLen(index, 10)
+      self.assertEqual(index.column("output_slot").tolist(),
+                       [i % 3 for i in range(10)])
+      self.assertEqual(index.column("output_slot", begin=2, end=4).tolist(),
+                       [2, 0])
+      foo_indices = index.find(op_type="FooOp")
+      self.assertEqual(foo_indices.tolist(), [1, 3, 5, 7, 9])
+      self.assertEqual(index.find(op_type="FooOp", op_name="Op3").tolist(),
+                       [3])
+      self.assertEqual(index.find(op_type="BazOp").tolist(), [])
+      digests = index.digests(foo_indices)
+      self.assertEqual([digest.op_name for digest in digests],
+                       ["Op1", "Op3", "Op5", "Op7", "Op9"])
+      self.assertEqual(
+          [digest.op_name for digest in digests],
+          [reader.read_graph_execution_trace(digest).op_name
+           for digest in digests])
+
+  def testPersistedGraphExecutionTraceIndexIsReusedAndExtended(self):
+    writer = debug_events_writer.DebugEventsWriter(
+        self.dump_root, self.tfdbg_run_id, circular_buffer_size=-1)
+    writer.WriteDebuggedGraph(
+        debug_event_pb2.DebuggedGraph(graph_id="graph1", graph_name="graph1"))
+    self._writeGraphExecutionTraces(writer, 0, 4)
+
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      reader.update()
+      self.assertEqual(reader.num_graph_execution_traces(), 4)
+      index_path = reader._reader.graph_execution_traces_index_path()
+      # The index is saved on exit, not on every update.
+      self.assertFalse(os.path.isfile(index_path))
+    self.assertTrue(os.path.isfile(index_path))
+
+    self._writeGraphExecutionTraces(writer, 4, 6)
+    writer.Close()
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      reader.update()
+      digests = reader.graph_execution_traces(digest=True)
+      self.assertEqual([digest.op_name for digest in digests],
+                       ["Op%d" % i for i in range(6)])
+      self.assertEqual(
+          [digest.op_type for digest in digests],
+          ["BarOp", "FooOp", "BarOp", "FooOp", "BarOp", "FooOp"])
+      trace = reader.read_graph_execution_trace(digests[5])
+      self.assertEqual(trace.op_name, "Op5")
+      self.assertEqual(trace.output_slot, 2)
+
+    # A non-persisting reader reads all traces from the trace files.
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      self.assertEqual(reader.num_graph_execution_traces(), 6)
+
+  def testGraphExecutionTraceIndexIsSavedOnDemand(self):
+    writer = debug_events_writer.DebugEventsWriter(
+        self.dump_root, self.tfdbg_run_id, circular_buffer_size=-1)
+    writer.WriteDebuggedGraph(
+        debug_event_pb2.DebuggedGraph(graph_id="graph1", graph_name="graph1"))
+    self._writeGraphExecutionTraces(writer, 0, 3)
+    writer.Close()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      index_path = reader._reader.graph_execution_traces_index_path()
+      reader.save_index()
+      self.assertTrue(os.path.isfile(index_path))
+      mtime = os.stat(index_path).st_mtime_ns
+      # Nothing new was read, so the index is not rewritten.
+      reader.update()
+      reader.save_index()
+      self.assertEqual(os.stat(index_path).st_mtime_ns, mtime)
+
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      reader.update()
+      self.assertEqual(reader.num_graph_execution_traces(), 3)
+
+  def testGraphOpDigestsByType(self):
+    writer = debug_events_writer.DebugEventsWriter(
+        self.dump_root, self.tfdbg_run_id, circular_buffer_size=-1)
+    writer.WriteDebuggedGraph(
+        debug_event_pb2.DebuggedGraph(graph_id="graph1", graph_name="graph1"))
+    self._writeGraphExecutionTraces(writer, 0, 5)
+    writer.Close()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      self.assertEqual(
+          [digest.op_name for digest in reader.graph_op_digests("BarOp")],
+          ["Op0", "Op2", "Op4"])
+      self.assertEqual(reader.graph_op_digests("BazOp"), [])
+      self.assertLen(reader.graph_op_digests(), 5)
+
 
 class MultiSetReaderTest(dumping_callback_test_lib.DumpingCallbackTestBase):
   """Test for DebugDataReader for multiple file sets under a dump root."""
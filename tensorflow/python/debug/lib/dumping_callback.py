@@ -15,10 +15,13 @@
 """Dumping op callbacks: Enables dump-based features in tfdbg v2."""
 
 import atexit
+import collections
 import os
+import random
 import re
 import socket
 import threading
+import time
 import uuid
 
 from tensorflow.core.framework import graph_debug_info_pb2
@@ -34,7 +37,11 @@ from tensorflow.python.framework import op_callbacks
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import cond
 from tensorflow.python.ops import gen_debug_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import random_ops
+from tensorflow.python.ops import variables
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import compat
 from tensorflow.python.util import object_identity
@@ -76,6 +83,181 @@ def _concrete_tensor_to_proto(tensor):
   return tensor_util.make_tensor_proto(tensor.numpy())
 
 
+# Number of float64 elements in the summaries of the tensor debug modes.
+_SUMMARY_NUM_ELEMENTS = {
+    debug_event_pb2.TensorDebugMode.NO_TENSOR: 0,
+    debug_event_pb2.TensorDebugMode.CURT_HEALTH: 2,
+    debug_event_pb2.TensorDebugMode.CONCISE_HEALTH: 5,
+    debug_event_pb2.TensorDebugMode.FULL_HEALTH: 11,
+    debug_event_pb2.TensorDebugMode.SHAPE: 10,
+}
+# Rough size of the fields of a GraphExecutionTrace other than the tensor.
+_GRAPH_EXECUTION_TRACE_OVERHEAD_BYTES = 64
+
+
+def _estimate_graph_execution_trace_bytes(tensor_debug_mode, tensor, op_name):
+  """Estimate the size of a GraphExecutionTrace written for a graph tensor."""
+  num_bytes = _GRAPH_EXECUTION_TRACE_OVERHEAD_BYTES + len(op_name or "")
+  if tensor_debug_mode == debug_event_pb2.TensorDebugMode.FULL_TENSOR:
+    num_elements = tensor.shape.num_elements()
+    if num_elements is not None:
+      num_bytes += num_elements * tensor.dtype.size
+  else:
+    num_bytes += _SUMMARY_NUM_ELEMENTS.get(tensor_debug_mode, 0) * 8
+  return num_bytes
+
+
+class _DumpSampler(object):
+  """Decides which steps, function calls and ops the dumping callback dumps.
+
+  A step is one eager call to a `tf.function` (e.g., one call to a
+  `tf.function`-decorated training step), i.e., what is recorded as an
+  `Execution` debug event of a function. Ops executed eagerly between two
+  function calls (e.g., `IteratorGetNext`) belong to the step of the next call
+  and do not advance the step counter.
+
+  Whether the next function call is dumped is decided when the preceding call
+  ends, and is held in a boolean variable that gates the ops inside
+  `tf.function`s at runtime, before their tensor summaries are computed. The
+  `Execution` of a call and the graph execution traces of its ops are thus
+  either all dumped or all skipped, unless an op probability below 1 draws at
+  runtime, for every op in a dumped call, whether the op is dumped.
+  """
+
+  def __init__(self, every_n_steps, probability, max_bytes_per_second,
+               op_probability=1.0):
+    self._every_n_steps = every_n_steps
+    self._probability = probability
+    self._op_probability = op_probability
+    self._max_bytes_per_second = max_bytes_per_second
+    self._random = random.Random()
+    self._lock = threading.Lock()
+    self._step = 0
+    # Token bucket holding up to one second worth of the byte budget.
+    self._bytes_available = max_bytes_per_second
+    self._last_refill_time = time.time()
+    # A map from graph ID to the estimated bytes of the graph execution traces
+    # written by one execution of the graph.
+    self._graph_trace_bytes = collections.defaultdict(int)
+    # Whether data from the current step is dumped.
+    self._step_sampled = True
+    # Whether the function call that ends the current step is dumped.
+    self._call_sampled = self.sample_op()
+    self._call_sampled_variable = None
+    if self.gates_calls:
+      with ops.init_scope():
+        if ops.executing_eagerly_outside_functions():
+          self._call_sampled_variable = variables.Variable(
+              self._call_sampled, trainable=False, name="tfdbg_call_sampled")
+
+  @property
+  def gates_calls(self):
+    """Whether only a subset of the function calls are dumped."""
+    return (self._every_n_steps > 1 or self._probability < 1.0 or
+            self._max_bytes_per_second is not None)
+
+  @property
+  def call_sampled(self):
+    """Whether data from the next function call is dumped."""
+    return self._call_sampled
+
+  def call_sampled_tensor(self):
+    """Get a boolean tensor of `call_sampled`, for gating graph ops.
+
+    Returns:
+      `None` if the calls are not gated at runtime, e.g., under TF1 graph mode.
+    """
+    if self._call_sampled_variable is None:
+      return None
+    return self._call_sampled_variable.read_value()
+
+  @property
+  def op_probability(self):
+    """Probability with which an op inside a dumped function call is dumped."""
+    return self._op_probability
+
+  def op_sampled_tensor(self):
+    """Get a boolean tensor that draws whether an op in a function is dumped.
+
+    Returns:
+      `None` if all ops of dumped function calls are dumped.
+    """
+    if self._op_probability >= 1.0:
+      return None
+    return math_ops.less(
+        random_ops.random_uniform([], dtype=dtypes.float32),
+        self._op_probability)
+
+  def sample_op(self):
+    """Draw whether an op or a function call is dumped."""
+    return (self._probability >= 1.0 or
+            self._random.random() < self._probability)
+
+  def sample_graph_op(self):
+    """Draw whether an op is dumped when it is built under TF1 graph mode."""
+    return self.sample_op() and (self._op_probability >= 1.0 or
+                                 self._random.random() < self._op_probability)
+
+  def sample_eager_op(self):
+    """Decide whether an eagerly-executed op, other than a call, is dumped."""
+    if not (self._step_sampled and self.sample_op()):
+      return False
+    with self._lock:
+      return self._budget_available()
+
+  def add_graph_trace_bytes(self, graph_id, num_bytes):
+    with self._lock:
+      self._graph_trace_bytes[graph_id] += num_bytes
+
+  def consume_bytes(self, num_bytes):
+    """Take the bytes dumped for an eagerly-executed op from the budget."""
+    if self._max_bytes_per_second is None:
+      return
+    with self._lock:
+      self._bytes_available -= num_bytes
+
+  def end_function_call(self, graph_id=None, num_bytes=0):
+    """End the step of a function call and decide whether to dump the next.
+
+    Args:
+      graph_id: ID of the graph executed by the call, if known.
+      num_bytes: Number of bytes dumped for the call outside the graph.
+    """
+    if not self.gates_calls:
+      return
+    with self._lock:
+      if self._call_sampled and self._max_bytes_per_second is not None:
+        self._bytes_available -= num_bytes
+        if graph_id is not None:
+          self._bytes_available -= self._graph_trace_bytes.get(graph_id, 0)
+      self._step += 1
+      self._step_sampled = (self._step % self._every_n_steps == 0 and
+                            self._budget_available())
+      call_sampled = self._step_sampled and self.sample_op()
+      if call_sampled != self._call_sampled:
+        self._call_sampled = call_sampled
+        if self._call_sampled_variable is not None:
+          self._call_sampled_variable.assign(call_sampled)
+
+  def _budget_available(self):
+    if self._max_bytes_per_second is None:
+      return True
+    now = time.time()
+    self._bytes_available = min(
+        self._max_bytes_per_second,
+        self._bytes_available +
+        (now - self._last_refill_time) * self._max_bytes_per_second)
+    self._last_refill_time = now
+    return self._bytes_available > 0
+
+
+def _outermost_graph(graph):
+  """Get the outermost FuncGraph enclosing `graph`, or `graph` itself."""
+  while hasattr(getattr(graph, "outer_graph", None), "outer_graph"):
+    graph = graph.outer_graph
+  return graph
+
+
 class _DumpingCallback(object):
   """An object holding the states surrounding the dumping callback."""
 
@@ -84,13 +266,24 @@ class _DumpingCallback(object):
                tensor_debug_mode,
                circular_buffer_size,
                op_regex,
-               tensor_dtypes):
+               tensor_dtypes,
+               op_types=None,
+               sample_every_n_steps=1,
+               sample_probability=1.0,
+               max_bytes_per_second=None,
+               op_sample_probability=1.0):
     self._dump_root = dump_root
     self._tfdbg_run_id = _get_tfdbg_run_id()
     self._tensor_debug_mode = tensor_debug_mode
     self._circular_buffer_size = circular_buffer_size
     self._op_regex = op_regex
     self._tensor_dtypes = tensor_dtypes
+    self._op_types = frozenset(op_types) if op_types is not None else None
+    # A cache of the decisions made by `_should_dump_tensor()`.
+    self._should_dump_cache = dict()
+    self._sampler = _DumpSampler(
+        sample_every_n_steps, sample_probability, max_bytes_per_second,
+        op_sample_probability)
 
     self._hostname = socket.gethostname()
     # A list of source-file paths.
@@ -349,6 +542,23 @@ class _DumpingCallback(object):
     debug_urls = ["file://%s" % self._dump_root]
     is_v1_graph_mode = not ops.executing_eagerly_outside_functions()
     instrumented_tensors = [] if is_v1_graph_mode else None
+    # Under TF1 graph mode, ops are not gated at runtime, so the sampling
+    # draw happens once per op when the graph is built.
+    if is_v1_graph_mode and not self._sampler.sample_graph_op():
+      return list(tensors)
+    graph_id = None
+    if tensors and self._sampler.gates_calls:
+      graph_id = self._get_context_id(_outermost_graph(tensors[0].graph))
+    # One runtime draw per op and function call, shared by all outputs of the
+    # op and created only once an output is dumped.
+    op_sampled = []
+
+    def draw_op_sampled():
+      if not op_sampled:
+        op_sampled.append(
+            None if is_v1_graph_mode else self._sampler.op_sampled_tensor())
+      return op_sampled[0]
+
     for output_slot, tensor in enumerate(tensors):
       with self._symbolic_tensor_counter_lock:
         debug_identity_name = ("DebugIdentityV2_%d" %
@@ -376,12 +586,12 @@ class _DumpingCallback(object):
           continue
         # Except in V1 graph mode + control flow, debug_identity_v2 triggers
         # auto control dependency because it's a stateful op.
-        debug_tensor = gen_debug_ops.debug_identity_v2(
+        debug_tensor = self._debug_identity(
             # Use an empty (shape=[0]) float32 tensor for the NO_TENSOR mode
             # as a low-overhead placeholder, since no actual tensor value is
             # traced.
-            constant_op.constant([], dtype=dtypes.float32),
-            **debug_identity_op_kwargs)
+            lambda: constant_op.constant([], dtype=dtypes.float32),
+            debug_identity_op_kwargs, is_v1_graph_mode, draw_op_sampled())
         if is_v1_graph_mode:
           instrumented_tensors.append(self._process_v1_graph_mode_tensor(
               op_type, tensor, debug_tensor, tensor_debug_mode))
@@ -403,12 +613,15 @@ class _DumpingCallback(object):
           if is_v1_graph_mode:
             instrumented_tensors.append(tensor)
           continue
-        debug_tensor = gen_debug_ops.debug_identity_v2(
-            gen_debug_ops.debug_numeric_summary_v2(
+        debug_tensor = self._debug_identity(
+            # pylint: disable=cell-var-from-loop,g-long-lambda
+            lambda: gen_debug_ops.debug_numeric_summary_v2(
                 tensor,
                 tensor_id=tensor_ids[output_slot],
                 tensor_debug_mode=self._tensor_debug_mode,
-                output_dtype=dtypes.float64), **debug_identity_op_kwargs)
+                output_dtype=dtypes.float64),
+            # pylint: enable=cell-var-from-loop,g-long-lambda
+            debug_identity_op_kwargs, is_v1_graph_mode, draw_op_sampled())
         if is_v1_graph_mode:
           instrumented_tensors.append(self._process_v1_graph_mode_tensor(
               op_type, tensor, debug_tensor, tensor_debug_mode))
@@ -420,8 +633,9 @@ class _DumpingCallback(object):
           if is_v1_graph_mode:
             instrumented_tensors.append(tensor)
           continue
-        debug_tensor = gen_debug_ops.debug_identity_v2(
-            tensor, **debug_identity_op_kwargs)
+        debug_tensor = self._debug_identity(
+            lambda: tensor,  # pylint: disable=cell-var-from-loop
+            debug_identity_op_kwargs, is_v1_graph_mode, draw_op_sampled())
         if is_v1_graph_mode:
           instrumented_tensors.append(self._process_v1_graph_mode_tensor(
               op_type, tensor, debug_tensor, tensor_debug_mode))
@@ -429,8 +643,51 @@ class _DumpingCallback(object):
         raise NotImplementedError(
             "Symbolic tensor instrumentation is not implemented for debug mode "
             "%s" % self._tensor_debug_mode)
+      if graph_id is not None:
+        # Ops sampled at runtime add their expected number of bytes.
+        self._sampler.add_graph_trace_bytes(
+            graph_id,
+            self._sampler.op_probability *
+            _estimate_graph_execution_trace_bytes(tensor_debug_mode, tensor,
+                                                  op_name))
     return instrumented_tensors
 
+  def _debug_identity(self, make_input, debug_identity_op_kwargs,
+                      is_v1_graph_mode, op_sampled=None):
+    """Create a DebugIdentityV2 op, gated by call and op sampling if configured.
+
+    Args:
+      make_input: A callable that creates the input tensor of the
+        DebugIdentityV2 op, e.g., a tensor summary. It is called in the branch
+        of the gating `cond`, so that the input is computed only on sampled
+        function calls and ops.
+      debug_identity_op_kwargs: Keyword arguments of the DebugIdentityV2 op.
+      is_v1_graph_mode: Whether the op is created under TF1 graph mode, where
+        calls are not gated.
+      op_sampled: An optional boolean tensor with the runtime draw of whether
+        the op is dumped.
+
+    Returns:
+      The output tensor of the DebugIdentityV2 op, or of the gating `cond`.
+    """
+    call_sampled = (None if is_v1_graph_mode else
+                    self._sampler.call_sampled_tensor())
+    if call_sampled is None:
+      call_sampled = op_sampled
+    elif op_sampled is not None:
+      call_sampled = math_ops.logical_and(call_sampled, op_sampled)
+    if call_sampled is None:
+      return gen_debug_ops.debug_identity_v2(make_input(),
+                                             **debug_identity_op_kwargs)
+
+    def dump():
+      debug_tensor = gen_debug_ops.debug_identity_v2(
+          make_input(), **debug_identity_op_kwargs)
+      with ops.control_dependencies([debug_tensor]):
+        return constant_op.constant(True)
+
+    return cond.cond(call_sampled, dump, lambda: constant_op.constant(False))
+
   def _dump_eager_tensors(self,
                           tensors,
                           op_type,
@@ -575,12 +832,31 @@ class _DumpingCallback(object):
       if op_type_bytes in op_callbacks_common.OP_CALLBACK_SKIP_OPS:
         return None
       context_id = self._func_graph_id_from_func_name(op_type)
+      is_function_call = is_op_type_function(op_type_bytes)
+      # Sampling is decided before any tensor summary is computed. For a
+      # function call, the decision was made before the call and also gated
+      # the ops inside the function.
+      if is_function_call:
+        sampled = self._sampler.call_sampled
+      else:
+        sampled = self._sampler.sample_eager_op()
+      if not sampled:
+        if is_function_call:
+          self._sampler.end_function_call(context_id)
+        return None
       input_ids = [t._id for t in inputs]  # pylint:disable=protected-access
       output_tensor_device_ids = [writer.RegisterDeviceAndGetId(output.device)
                                   for output in outputs] if outputs else []
-      writer.WriteExecution(self._dump_eager_tensors(
+      execution_proto = self._dump_eager_tensors(
           outputs, op_type, input_ids, output_tensor_device_ids,
-          graph_id=context_id))
+          graph_id=context_id)
+      writer.WriteExecution(execution_proto)
+      num_bytes = (execution_proto.ByteSize() if self._sampler.gates_calls
+                   else 0)
+      if is_function_call:
+        self._sampler.end_function_call(context_id, num_bytes)
+      else:
+        self._sampler.consume_bytes(num_bytes)
 
   def _lookup_tensor_name(self, tensor):
     """Look up the name of a graph tensor.
@@ -645,8 +921,8 @@ class _DumpingCallback(object):
   def _should_dump_tensor(self, op_type, dtype):
     """Determine if the given tensor's value will be dumped.
 
-    The determination is made given the configurations such as `op_regex`,
-    `tensor_dtypes`.
+    The determination is made given the configurations such as `op_types`,
+    `op_regex`, `tensor_dtypes`, and is cached for each op type and dtype.
 
     Args:
       op_type: Name of the op's type, as a string (e.g., "MatMul").
@@ -655,7 +931,17 @@ class _DumpingCallback(object):
     Returns:
       A bool indicating whether the tensor's value will be dumped.
     """
+    key = (op_type, dtype)
+    should_dump = self._should_dump_cache.get(key)
+    if should_dump is None:
+      should_dump = bool(self._compute_should_dump_tensor(op_type, dtype))
+      self._should_dump_cache[key] = should_dump
+    return should_dump
+
+  def _compute_should_dump_tensor(self, op_type, dtype):
     should_dump = True
+    if self._op_types is not None:
+      should_dump = op_type in self._op_types
     if self._op_regex:
       should_dump = (should_dump and
                      re.match(self._op_regex, op_type))
@@ -674,7 +960,12 @@ def enable_dump_debug_info(dump_root,
                            tensor_debug_mode=DEFAULT_TENSOR_DEBUG_MODE,
                            circular_buffer_size=1000,
                            op_regex=None,
-                           tensor_dtypes=None):
+                           tensor_dtypes=None,
+                           op_types=None,
+                           sample_every_n_steps=1,
+                           sample_probability=1.0,
+                           max_bytes_per_second=None,
+                           op_sample_probability=1.0):
   """Enable dumping debugging information from a TensorFlow program.
 
   The debugging information is dumped to a directory on the file system
@@ -780,6 +1071,31 @@ def enable_dump_debug_info(dump_root,
         dumping. Examples:
         - `tensor_dtype=lambda dtype: dtype.is_integer`.
       This filter operates in a logical AND relation with `op_regex`.
+    op_types: Dump data from only the tensors from ops whose types are in this
+      list or tuple of op type names (e.g., `["MatMul", "Relu"]`). This is a
+      cheaper alternative to `op_regex` for exact matches, and operates in a
+      logical AND relation with `op_regex` and `tensor_dtypes`.
+    sample_every_n_steps: Dump data from only every N-th step, where a step is
+      an eager call to a `tf.function` (e.g., one call to a
+      `tf.function`-decorated training step), together with the ops executed
+      eagerly since the previous call. On the other steps, the tensor
+      summaries of the ops inside `tf.function`s are not computed. Only takes
+      effect under eager execution. Defaults to 1, i.e., every step.
+    sample_probability: Probability with which an eagerly-executed op or a
+      `tf.function` call is dumped. The draw for a `tf.function` call applies
+      to both its `Execution` and the graph execution traces of the ops inside
+      it. Under TF1 graph mode, the draw happens once per op when the graph is
+      built. Defaults to 1.0.
+    max_bytes_per_second: If specified, an approximate budget of the bytes of
+      debug data dumped per second. Once the budget is exhausted, steps are
+      skipped until it is replenished. The bytes written from inside
+      `tf.function`s are estimated from the tensor debug mode and the static
+      shapes of the tensors. Only takes effect under eager execution.
+    op_sample_probability: Probability with which an op inside a dumped
+      `tf.function` call is dumped. Unlike `sample_probability`, which dumps
+      all or none of the ops of a call, every op draws at runtime, on every
+      call, whether its graph execution trace is dumped. Under TF1 graph mode,
+      the draw happens once per op when the graph is built. Defaults to 1.0.
   Returns:
     A DebugEventsWriter instance used by the dumping callback. The caller
     may use its flushing methods, including `FlushNonExecutionFiles()` and
@@ -820,6 +1136,29 @@ def enable_dump_debug_info(dump_root,
       tensor_dtypes = [
           dtypes.as_dtype(dtype_item) for dtype_item in tensor_dtypes]
 
+  if op_types is not None and (
+      not isinstance(op_types, (list, tuple, set, frozenset)) or
+      not all(isinstance(op_type, str) for op_type in op_types)):
+    raise ValueError(
+        "If specified, op_types is expected to be a list, a tuple or a set of "
+        "op type names, but received %s" % (op_types,))
+  if not isinstance(sample_every_n_steps, int) or sample_every_n_steps < 1:
+    raise ValueError(
+        "sample_every_n_steps is expected to be a positive integer, but "
+        "received %s" % (sample_every_n_steps,))
+  if not 0.0 <= sample_probability <= 1.0:
+    raise ValueError(
+        "sample_probability is expected to be in the interval [0, 1], but "
+        "received %s" % (sample_probability,))
+  if not 0.0 <= op_sample_probability <= 1.0:
+    raise ValueError(
+        "op_sample_probability is expected to be in the interval [0, 1], but "
+        "received %s" % (op_sample_probability,))
+  if max_bytes_per_second is not None and max_bytes_per_second <= 0:
+    raise ValueError(
+        "If specified, max_bytes_per_second is expected to be positive, but "
+        "received %s" % (max_bytes_per_second,))
+
   if hasattr(_state, "dumping_callback"):
     if _state.dumping_callback.circular_buffer_size != circular_buffer_size:
       raise ValueError(
@@ -837,11 +1176,17 @@ def enable_dump_debug_info(dump_root,
            tensor_debug_mode_keys[_state.dumping_callback.tensor_debug_mode],
            tensor_debug_mode_keys[tensor_debug_mode]))
   else:
-    _state.dumping_callback = _DumpingCallback(dump_root,
-                                               tensor_debug_mode,
-                                               circular_buffer_size,
-                                               op_regex,
-                                               tensor_dtypes)
+    _state.dumping_callback = _DumpingCallback(
+        dump_root,
+        tensor_debug_mode,
+        circular_buffer_size,
+        op_regex,
+        tensor_dtypes,
+        op_types=op_types,
+        sample_every_n_steps=sample_every_n_steps,
+        sample_probability=sample_probability,
+        max_bytes_per_second=max_bytes_per_second,
+        op_sample_probability=op_sample_probability)
     op_callbacks.add_op_callback(_state.dumping_callback.callback)
     function_lib.CONCRETE_FUNCTION_CALLBACKS.append(
         _state.dumping_callback.function_callback)
@@ -20,6 +20,7 @@ import shutil
 import socket
 import tempfile
 import threading
+import time
 
 from absl.testing import parameterized
 import numpy as np
@@ -947,6 +948,209 @@ class DumpingCallbackTest(
             tensor_values[1], [0, 1, 2, 3, 0])  # Unique indices.
         self.assertAllClose(tensor_values[2], 17)  # Sum.
 
+  def testOpTypesFilter(self):
+    x = constant_op.constant(2.0)
+    y = constant_op.constant(3.0)
+    writer = dumping_callback.enable_dump_debug_info(
+        self.dump_root, tensor_debug_mode="FULL_TENSOR", op_types=["Log"])
+
+    @def_function.function
+    def log_sum(x, y):
+      return math_ops.log(x + y)
+
+    self.assertAllClose(log_sum(x, y), np.log(5.0))
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      graph_exec_digests = reader.graph_execution_traces(digest=True)
+      self.assertEqual([digest.op_type for digest in graph_exec_digests],
+                       ["Log"])
+      self.assertAllClose(
+          reader.graph_execution_trace_to_tensor_value(graph_exec_digests[0]),
+          np.log(5.0))
+
+  @parameterized.named_parameters(
+      ("CurtHealth", "CURT_HEALTH"),
+      ("FullTensor", "FULL_TENSOR"),
+  )
+  def testSampleEveryNSteps(self, tensor_debug_mode):
+    writer = dumping_callback.enable_dump_debug_info(
+        self.dump_root, tensor_debug_mode=tensor_debug_mode,
+        op_types=["Mul"], sample_every_n_steps=3)
+
+    @def_function.function
+    def times_two(x):
+      return x * 2.0
+
+    for i in range(7):
+      # Eagerly-executed ops don't advance the step counter.
+      x = math_ops.add(constant_op.constant(float(i)), 0.0)
+      self.assertAllClose(times_two(x), i * 2.0)
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      # Steps 0, 3 and 6 are sampled, including the AddV2 ops before the calls.
+      executions = reader.executions()
+      self.assertEqual(
+          [execution.op_type.startswith("__inference_times_two")
+           for execution in executions], [False, True] * 3)
+      graph_exec_digests = reader.graph_execution_traces(digest=True)
+      self.assertEqual([digest.op_type for digest in graph_exec_digests],
+                       ["Mul"] * 3)
+      if tensor_debug_mode == "FULL_TENSOR":
+        self.assertAllClose(
+            [reader.graph_execution_trace_to_tensor_value(digest)
+             for digest in graph_exec_digests], [0.0, 6.0, 12.0])
+
+  def testSampleProbabilityZeroDumpsNoTensors(self):
+    writer = dumping_callback.enable_dump_debug_info(
+        self.dump_root, tensor_debug_mode="FULL_TENSOR", sample_probability=0.0)
+
+    @def_function.function
+    def log_sum(x, y):
+      return math_ops.log(x + y)
+
+    self.assertAllClose(
+        log_sum(constant_op.constant(2.0), constant_op.constant(3.0)),
+        np.log(5.0))
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      # Graph op creations are always recorded.
+      op_types = [digest.op_type for digest in reader.graph_op_digests()]
+      self.assertIn("AddV2", op_types)
+      self.assertIn("Log", op_types)
+      self.assertEqual(reader.executions(), [])
+      self.assertEqual(reader.graph_execution_traces(), [])
+
+  def testSampleProbabilityDumpsExecutionAndTracesOfSameCalls(self):
+    writer = dumping_callback.enable_dump_debug_info(
+        self.dump_root, tensor_debug_mode="FULL_TENSOR", op_types=["Mul"],
+        sample_probability=0.5)
+
+    @def_function.function
+    def times_two(x):
+      return x * 2.0
+
+    for i in range(20):
+      self.assertAllClose(times_two(constant_op.constant(float(i))), i * 2.0)
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      # Each dumped call has its graph execution trace, and vice versa.
+      executions = reader.executions()
+      graph_exec_digests = reader.graph_execution_traces(digest=True)
+      self.assertLen(graph_exec_digests, len(executions))
+      for execution in executions:
+        self.assertStartsWith(execution.op_type, "__inference_times_two")
+      for digest in graph_exec_digests:
+        self.assertEqual(digest.op_type, "Mul")
+
+  def testOpSampleProbabilityZeroDumpsExecutionsButNoTraces(self):
+    writer = dumping_callback.enable_dump_debug_info(
+        self.dump_root, tensor_debug_mode="FULL_TENSOR", op_types=["Mul"],
+        op_sample_probability=0.0)
+
+    @def_function.function
+    def times_two(x):
+      return x * 2.0
+
+    for i in range(3):
+      self.assertAllClose(times_two(constant_op.constant(float(i))), i * 2.0)
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      self.assertLen(reader.executions(), 3)
+      self.assertEqual(reader.graph_execution_traces(), [])
+
+  def testOpSampleProbabilityDrawsPerOpAndCall(self):
+    writer = dumping_callback.enable_dump_debug_info(
+        self.dump_root, tensor_debug_mode="FULL_TENSOR",
+        op_types=["Mul", "AddV2"], op_sample_probability=0.5)
+
+    @def_function.function
+    def times_two_plus_one(x):
+      return x * 2.0, x + 1.0
+
+    num_calls = 50
+    for i in range(num_calls):
+      times_two_plus_one(constant_op.constant(float(i)))
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      self.assertLen(reader.executions(), num_calls)
+      mul_calls = set()
+      add_calls = set()
+      for digest in reader.graph_execution_traces(digest=True):
+        value = reader.graph_execution_trace_to_tensor_value(digest)
+        if digest.op_type == "Mul":
+          mul_calls.add(int(value / 2.0))
+        else:
+          add_calls.add(int(value - 1.0))
+      # Each op is dumped on some calls only, and independently of the other
+      # op of the same calls.
+      self.assertNotEmpty(mul_calls)
+      self.assertLess(len(mul_calls), num_calls)
+      self.assertNotEmpty(add_calls)
+      self.assertLess(len(add_calls), num_calls)
+      self.assertNotEqual(mul_calls, add_calls)
+
+  def testMaxBytesPerSecondSkipsStepsOnceBudgetIsExhausted(self):
+    x = constant_op.constant(np.ones([64, 64], dtype=np.float32))
+    writer = dumping_callback.enable_dump_debug_info(
+        self.dump_root, tensor_debug_mode="FULL_TENSOR", op_types=["Mul"],
+        max_bytes_per_second=1)
+
+    @def_function.function
+    def times_two(x):
+      return x * 2.0
+
+    for _ in range(5):
+      x = times_two(x)
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      # The first step exhausts the budget of 1 byte per second.
+      executions = reader.executions()
+      self.assertLen(executions, 1)
+      self.assertStartsWith(executions[0].op_type, "__inference_times_two")
+      self.assertEqual(
+          [digest.op_type
+           for digest in reader.graph_execution_traces(digest=True)], ["Mul"])
+
+  def testInvalidSamplingArgsLeadToErrors(self):
+    with self.assertRaisesRegex(ValueError, r"op_types.*list.*but received"):
+      dumping_callback.enable_dump_debug_info(self.dump_root, op_types="Log")
+    with self.assertRaisesRegex(ValueError,
+                                r"sample_every_n_steps.*positive integer"):
+      dumping_callback.enable_dump_debug_info(
+          self.dump_root, sample_every_n_steps=0)
+    with self.assertRaisesRegex(ValueError, r"sample_probability.*\[0, 1\]"):
+      dumping_callback.enable_dump_debug_info(
+          self.dump_root, sample_probability=1.5)
+    with self.assertRaisesRegex(ValueError,
+                                r"op_sample_probability.*\[0, 1\]"):
+      dumping_callback.enable_dump_debug_info(
+          self.dump_root, op_sample_probability=-0.5)
+    with self.assertRaisesRegex(ValueError,
+                                r"max_bytes_per_second.*positive"):
+      dumping_callback.enable_dump_debug_info(
+          self.dump_root, max_bytes_per_second=0)
+
   @parameterized.named_parameters(
       ("NoTensor", "NO_TENSOR"),
       ("CurtHealth", "CURT_HEALTH"),
@@ -1392,6 +1596,53 @@ class DumpingCallbackTest(
       self.assertTrue(div_op_name)
 
 
+class DumpingCallbackBenchmark(test.Benchmark):
+  """Steps per second of a training-like step with and without dumping."""
+
+  def _benchmarkSteps(self, name, num_steps=200, **dump_kwargs):
+    dump_root = tempfile.mkdtemp()
+    try:
+      if dump_kwargs:
+        dumping_callback.enable_dump_debug_info(dump_root, **dump_kwargs)
+      weights = variables.Variable(np.ones([64, 64], dtype=np.float32))
+
+      @def_function.function
+      def step(x):
+        for _ in range(8):
+          x = math_ops.tanh(math_ops.matmul(x, weights))
+        weights.assign_sub(0.01 * x)
+        return math_ops.reduce_sum(x)
+
+      x = constant_op.constant(np.ones([64, 64], dtype=np.float32))
+      step(x)  # Warm up.
+      start_time = time.time()
+      for _ in range(num_steps):
+        step(x)
+      wall_time = (time.time() - start_time) / num_steps
+    finally:
+      dumping_callback.disable_dump_debug_info()
+      shutil.rmtree(dump_root, ignore_errors=True)
+    self.report_benchmark(
+        name=name, iters=num_steps, wall_time=wall_time,
+        extras={"steps_per_sec": 1.0 / wall_time})
+
+  def benchmarkDumpingOff(self):
+    self._benchmarkSteps("dumping_off")
+
+  def benchmarkDumpingEveryStep(self):
+    self._benchmarkSteps("dumping_full", tensor_debug_mode="FULL_HEALTH")
+
+  def benchmarkDumpingEvery10thStep(self):
+    self._benchmarkSteps(
+        "dumping_every_10th_step", tensor_debug_mode="FULL_HEALTH",
+        sample_every_n_steps=10)
+
+  def benchmarkDumpingSampledOps(self):
+    self._benchmarkSteps(
+        "dumping_sampled_ops", tensor_debug_mode="FULL_HEALTH",
+        sample_probability=0.1)
+
+
 if __name__ == "__main__":
   ops.enable_eager_execution()
   googletest.main()
@@ -43,10 +43,12 @@ from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import sparse_tensor
+from tensorflow.python.framework import tensor as tensor_lib
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.framework import type_spec
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import array_ops_stack
 from tensorflow.python.ops import cond as tf_cond
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import while_loop
@@ -348,6 +350,65 @@ class DistributedIteratorBase(collections_abc.Iterator,
     return tf_cond.cond(
         num_replicas_with_values > 0, _value_or_dummy, _eof, strict=True)
 
+  def get_next_many(self, num_steps, name=None):
+    """Returns the next `num_steps` inputs for all replicas, stacked.
+
+    Each per-replica component has a new leading dimension of size
+    `num_steps`, so a single call feeds a multi-step loop inside
+    `strategy.run`. All `num_steps` elements are fetched by one call, which
+    amortizes the Python-side iterator overhead over the steps, e.g.:
+
+    ```python
+    @tf.function
+    def train_steps(iterator):
+      def replica_fn(inputs):
+        def body(i):
+          step_fn(tf.nest.map_structure(lambda x: x[i], inputs))
+          return i + 1
+        tf.while_loop(lambda i: i < num_steps, body, [0])
+      strategy.run(replica_fn, args=(iterator.get_next_many(num_steps),))
+    ```
+
+    Combine with `double_buffered_input_options` so the next `num_steps`
+    elements are copied to the devices while the current ones are consumed.
+
+    Partial batches are not handled: every element must have the same shape,
+    so finite datasets should be batched with `drop_remainder=True`. Only
+    dense `Tensor` components are supported.
+
+    Args:
+      num_steps: Python `int`, the number of elements to fetch per replica.
+      name: not used.
+
+    Returns:
+      A `tf.distribute.DistributedValues` structure whose components are
+      stacked along a new leading axis of size `num_steps`.
+
+    Raises:
+      ValueError: If `num_steps` is not a positive integer or if called in a
+        replica context.
+      `tf.errors.OutOfRangeError`: If fewer than `num_steps` elements remain.
+    """
+    del name
+    if not isinstance(num_steps, int) or num_steps < 1:
+      raise ValueError("`num_steps` must be a positive Python integer. "
+                       f"Received: {num_steps}")
+    with distribute_lib.enter_or_assert_strategy(self._strategy):
+      if distribute_lib.get_replica_context() is not None:
+        raise ValueError("get_next_many() should be called from outside of "
+                         "replica_fn. e.g. strategy.run(replica_fn, "
+                         "args=(iterator.get_next_many(num_steps),))")
+
+    replicas = []
+    for i, worker in enumerate(self._input_workers.worker_devices):
+      with ops.device(worker):
+        replicas.extend(self._iterators[i].get_next_many_as_list(num_steps))
+
+    if self._replica_order is not None:
+      replicas = self._reorder_replicas(replicas)
+
+    return _create_per_replica(replicas, self._strategy)
+
   def _get_next_no_partial_batch_handling(self, name=None):
     replicas = []
     for i, worker in enumerate(self._input_workers.worker_devices):
@@ -1431,6 +1492,30 @@ class _SingleWorkerDatasetIteratorBase(object):
       return self._format_data_list_with_options(
           self._iterator.get_next_as_optional())
 
+  def get_next_many_as_list(self, num_steps):
+    """Get the next `num_steps` elements for each device, stacked.
+
+    Args:
+      num_steps: Python `int`, the number of elements to fetch per device.
+
+    Returns:
+      A list with one structure per device, whose components have a new
+      leading dimension of size `num_steps`.
+    """
+    with ops.device(self._worker):
+      steps = [
+          self._format_data_list_with_options(self._iterator.get_next())
+          for _ in range(num_steps)
+      ]
+    result = []
+    for device_index, device in enumerate(self._devices):
+      with ops.device(device):
+        result.append(
+            nest.map_structure(
+                _stack_steps,
+                *[step[device_index] for step in steps]))
+    return result
+
 
 class _SingleWorkerDatasetIteratorSpec(type_spec.TypeSpec):
   """Type specification for `_SingleWorkerOwnedDatasetIterator`."""
@@ -1756,6 +1841,40 @@ def _should_use_multi_device_iterator(options):
   return False
 
 
+def double_buffered_input_options(num_steps, input_options=None):
+  """Returns `InputOptions` that double-buffer input for `get_next_many`.
+
+  The returned options prefetch to the replica devices through a
+  `MultiDeviceIterator` with room for `2 * num_steps` elements per replica,
+  so the host-to-device copies of the next `get_next_many(num_steps)` call
+  overlap with the computation on the current one.
+
+  Args:
+    num_steps: Python `int`, the `num_steps` later passed to `get_next_many`.
+    input_options: Optional `tf.distribute.InputOptions` to start from.
+
+  Returns:
+    A `tf.distribute.InputOptions`.
+  """
+  if input_options is None:
+    input_options = distribute_lib.InputOptions()
+  if input_options.experimental_place_dataset_on_device:
+    raise ValueError("Double buffering requires the dataset to be placed on "
+                     "the host; `experimental_place_dataset_on_device` must "
+                     "be False.")
+  return input_options._replace(
+      experimental_fetch_to_device=True,
+      experimental_per_replica_buffer_size=2 * num_steps)
+
+
+def _stack_steps(*values):
+  """Stacks one component across the steps fetched by `get_next_many`."""
+  if not all(isinstance(v, tensor_lib.Tensor) for v in values):
+    raise ValueError("get_next_many() only supports dense Tensor components. "
+                     f"Received: {type(values[0]).__name__}")
+  return array_ops_stack.stack(values)
+
+
 class MultiStepContext(object):
   """A context object that can be used to capture things when running steps.
 
@@ -15,6 +15,7 @@
 """Tests for the input_lib library."""
 
 import collections
+import time
 
 from absl.testing import parameterized
 import numpy as np
@@ -54,6 +55,7 @@ from tensorflow.python.ops import control_flow_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import sparse_ops
 from tensorflow.python.ops import variables
+from tensorflow.python.ops import while_loop
 from tensorflow.python.ops.ragged import ragged_tensor as ragged_tensor_lib
 from tensorflow.python.util import nest
 
@@ -2014,5 +2016,130 @@ class DistributedIteratorTfDataServiceTest(DistributedIteratorTestBase,
     self.assertCountEqual(
         num_workers * [expect_component for _ in range(1, 10)], results)
 
+
+class GetNextManyTest(test.TestCase, parameterized.TestCase):
+
+  @combinations.generate(
+      combinations.combine(
+          mode=["eager"],
+          double_buffered=[True, False],
+          distribution=[
+              strategy_combinations.one_device_strategy,
+              strategy_combinations.mirrored_strategy_with_two_cpus,
+              strategy_combinations.mirrored_strategy_with_gpu_and_cpu,
+          ]))
+  def testGetNextMany(self, distribution, double_buffered):
+    num_replicas = distribution.num_replicas_in_sync
+    dataset = dataset_ops.Dataset.range(12 * num_replicas).batch(
+        num_replicas, drop_remainder=True)
+    input_options = None
+    if double_buffered:
+      input_options = input_lib.double_buffered_input_options(3)
+    iterator = iter(
+        distribution.experimental_distribute_dataset(dataset, input_options))
+
+    for start in (0, 3):
+      local_results = distribution.experimental_local_results(
+          iterator.get_next_many(3))
+      self.assertLen(local_results, num_replicas)
+      for replica_id, result in enumerate(local_results):
+        self.assertAllEqual(
+            result,
+            [[(start + step) * num_replicas + replica_id]
+             for step in range(3)])
+
+    # Single-step iteration continues where the multi-step fetch stopped.
+    next_local = distribution.experimental_local_results(next(iterator))
+    self.assertAllEqual(next_local[0], [6 * num_replicas])
+
+  @combinations.generate(
+      combinations.combine(
+          mode=["eager"],
+          distribution=[strategy_combinations.mirrored_strategy_with_two_cpus]))
+  def testGetNextManyInWhileLoop(self, distribution):
+    dataset = dataset_ops.Dataset.from_tensors(
+        constant_op.constant([1., 2.])).repeat().batch(2)
+    iterator = iter(distribution.experimental_distribute_dataset(
+        dataset, input_lib.double_buffered_input_options(4)))
+
+    @def_function.function
+    def run_steps(iterator):
+
+      def replica_fn(inputs):
+
+        def body(i, total):
+          return i + 1, total + math_ops.reduce_sum(inputs[i])
+
+        return while_loop.while_loop(
+            lambda i, _: i < 4, body, [0, constant_op.constant(0.)])[1]
+
+      return distribution.run(replica_fn, args=(iterator.get_next_many(4),))
+
+    for result in distribution.experimental_local_results(run_steps(iterator)):
+      self.assertAllClose(result, 12.)
+
+  @combinations.generate(
+      combinations.combine(
+          mode=["eager"],
+          distribution=[strategy_combinations.one_device_strategy]))
+  def testGetNextManyErrors(self, distribution):
+    dataset = dataset_ops.Dataset.range(4).batch(1)
+    iterator = iter(distribution.experimental_distribute_dataset(dataset))
+    with self.assertRaisesRegex(ValueError, "positive Python integer"):
+      iterator.get_next_many(0)
+    with self.assertRaises(errors.OutOfRangeError):
+      iterator.get_next_many(5)
+    with self.assertRaisesRegex(ValueError, "placed on the host"):
+      input_lib.double_buffered_input_options(
+          2,
+          distribute_lib.InputOptions(
+              experimental_place_dataset_on_device=True))
+
+
+class GetNextManyBenchmark(test.Benchmark):
+  """Compares per-step input overhead of `next()` and `get_next_many()`."""
+
+  def _run_and_report(self, num_steps, steps_per_fetch, double_buffered):
+    distribution = strategy_combinations.mirrored_strategy_with_two_cpus
+    distribution = distribution.strategy
+    dataset = dataset_ops.Dataset.from_tensors(
+        array_ops.ones([2, 32])).repeat()
+    input_options = None
+    if double_buffered:
+      input_options = input_lib.double_buffered_input_options(steps_per_fetch)
+    iterator = iter(
+        distribution.experimental_distribute_dataset(dataset, input_options))
+
+    @def_function.function
+    def fetch(iterator):
+      if steps_per_fetch == 1:
+        return distribution.run(math_ops.reduce_sum, args=(next(iterator),))
+      return distribution.run(
+          math_ops.reduce_sum, args=(iterator.get_next_many(steps_per_fetch),))
+
+    fetch(iterator)  # Warm up and trace.
+    num_fetches = num_steps // steps_per_fetch
+    start = time.time()
+    for _ in range(num_fetches):
+      fetch(iterator)
+    wall_time = (time.time() - start) / (num_fetches * steps_per_fetch)
+    self.report_benchmark(
+        iters=num_fetches * steps_per_fetch,
+        wall_time=wall_time,
+        name="steps_per_fetch_%d%s" % (
+            steps_per_fetch, "_double_buffered" if double_buffered else ""))
+
+  def benchmark_next(self):
+    self._run_and_report(1000, 1, double_buffered=False)
+
+  def benchmark_get_next_many(self):
+    for steps_per_fetch in (10, 100):
+      self._run_and_report(1000, steps_per_fetch, double_buffered=False)
+
+  def benchmark_get_next_many_double_buffered(self):
+    for steps_per_fetch in (10, 100):
+      self._run_and_report(1000, steps_per_fetch, double_buffered=True)
+
+
 if __name__ == "__main__":
   test_util.main()
@@ -239,6 +239,165 @@ class MaxSizePartitioner(Partitioner):
     )(shape, dtype)
 
 
+@tf_export('distribute.experimental.partitioners.LoadAwarePartitioner', v1=[])
+class LoadAwarePartitioner(Partitioner):
+  """Partitioner that balances observed access load rather than bytes.
+
+  Byte-based partitioners give every shard the same number of rows. When some
+  rows are read or updated far more often than others (e.g. the head of an
+  embedding vocabulary), the parameter servers holding those rows become hot.
+  This partitioner records how often each shard of an existing
+  `ShardedVariable` was accessed and proposes new shard boundaries such that
+  every shard receives roughly the same number of accesses. Access density is
+  assumed to be uniform within each observed shard.
+
+  Without any recorded accesses it falls back to an even "div" split, which is
+  the layout produced by `FixedShardsPartitioner`.
+
+  Examples:
+
+  >>> partitioner = LoadAwarePartitioner(num_shards=2)
+  >>> partitioner.record_accesses(shard_sizes=[4, 4], access_counts=[30, 10])
+  >>> partitioner.shard_sizes(tf.TensorShape([8, 1]))
+  [3, 5]
+
+  The resulting layout can be applied to a live `ShardedVariable` with
+  `reshard_variable`.
+  """
+
+  def __init__(self, num_shards, min_rows_per_shard=1):
+    """Creates a new `LoadAwarePartitioner`.
+
+    Args:
+      num_shards: `int`, number of shards to partition.
+      min_rows_per_shard: `int`, lower bound on the number of rows each shard
+        is given regardless of load. Defaults to 1.
+    """
+    if num_shards < 1:
+      raise ValueError(
+          f'Argument `num_shards` must be positive. Received: {num_shards}'
+      )
+    if min_rows_per_shard < 1:
+      raise ValueError(
+          'Argument `min_rows_per_shard` must be positive. '
+          f'Received: {min_rows_per_shard}'
+      )
+    self._num_shards = num_shards
+    self._min_rows_per_shard = min_rows_per_shard
+    self._observed_sizes = None
+    self._observed_counts = None
+
+  def record_accesses(self, shard_sizes, access_counts):
+    """Accumulates per-shard access counts observed on the current layout.
+
+    Counts recorded for a different layout than the previously recorded one
+    replace the previous observations.
+
+    Args:
+      shard_sizes: Sequence of `int`, number of rows in each current shard.
+      access_counts: Sequence of numbers, how many times each current shard
+        was accessed (e.g. as returned by `shard_access_counts`).
+    """
+    shard_sizes = np.asarray(shard_sizes, dtype=np.int64)
+    access_counts = np.asarray(access_counts, dtype=np.float64)
+    if shard_sizes.shape != access_counts.shape or shard_sizes.ndim != 1:
+      raise ValueError(
+          'Arguments `shard_sizes` and `access_counts` must be 1D and have the '
+          f'same length. Received: {shard_sizes} and {access_counts}'
+      )
+    if np.any(shard_sizes < 1) or np.any(access_counts < 0):
+      raise ValueError(
+          'Shard sizes must be positive and access counts non-negative. '
+          f'Received: {shard_sizes} and {access_counts}'
+      )
+    if self._observed_sizes is not None and np.array_equal(
+        self._observed_sizes, shard_sizes
+    ):
+      self._observed_counts = self._observed_counts + access_counts
+    else:
+      self._observed_sizes = shard_sizes
+      self._observed_counts = access_counts
+
+  def reset(self):
+    """Discards all recorded access counts."""
+    self._observed_sizes = None
+    self._observed_counts = None
+
+  def __call__(self, shape, dtype, axis=0):
+    del dtype
+    result = [1] * len(shape)
+    result[axis] = min(self._num_shards, shape.dims[axis].value)
+    return result
+
+  def shard_sizes(self, shape, axis=0):
+    """Returns the number of rows of each shard along `axis`.
+
+    Args:
+      shape: a `tf.TensorShape`, the full shape of the variable.
+      axis: The axis to partition along. Default: outermost axis.
+
+    Returns:
+      A list of `int` with one entry per shard, summing to `shape[axis]`.
+    """
+    total_rows = int(shape.dims[axis].value)
+    num_shards = min(self._num_shards, total_rows)
+    if (
+        self._observed_sizes is None
+        or int(np.sum(self._observed_sizes)) != total_rows
+        or np.sum(self._observed_counts) == 0
+    ):
+      base, extra = divmod(total_rows, num_shards)
+      return [base + 1] * extra + [base] * (num_shards - extra)
+
+    # The cumulative load is piecewise linear in the row index, so the row at
+    # which it crosses each multiple of `total_load / num_shards` can be found
+    # exactly by interpolating within the observed shard containing it.
+    row_boundaries = np.concatenate([[0], np.cumsum(self._observed_sizes)])
+    load_boundaries = np.concatenate([[0.], np.cumsum(self._observed_counts)])
+    targets = load_boundaries[-1] * np.arange(1, num_shards) / num_shards
+    # Index of the first boundary whose cumulative load reaches each target;
+    # the segment ending there always carries a non-zero load.
+    seg_end = np.searchsorted(load_boundaries, targets, side='left')
+    seg_start = seg_end - 1
+    fraction = (targets - load_boundaries[seg_start]) / (
+        load_boundaries[seg_end] - load_boundaries[seg_start]
+    )
+    cuts = row_boundaries[seg_start] + fraction * (
+        row_boundaries[seg_end] - row_boundaries[seg_start]
+    )
+    cuts = np.rint(cuts).astype(np.int64)
+
+    # Enforce the minimum shard size from both ends so boundaries stay valid.
+    min_rows = min(self._min_rows_per_shard, total_rows // num_shards)
+    for i in range(num_shards - 1):
+      lower = (cuts[i - 1] if i > 0 else 0) + min_rows
+      upper = total_rows - (num_shards - 1 - i) * min_rows
+      cuts[i] = min(max(cuts[i], lower), upper)
+    boundaries = np.concatenate([[0], cuts, [total_rows]])
+    return [int(size) for size in np.diff(boundaries)]
+
+
+def shard_access_counts(variable, ids):
+  """Counts how many of `ids` fall into each shard of `variable`.
+
+  This is intended to be fed from the ids seen by embedding lookups during
+  training and passed to `LoadAwarePartitioner.record_accesses`.
+
+  Args:
+    variable: A `ShardedVariable`.
+    ids: A 1D integer array-like or eager `Tensor` of row ids along axis 0.
+
+  Returns:
+    A numpy `int64` array with the number of ids that fall into each shard.
+  """
+  if isinstance(ids, tensor_lib.Tensor):
+    ids = ids.numpy()
+  ids = np.asarray(ids, dtype=np.int64).reshape([-1])
+  shard_starts = [offset[0] for offset in variable._var_offsets]  # pylint: disable=protected-access
+  assignment = np.searchsorted(shard_starts, ids, side='right') - 1
+  return np.bincount(assignment, minlength=len(shard_starts)).astype(np.int64)
+
+
 class ShardedVariableSpec(type_spec.TypeSpec):
   """Type specification for a `ShardedVariable`."""
 
@@ -602,6 +761,14 @@ class ShardedVariableMixin(trackable.Trackable):
       )
     return self
 
+  def _is_div_sharded(self):
+    """Whether the shards follow the "div" layout of `embedding_lookup`."""
+    base, extra = divmod(self._shape[0], len(self._variables))
+    expect_first_dim = [base + 1] * extra + [base] * (
+        len(self._variables) - extra
+    )
+    return expect_first_dim == [v.shape[0] for v in self._variables]
+
   def _decompose_indices(self, indices):
     """Decompose a global 1D indices into a list of per-variable indices."""
     if indices.shape.rank != 1:
@@ -610,20 +777,26 @@ class ShardedVariableMixin(trackable.Trackable):
           f'Received shape: {indices.shape}'
       )
 
+    if not self._is_div_sharded():
+      # Uneven layouts, e.g. produced by `reshard_variable`, are routed by the
+      # actual offset of each shard.
+      shard_starts = constant_op.constant(
+          [offset[0] for offset in self._var_offsets], dtype=indices.dtype
+      )
+      partition_assignments = (
+          array_ops.searchsorted(shard_starts, indices, side='right') - 1
+      )
+      local_indices = indices - array_ops.gather(
+          shard_starts, partition_assignments
+      )
+      per_var_indices = data_flow_ops.dynamic_partition(
+          local_indices, partition_assignments, len(self._variables)
+      )
+      return per_var_indices, partition_assignments
+
     base = self._shape[0] // len(self._variables)
     extra = self._shape[0] % len(self._variables)
 
-    # Assert that sharding conforms to "div" sharding
-    expect_first_dim = [base] * len(self._variables)
-    for i in range(extra):
-      expect_first_dim[i] = expect_first_dim[i] + 1
-    actual_first_dim = [v.shape.as_list()[0] for v in self._variables]
-    if expect_first_dim != actual_first_dim:
-      raise NotImplementedError(
-          'scater_xxx ops are not supported in ShardedVariale that does not '
-          'conform to "div" sharding'
-      )
-
     # For index that falls into the partition that has extra 1, assignment is
     # `index // (base + 1)` (no less than `(indices - extra) // base`)
     # For index that falls into the partition that doesn't has extra 1,
@@ -948,6 +1121,96 @@ class ShardedVariable(ShardedVariableMixin, composite_tensor.CompositeTensor):
       object_map[self] = new_var
 
 
+def reshard_variable(variable, shard_sizes=None, partitioner=None,
+                     devices=None):
+  """Copies `variable` into a new `ShardedVariable` with a different layout.
+
+  Each new shard is initialized by reading only the overlapping rows of the
+  existing shards, so no full copy of the variable is materialized. The result
+  keeps the name of `variable`, and since `ShardedVariable` checkpoints are
+  saved as slices of one full variable, checkpoints written before resharding
+  restore into the new layout and vice versa.
+
+  This must be called outside of a `ParameterServerStrategy` scope, otherwise
+  the strategy would partition each new shard again. The caller is responsible
+  for swapping the returned variable in for the old one (e.g. on the owning
+  layer and optimizer) and for releasing the old shards.
+
+  Example:
+
+  ```python
+  partitioner = LoadAwarePartitioner(num_shards=3)
+  partitioner.record_accesses(
+      [v.shape[0] for v in embedding.variables],
+      shard_access_counts(embedding, seen_ids))
+  embedding = reshard_variable(
+      embedding, partitioner=partitioner,
+      devices=['/job:ps/task:0', '/job:ps/task:1', '/job:ps/task:2'])
+  ```
+
+  Args:
+    variable: The `ShardedVariable` to reshard.
+    shard_sizes: Optional sequence of `int`, the number of rows of each new
+      shard. Must sum to `variable.shape[0]`.
+    partitioner: Optional `Partitioner` used to compute the new layout when
+      `shard_sizes` is not given. A `LoadAwarePartitioner` contributes its
+      load-balanced boundaries; other partitioners are split evenly into the
+      number of shards they return.
+    devices: Optional sequence of device strings, one per new shard. Defaults
+      to reusing the devices of the existing shards round-robin.
+
+  Returns:
+    A new `ShardedVariable` holding the same values as `variable`.
+
+  Raises:
+    ValueError: If the requested layout is invalid.
+  """
+  if (shard_sizes is None) == (partitioner is None):
+    raise ValueError(
+        'Exactly one of `shard_sizes` and `partitioner` must be specified.'
+    )
+  shape = variable.shape
+  if shard_sizes is None:
+    if isinstance(partitioner, LoadAwarePartitioner):
+      shard_sizes = partitioner.shard_sizes(shape)
+    else:
+      num_shards = partitioner(shape, variable.dtype)[0]
+      base, extra = divmod(int(shape[0]), num_shards)
+      shard_sizes = [base + 1] * extra + [base] * (num_shards - extra)
+  shard_sizes = [int(size) for size in shard_sizes]
+  if any(size < 1 for size in shard_sizes) or sum(shard_sizes) != shape[0]:
+    raise ValueError(
+        'Shard sizes must be positive and sum to the size of the first axis '
+        f'{shape[0]}. Received: {shard_sizes}'
+    )
+  old_variables = variable.variables
+  if devices is None:
+    devices = [
+        old_variables[i % len(old_variables)].device
+        for i in range(len(shard_sizes))
+    ]
+  if len(devices) != len(shard_sizes):
+    raise ValueError(
+        'Argument `devices` must have one entry per shard. '
+        f'Received {len(devices)} devices for {len(shard_sizes)} shards.'
+    )
+
+  new_variables = []
+  start = 0
+  for i, (size, device) in enumerate(zip(shard_sizes, devices)):
+    with ops.device(device):
+      new_variables.append(
+          variables_lib.Variable(
+              initial_value=variable[start:start + size],
+              trainable=old_variables[0].trainable,
+              name='{}/part_{}'.format(variable.name, i),
+              dtype=variable.dtype,
+          )
+      )
+    start += size
+  return ShardedVariable(new_variables, name=variable.name)
+
+
 def _var_to_tensor(var, dtype=None, name=None, as_ref=False):
   """Converts a `ShardedVariable` to a `Tensor`."""
   del name
@@ -1002,6 +1265,8 @@ def embedding_lookup(
 ):
   if isinstance(params, list):
     params = params[0]
+  if not params._is_div_sharded():  # pylint: disable=protected-access
+    return _embedding_lookup_by_offsets(params, ids, name, max_norm)
   return embedding_ops.embedding_lookup(
       params.variables,
       ids,
@@ -1012,6 +1277,41 @@ def embedding_lookup(
   )
 
 
+def _embedding_lookup_by_offsets(params, ids, name=None, max_norm=None):
+  """Looks up `ids` in a `ShardedVariable` with an uneven shard layout.
+
+  `embedding_ops.embedding_lookup` assumes that every shard holds the same
+  number of rows (up to one), so ids are routed by the actual shard offsets
+  here instead. `partition_strategy` does not apply since the layout of the
+  `ShardedVariable` already determines which shard holds each row.
+  """
+  with ops.name_scope(name, 'embedding_lookup', [ids]) as name:
+    ids = ops.convert_to_tensor(ids, name='ids')
+    flat_ids = array_ops.reshape(ids, [-1])
+    per_var_ids, partition_assignments = params._decompose_indices(flat_ids)  # pylint: disable=protected-access
+    original_indices = data_flow_ops.dynamic_partition(
+        math_ops.range(array_ops.size(flat_ids)),
+        partition_assignments,
+        len(params.variables),
+    )
+    partitioned_result = [
+        array_ops.gather(v, var_ids)
+        for v, var_ids in zip(params.variables, per_var_ids)
+    ]
+    ret = data_flow_ops.parallel_dynamic_stitch(
+        original_indices, partitioned_result
+    )
+    ret = array_ops.reshape(
+        ret,
+        array_ops.concat(
+            [array_ops.shape(ids), params.shape[1:].as_list()], axis=0
+        ),
+        name=name,
+    )
+    ret.set_shape(ids.shape.concatenate(params.shape[1:]))
+    return embedding_ops._clip(ret, ids, max_norm)  # pylint: disable=protected-access
+
+
 # Separately override safe_embedding_lookup_sparse, to avoid conversion of
 # ShardedVariable to tensor.
 @dispatch.dispatch_for_api(embedding_ops.safe_embedding_lookup_sparse)
@@ -1027,6 +1327,20 @@ def safe_embedding_lookup_sparse(
     allow_fast_lookup=False,
 ):
   """Pass the individual shard variables as a list."""
+  if not embedding_weights._is_div_sharded():  # pylint: disable=protected-access
+    # Keep the `ShardedVariable` intact so that the inner `embedding_lookup`
+    # dispatches to `_embedding_lookup_by_offsets`.
+    return embedding_ops.safe_embedding_lookup_sparse(
+        [embedding_weights],
+        sparse_ids,
+        sparse_weights=sparse_weights,
+        combiner=combiner,
+        default_id=default_id,
+        name=name,
+        partition_strategy=partition_strategy,
+        max_norm=max_norm,
+        allow_fast_lookup=allow_fast_lookup,
+    )
   return embedding_ops.safe_embedding_lookup_sparse(
       embedding_weights.variables,
       sparse_ids,
@@ -113,6 +113,37 @@ class PartitionerTest(test.TestCase):
     got = partitioner(tensor_shape.TensorShape([6, 1]), dtypes.float32)
     self.assertAllEqual(got, [1, 1])
 
+  def test_load_aware_partitioner(self):
+    partitioner = sharded_variable.LoadAwarePartitioner(num_shards=2)
+    shape = tensor_shape.TensorShape([8, 1])
+    self.assertAllEqual(partitioner(shape, dtypes.float32), [2, 1])
+    # Without observations the layout is an even split.
+    self.assertAllEqual(partitioner.shard_sizes(shape), [4, 4])
+
+    partitioner.record_accesses(shard_sizes=[4, 4], access_counts=[30, 10])
+    self.assertAllEqual(partitioner.shard_sizes(shape), [3, 5])
+    # Counts on the same layout accumulate.
+    partitioner.record_accesses(shard_sizes=[4, 4], access_counts=[0, 20])
+    self.assertAllEqual(partitioner.shard_sizes(shape), [4, 4])
+
+    partitioner.reset()
+    partitioner.record_accesses(shard_sizes=[2, 6], access_counts=[0, 60])
+    self.assertAllEqual(partitioner.shard_sizes(shape), [5, 3])
+
+  def test_load_aware_partitioner_min_rows(self):
+    partitioner = sharded_variable.LoadAwarePartitioner(
+        num_shards=3, min_rows_per_shard=2)
+    partitioner.record_accesses(shard_sizes=[1, 9], access_counts=[100, 0])
+    self.assertAllEqual(
+        partitioner.shard_sizes(tensor_shape.TensorShape([10])), [2, 2, 6])
+
+  def test_load_aware_partitioner_validation(self):
+    with self.assertRaisesRegex(ValueError, 'num_shards'):
+      sharded_variable.LoadAwarePartitioner(num_shards=0)
+    partitioner = sharded_variable.LoadAwarePartitioner(num_shards=2)
+    with self.assertRaisesRegex(ValueError, 'same length'):
+      partitioner.record_accesses(shard_sizes=[1, 2], access_counts=[1])
+
 
 class ShardedVariableTest(test.TestCase, parameterized.TestCase):
 
@@ -694,6 +725,100 @@ class ShardedVariableTest(test.TestCase, parameterized.TestCase):
       self.assertTrue(hasattr(v, '_sharded_container'))
       self.assertIs(v._sharded_container(), sv1)
 
+  def test_shard_access_counts(self):
+    s = sharded_variable.ShardedVariable([
+        variables_lib.Variable([0, 1, 2]),
+        variables_lib.Variable([3, 4]),
+        variables_lib.Variable([5]),
+    ])
+    self.assertAllEqual(
+        sharded_variable.shard_access_counts(s, [0, 2, 3, 5, 5, 1]), [3, 1, 2])
+
+  def test_reshard_variable(self):
+    fname = os.path.join(self.get_temp_dir(), 'checkpoint')
+    s = sharded_variable.ShardedVariable([
+        variables_lib.Variable([[0], [1], [2]]),
+        variables_lib.Variable([[3], [4], [5]]),
+    ], name='s')
+    self.evaluate(variables_lib.global_variables_initializer())
+    util.Checkpoint(s=s).write(fname)
+
+    resharded = sharded_variable.reshard_variable(s, shard_sizes=[1, 2, 3])
+    self.evaluate(variables_lib.global_variables_initializer())
+    self.assertEqual(resharded.name, 's')
+    self.assertLen(resharded.variables, 3)
+    self.assertAllEqual(self.evaluate(resharded.variables[0]), [[0]])
+    self.assertAllEqual(self.evaluate(resharded.variables[1]), [[1], [2]])
+    self.assertAllEqual(self.evaluate(resharded.variables[2]), [[3], [4], [5]])
+
+    # Checkpoints written with the old layout restore into the new one.
+    self.evaluate(resharded.assign(array_ops.zeros([6, 1], dtypes.int32)))
+    util.Checkpoint(s=resharded).restore(fname)
+    self.assertAllEqual(
+        self.evaluate(ops.convert_to_tensor(resharded)),
+        [[0], [1], [2], [3], [4], [5]])
+
+  def test_reshard_variable_with_partitioner(self):
+    s = sharded_variable.ShardedVariable([
+        variables_lib.Variable([0, 1, 2, 3]),
+        variables_lib.Variable([4, 5, 6, 7]),
+    ])
+    self.evaluate(variables_lib.global_variables_initializer())
+    partitioner = sharded_variable.LoadAwarePartitioner(num_shards=2)
+    partitioner.record_accesses(
+        [4, 4], sharded_variable.shard_access_counts(s, [0, 0, 1, 2, 6]))
+    resharded = sharded_variable.reshard_variable(s, partitioner=partitioner)
+    self.evaluate(variables_lib.global_variables_initializer())
+    self.assertAllEqual(self.evaluate(resharded.variables[0]), [0, 1])
+    self.assertAllEqual(
+        self.evaluate(resharded.variables[1]), [2, 3, 4, 5, 6, 7])
+
+    resharded = sharded_variable.reshard_variable(
+        s, partitioner=sharded_variable.FixedShardsPartitioner(3))
+    self.evaluate(variables_lib.global_variables_initializer())
+    self.assertEqual([v.shape[0] for v in resharded.variables], [3, 3, 2])
+
+    with self.assertRaisesRegex(ValueError, 'sum to the size'):
+      sharded_variable.reshard_variable(s, shard_sizes=[3, 3])
+    with self.assertRaisesRegex(ValueError, 'Exactly one'):
+      sharded_variable.reshard_variable(s)
+
+  def test_lookup_after_uneven_reshard(self):
+    s = sharded_variable.ShardedVariable([
+        variables_lib.Variable([[0.], [1.], [2.], [3.]]),
+        variables_lib.Variable([[4.], [5.], [6.], [7.]]),
+    ])
+    self.evaluate(variables_lib.global_variables_initializer())
+    resharded = sharded_variable.reshard_variable(s, shard_sizes=[3, 5])
+    self.evaluate(variables_lib.global_variables_initializer())
+
+    @def_function.function
+    def lookup(ids):
+      return embedding_ops.embedding_lookup_v2(resharded, ids)
+
+    @def_function.function
+    def safe_sparse_lookup():
+      sp_ids = sparse_tensor.SparseTensor(
+          indices=[[0, 0], [0, 1], [1, 0]],
+          values=[2, 3, 7],
+          dense_shape=[2, 2])
+      return embedding_ops.safe_embedding_lookup_sparse_v2(
+          resharded, sp_ids, None, combiner='sum')
+
+    ids = constant_op.constant([[2, 3], [7, 0]])
+    self.assertAllEqual(
+        self.evaluate(lookup(ids)), [[[2.], [3.]], [[7.], [0.]]])
+    self.assertAllEqual(self.evaluate(safe_sparse_lookup()), [[5.], [7.]])
+    self.assertAllEqual(
+        self.evaluate(resharded.sparse_read(constant_op.constant([7, 2, 3]))),
+        [[7.], [2.], [3.]])
+    # Each shard is gathered from directly instead of the concatenated value.
+    op_types = [
+        op.type
+        for op in lookup.get_concrete_function(ids).graph.get_operations()
+    ]
+    self.assertEqual(op_types.count('ResourceGather'), 2)
+
   def test_numpy(self):
     v1 = [
         variables_lib.Variable([1.]),
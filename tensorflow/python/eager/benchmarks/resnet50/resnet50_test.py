@@ -260,9 +260,10 @@ class MockIterator(object):
 class ResNet50Benchmarks(tf.test.Benchmark):
 
   def _report(self, label, start, num_iters, device, batch_size, data_format,
-              num_replicas=1):
-    resnet50_test_util.report(self, label, start, num_iters, device, batch_size,
-                              data_format, num_replicas)
+              num_replicas=1, extras=None):
+    return resnet50_test_util.report(self, label, start, num_iters, device,
+                                     batch_size, data_format, num_replicas,
+                                     extras)
 
   def _train_batch_sizes(self):
     """Choose batch sizes based on GPU capability."""
@@ -341,7 +342,27 @@ class ResNet50Benchmarks(tf.test.Benchmark):
                              make_iterator,
                              device_and_format,
                              defun=False,
-                             execution_mode=None):
+                             execution_mode=None,
+                             baseline_times=None,
+                             target_overhead=None):
+    """Benchmarks training steps for each batch size.
+
+    Args:
+      label: Label of the benchmark.
+      make_iterator: Callable creating an iterator over the batches.
+      device_and_format: Tuple of the device and the data format.
+      defun: Whether to run the model and the updates in `tf.function`s.
+      execution_mode: Optional eager execution mode.
+      baseline_times: Optional dict from batch size to the average time of a
+        step of a baseline run. The relative overhead over it is reported in
+        the extras as `overhead`.
+      target_overhead: Optional target of the relative overhead, reported in
+        the extras as `target_overhead` along with whether it is met.
+
+    Returns:
+      A dict from batch size to the average time of a step.
+    """
+    times = {}
     with context.execution_mode(execution_mode):
       device, data_format = device_and_format
       for batch_size in self._train_batch_sizes():
@@ -377,7 +398,18 @@ class ResNet50Benchmarks(tf.test.Benchmark):
           if execution_mode:
             context.async_wait()
           self._force_device_sync()
-          self._report(label, start, num_iters, device, batch_size, data_format)
+          extras = {}
+          if baseline_times and batch_size in baseline_times:
+            overhead = (time.time() - start) / num_iters / baseline_times[
+                batch_size] - 1
+            extras['overhead'] = overhead
+            if target_overhead is not None:
+              extras['target_overhead'] = target_overhead
+              extras['meets_target_overhead'] = overhead <= target_overhead
+          times[batch_size] = self._report(label, start, num_iters, device,
+                                           batch_size, data_format,
+                                           extras=extras)
+    return times
 
   def benchmark_eager_train_sync(self):
     self._benchmark_eager_train(
@@ -397,6 +429,39 @@ class ResNet50Benchmarks(tf.test.Benchmark):
         'eager_train_with_defun', MockIterator,
         resnet50_test_util.device_and_data_format(), defun=True)
 
+  def _benchmark_eager_train_with_check_numerics(self, label, fused):
+    """Benchmark training with `tf.debugging.enable_check_numerics()`.
+
+    The overhead is measured against the same training steps without checks,
+    run first in the same process as `<label>_baseline`, and reported in the
+    extras. The target for the fused mode is to stay within 10% of the
+    baseline, so that it can be left on in production, whereas the per-op
+    checks cost 2-5x.
+
+    Args:
+      label: Label of the benchmark.
+      fused: Whether to use the fused numerics checks.
+    """
+    device_and_format = resnet50_test_util.device_and_data_format()
+    baseline_times = self._benchmark_eager_train(
+        label + '_baseline', MockIterator, device_and_format, defun=True)
+    tf.debugging.enable_check_numerics(fused=fused)
+    try:
+      self._benchmark_eager_train(
+          label, MockIterator, device_and_format, defun=True,
+          baseline_times=baseline_times,
+          target_overhead=0.1 if fused else None)
+    finally:
+      tf.debugging.disable_check_numerics()
+
+  def benchmark_eager_train_with_defun_check_numerics(self):
+    self._benchmark_eager_train_with_check_numerics(
+        'eager_train_with_defun_check_numerics', fused=False)
+
+  def benchmark_eager_train_with_defun_fused_check_numerics(self):
+    self._benchmark_eager_train_with_check_numerics(
+        'eager_train_with_defun_fused_check_numerics', fused=True)
+
   def benchmark_eager_train_datasets(self):
 
     def make_iterator(tensors):
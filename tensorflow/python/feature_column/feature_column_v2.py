@@ -28,6 +28,7 @@ import abc
 import collections
 import math
 import re
+import zlib
 
 import numpy as np
 import six
@@ -63,6 +64,7 @@ from tensorflow.python.trackable import autotrackable
 from tensorflow.python.trackable import base as trackable
 from tensorflow.python.trackable import data_structures
 from tensorflow.python.training import checkpoint_utils
+from tensorflow.python.util import compat
 from tensorflow.python.util import deprecation
 from tensorflow.python.util import nest
 from tensorflow.python.util import tf_inspect
@@ -320,7 +322,8 @@ class _StateManagerImpl(StateManager):
     return self._cols_to_resources_map[feature_column][resource_name]
 
 
-def _transform_features_v2(features, feature_columns, state_manager):
+def _transform_features_v2(features, feature_columns, state_manager,
+                           fused=False):
   """Returns transformed features based on features columns passed in.
 
   Please note that most probably you would not need to use this function. Please
@@ -350,6 +353,9 @@ def _transform_features_v2(features, feature_columns, state_manager):
       corresponding `FeatureColumn`.
     feature_columns: An iterable containing all the `FeatureColumn`s.
     state_manager: A StateManager object that holds the FeatureColumn state.
+    fused: If True, categorical columns of the same kind are transformed
+      together (see `FeatureTransformationCache.fuse_categorical_columns`)
+      before the remaining columns are transformed one by one.
 
   Returns:
     A `dict` mapping `FeatureColumn` to `Tensor` and `SparseTensor` values.
@@ -359,6 +365,9 @@ def _transform_features_v2(features, feature_columns, state_manager):
   with ops.name_scope(
       None, default_name='transform_features', values=features.values()):
     transformation_cache = FeatureTransformationCache(features)
+    if fused:
+      transformation_cache.fuse_categorical_columns(feature_columns,
+                                                    state_manager)
     for column in feature_columns:
       with ops.name_scope(
           None,
@@ -2059,6 +2068,171 @@ class FeatureTransformationCache(object):
     self._feature_tensors[column] = transformed
     return transformed
 
+  def fuse_categorical_columns(self, feature_columns, state_manager):
+    """Transforms categorical columns of the same kind together.
+
+    Models with many feature columns otherwise emit a few small ops per column.
+    This transforms `feature_columns`, and the categorical columns they depend
+    on, in groups and caches the results so that later calls to `get` return
+    them:
+
+    * `HashedCategoricalColumn`s with the same `hash_bucket_size` are hashed
+      with a single op over their concatenated values.
+    * `VocabularyListCategoricalColumn`s with the same `num_oov_buckets` share
+      a single lookup table keyed by column and value.
+
+    The transformed values are the same as when each column is transformed on
+    its own. Other columns, and groups with a single column, are left to
+    `get`.
+
+    Args:
+      feature_columns: An iterable of `FeatureColumn`s.
+      state_manager: A StateManager object that holds the FeatureColumn state.
+    """
+    hashed_columns = collections.defaultdict(list)
+    vocabulary_columns = collections.defaultdict(list)
+    seen = set()
+    to_visit = list(feature_columns)
+    while to_visit:
+      column = to_visit.pop()
+      if not isinstance(column, fc_types.FeatureColumn) or column in seen:
+        continue
+      seen.add(column)
+      if column in self._feature_tensors:
+        continue
+      # Subclasses may override the transformation, so only exact types are
+      # fused.
+      if type(column) is HashedCategoricalColumn:  # pylint: disable=unidiomatic-typecheck
+        if column.key in self._features:
+          hashed_columns[column.hash_bucket_size].append(column)
+      elif type(column) is VocabularyListCategoricalColumn:  # pylint: disable=unidiomatic-typecheck
+        if column.key in self._features:
+          vocabulary_columns[column.num_oov_buckets].append(column)
+      else:
+        to_visit.extend(column.parents)
+
+    for hash_bucket_size, columns in sorted(hashed_columns.items()):
+      if len(columns) > 1:
+        self._fuse_hashed_columns(
+            sorted(columns, key=lambda c: c.name), hash_bucket_size,
+            state_manager)
+    for num_oov_buckets, columns in sorted(vocabulary_columns.items()):
+      if len(columns) > 1:
+        self._fuse_vocabulary_list_columns(
+            sorted(columns, key=lambda c: c.name), num_oov_buckets,
+            state_manager)
+
+  def _fused_inputs(self, columns, state_manager):
+    """Returns validated sparse inputs and their values as one string tensor.
+
+    Args:
+      columns: Categorical columns with `key` and `dtype` attributes.
+      state_manager: A StateManager object that holds the FeatureColumn state.
+
+    Returns:
+      A tuple `(inputs, order, values)`, where `inputs` holds the sparse input
+      of each column, `order` the column indices in the order in which their
+      values are concatenated, and `values` the concatenated values. Integer
+      values are converted with a single `as_string` after the string values.
+    """
+    inputs = []
+    for column in columns:
+      input_tensor = _to_sparse_input_and_drop_ignore_values(
+          self.get(column.key, state_manager))
+      fc_utils.assert_string_or_int(
+          input_tensor.dtype,
+          prefix='column_name: {} input_tensor'.format(column.key))
+      if column.dtype.is_integer != input_tensor.dtype.is_integer:
+        raise ValueError(
+            'Column dtype and SparseTensors dtype must be compatible. '
+            'key: {}, column dtype: {}, tensor dtype: {}'.format(
+                column.key, column.dtype, input_tensor.dtype))
+      inputs.append(input_tensor)
+
+    string_order = [
+        i for i, t in enumerate(inputs) if t.dtype == dtypes.string]
+    int_order = [i for i, t in enumerate(inputs) if t.dtype != dtypes.string]
+    values = [inputs[i].values for i in string_order]
+    if int_order:
+      int_values = array_ops.concat(
+          [math_ops.cast(inputs[i].values, dtypes.int64) for i in int_order],
+          axis=0)
+      values.append(string_ops.as_string(int_values))
+    return inputs, string_order + int_order, array_ops.concat(values, axis=0)
+
+  def _cache_fused_ids(self, columns, inputs, order, ids):
+    """Splits fused ids and caches them as the columns' transformations."""
+    sizes = array_ops_stack.stack(
+        [array_ops.size(inputs[i].values) for i in order])
+    split_ids = array_ops.split(ids, sizes, num=len(order))
+    for i, column_ids in zip(order, split_ids):
+      self._feature_tensors[columns[i]] = sparse_tensor_lib.SparseTensor(
+          inputs[i].indices, column_ids, inputs[i].dense_shape)
+
+  def _fuse_hashed_columns(self, columns, hash_bucket_size, state_manager):
+    with ops.name_scope(None, 'fused_hash_bucket'):
+      inputs, order, values = self._fused_inputs(columns, state_manager)
+      ids = string_ops.string_to_hash_bucket_fast(
+          values, hash_bucket_size, name='lookup')
+      self._cache_fused_ids(columns, inputs, order, ids)
+
+  def _fuse_vocabulary_list_columns(self, columns, num_oov_buckets,
+                                    state_manager):
+    """Looks up all columns in a single table keyed by column and value."""
+    with ops.name_scope(None, 'fused_vocabulary_lookup'):
+      inputs, order, values = self._fused_inputs(columns, state_manager)
+
+      owner = columns[0]
+      # The resource name identifies the fused columns, since `owner` may be
+      # fused with different columns by another call.
+      name = 'fused_lookup_{:08x}'.format(
+          zlib.crc32(compat.as_bytes(','.join(c.name for c in columns))))
+      if state_manager is None or not state_manager.has_resource(owner, name):
+        keys = []
+        table_ids = []
+        for i, column in enumerate(columns):
+          for vocabulary_id, value in enumerate(column.vocabulary_list):
+            if column.dtype.is_integer:
+              value = str(int(value))
+            keys.append(b'%d\x1f' % i + compat.as_bytes(value))
+            table_ids.append(vocabulary_id)
+        with ops.init_scope():
+          table = lookup_ops.StaticHashTable(
+              lookup_ops.KeyValueTensorInitializer(
+                  keys, table_ids, key_dtype=dtypes.string,
+                  value_dtype=dtypes.int64),
+              default_value=-1,
+              name=name)
+        if state_manager is not None:
+          state_manager.add_resource(owner, name, table)
+      else:
+        table = state_manager.get_resource(owner, name)
+
+      column_indices = array_ops.repeat(
+          ops.convert_to_tensor(order, dtype=dtypes.int64),
+          array_ops_stack.stack(
+              [array_ops.size(inputs[i].values) for i in order]))
+      ids = table.lookup(
+          string_ops.string_join(
+              [string_ops.as_string(column_indices), values],
+              separator='\x1f'))
+
+      # Values missing from the vocabulary get the column's default value,
+      # or are hashed into its OOV buckets after its vocabulary.
+      if num_oov_buckets:
+        vocabulary_sizes = ops.convert_to_tensor(
+            [len(column.vocabulary_list) for column in columns],
+            dtype=dtypes.int64)
+        missing_ids = array_ops.gather(vocabulary_sizes, column_indices) + (
+            string_ops.string_to_hash_bucket_fast(values, num_oov_buckets))
+      else:
+        default_values = ops.convert_to_tensor(
+            [column.default_value for column in columns], dtype=dtypes.int64)
+        missing_ids = array_ops.gather(default_values, column_indices)
+      ids = array_ops.where_v2(
+          math_ops.greater_equal(ids, 0), ids, missing_ids)
+      self._cache_fused_ids(columns, inputs, order, ids)
+
   def _get_raw_feature_as_tensor(self, key):
     """Gets the raw_feature (keyed by `key`) as `tensor`.
 
@@ -16,6 +16,7 @@
 
 import collections
 import copy
+import time
 
 from absl.testing import parameterized
 import numpy as np
@@ -27,6 +28,7 @@ from tensorflow.core.protobuf import rewriter_config_pb2
 from tensorflow.python.client import session
 from tensorflow.python.eager import backprop
 from tensorflow.python.eager import context
+from tensorflow.python.eager import def_function
 from tensorflow.python.feature_column import feature_column as fc_old
 from tensorflow.python.feature_column import feature_column_v2 as fc
 from tensorflow.python.feature_column import feature_column_v2_types
@@ -4348,6 +4350,107 @@ class TransformFeaturesTest(test.TestCase):
       self.assertEqual(1, column2.call_order)
 
 
+class FusedTransformFeaturesTest(test.TestCase):
+
+  def _features(self):
+    return {
+        'a': sparse_tensor.SparseTensor(
+            values=['omar', 'stringer', 'marlo'],
+            indices=[[0, 0], [1, 0], [1, 1]],
+            dense_shape=[2, 2]),
+        'b': sparse_tensor.SparseTensor(
+            values=['marlo', 'skywalker'],
+            indices=[[0, 0], [1, 1]],
+            dense_shape=[2, 2]),
+        'c': constant_op.constant([[3, -1], [-1, 11]], dtype=dtypes.int64),
+        'd': sparse_tensor.SparseTensor(
+            values=[11, 12, 100],
+            indices=[[0, 0], [0, 1], [1, 0]],
+            dense_shape=[2, 2]),
+    }
+
+  def _columns(self):
+    return [
+        fc.categorical_column_with_hash_bucket('a', 10),
+        fc.categorical_column_with_hash_bucket('b', 10),
+        fc.categorical_column_with_hash_bucket('c', 10, dtype=dtypes.int64),
+        fc.categorical_column_with_hash_bucket('d', 20, dtype=dtypes.int64),
+        fc.categorical_column_with_vocabulary_list(
+            'a', vocabulary_list=('omar', 'marlo'), num_oov_buckets=3),
+        fc.categorical_column_with_vocabulary_list(
+            'b', vocabulary_list=('marlo', 'omar'), num_oov_buckets=3),
+        fc.categorical_column_with_vocabulary_list(
+            'c', vocabulary_list=(11, 3, 5), dtype=dtypes.int64,
+            default_value=7),
+        fc.categorical_column_with_vocabulary_list(
+            'd', vocabulary_list=(12, 11), dtype=dtypes.int32),
+    ]
+
+  @test_util.run_in_graph_and_eager_modes
+  def test_fused_matches_unfused(self):
+    columns = self._columns()
+    expected = fc._transform_features_v2(self._features(), columns, None)
+    actual = fc._transform_features_v2(
+        self._features(), columns, None, fused=True)
+    self.evaluate(lookup_ops.tables_initializer())
+
+    self.assertCountEqual(columns, actual.keys())
+    for column in columns:
+      expected_ids, actual_ids = self.evaluate(
+          (expected[column], actual[column]))
+      self.assertAllEqual(expected_ids.indices, actual_ids.indices)
+      self.assertAllEqual(expected_ids.values, actual_ids.values)
+      self.assertAllEqual(expected_ids.dense_shape, actual_ids.dense_shape)
+
+  @test_util.run_in_graph_and_eager_modes
+  def test_fused_nested_columns(self):
+    hashed_a = fc.categorical_column_with_hash_bucket('a', 10)
+    hashed_b = fc.categorical_column_with_hash_bucket('b', 10)
+    columns = [fc.indicator_column(hashed_a), fc.indicator_column(hashed_b)]
+    expected = fc._transform_features_v2(self._features(), columns, None)
+    actual = fc._transform_features_v2(
+        self._features(), columns, None, fused=True)
+
+    for column in columns:
+      self.assertAllEqual(*self.evaluate((expected[column], actual[column])))
+
+  def test_fused_reuses_table_from_state_manager(self):
+
+    class _ResourceStateManager(fc.StateManager):
+
+      def __init__(self):
+        self.resources = {}
+
+      def add_resource(self, feature_column, name, resource):
+        self.resources[(feature_column, name)] = resource
+
+      def has_resource(self, feature_column, name):
+        return (feature_column, name) in self.resources
+
+      def get_resource(self, feature_column, name):
+        return self.resources[(feature_column, name)]
+
+    columns = self._columns()[4:6]
+    state_manager = _ResourceStateManager()
+    fc._transform_features_v2(
+        self._features(), columns, state_manager, fused=True)
+    self.assertLen(state_manager.resources, 1)
+    table = list(state_manager.resources.values())[0]
+    fc._transform_features_v2(
+        self._features(), columns, state_manager, fused=True)
+    self.assertLen(state_manager.resources, 1)
+    self.assertIs(table, list(state_manager.resources.values())[0])
+
+  def test_fused_dtype_mismatch(self):
+    columns = [
+        fc.categorical_column_with_hash_bucket('a', 10, dtype=dtypes.int64),
+        fc.categorical_column_with_hash_bucket('c', 10, dtype=dtypes.int64),
+    ]
+    with self.assertRaisesRegex(ValueError,
+                                'dtype must be compatible'):
+      fc._transform_features_v2(self._features(), columns, None, fused=True)
+
+
 class IndicatorColumnTest(test.TestCase):
 
   def test_indicator_column(self):
@@ -6421,5 +6524,57 @@ class WeightedCategoricalColumnTest(test.TestCase):
     self.assertEqual(column, new_column)
     self.assertIs(categorical_column, new_column.categorical_column)
 
+
+class FusedTransformFeaturesBenchmark(test.Benchmark):
+  """Benchmarks fused transformation of a synthetic 300 column schema."""
+
+  def _benchmark(self, fused, num_hashed=150, num_vocabulary=150,
+                 batch_size=256, num_iters=100):
+    columns = []
+    features = {}
+    indices = [[i, 0] for i in range(batch_size)]
+    for i in range(num_hashed):
+      key = 'hashed_{}'.format(i)
+      columns.append(fc.categorical_column_with_hash_bucket(key, 1000))
+      features[key] = sparse_tensor.SparseTensor(
+          values=['value_{}'.format(j % 50) for j in range(batch_size)],
+          indices=indices,
+          dense_shape=[batch_size, 1])
+    for i in range(num_vocabulary):
+      key = 'vocabulary_{}'.format(i)
+      columns.append(
+          fc.categorical_column_with_vocabulary_list(
+              key,
+              vocabulary_list=['value_{}'.format(j) for j in range(20)],
+              num_oov_buckets=1))
+      features[key] = sparse_tensor.SparseTensor(
+          values=['value_{}'.format(j % 50) for j in range(batch_size)],
+          indices=indices,
+          dense_shape=[batch_size, 1])
+
+    @def_function.function
+    def transform():
+      outputs = fc._transform_features_v2(
+          features, columns, None, fused=fused)
+      return [outputs[column].values for column in columns]
+
+    with context.eager_mode():
+      transform()  # Warm up.
+      start = time.time()
+      for _ in range(num_iters):
+        transform()
+      wall_time = (time.time() - start) / num_iters
+    self.report_benchmark(
+        iters=num_iters,
+        wall_time=wall_time,
+        name='transform_300_columns_{}'.format('fused' if fused else 'unfused'))
+
+  def benchmark_unfused(self):
+    self._benchmark(fused=False)
+
+  def benchmark_fused(self):
+    self._benchmark(fused=True)
+
+
 if __name__ == '__main__':
   test.main()
@@ -23,6 +23,7 @@ from tensorflow.python.keras import backend_config
 from tensorflow.python.keras.optimizer_v2 import optimizer_v2
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import gen_resource_variable_ops
 from tensorflow.python.ops import gen_training_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import state_ops
@@ -60,6 +61,12 @@ class Adam(optimizer_v2.OptimizerV2):
       the paper "On the Convergence of Adam and beyond". Defaults to `False`.
     name: Optional name for the operations created when applying gradients.
       Defaults to `"Adam"`.
+    lazy: Boolean. If `True`, sparse gradients only update the moments and
+      values of the rows they touch. See the notes below. Defaults to `False`.
+    row_bias_correction: Boolean. Only used if `lazy` is `True`. If `True`, the
+      bias correction of sparse updates uses the number of updates of each row
+      rather than the global step, tracked by the `beta_1_power` and
+      `beta_2_power` slots of shape `[num_rows]`. Defaults to `False`.
     **kwargs: Keyword arguments. Allowed to be one of
       `"clipnorm"` or `"clipvalue"`.
       `"clipnorm"` (float) clips gradients by norm; `"clipvalue"` (float) clips
@@ -97,6 +104,15 @@ class Adam(optimizer_v2.OptimizerV2):
   accumulator. This means that the sparse behavior is equivalent to the dense
   behavior (in contrast to some momentum implementations which ignore momentum
   unless a variable slice was actually used).
+
+  With `lazy=True`, sparse updates instead only decay and update the moments of
+  the rows in the gradient, and only update those rows of the variable. The cost
+  of a step is then proportional to the number of touched rows rather than to
+  the size of the variable, which matters for large embedding tables, at the
+  cost of diverging from the dense behavior for rarely touched rows. Rows that
+  are touched rarely are also bias-corrected with the global step, which
+  underestimates their moments; `row_bias_correction=True` corrects each row
+  by its own number of updates instead.
   """
 
   _HAS_AGGREGATE_GRAD = True
@@ -108,6 +124,8 @@ class Adam(optimizer_v2.OptimizerV2):
                epsilon=1e-7,
                amsgrad=False,
                name='Adam',
+               lazy=False,
+               row_bias_correction=False,
                **kwargs):
     super(Adam, self).__init__(name, **kwargs)
     self._set_hyper('learning_rate', kwargs.get('lr', learning_rate))
@@ -116,6 +134,8 @@ class Adam(optimizer_v2.OptimizerV2):
     self._set_hyper('beta_2', beta_2)
     self.epsilon = epsilon or backend_config.epsilon()
     self.amsgrad = amsgrad
+    self.lazy = lazy
+    self.row_bias_correction = lazy and row_bias_correction
 
   def _create_slots(self, var_list):
     # Create slots for the first and second moments.
@@ -127,6 +147,13 @@ class Adam(optimizer_v2.OptimizerV2):
     if self.amsgrad:
       for var in var_list:
         self.add_slot(var, 'vhat')
+    if self.lazy and self.row_bias_correction:
+      # Per-row powers of beta_1 and beta_2, i.e. beta ** (number of updates
+      # of the row), which unlike update counts stay exact in any float dtype.
+      for var in var_list:
+        if var.shape.rank:
+          self.add_slot(var, 'beta_1_power', 'ones', shape=var.shape[:1])
+          self.add_slot(var, 'beta_2_power', 'ones', shape=var.shape[:1])
 
   def _prepare_local(self, var_device, var_dtype, apply_state):
     super(Adam, self)._prepare_local(var_device, var_dtype, apply_state)
@@ -159,7 +186,7 @@ class Adam(optimizer_v2.OptimizerV2):
     # even without amsgrad, i.e, V1 optimizer has 3x + 1 variables, while V2
     # optimizer has 2x + 1 variables. Filter vhats out for compatibility.
     num_vars = int((len(params) - 1) / 2)
-    if len(weights) == 3 * num_vars + 1:
+    if not self.row_bias_correction and len(weights) == 3 * num_vars + 1:
       weights = weights[:len(params)]
     super(Adam, self).set_weights(weights)
 
@@ -204,6 +231,8 @@ class Adam(optimizer_v2.OptimizerV2):
     var_device, var_dtype = var.device, var.dtype.base_dtype
     coefficients = ((apply_state or {}).get((var_device, var_dtype))
                     or self._fallback_apply_state(var_device, var_dtype))
+    if self.lazy:
+      return self._lazy_resource_apply_sparse(grad, var, indices, coefficients)
 
     # m_t = beta1 * m + (1 - beta1) * g_t
     m = self.get_slot(var, 'm')
@@ -240,6 +269,53 @@ class Adam(optimizer_v2.OptimizerV2):
           use_locking=self._use_locking)
       return control_flow_ops.group(*[var_update, m_t, v_t, v_hat_t])
 
+  def _lazy_resource_apply_sparse(self, grad, var, indices, coefficients):
+    """Updates only the rows of `var` and its slots in (unique) `indices`."""
+    update_ops = []
+
+    def scatter_update(slot, values):
+      update_ops.append(
+          gen_resource_variable_ops.ResourceScatterUpdate(
+              resource=slot.handle, indices=indices, updates=values))
+
+    m = self.get_slot(var, 'm')
+    m_t_slice = (coefficients['beta_1_t'] * array_ops.gather(m, indices) +
+                 coefficients['one_minus_beta_1_t'] * grad)
+    scatter_update(m, m_t_slice)
+
+    v = self.get_slot(var, 'v')
+    v_t_slice = (coefficients['beta_2_t'] * array_ops.gather(v, indices) +
+                 coefficients['one_minus_beta_2_t'] * math_ops.square(grad))
+    scatter_update(v, v_t_slice)
+
+    if self.amsgrad:
+      v_hat = self.get_slot(var, 'vhat')
+      v_t_slice = math_ops.maximum(array_ops.gather(v_hat, indices), v_t_slice)
+      scatter_update(v_hat, v_t_slice)
+
+    if self.row_bias_correction and var.shape.rank:
+      beta_1_power = self.get_slot(var, 'beta_1_power')
+      beta_2_power = self.get_slot(var, 'beta_2_power')
+      beta_1_power_slice = (
+          array_ops.gather(beta_1_power, indices) * coefficients['beta_1_t'])
+      beta_2_power_slice = (
+          array_ops.gather(beta_2_power, indices) * coefficients['beta_2_t'])
+      scatter_update(beta_1_power, beta_1_power_slice)
+      scatter_update(beta_2_power, beta_2_power_slice)
+      lr = (coefficients['lr_t'] * math_ops.sqrt(1 - beta_2_power_slice) /
+            (1 - beta_1_power_slice))
+      lr = array_ops.reshape(lr, [-1] + [1] * (var.shape.rank - 1))
+    else:
+      lr = coefficients['lr']
+
+    update_ops.append(
+        gen_resource_variable_ops.ResourceScatterSub(
+            resource=var.handle,
+            indices=indices,
+            updates=lr * m_t_slice / (math_ops.sqrt(v_t_slice) +
+                                      coefficients['epsilon'])))
+    return control_flow_ops.group(*update_ops)
+
   def get_config(self):
     config = super(Adam, self).get_config()
     config.update({
@@ -249,6 +325,8 @@ class Adam(optimizer_v2.OptimizerV2):
         'beta_2': self._serialize_hyperparameter('beta_2'),
         'epsilon': self.epsilon,
         'amsgrad': self.amsgrad,
+        'lazy': self.lazy,
+        'row_bias_correction': self.row_bias_correction,
     })
     return config
 
@@ -0,0 +1,141 @@
+# Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the lazy sparse updates of Adam."""
+
+import time
+
+from absl.testing import parameterized
+import numpy as np
+
+from tensorflow.python.eager import def_function
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import indexed_slices
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import test_util
+from tensorflow.python.keras.optimizer_v2 import adam
+from tensorflow.python.ops import variables
+from tensorflow.python.platform import test
+
+
+def _sparse_grad(values, indices, num_rows):
+  values = constant_op.constant(values, dtype=np.float32)
+  return indexed_slices.IndexedSlices(
+      values, constant_op.constant(indices),
+      constant_op.constant([num_rows, values.shape[1]]))
+
+
+@test_util.run_v2_only
+class LazyAdamTest(test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('GlobalBiasCorrection', False),
+      ('RowBiasCorrection', True),
+  )
+  def testLazyEqualsDenseOnRowsUpdatedEveryStep(self, row_bias_correction):
+    initial_value = np.arange(12, dtype=np.float32).reshape([4, 3])
+    lazy_var = variables.Variable(initial_value)
+    dense_var = variables.Variable(initial_value)
+    lazy_opt = adam.Adam(
+        learning_rate=0.1, lazy=True, row_bias_correction=row_bias_correction)
+    dense_opt = adam.Adam(learning_rate=0.1)
+    indices = [0, 2]
+    for step in range(3):
+      values = np.full([2, 3], step + 1.0, dtype=np.float32)
+      values[1] *= -0.5
+      grad = _sparse_grad(values, indices, 4)
+      self.evaluate(lazy_opt.apply_gradients([(grad, lazy_var)]))
+      self.evaluate(
+          dense_opt.apply_gradients([(ops.convert_to_tensor(grad), dense_var)
+                                    ]))
+
+    lazy_value, dense_value = self.evaluate([lazy_var, dense_var])
+    self.assertAllClose(dense_value[indices], lazy_value[indices])
+    self.assertNotAllClose(initial_value[indices], lazy_value[indices])
+
+  def testLazyLeavesUntouchedRowsAsIs(self):
+    var = variables.Variable(np.ones([3, 2], dtype=np.float32))
+    opt = adam.Adam(learning_rate=0.1, lazy=True)
+    self.evaluate(
+        opt.apply_gradients([(_sparse_grad([[1.0, 2.0], [3.0, 4.0]], [0, 1],
+                                           3), var)]))
+    slots = [var] + [opt.get_slot(var, name) for name in ('m', 'v')]
+    before = self.evaluate(slots)
+    for _ in range(2):
+      self.evaluate(
+          opt.apply_gradients([(_sparse_grad([[1.0, 1.0]], [0], 3), var)]))
+    after = self.evaluate(slots)
+    for before_value, after_value in zip(before, after):
+      # Row 1 keeps its value and moments, row 2 was never touched.
+      self.assertAllEqual(before_value[1:], after_value[1:])
+      self.assertNotAllClose(before_value[0], after_value[0])
+    self.assertAllEqual([1.0, 1.0], after[0][2])
+
+  def testRowPowerSlotsAreCreatedOnlyInLazyMode(self):
+    var = variables.Variable(np.ones([3, 2], dtype=np.float32))
+    grad = _sparse_grad([[1.0, 1.0]], [0], 3)
+
+    opt = adam.Adam(row_bias_correction=True)
+    self.evaluate(opt.apply_gradients([(grad, var)]))
+    self.assertEqual(['m', 'v'], opt.get_slot_names())
+
+    opt = adam.Adam(lazy=True, row_bias_correction=True)
+    self.evaluate(opt.apply_gradients([(grad, var)]))
+    self.assertEqual(['m', 'v', 'beta_1_power', 'beta_2_power'],
+                     opt.get_slot_names())
+    self.assertEqual([3], opt.get_slot(var, 'beta_1_power').shape)
+
+
+class LazyAdamBenchmark(test.Benchmark):
+  """Compares lazy and dense Adam steps on a large embedding table."""
+
+  def _benchmark_sparse_step(self, lazy, num_rows=1000000, dim=64,
+                             num_touched=1000, iters=20):
+    with ops.device('/cpu:0'):
+      var = variables.Variable(np.zeros([num_rows, dim], dtype=np.float32))
+      opt = adam.Adam(lazy=lazy)
+      indices = np.random.RandomState(0).choice(
+          num_rows, num_touched, replace=False).astype(np.int32)
+      grad = _sparse_grad(
+          np.ones([num_touched, dim], dtype=np.float32), indices, num_rows)
+
+      @def_function.function
+      def step():
+        opt.apply_gradients([(grad, var)])
+
+      # Creates the slots and traces the step.
+      step()
+      start = time.time()
+      for _ in range(iters):
+        step()
+      wall_time = (time.time() - start) / iters
+    self.report_benchmark(
+        iters=iters,
+        wall_time=wall_time,
+        name='lazy' if lazy else 'dense',
+        extras={
+            'num_rows': num_rows,
+            'dim': dim,
+            'num_touched_rows': num_touched
+        })
+
+  def benchmark_lazy_sparse_step(self):
+    self._benchmark_sparse_step(lazy=True)
+
+  def benchmark_dense_sparse_step(self):
+    self._benchmark_sparse_step(lazy=False)
+
+
+if __name__ == '__main__':
+  test.main()
@@ -708,6 +708,10 @@ class OptimizerV2(trackable.Trackable):
     eagerly_outside_functions = ops.executing_eagerly_outside_functions()
     update_ops = []
     with name_scope_only_in_function_or_graph(name or self._name):
+      # Every variable is updated by its own fused `ResourceApply*` op. Updating
+      # concatenated variables and slots would still take a split and an
+      # assign per variable and slot, i.e. more ops than this loop, since no
+      # kernel updates a list of resource variables at once.
       for grad, var in grads_and_vars:
         # Colocate the update with variables to avoid unnecessary communication
         # delays. See b/136304694.
@@ -20,6 +20,7 @@ import os
 
 import numpy as np
 
+from tensorflow.python.eager import context
 from tensorflow.python.keras import backend
 from tensorflow.python.keras import optimizer_v1
 from tensorflow.python.keras.saving import model_config as model_config_lib
@@ -40,6 +41,12 @@ except ImportError:
   h5py = None
 # pylint: enable=g-import-not-at-top
 
+# Default target size of weight dataset chunks when chunking is enabled.
+_DEFAULT_CHUNK_BYTES = 1 << 20
+# Size of the weight values read from the file before they are assigned, when
+# loading weights.
+_LOAD_BATCH_BYTES = 64 << 20
+
 # TODO(b/134426265): Switch back to single-quotes to match the rest of the file
 # once the issue with copybara is fixed.
 # pylint:disable=g-inconsistent-quotes
@@ -615,12 +622,19 @@ def load_optimizer_weights_from_hdf5_group(hdf5_group):
   return [weights_group[weight_name] for weight_name in optimizer_weight_names]
 
 
-def save_weights_to_hdf5_group(f, layers):
+def save_weights_to_hdf5_group(f, layers, compression=None, chunk_bytes=None):
   """Saves the weights of a list of layers to a HDF5 group.
 
   Args:
       f: HDF5 group.
       layers: List of layer instances.
+      compression: Optional h5py compression filter of the weight datasets,
+          e.g. `'gzip'` or `'lzf'`. Compressed datasets are chunked.
+      chunk_bytes: Optional target size in bytes of the chunks of the weight
+          datasets. If set, or if `compression` is set, weights are stored in
+          chunks along their first axis. When executing eagerly they are then
+          also read from the variables and written chunk by chunk, instead of
+          being materialized at once.
   """
   from tensorflow.python.keras import __version__ as keras_version  # pylint: disable=g-import-not-at-top
 
@@ -629,14 +643,20 @@ def save_weights_to_hdf5_group(f, layers):
   f.attrs['backend'] = backend.backend().encode('utf8')
   f.attrs['keras_version'] = str(keras_version).encode('utf8')
 
+  chunked = compression is not None or chunk_bytes is not None
   # Sort model layers by layer name to ensure that group names are strictly
   # growing to avoid prefix issues.
   for layer in sorted(layers, key=lambda x: x.name):
     g = f.create_group(layer.name)
     weights = _legacy_weights(layer)
-    weight_values = backend.batch_get_value(weights)
     weight_names = [w.name.encode('utf8') for w in weights]
     save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
+    if chunked:
+      for name, weight in zip(weight_names, weights):
+        _save_weight_in_chunks(g, name, weight, compression,
+                               chunk_bytes or _DEFAULT_CHUNK_BYTES)
+      continue
+    weight_values = backend.batch_get_value(weights)
     for name, val in zip(weight_names, weight_values):
       param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
       if not val.shape:
@@ -646,9 +666,117 @@ def save_weights_to_hdf5_group(f, layers):
         param_dset[:] = val
 
 
+def _weight_chunk_shape(shape, itemsize, chunk_bytes):
+  """Returns the shape of chunks of about `chunk_bytes` along the first axis."""
+  if not shape or not all(shape):
+    # Scalar and empty datasets cannot be chunked.
+    return None
+  row_bytes = max(1, itemsize * int(np.prod(shape[1:])))
+  rows = max(1, min(shape[0], chunk_bytes // row_bytes))
+  return (rows,) + tuple(shape[1:])
+
+
+def _save_weight_in_chunks(group, name, weight, compression, chunk_bytes):
+  """Saves `weight` to a chunked dataset, one chunk at a time if eager."""
+  shape = tuple(backend.int_shape(weight))
+  dtype = np.dtype(weight.dtype.as_numpy_dtype)
+  chunks = _weight_chunk_shape(shape, dtype.itemsize, chunk_bytes)
+  if chunks is None:
+    val = backend.get_value(weight)
+    param_dset = group.create_dataset(name, val.shape, dtype=val.dtype)
+    if not val.shape:
+      # scalar
+      param_dset[()] = val
+    else:
+      param_dset[:] = val
+    return
+
+  param_dset = group.create_dataset(
+      name, shape, dtype=dtype, chunks=chunks, compression=compression)
+  if not context.executing_eagerly():
+    param_dset[:] = backend.get_value(weight)
+    return
+  rows = chunks[0]
+  for start in range(0, shape[0], rows):
+    param_dset[start:start + rows] = backend.get_value(
+        weight[start:start + rows])
+
+
+def _weight_datasets(g):
+  """Returns the weight datasets of a layer group, without reading them."""
+  weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
+  return [g[weight_name] for weight_name in weight_names]
+
+
+def _weight_placeholders(datasets):
+  """Returns arrays with the shapes and dtypes of `datasets`, but no data.
+
+  The arrays broadcast a single element, so running
+  `preprocess_weights_for_loading` on them yields the shapes of the converted
+  weights without reading the file. Only conversions that concatenate or
+  reshape weights (legacy and CuDNN RNN layers) allocate, one layer at a time.
+
+  Args:
+      datasets: HDF5 datasets.
+
+  Returns:
+      A list of read-only numpy arrays.
+  """
+  return [
+      np.broadcast_to(np.zeros((), dtype=dataset.dtype), dataset.shape)
+      for dataset in datasets
+  ]
+
+
+def _load_layers_weights(entries, original_keras_version, original_backend):
+  """Reads and assigns the weights of layers in batches of bounded size.
+
+  Args:
+      entries: List of `(layer, datasets, weight_indices)` tuples, with the
+          HDF5 datasets of the weights of each layer and the indices of the
+          converted weights to assign. They must have been validated.
+      original_keras_version: Keras version for the weights, as a string.
+      original_backend: Keras backend the weights were trained with,
+          as a string.
+  """
+  weight_value_tuples = []
+  batch_bytes = 0
+  for layer, datasets, weight_indices in entries:
+    symbolic_weights = _legacy_weights(layer)
+    weight_values = preprocess_weights_for_loading(
+        layer, [np.asarray(dataset) for dataset in datasets],
+        original_keras_version, original_backend)
+    for i in weight_indices:
+      weight_value_tuples.append((symbolic_weights[i], weight_values[i]))
+      batch_bytes += np.asarray(weight_values[i]).nbytes
+    # We batch weight value assignments, which provides a speedup in
+    # TensorFlow, but only up to a size so that the values read from the file
+    # do not double the memory of large models.
+    if batch_bytes >= _LOAD_BATCH_BYTES:
+      backend.batch_set_value(weight_value_tuples)
+      weight_value_tuples = []
+      batch_bytes = 0
+  if weight_value_tuples:
+    backend.batch_set_value(weight_value_tuples)
+
+
+def _is_compatible_weight_shape(weight, value):
+  """Returns whether `value` can be assigned to the variable `weight`."""
+  shape = backend.int_shape(weight)
+  value_shape = np.shape(value)
+  return len(shape) == len(value_shape) and all(
+      dim is None or dim == value_dim
+      for dim, value_dim in zip(shape, value_shape))
+
+
 def load_weights_from_hdf5_group(f, layers):
   """Implements topological (order-based) weight loading.
 
+  The numbers and shapes of the weights of all layers are checked against the
+  model from the metadata of the file, before any weight is read or assigned,
+  so that a mismatch leaves the model unchanged. Weights are then read and
+  assigned in batches of bounded size.
+
   Args:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
@@ -690,17 +818,14 @@ def load_weights_from_hdf5_group(f, layers):
                      ' layers into a model with ' + str(len(filtered_layers)) +
                      ' layers.')
 
-  # We batch weight value assignments in a single backend call
-  # which provides a speedup in TensorFlow.
-  weight_value_tuples = []
+  entries = []
   for k, name in enumerate(layer_names):
-    g = f[name]
-    weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
     layer = filtered_layers[k]
     symbolic_weights = _legacy_weights(layer)
+    datasets = _weight_datasets(f[name])
     weight_values = preprocess_weights_for_loading(
-        layer, weight_values, original_keras_version, original_backend)
+        layer, _weight_placeholders(datasets), original_keras_version,
+        original_backend)
     if len(weight_values) != len(symbolic_weights):
       raise ValueError('Layer #' + str(k) + ' (named "' + layer.name +
                        '" in the current model) was found to '
@@ -709,17 +834,27 @@ def load_weights_from_hdf5_group(f, layers):
                        str(len(symbolic_weights)) +
                        ' weights, but the saved weights have ' +
                        str(len(weight_values)) + ' elements.')
-    weight_value_tuples += zip(symbolic_weights, weight_values)
-  backend.batch_set_value(weight_value_tuples)
+    for weight, value in zip(symbolic_weights, weight_values):
+      if not _is_compatible_weight_shape(weight, value):
+        raise ValueError('Layer #' + str(k) + ' (named "' + layer.name +
+                         '"), weight ' + str(weight) + ' has shape ' +
+                         str(backend.int_shape(weight)) + ', but the saved '
+                         'weight has shape ' + str(np.shape(value)) + '.')
+    entries.append((layer, datasets, range(len(symbolic_weights))))
+  _load_layers_weights(entries, original_keras_version, original_backend)
 
 
 def load_weights_from_hdf5_group_by_name(
-    f, layers, skip_mismatch=False):
+    f, layers, skip_mismatch=False, layer_filter=None):
   """Implements name-based weight loading.
 
   (instead of topological weight loading).
 
-  Layers that have no matching name are skipped.
+  Layers that have no matching name are skipped, and their weights are not
+  read from the file. The numbers and shapes of the weights of all matching
+  layers are checked from the metadata of the file before any weight is read
+  or assigned, so that a mismatch raising an error leaves the model
+  unchanged. Weights are then read and assigned in batches of bounded size.
 
   Args:
       f: A pointer to a HDF5 group.
@@ -727,6 +862,9 @@ def load_weights_from_hdf5_group_by_name(
       skip_mismatch: Boolean, whether to skip loading of layers
           where there is a mismatch in the number of weights,
           or a mismatch in the shape of the weights.
+      layer_filter: Optional callable taking a layer name and returning
+          whether to load the weights of that layer. Layers for which it
+          returns False are neither read nor assigned.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -754,18 +892,17 @@ def load_weights_from_hdf5_group_by_name(
     if layer.name:
       index.setdefault(layer.name, []).append(layer)
 
-  # We batch weight value assignments in a single backend call
-  # which provides a speedup in TensorFlow.
-  weight_value_tuples = []
+  entries = []
   for k, name in enumerate(layer_names):
-    g = f[name]
-    weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
-
-    for layer in index.get(name, []):
+    if name not in index or (layer_filter is not None and
+                             not layer_filter(name)):
+      continue
+    datasets = _weight_datasets(f[name])
+    for layer in index[name]:
       symbolic_weights = _legacy_weights(layer)
       weight_values = preprocess_weights_for_loading(
-          layer, weight_values, original_keras_version, original_backend)
+          layer, _weight_placeholders(datasets), original_keras_version,
+          original_backend)
       if len(weight_values) != len(symbolic_weights):
         if skip_mismatch:
           logging.warning('Skipping loading of weights for '
@@ -777,7 +914,7 @@ def load_weights_from_hdf5_group_by_name(
                          '") expects ' + str(len(symbolic_weights)) +
                          ' weight(s), but the saved weights' + ' have ' +
                          str(len(weight_values)) + ' element(s).')
-      # Set values.
+      weight_indices = []
       for i in range(len(weight_values)):
         if backend.int_shape(symbolic_weights[i]) != weight_values[i].shape:
           if skip_mismatch:
@@ -795,8 +932,9 @@ def load_weights_from_hdf5_group_by_name(
                            str(weight_values[i].shape) + '.')
 
         else:
-          weight_value_tuples.append((symbolic_weights[i], weight_values[i]))
-  backend.batch_set_value(weight_value_tuples)
+          weight_indices.append(i)
+      entries.append((layer, datasets, weight_indices))
+  _load_layers_weights(entries, original_keras_version, original_backend)
 
 
 def save_attributes_to_hdf5_group(group, name, data):
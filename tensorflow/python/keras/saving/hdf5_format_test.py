@@ -0,0 +1,150 @@
+# Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for HDF5 weight saving and loading."""
+
+import os
+
+import numpy as np
+
+from tensorflow.python.keras import backend
+from tensorflow.python.keras.engine import sequential
+from tensorflow.python.keras.layers import core
+from tensorflow.python.keras.saving import hdf5_format
+from tensorflow.python.platform import test
+
+try:
+  import h5py  # pylint:disable=g-import-not-at-top
+except ImportError:
+  h5py = None
+
+
+def _make_model(last_units=3):
+  return sequential.Sequential([
+      core.Dense(4, input_shape=(2,), name='dense_1'),
+      core.Dense(5, name='dense_2'),
+      core.Dense(last_units, name='dense_3'),
+  ])
+
+
+class LoadWeightsFromHDF5GroupTest(test.TestCase):
+
+  def setUp(self):
+    super(LoadWeightsFromHDF5GroupTest, self).setUp()
+    if h5py is None:
+      self.skipTest('h5py required to run this test')
+    self.path = os.path.join(self.get_temp_dir(), 'weights.h5')
+    self.model = _make_model()
+    with h5py.File(self.path, 'w') as f:
+      hdf5_format.save_weights_to_hdf5_group(f, self.model.layers)
+
+  def _assertSameWeights(self, expected, model):
+    for expected_value, value in zip(expected,
+                                     backend.batch_get_value(model.weights)):
+      self.assertAllEqual(expected_value, value)
+
+  def test_load_weights(self):
+    expected = backend.batch_get_value(self.model.weights)
+    model = _make_model()
+    with h5py.File(self.path, 'r') as f:
+      hdf5_format.load_weights_from_hdf5_group(f, model.layers)
+    self._assertSameWeights(expected, model)
+
+    model = _make_model()
+    with h5py.File(self.path, 'r') as f:
+      hdf5_format.load_weights_from_hdf5_group_by_name(f, model.layers)
+    self._assertSameWeights(expected, model)
+
+  def test_load_weights_in_bounded_batches(self):
+    expected = backend.batch_get_value(self.model.weights)
+    model = _make_model()
+    with test.mock.patch.object(hdf5_format, '_LOAD_BATCH_BYTES', 1):
+      with test.mock.patch.object(
+          backend, 'batch_set_value',
+          wraps=backend.batch_set_value) as batch_set_value:
+        with h5py.File(self.path, 'r') as f:
+          hdf5_format.load_weights_from_hdf5_group(f, model.layers)
+    # One assignment per layer.
+    self.assertEqual(3, batch_set_value.call_count)
+    self._assertSameWeights(expected, model)
+
+  def test_compression(self):
+    path = os.path.join(self.get_temp_dir(), 'compressed.h5')
+    with h5py.File(path, 'w') as f:
+      hdf5_format.save_weights_to_hdf5_group(
+          f, self.model.layers, compression='gzip')
+    with h5py.File(path, 'r') as f:
+      kernel = f['dense_1'][hdf5_format.load_attributes_from_hdf5_group(
+          f['dense_1'], 'weight_names')[0]]
+      self.assertEqual('gzip', kernel.compression)
+      self.assertIsNotNone(kernel.chunks)
+
+      model = _make_model()
+      hdf5_format.load_weights_from_hdf5_group(f, model.layers)
+    self._assertSameWeights(backend.batch_get_value(self.model.weights), model)
+
+  def test_chunk_bytes(self):
+    path = os.path.join(self.get_temp_dir(), 'chunked.h5')
+    with h5py.File(path, 'w') as f:
+      # Rows of the (2, 4) float32 kernel take 16 bytes, so each chunk holds
+      # a single row.
+      hdf5_format.save_weights_to_hdf5_group(
+          f, self.model.layers, chunk_bytes=8)
+    with h5py.File(path, 'r') as f:
+      kernel = f['dense_1'][hdf5_format.load_attributes_from_hdf5_group(
+          f['dense_1'], 'weight_names')[0]]
+      self.assertEqual((1, 4), kernel.chunks)
+      self.assertIsNone(kernel.compression)
+
+      model = _make_model()
+      hdf5_format.load_weights_from_hdf5_group_by_name(f, model.layers)
+    self._assertSameWeights(backend.batch_get_value(self.model.weights), model)
+
+  def test_layer_filter(self):
+    model = _make_model()
+    initial = backend.get_value(model.layers[1].kernel)
+    with h5py.File(self.path, 'r') as f:
+      hdf5_format.load_weights_from_hdf5_group_by_name(
+          f, model.layers, layer_filter=lambda name: name != 'dense_2')
+    for i in (0, 2):
+      self.assertAllEqual(
+          backend.get_value(self.model.layers[i].kernel),
+          backend.get_value(model.layers[i].kernel))
+    self.assertAllEqual(initial, backend.get_value(model.layers[1].kernel))
+
+  def test_mismatch_leaves_weights_unchanged(self):
+    model = _make_model(last_units=6)
+    expected = backend.batch_get_value(model.weights)
+    with h5py.File(self.path, 'r') as f:
+      with self.assertRaisesRegex(ValueError, 'dense_3'):
+        hdf5_format.load_weights_from_hdf5_group(f, model.layers)
+      self._assertSameWeights(expected, model)
+
+      with self.assertRaisesRegex(ValueError, 'dense_3'):
+        hdf5_format.load_weights_from_hdf5_group_by_name(f, model.layers)
+      self._assertSameWeights(expected, model)
+
+    # With skip_mismatch, the layers that match are loaded.
+    with h5py.File(self.path, 'r') as f:
+      hdf5_format.load_weights_from_hdf5_group_by_name(
+          f, model.layers, skip_mismatch=True)
+    self.assertAllEqual(
+        backend.get_value(self.model.layers[0].kernel),
+        backend.get_value(model.layers[0].kernel))
+    self.assertFalse(
+        np.array_equal(expected[0], backend.get_value(model.layers[0].kernel)))
+
+
+if __name__ == '__main__':
+  test.main()
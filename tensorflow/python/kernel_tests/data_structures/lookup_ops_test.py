@@ -1083,6 +1083,150 @@ class InitializeTableFromFileOpTest(BaseLookupTableTest):
       self.assertEqual(vocab_size, self.evaluate(table.size()))
 
 
+class MemmappedVocabularyTableTest(test.TestCase):
+
+  def _createVocabFile(self, basename, lines):
+    vocabulary_file = os.path.join(self.get_temp_dir(), basename)
+    with open(vocabulary_file, "w") as f:
+      f.write("\n".join(lines) + "\n")
+    return vocabulary_file
+
+  def testConvertAndLookup(self):
+    text_file = self._createVocabFile("memmapped_source.txt",
+                                      ["brain", "salad", "", "surgery"])
+    binary_file = os.path.join(self.get_temp_dir(), "memmapped_source.vocab")
+    lookup_ops.convert_text_vocabulary(text_file, binary_file)
+
+    table = lookup_ops.MemmappedVocabularyTable(binary_file, dtypes.string,
+                                                dtypes.int64, -1)
+    output = table.lookup(
+        constant_op.constant(["brain", "salad", "", "surgery", "tank"]))
+    self.assertAllEqual([0, 1, 2, 3, -1], self.evaluate(output))
+    output = table.lookup(
+        constant_op.constant([["salad", "tank"], ["surgery", "brain"]]))
+    self.assertAllEqual([[1, -1], [3, 0]], self.evaluate(output))
+    self.assertEqual(4, self.evaluate(table.size()))
+
+  def testConvertInBatches(self):
+    text_file = self._createVocabFile(
+        "memmapped_columns.txt",
+        ["0\tbrain\t1", "1\tsalad\t5", "2\tsurgery\t6"])
+    binary_file = os.path.join(self.get_temp_dir(), "memmapped_columns.vocab")
+    with test.mock.patch.object(lookup_ops, "_TEXT_VOCABULARY_BATCH_SIZE", 2):
+      lookup_ops.convert_text_vocabulary(
+          text_file,
+          binary_file,
+          value_dtype=dtypes.int32,
+          key_index=1,
+          value_index=2,
+          value_index_offset=10)
+
+    table = lookup_ops.MemmappedVocabularyTable(binary_file, dtypes.string,
+                                                dtypes.int32, -1)
+    output = table.lookup(
+        constant_op.constant(["brain", "salad", "surgery", "x"]))
+    self.assertAllEqual([11, 15, 16, -1], self.evaluate(output))
+
+  def testConvertMissingColumn(self):
+    text_file = self._createVocabFile("memmapped_missing_column.txt",
+                                      ["0\tbrain", "1", "2\tsurgery"])
+    binary_file = os.path.join(self.get_temp_dir(), "missing_column.vocab")
+    with self.assertRaisesRegex(errors_impl.InvalidArgumentError,
+                                "Invalid number of columns"):
+      lookup_ops.convert_text_vocabulary(
+          text_file, binary_file, key_index=1)
+
+  def testConvertVocabSizeTooLarge(self):
+    text_file = self._createVocabFile("memmapped_vocab_size.txt",
+                                      ["brain", "salad"])
+    binary_file = os.path.join(self.get_temp_dir(), "vocab_size.vocab")
+    with self.assertRaisesRegex(ValueError, "Invalid vocab_size"):
+      lookup_ops.convert_text_vocabulary(text_file, binary_file, vocab_size=3)
+
+  def testNumericKeys(self):
+    binary_file = os.path.join(self.get_temp_dir(), "numeric_keys.vocab")
+    lookup_ops.write_binary_vocabulary([7, 3, -2], [0.5, 1.5, 2.5],
+                                       binary_file,
+                                       key_dtype=dtypes.int64,
+                                       value_dtype=dtypes.float32)
+
+    table = lookup_ops.MemmappedVocabularyTable(binary_file, dtypes.int64,
+                                                dtypes.float32, -1.0)
+    output = table.lookup(
+        constant_op.constant([3, 7, -2, 0, -3, 8], dtypes.int64))
+    self.assertAllEqual([1.5, 0.5, 2.5, -1.0, -1.0, -1.0],
+                        self.evaluate(output))
+
+  def testLookupInFunction(self):
+    binary_file = os.path.join(self.get_temp_dir(), "function.vocab")
+    lookup_ops.write_binary_vocabulary(["brain", "salad"], [4, 5],
+                                       binary_file,
+                                       value_dtype=dtypes.int64)
+    table = lookup_ops.MemmappedVocabularyTable(binary_file, dtypes.string,
+                                                dtypes.int64, -1)
+
+    @def_function.function
+    def lookup(keys):
+      return table.lookup(keys)
+
+    self.assertAllEqual([5, -1, 4],
+                        self.evaluate(
+                            lookup(constant_op.constant(
+                                ["salad", "x", "brain"]))))
+
+  def testReadBinaryVocabulary(self):
+    binary_file = os.path.join(self.get_temp_dir(), "memmapped.vocab")
+    lookup_ops.write_binary_vocabulary(["brain", "", "surgery"],
+                                       [1.5, 2.5, 3.5], binary_file)
+
+    vocabulary = lookup_ops.read_binary_vocabulary(binary_file)
+    self.assertLen(vocabulary.keys, 3)
+    self.assertEqual({b"brain": 1.5, b"": 2.5, b"surgery": 3.5},
+                     dict(zip(vocabulary.keys, vocabulary.values)))
+    self.assertEqual(vocabulary.keys[2], vocabulary.keys[-1])
+    self.assertEqual(list(vocabulary.keys)[:2], vocabulary.keys[:2])
+
+    binary_file = os.path.join(self.get_temp_dir(), "memmapped_int.vocab")
+    lookup_ops.write_binary_vocabulary([7, 3, -2], ["a", "bb", "ccc"],
+                                       binary_file, key_dtype=dtypes.int64)
+    vocabulary = lookup_ops.read_binary_vocabulary(binary_file)
+    self.assertAllEqual([-2, 3, 7], vocabulary.keys)
+    self.assertEqual([b"ccc", b"bb", b"a"], list(vocabulary.values))
+
+  def testDtypeMismatch(self):
+    binary_file = os.path.join(self.get_temp_dir(), "mismatch.vocab")
+    lookup_ops.write_binary_vocabulary(["a"], [1], binary_file,
+                                       value_dtype=dtypes.int64)
+
+    with self.assertRaisesRegex(ValueError, "has keys of type string"):
+      lookup_ops.MemmappedVocabularyTable(binary_file, dtypes.string,
+                                          dtypes.int32, -1)
+
+  def testStringValues(self):
+    binary_file = os.path.join(self.get_temp_dir(), "string_values.vocab")
+    lookup_ops.write_binary_vocabulary([1], ["a"], binary_file,
+                                       key_dtype=dtypes.int64)
+
+    with self.assertRaisesRegex(ValueError, "needs numeric values"):
+      lookup_ops.MemmappedVocabularyTable(binary_file, dtypes.int64,
+                                          dtypes.string, "")
+
+  def testInvalidVocabularies(self):
+    binary_file = os.path.join(self.get_temp_dir(), "invalid.vocab")
+    with self.assertRaisesRegex(ValueError, "must be unique"):
+      lookup_ops.write_binary_vocabulary(["a", "b", "a"], [1, 2, 3],
+                                         binary_file)
+    with self.assertRaisesRegex(ValueError, "must not be empty"):
+      lookup_ops.write_binary_vocabulary([], [], binary_file,
+                                         key_dtype=dtypes.string,
+                                         value_dtype=dtypes.int64)
+
+    text_file = self._createVocabFile("not_binary.txt", ["brain"])
+    with self.assertRaisesRegex(ValueError, "not a binary vocabulary file"):
+      lookup_ops.MemmappedVocabularyTable(text_file, dtypes.string,
+                                          dtypes.int64, -1)
+
+
 @parameterized.named_parameters(
     (f"_{is_anonymous}", is_anonymous) for is_anonymous in [False, True])
 class StaticVocabularyTableTest(BaseLookupTableTest):
@@ -4226,6 +4370,188 @@ class MutableHashTableOpTest(test.TestCase):
     self.assertTrue(inferred_shapes[1].is_compatible_with(actual_shapes[1]))
 
 
+@test_util.run_v2_only
+class HashTableEvictionTest(test.TestCase, parameterized.TestCase):
+
+  def _createTable(self, table_type, capacity, eviction_policy="lru",
+                   value_shape=()):
+    default_value = array_ops.fill(value_shape, constant_op.constant(
+        -1, dtypes.int64))
+    if table_type == "dense":
+      return lookup_ops.DenseHashTable(
+          dtypes.int64,
+          dtypes.int64,
+          default_value=default_value,
+          empty_key=0,
+          deleted_key=-1,
+          initial_num_buckets=16,
+          capacity=capacity,
+          eviction_policy=eviction_policy)
+    return lookup_ops.MutableHashTable(
+        dtypes.int64,
+        dtypes.int64,
+        default_value=default_value,
+        capacity=capacity,
+        eviction_policy=eviction_policy)
+
+  def _insert(self, table, keys):
+    table.insert(
+        constant_op.constant(keys, dtypes.int64),
+        constant_op.constant([10 * k for k in keys], dtypes.int64))
+
+  def _lookup(self, table, keys):
+    return self.evaluate(
+        table.lookup(constant_op.constant(keys, dtypes.int64)))
+
+  @parameterized.parameters("mutable", "dense")
+  def testLruEviction(self, table_type):
+    table = self._createTable(table_type, capacity=3)
+    self._insert(table, [1, 2, 3])
+    self.assertAllEqual([10], self._lookup(table, [1]))
+    self._insert(table, [4, 5])
+
+    self.assertEqual(3, self.evaluate(table.size()))
+    self.assertAllEqual([10, -1, -1, 40, 50],
+                        self._lookup(table, [1, 2, 3, 4, 5]))
+
+  @parameterized.parameters("mutable", "dense")
+  def testLfuEviction(self, table_type):
+    table = self._createTable(table_type, capacity=2, eviction_policy="lfu")
+    self._insert(table, [1, 2])
+    self._lookup(table, [2, 2, 1, 2])
+    self._insert(table, [3])
+
+    self.assertAllEqual([-1, 20, 30], self._lookup(table, [1, 2, 3]))
+
+  @parameterized.parameters("mutable", "dense")
+  def testStatistics(self, table_type):
+    table = self._createTable(table_type, capacity=2)
+    self._insert(table, [1, 2])
+    self._lookup(table, [2])
+    self._insert(table, [3])
+    self._lookup(table, [2, 3, 4, 2])
+
+    statistics = self.evaluate(table.statistics())
+    self.assertEqual(2, statistics.size)
+    self.assertEqual(4, statistics.hits)
+    self.assertEqual(1, statistics.misses)
+    self.assertEqual(1, statistics.evictions)
+
+  def testStatisticsRequireCapacity(self):
+    table = self._createTable("mutable", capacity=None)
+    with self.assertRaisesRegex(ValueError, "capacity"):
+      table.statistics()
+
+  def testInsertLargerThanCapacity(self):
+    table = self._createTable("mutable", capacity=2)
+    self._insert(table, [1, 2, 3, 4])
+
+    self.assertEqual(2, self.evaluate(table.size()))
+    self.assertEqual(2, self.evaluate(table.statistics().evictions))
+
+  @parameterized.parameters("mutable", "dense")
+  def testEvictionDownToLowWatermark(self, table_type):
+    table = self._createTable(table_type, capacity=16)
+    for key in range(1, 17):
+      self._insert(table, [key])
+    self.assertEqual(0, self.evaluate(table.statistics().evictions))
+
+    # 2 = 16 // 8 keys are evicted on top of the one over capacity.
+    self._insert(table, [17])
+    self.assertEqual(14, self.evaluate(table.size()))
+    self.assertAllEqual([-1, -1, -1, 40, 170],
+                        self._lookup(table, [1, 2, 3, 4, 17]))
+
+    # The next inserts fit without any eviction.
+    self._insert(table, [18, 19])
+    statistics = self.evaluate(table.statistics())
+    self.assertEqual(16, statistics.size)
+    self.assertEqual(3, statistics.evictions)
+
+  def testStringKeysKeepInsertedKeys(self):
+    table = lookup_ops.MutableHashTable(
+        dtypes.string, dtypes.int64, default_value=-1, capacity=2,
+        eviction_policy="lfu")
+    table.insert(constant_op.constant(["a", "b"]), constant_op.constant([1, 2]))
+    self.evaluate(table.lookup(constant_op.constant(["a", "a", "b"])))
+    # "c" has the smallest counter, but keys of the last insert are evicted
+    # last.
+    table.insert(constant_op.constant(["c"]), constant_op.constant([3]))
+
+    self.assertAllEqual([1, -1, 3],
+                        self.evaluate(
+                            table.lookup(constant_op.constant(["a", "b",
+                                                               "c"]))))
+
+  def testInvalidArguments(self):
+    with self.assertRaisesRegex(ValueError, "capacity"):
+      self._createTable("mutable", capacity=0)
+    with self.assertRaisesRegex(ValueError, "eviction_policy"):
+      self._createTable("mutable", capacity=1, eviction_policy="fifo")
+    with self.assertRaisesRegex(ValueError, "scalar keys"):
+      lookup_ops.DenseHashTable(
+          dtypes.int64,
+          dtypes.int64,
+          default_value=-1,
+          empty_key=[0, 0],
+          deleted_key=[-1, -1],
+          capacity=2)
+
+  def testRemove(self):
+    table = self._createTable("mutable", capacity=2)
+    self._insert(table, [1, 2])
+    table.remove(constant_op.constant([1], dtypes.int64))
+    self._insert(table, [3])
+
+    self.assertEqual(0, self.evaluate(table.statistics().evictions))
+    self.assertAllEqual([-1, 20, 30], self._lookup(table, [1, 2, 3]))
+
+  def testInsideFunction(self):
+    table = self._createTable("mutable", capacity=2)
+
+    @def_function.function
+    def insert(keys):
+      table.insert(keys, keys * 10)
+
+    for key in range(5):
+      insert(constant_op.constant([key], dtypes.int64))
+    self.assertAllEqual([-1, -1, -1, 30, 40],
+                        self._lookup(table, [0, 1, 2, 3, 4]))
+    self.assertEqual(3, self.evaluate(table.statistics().evictions))
+
+  @parameterized.parameters("mutable", "dense")
+  def testExportChunks(self, table_type):
+    for capacity in (None, 100):
+      table = self._createTable(table_type, capacity, value_shape=(2,))
+      keys = list(range(1, 8))
+      table.insert(
+          constant_op.constant(keys, dtypes.int64),
+          constant_op.constant([[k, -k] for k in keys], dtypes.int64))
+
+      chunks = list(table.export_chunks(3))
+      self.assertEqual([3, 3, 1], [len(k) for k, _ in chunks])
+      exported = {}
+      for chunk_keys, chunk_values in chunks:
+        exported.update(zip(chunk_keys.numpy(), chunk_values.numpy().tolist()))
+      self.assertEqual({k: [k, -k] for k in keys}, exported)
+
+  @parameterized.parameters("mutable", "dense")
+  def testCheckpointSaveRestore(self, table_type):
+    save_prefix = os.path.join(self.get_temp_dir(), "eviction_ckpt")
+    save_table = self._createTable(table_type, capacity=2)
+    self._insert(save_table, [1, 2])
+    self._lookup(save_table, [1])
+    save_path = trackable.Checkpoint(table=save_table).save(save_prefix)
+
+    load_table = self._createTable(table_type, capacity=2)
+    trackable.Checkpoint(table=load_table).restore(save_path)
+    self.assertEqual(1, self.evaluate(load_table.statistics().hits))
+
+    # The restored access counters decide which key is evicted.
+    self._insert(load_table, [3])
+    self.assertAllEqual([10, -1, 30], self._lookup(load_table, [1, 2, 3]))
+
+
 class MutableHashTableBenchmark(test.Benchmark):
 
   def _create_table(self):
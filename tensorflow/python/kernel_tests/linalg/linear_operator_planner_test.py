@@ -0,0 +1,138 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for linear_operator_planner."""
+
+import numpy as np
+
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import test_util
+from tensorflow.python.ops.linalg import linalg as linalg_lib
+from tensorflow.python.ops.linalg import linear_operator_planner
+from tensorflow.python.platform import test
+
+linalg = linalg_lib
+rng = np.random.RandomState(0)
+
+
+def _spd_matrix(n):
+  x = rng.randn(n, n)
+  return x.dot(x.T) + n * np.eye(n)
+
+
+def _spd_toeplitz(n):
+  # Diagonally dominant symmetric Toeplitz matrices are positive definite.
+  col = np.concatenate([[2. * n], rng.uniform(-1., 1., n - 1)])
+  return linalg.LinearOperatorToeplitz(
+      col, col, is_self_adjoint=True, is_positive_definite=True)
+
+
+@test_util.run_all_in_graph_and_eager_modes
+class LinearOperatorPlannerTest(test.TestCase):
+
+  def _assert_solves(self, plan, operator, rhs, tol=1e-8):
+    self.assertAllClose(
+        np.linalg.solve(self.evaluate(operator.to_dense()), rhs),
+        self.evaluate(plan.solve(rhs)), rtol=tol, atol=tol)
+
+  def test_low_rank_update_uses_woodbury(self):
+    operator = linalg.LinearOperatorLowRankUpdate(
+        linalg.LinearOperatorDiag(rng.uniform(1., 2., 6)),
+        u=rng.randn(6, 2))
+    plan = linear_operator_planner.plan_solve(operator)
+
+    self.assertEqual("woodbury", plan.algorithm)
+    self.assertEqual(["diagonal"], [p.algorithm for p in plan.children])
+    self.assertIs(operator, plan.operator)
+    self.assertFalse(plan.uses_dense_solve)
+    self._assert_solves(plan, operator, rng.randn(6, 3))
+
+  def test_kronecker_plans_factors(self):
+    operator = linalg.LinearOperatorKronecker([
+        linalg.LinearOperatorCirculant(
+            np.fft.fft(rng.randn(4) + 4.), input_output_dtype=dtypes.float64),
+        linalg.LinearOperatorFullMatrix(rng.randn(3, 3) + 3. * np.eye(3)),
+    ])
+    plan = linear_operator_planner.plan_solve(operator)
+
+    self.assertEqual("kronecker_factor_solves", plan.algorithm)
+    self.assertEqual(["fft", "dense_lu"], [p.algorithm for p in plan.children])
+    self.assertTrue(plan.uses_dense_solve)
+
+  def test_spd_toeplitz_uses_preconditioned_cg(self):
+    operator = _spd_toeplitz(32)
+    plan = linear_operator_planner.plan_solve(operator)
+
+    self.assertEqual("conjugate_gradient", plan.algorithm)
+    self.assertEqual("circulant", plan.preconditioner)
+    self.assertFalse(plan.uses_dense_solve)
+    self._assert_solves(plan, operator, rng.randn(32, 2), tol=1e-5)
+
+  def test_non_spd_toeplitz_uses_dense_solve(self):
+    operator = linalg.LinearOperatorToeplitz(
+        rng.randn(5) + [5., 0., 0., 0., 0.], rng.randn(5))
+    plan = linear_operator_planner.plan_solve(operator)
+
+    self.assertEqual("dense_lu", plan.algorithm)
+    self.assertTrue(plan.uses_dense_solve)
+
+  def test_composite_operators_are_rebuilt_around_iterative_solves(self):
+    toeplitz = _spd_toeplitz(8)
+    operator = linalg.LinearOperatorComposition([
+        linalg.LinearOperatorBlockDiag(
+            [toeplitz, linalg.LinearOperatorIdentity(4, dtype=toeplitz.dtype)]),
+        linalg.LinearOperatorDiag(rng.uniform(1., 2., 12)),
+    ])
+    plan = linear_operator_planner.plan_solve(operator)
+
+    self.assertIsNot(operator, plan.operator)
+    self.assertIsInstance(plan.operator, linalg.LinearOperatorComposition)
+    block_plan = plan.children[0]
+    self.assertEqual("block_solves", block_plan.algorithm)
+    self.assertEqual(["conjugate_gradient", "identity"],
+                     [p.algorithm for p in block_plan.children])
+    self._assert_solves(plan, operator, rng.randn(12, 3), tol=1e-5)
+
+  def test_prefer_iterative_full_matrix(self):
+    operator = linalg.LinearOperatorFullMatrix(
+        _spd_matrix(10), is_self_adjoint=True, is_positive_definite=True)
+
+    self.assertEqual(
+        "dense_cholesky",
+        linear_operator_planner.plan_solve(operator).algorithm)
+    plan = linear_operator_planner.plan_solve(operator, prefer_iterative=True)
+    self.assertEqual("conjugate_gradient", plan.algorithm)
+    self.assertEqual("jacobi", plan.preconditioner)
+    self._assert_solves(plan, operator, rng.randn(10, 2), tol=1e-5)
+    self.assertAllClose(
+        np.linalg.solve(self.evaluate(operator.to_dense()), np.ones(10)),
+        self.evaluate(plan.solvevec(np.ones(10))), rtol=1e-5, atol=1e-5)
+
+  def test_describe(self):
+    operator = linalg.LinearOperatorComposition([
+        _spd_toeplitz(4),
+        linalg.LinearOperatorDiag(np.array([1., 2., 3., 4.]), name="diag"),
+    ], name="composition")
+    description = str(linear_operator_planner.plan_solve(operator))
+
+    self.assertIn("composition (LinearOperatorComposition): "
+                  "sequential_factor_solves", description)
+    self.assertIn("  LinearOperatorToeplitz (LinearOperatorToeplitz): "
+                  "conjugate_gradient", description)
+    self.assertIn("preconditioner: circulant", description)
+    self.assertIn("  diag (LinearOperatorDiag): diagonal, O(N)", description)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -14,10 +14,13 @@
 # ==============================================================================
 """Tests for mel_ops."""
 
+import time
+
 from absl.testing import parameterized
 import numpy as np
 
 from tensorflow.python.eager import context
+from tensorflow.python.eager import def_function
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
@@ -25,7 +28,11 @@ from tensorflow.python.framework import tensor_util
 from tensorflow.python.framework import test_util as tf_test_util
 from tensorflow.python.kernel_tests.signal import test_util
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops.signal import fft_ops
 from tensorflow.python.ops.signal import mel_ops
+from tensorflow.python.ops.signal import util_ops
+from tensorflow.python.ops.signal import window_ops
 from tensorflow.python.platform import test
 
 # mel spectrum constants and functions.
@@ -201,6 +208,114 @@ class LinearToMelTest(test.TestCase, parameterized.TestCase):
         20, num_spectrogram_bins, 8000.0, 125.0, 3800.0)
     self.assertAllClose(mel_matrix_np, mel_matrix, atol=3e-6)
 
+  def test_cached_matrix_is_reused(self):
+    if not context.executing_eagerly():
+      return
+    util_ops.clear_constant_cache()
+    first = mel_ops.linear_to_mel_weight_matrix(40, 257, 16000, 20.0, 8000.0)
+    second = mel_ops.linear_to_mel_weight_matrix(40, 257, 16000.0, 20.0, 8000.0)
+    self.assertIs(first, second)
+    self.assertIsNot(
+        first,
+        mel_ops.linear_to_mel_weight_matrix(
+            40, 257, 16000, 20.0, 8000.0, dtype=dtypes.float64))
+    self.assertAllClose(
+        spectrogram_to_mel_matrix(40, 257, 16000, 20.0, 8000.0), first,
+        atol=3e-6)
+
+  def test_cache_is_bounded(self):
+    if not context.executing_eagerly():
+      return
+    util_ops.clear_constant_cache()
+    with test.mock.patch.object(util_ops, "_CONSTANT_CACHE_SIZE", 2):
+      for num_mel_bins in (10, 20, 30):
+        mel_ops.linear_to_mel_weight_matrix(num_mel_bins)
+      self.assertLen(util_ops._constant_cache, 2)  # pylint: disable=protected-access
+
+  def test_cached_matrix_in_function(self):
+    if not context.executing_eagerly():
+      return
+    expected = mel_ops.linear_to_mel_weight_matrix(40, 257, 16000, 20.0, 8000.0)
+
+    @def_function.function
+    def weights():
+      return mel_ops.linear_to_mel_weight_matrix(40, 257, 16000, 20.0, 8000.0)
+
+    self.assertAllEqual(expected, weights())
+
+  @parameterized.parameters(((5, 400), 512, 1.0), ((2, 3, 256), None, 2.0))
+  def test_log_mel_spectrogram(self, shape, fft_length, magnitude_power):
+    frames = np.random.uniform(-1., 1., shape).astype(np.float32)
+    log_mel = mel_ops.log_mel_spectrogram(
+        frames, 16000, num_mel_bins=40, fft_length=fft_length,
+        magnitude_power=magnitude_power)
+
+    window = window_ops.hann_window(shape[-1])
+    fft_length = fft_length or shape[-1]
+    spectrograms = math_ops.abs(
+        fft_ops.rfft(frames * window, [fft_length])) ** magnitude_power
+    weights = mel_ops.linear_to_mel_weight_matrix(
+        40, fft_length // 2 + 1, 16000, 80.0, 7600.0)
+    expected = math_ops.log(math_ops.tensordot(spectrograms, weights, 1) + 1e-6)
+    self.assertEqual(shape[:-1] + (40,), tuple(log_mel.shape))
+    self.assertAllClose(self.evaluate(expected), self.evaluate(log_mel),
+                        rtol=1e-5, atol=1e-5)
+
+  def test_log_mel_spectrogram_unknown_frame_length(self):
+    frames = np.random.uniform(-1., 1., (3, 400)).astype(np.float32)
+    dynamic_frames = array_ops.placeholder_with_default(
+        frames, shape=[None, None])
+    self.assertAllClose(
+        self.evaluate(mel_ops.log_mel_spectrogram(frames, 16000)),
+        self.evaluate(mel_ops.log_mel_spectrogram(dynamic_frames, 16000)),
+        rtol=1e-5, atol=1e-5)
+
+
+class LinearToMelBenchmark(test.Benchmark):
+
+  def _run(self, fn, num_iters):
+    for _ in range(3):
+      # Warm up.
+      fn()
+    start_time = time.time()
+    for _ in range(num_iters):
+      fn()
+    return (time.time() - start_time) / num_iters
+
+  def benchmark_linear_to_mel_weight_matrix(self):
+    num_iters = 200
+    args = (80, 513, 16000, 80.0, 7600.0)
+
+    def uncached():
+      util_ops.clear_constant_cache()
+      return mel_ops.linear_to_mel_weight_matrix(*args)
+
+    def cached():
+      return mel_ops.linear_to_mel_weight_matrix(*args)
+
+    frames = np.random.uniform(-1., 1., (100, 1024)).astype(np.float32)
+
+    def log_mel_unfused():
+      util_ops.clear_constant_cache()
+      spectrograms = math_ops.abs(
+          fft_ops.rfft(frames * window_ops.hann_window(1024), [1024]))
+      return math_ops.log(
+          math_ops.tensordot(
+              spectrograms, mel_ops.linear_to_mel_weight_matrix(*args), 1) +
+          1e-6)
+
+    def log_mel_fused():
+      return mel_ops.log_mel_spectrogram(frames, 16000)
+
+    with context.eager_mode():
+      for name, fn in (("uncached", uncached), ("cached", cached),
+                       ("log_mel_unfused", log_mel_unfused),
+                       ("log_mel_fused", log_mel_fused)):
+        self.report_benchmark(
+            name="linear_to_mel_weight_matrix_%s" % name,
+            iters=num_iters,
+            wall_time=self._run(fn, num_iters))
+
 
 if __name__ == "__main__":
   test.main()
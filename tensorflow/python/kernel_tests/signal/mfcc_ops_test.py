@@ -15,14 +15,18 @@
 """Tests for mfcc_ops."""
 
 from absl.testing import parameterized
+import numpy as np
 
 from tensorflow.python.eager import context
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import test_util
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import random_ops
+from tensorflow.python.ops.signal import mel_ops
 from tensorflow.python.ops.signal import mfcc_ops
+from tensorflow.python.ops.signal import spectral_ops
 from tensorflow.python.platform import test
 
 
@@ -53,5 +57,28 @@ class MFCCTest(test.TestCase, parameterized.TestCase):
     self.assertIsNone(signal.shape.ndims)
     self.evaluate(mfcc_ops.mfccs_from_log_mel_spectrograms(signal))
 
+  def test_streaming_mfccs(self):
+    frame_length, frame_step, sample_rate = 400, 160, 16000.0
+    signal = np.random.uniform(-1., 1., (2, 4000)).astype(np.float32)
+    weights = mel_ops.linear_to_mel_weight_matrix(
+        num_mel_bins=40, num_spectrogram_bins=257, sample_rate=sample_rate)
+
+    spectrograms = math_ops.abs(
+        spectral_ops.stft(signal, frame_length, frame_step))
+    log_mel_spectrograms = math_ops.log(
+        math_ops.tensordot(spectrograms, weights, 1) + 1e-6)
+    expected = mfcc_ops.mfccs_from_log_mel_spectrograms(log_mel_spectrograms)
+
+    mfccs = []
+    state = None
+    for start in range(0, 4000, 230):
+      chunk_mfccs, state = mfcc_ops.streaming_mfccs(
+          signal[:, start:start + 230], state, frame_length, frame_step,
+          weights)
+      mfccs.append(chunk_mfccs)
+    actual = array_ops.concat(mfccs, axis=-2)
+    self.assertAllClose(self.evaluate(expected), self.evaluate(actual),
+                        rtol=1e-5, atol=1e-5)
+
 if __name__ == "__main__":
   test.main()
@@ -15,6 +15,7 @@
 """Tests for spectral_ops."""
 
 import itertools
+import time
 
 from absl.testing import parameterized
 import numpy as np
@@ -248,6 +249,36 @@ class SpectralOpsTest(test.TestCase, parameterized.TestCase):
     inverse_window = inverse_window_fn(frame_length, dtype=dtypes.float32)
     self.assertAllClose(hann_window, inverse_window * 1.5)
 
+  @parameterized.parameters(
+      # Chunk sizes smaller than, equal to and larger than the frame step.
+      ((37, 64, 1, 500), 128, 64),
+      ((64, 64, 64), 128, 64),
+      ((300, 0, 301), 128, 32),
+      ((255, 257), 256, 256),
+      ((11,) * 40, 64, 48))
+  def test_streaming_stft(self, chunk_lengths, frame_length, frame_step):
+    signal = np.random.random((2, sum(chunk_lengths))).astype(np.float32)
+    expected = spectral_ops.stft(signal, frame_length, frame_step)
+
+    stfts = []
+    state = None
+    offset = 0
+    for chunk_length in chunk_lengths:
+      chunk = signal[:, offset:offset + chunk_length]
+      offset += chunk_length
+      chunk_stfts, state = spectral_ops.streaming_stft(
+          chunk, state, frame_length, frame_step)
+      stfts.append(chunk_stfts)
+      self.assertLess(self.evaluate(array_ops.shape(state))[-1], frame_length)
+
+    actual = array_ops.concat(stfts, axis=-2)
+    self.assertAllClose(self.evaluate(expected), self.evaluate(actual),
+                        rtol=1e-6, atol=1e-6)
+
+  def test_streaming_stft_frame_step_larger_than_frame_length(self):
+    with self.assertRaisesRegex(ValueError, "frame_step"):
+      spectral_ops.streaming_stft(np.zeros(10, np.float32), None, 4, 5)
+
   @staticmethod
   def _compute_stft_gradient(signal, frame_length=32, frame_step=16,
                              fft_length=32):
@@ -358,5 +389,45 @@ class SpectralOpsTest(test.TestCase, parameterized.TestCase):
     # Check that the inverse and original signal are close.
     self.assertAllClose(inverse_mdct, signal, atol=tol, rtol=tol)
 
+
+class StreamingStftBenchmark(test.Benchmark):
+
+  def _run(self, fn, chunks):
+    state = None
+    for chunk in chunks[:3]:
+      # Warm up.
+      _, state = fn(chunk, state)
+    start_time = time.time()
+    for chunk in chunks:
+      _, state = fn(chunk, state)
+    return (time.time() - start_time) / len(chunks)
+
+  def benchmark_streaming_stft_latency(self):
+    sample_rate, frame_length, frame_step = 16000, 400, 160
+    chunk_length = sample_rate // 100
+    num_chunks = 500
+    chunks = [
+        np.random.random(chunk_length).astype(np.float32)
+        for _ in range(num_chunks)
+    ]
+
+    def streaming(chunk, state):
+      return spectral_ops.streaming_stft(chunk, state, frame_length,
+                                         frame_step)
+
+    def recompute(chunk, signal):
+      # Recomputes the STFT of the last second of audio for each chunk.
+      signal = chunk if signal is None else np.concatenate([signal, chunk])
+      signal = signal[-sample_rate:]
+      return spectral_ops.stft(signal, frame_length, frame_step), signal
+
+    with context.eager_mode():
+      for name, fn in (("streaming", streaming), ("recompute", recompute)):
+        self.report_benchmark(
+            name="stft_%s_chunk_%d" % (name, chunk_length),
+            iters=num_chunks,
+            wall_time=self._run(fn, chunks))
+
+
 if __name__ == "__main__":
   test.main()
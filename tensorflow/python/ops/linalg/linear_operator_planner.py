@@ -0,0 +1,431 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Plans structure-exploiting solves of (composite) `LinearOperator`s.
+
+`plan_solve` walks the tree of a `LinearOperator` and records, for every node,
+the algorithm its `solve` will use, e.g. the Woodbury identity for
+`LinearOperatorLowRankUpdate`, FFTs for circulant operators or per-factor solves
+for `LinearOperatorKronecker`. Nodes whose `solve` would densify the operator
+and run an O(N^3) factorization, such as `LinearOperatorToeplitz`, are replaced
+by a preconditioned conjugate gradient solver when they are hinted to be
+self-adjoint and positive definite. The resulting `SolvePlan` solves with the
+rewritten operator and describes the chosen algorithms:
+
+```python
+plan = linear_operator_planner.plan_solve(operator)
+print(plan)
+x = plan.solve(rhs)
+```
+"""
+
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import while_loop
+from tensorflow.python.ops.linalg import linalg_impl as linalg
+from tensorflow.python.ops.linalg import linear_operator
+from tensorflow.python.ops.linalg import linear_operator_adjoint
+from tensorflow.python.ops.linalg import linear_operator_block_diag
+from tensorflow.python.ops.linalg import linear_operator_block_lower_triangular
+from tensorflow.python.ops.linalg import linear_operator_circulant
+from tensorflow.python.ops.linalg import linear_operator_composition
+from tensorflow.python.ops.linalg import linear_operator_diag
+from tensorflow.python.ops.linalg import linear_operator_full_matrix
+from tensorflow.python.ops.linalg import linear_operator_householder
+from tensorflow.python.ops.linalg import linear_operator_identity
+from tensorflow.python.ops.linalg import linear_operator_inversion
+from tensorflow.python.ops.linalg import linear_operator_kronecker
+from tensorflow.python.ops.linalg import linear_operator_low_rank_update
+from tensorflow.python.ops.linalg import linear_operator_lower_triangular
+from tensorflow.python.ops.linalg import linear_operator_permutation
+from tensorflow.python.ops.linalg import linear_operator_toeplitz
+from tensorflow.python.ops.linalg import linear_operator_tridiag
+from tensorflow.python.ops.linalg import linear_operator_zeros
+from tensorflow.python.ops.signal import fft_ops
+from tensorflow.python.platform import tf_logging as logging
+
+__all__ = ["SolvePlan", "plan_solve"]
+
+# Operators whose own `solve` exploits their structure without delegating to
+# other operators, as (type, algorithm, complexity of an [N, N] solve).
+_LEAF_ALGORITHMS = (
+    (linear_operator_identity.BaseLinearOperatorIdentity, "identity", "O(N)"),
+    (linear_operator_diag.LinearOperatorDiag, "diagonal", "O(N)"),
+    (linear_operator_permutation.LinearOperatorPermutation, "permutation",
+     "O(N)"),
+    (linear_operator_householder.LinearOperatorHouseholder, "householder",
+     "O(N)"),
+    (linear_operator_tridiag.LinearOperatorTridiag, "tridiagonal", "O(N)"),
+    (linear_operator_lower_triangular.LinearOperatorLowerTriangular,
+     "triangular", "O(N^2)"),
+    (linear_operator_circulant._BaseLinearOperatorCirculant,  # pylint: disable=protected-access
+     "fft", "O(N log N)"),
+    (linear_operator_inversion.LinearOperatorInversion, "inverse_matmul",
+     "matmul"),
+    (linear_operator_zeros.LinearOperatorZeros, "singular", "-"),
+)
+
+# Operators whose `solve` delegates to the solves of the operators in the
+# given constructor argument, as (type, argument, algorithm).
+_COMPOSITE_ALGORITHMS = (
+    (linear_operator_composition.LinearOperatorComposition, "operators",
+     "sequential_factor_solves"),
+    (linear_operator_kronecker.LinearOperatorKronecker, "operators",
+     "kronecker_factor_solves"),
+    (linear_operator_block_diag.LinearOperatorBlockDiag, "operators",
+     "block_solves"),
+    (linear_operator_block_lower_triangular.LinearOperatorBlockLowerTriangular,
+     "operators", "block_forward_substitution"),
+    (linear_operator_low_rank_update.LinearOperatorLowRankUpdate,
+     "base_operator", "woodbury"),
+    (linear_operator_adjoint.LinearOperatorAdjoint, "operator", "adjoint"),
+)
+
+_DENSE_ALGORITHMS = ("dense_lu", "dense_cholesky")
+
+
+class SolvePlan(object):
+  """The algorithms `plan_solve` chose for an operator and its children."""
+
+  def __init__(self, operator, algorithm, complexity, children=(),
+               preconditioner=None):
+    self._operator = operator
+    self._algorithm = algorithm
+    self._complexity = complexity
+    self._children = tuple(children)
+    self._preconditioner = preconditioner
+
+  @property
+  def operator(self):
+    """The `LinearOperator` whose `solve` implements this plan."""
+    return self._operator
+
+  @property
+  def algorithm(self):
+    """Name of the algorithm used to solve with this node."""
+    return self._algorithm
+
+  @property
+  def complexity(self):
+    """Complexity of solving one `[N]` system with this node."""
+    return self._complexity
+
+  @property
+  def children(self):
+    """Plans of the operators this node delegates its solve to."""
+    return self._children
+
+  @property
+  def preconditioner(self):
+    """Name of the preconditioner of an iterative solve, or None."""
+    return self._preconditioner
+
+  @property
+  def uses_dense_solve(self):
+    """Whether any node of the plan densifies its operator."""
+    return (self._algorithm in _DENSE_ALGORITHMS or
+            any(child.uses_dense_solve for child in self._children))
+
+  def solve(self, rhs, adjoint=False, adjoint_arg=False, name="solve"):
+    """Solves `A X = rhs` following the plan. See `LinearOperator.solve`."""
+    return self._operator.solve(
+        rhs, adjoint=adjoint, adjoint_arg=adjoint_arg, name=name)
+
+  def solvevec(self, rhs, adjoint=False, name="solve"):
+    """Solves `A x = rhs` following the plan. See `LinearOperator.solvevec`."""
+    return self._operator.solvevec(rhs, adjoint=adjoint, name=name)
+
+  def _describe(self, depth):
+    operator = self._operator
+    if isinstance(operator, _LinearOperatorIterativeSolve):
+      operator = operator.operator
+    description = "%s%s (%s): %s, %s" % ("  " * depth, operator.name,
+                                         type(operator).__name__,
+                                         self._algorithm, self._complexity)
+    if self._preconditioner is not None:
+      description += ", preconditioner: %s" % self._preconditioner
+    return [description] + [
+        line for child in self._children
+        for line in child._describe(depth + 1)  # pylint: disable=protected-access
+    ]
+
+  def __str__(self):
+    return "\n".join(self._describe(0))
+
+  def __repr__(self):
+    return "<SolvePlan %s>" % self._algorithm
+
+
+def plan_solve(operator, prefer_iterative=False, tol=1e-6, max_iter=None):
+  """Chooses structure-exploiting algorithms to solve with `operator`.
+
+  Args:
+    operator: A square `LinearOperator`.
+    prefer_iterative: Python `bool`. If `True`, also use conjugate gradients
+      for self-adjoint positive definite dense operators, which only pays off
+      when few iterations are needed.
+    tol: Relative residual tolerance of iterative solves.
+    max_iter: Maximum number of iterations of iterative solves. Defaults to
+      the dimension of the operator.
+
+  Returns:
+    A `SolvePlan`.
+  """
+  plan = _plan(operator, prefer_iterative, tol, max_iter)
+  logging.vlog(1, "Solve plan for %s:\n%s", operator.name, plan)
+  return plan
+
+
+def _is_spd(operator):
+  return bool(operator.is_self_adjoint and operator.is_positive_definite)
+
+
+def _plan(operator, prefer_iterative, tol, max_iter):
+  """Returns the `SolvePlan` of `operator`."""
+  for cls, algorithm, complexity in _LEAF_ALGORITHMS:
+    if isinstance(operator, cls):
+      return SolvePlan(operator, algorithm, complexity)
+
+  for cls, field, algorithm in _COMPOSITE_ALGORITHMS:
+    if isinstance(operator, cls):
+      children = operator.parameters[field]
+      child_plans, new_children = _plan_children(
+          children, prefer_iterative, tol, max_iter)
+      if any(plan.operator is not child for plan, child in zip(
+          child_plans, _flatten_operators(children))):
+        # Rebuild the operator around the rewritten children.
+        parameters = operator.parameters
+        parameters[field] = new_children
+        operator = type(operator)(**parameters)
+      return SolvePlan(operator, algorithm, "sum of children", child_plans)
+
+  if isinstance(operator, linear_operator_toeplitz.LinearOperatorToeplitz):
+    if _is_spd(operator):
+      return SolvePlan(
+          _LinearOperatorIterativeSolve(
+              operator, _toeplitz_preconditioner(operator), tol, max_iter),
+          "conjugate_gradient", "O(N log N) per iteration",
+          preconditioner="circulant")
+    return _dense_plan(operator)
+
+  native_solve = (
+      type(operator)._solve is not linear_operator.LinearOperator._solve)  # pylint: disable=protected-access
+  is_full_matrix = isinstance(
+      operator, linear_operator_full_matrix.LinearOperatorFullMatrix)
+  if native_solve and not is_full_matrix:
+    return SolvePlan(operator, "native", "unknown")
+  if _is_spd(operator) and (prefer_iterative or not native_solve):
+    preconditioner = None
+    if (is_full_matrix or type(operator)._diag_part  # pylint: disable=protected-access
+        is not linear_operator.LinearOperator._diag_part):  # pylint: disable=protected-access
+      preconditioner = linear_operator_diag.LinearOperatorDiag(
+          math_ops.reciprocal(operator.diag_part()),
+          is_self_adjoint=True,
+          is_positive_definite=True)
+    return SolvePlan(
+        _LinearOperatorIterativeSolve(operator, preconditioner, tol, max_iter),
+        "conjugate_gradient", "O(matmul) per iteration",
+        preconditioner="jacobi" if preconditioner is not None else None)
+  return _dense_plan(operator)
+
+
+def _plan_children(children, prefer_iterative, tol, max_iter):
+  """Plans an operator, a list of operators or a list of lists of operators.
+
+  Returns:
+    A tuple of the flat list of child plans and `children` with every
+    operator replaced by the operator of its plan.
+  """
+  if isinstance(children, linear_operator.LinearOperator):
+    plan = _plan(children, prefer_iterative, tol, max_iter)
+    return [plan], plan.operator
+  plans = []
+  new_children = []
+  for child in children:
+    if isinstance(child, (list, tuple)):
+      # `LinearOperatorBlockLowerTriangular` takes a list of lists.
+      row_plans = [_plan(o, prefer_iterative, tol, max_iter) for o in child]
+      plans.extend(row_plans)
+      new_children.append([plan.operator for plan in row_plans])
+    else:
+      plan = _plan(child, prefer_iterative, tol, max_iter)
+      plans.append(plan)
+      new_children.append(plan.operator)
+  return plans, new_children
+
+
+def _flatten_operators(children):
+  if isinstance(children, linear_operator.LinearOperator):
+    return [children]
+  return [
+      o for child in children
+      for o in (child if isinstance(child, (list, tuple)) else [child])
+  ]
+
+
+def _dense_plan(operator):
+  algorithm = ("dense_cholesky" if operator._can_use_cholesky()  # pylint: disable=protected-access
+               else "dense_lu")
+  return SolvePlan(operator, algorithm, "O(N^3)")
+
+
+def _toeplitz_preconditioner(operator):
+  """Returns the inverse of T. Chan's optimal circulant approximation."""
+  # The optimal circulant approximation of a Toeplitz matrix with first column
+  # [t_0, t_1, ..., t_{n-1}] and first row [t_0, t_{-1}, ..., t_{-(n-1)}] has
+  # first column c_k = ((n - k) t_k + k t_{k - n}) / n.
+  col = ops.convert_to_tensor(operator.col)
+  row = ops.convert_to_tensor(operator.row)
+  n = math_ops.cast(array_ops.shape(col)[-1], col.dtype.real_dtype)
+  k = math_ops.range(n, dtype=col.dtype.real_dtype)
+  wrapped_row = array_ops.concat(
+      [array_ops.zeros_like(row[..., :1]),
+       array_ops.reverse(row[..., 1:], axis=[-1])], axis=-1)
+  circulant_col = (math_ops.cast((n - k) / n, col.dtype) * col +
+                   math_ops.cast(k / n, col.dtype) * wrapped_row)
+  if not circulant_col.dtype.is_complex:
+    complex_dtype = (dtypes.complex128 if circulant_col.dtype == dtypes.float64
+                     else dtypes.complex64)
+    circulant_col = math_ops.cast(circulant_col, complex_dtype)
+  circulant = linear_operator_circulant.LinearOperatorCirculant(
+      fft_ops.fft(circulant_col),
+      input_output_dtype=operator.dtype,
+      is_non_singular=True,
+      is_self_adjoint=True,
+      is_positive_definite=True)
+  return circulant.inverse()
+
+
+def _conjugate_gradient(operator, rhs, preconditioner, tol, max_iter):
+  """Solves `operator X = rhs` for all columns of `rhs` simultaneously."""
+  batch_shape = array_ops.broadcast_dynamic_shape(
+      array_ops.shape(rhs)[:-2], operator.batch_shape_tensor())
+  rhs = array_ops.broadcast_to(
+      rhs, array_ops.concat([batch_shape, array_ops.shape(rhs)[-2:]], 0))
+  if max_iter is None:
+    max_iter = operator.domain_dimension_tensor()
+  threshold = tol * linalg.norm(rhs, axis=-2, keepdims=True)
+
+  def dot(x, y):
+    return math_ops.reduce_sum(math_ops.conj(x) * y, axis=-2, keepdims=True)
+
+  def precondition(r):
+    return r if preconditioner is None else preconditioner.matmul(r)
+
+  def cond(i, unused_x, r, unused_p, unused_gamma):
+    return math_ops.logical_and(
+        i < max_iter,
+        math_ops.reduce_any(linalg.norm(r, axis=-2, keepdims=True) >
+                            threshold))
+
+  def body(i, x, r, p, gamma):
+    q = operator.matmul(p)
+    # Converged columns have `gamma == 0` and are left unchanged.
+    alpha = math_ops.div_no_nan(gamma, dot(p, q))
+    x += alpha * p
+    r -= alpha * q
+    z = precondition(r)
+    new_gamma = dot(r, z)
+    p = z + math_ops.div_no_nan(new_gamma, gamma) * p
+    return i + 1, x, r, p, new_gamma
+
+  z = precondition(rhs)
+  _, x, _, _, _ = while_loop.while_loop(
+      cond, body,
+      [0, array_ops.zeros_like(rhs), rhs, z, dot(rhs, z)])
+  return x
+
+
+@linear_operator.make_composite_tensor
+class _LinearOperatorIterativeSolve(linear_operator.LinearOperator):
+  """Solves with a self-adjoint positive definite operator using CG."""
+
+  def __init__(self,
+               operator,
+               preconditioner=None,
+               tol=1e-6,
+               max_iter=None,
+               name=None):
+    parameters = dict(
+        operator=operator,
+        preconditioner=preconditioner,
+        tol=tol,
+        max_iter=max_iter,
+        name=name)
+    self._operator = operator
+    self._preconditioner = preconditioner
+    self._tol = tol
+    self._max_iter = max_iter
+    if name is None:
+      name = operator.name + "_iterative_solve"
+    with ops.name_scope(name):
+      super(_LinearOperatorIterativeSolve, self).__init__(
+          dtype=operator.dtype,
+          is_non_singular=True,
+          is_self_adjoint=True,
+          is_positive_definite=True,
+          is_square=True,
+          parameters=parameters,
+          name=name)
+
+  @property
+  def operator(self):
+    return self._operator
+
+  @property
+  def preconditioner(self):
+    return self._preconditioner
+
+  def _shape(self):
+    return self.operator.shape
+
+  def _shape_tensor(self):
+    return self.operator.shape_tensor()
+
+  def _matmul(self, x, adjoint=False, adjoint_arg=False):
+    return self.operator.matmul(x, adjoint=adjoint, adjoint_arg=adjoint_arg)
+
+  def _matvec(self, x, adjoint=False):
+    return self.operator.matvec(x, adjoint=adjoint)
+
+  def _determinant(self):
+    return self.operator.determinant()
+
+  def _log_abs_determinant(self):
+    return self.operator.log_abs_determinant()
+
+  def _trace(self):
+    return self.operator.trace()
+
+  def _diag_part(self):
+    return self.operator.diag_part()
+
+  def _to_dense(self):
+    return self.operator.to_dense()
+
+  def _solve(self, rhs, adjoint=False, adjoint_arg=False):
+    # The operator is self-adjoint, so `adjoint` does not change the system.
+    rhs = linalg.adjoint(rhs) if adjoint_arg else rhs
+    return _conjugate_gradient(self.operator, rhs, self.preconditioner,
+                               self._tol, self._max_iter)
+
+  @property
+  def _composite_tensor_fields(self):
+    return ("operator", "preconditioner")
+
+  @property
+  def _experimental_parameter_ndims_to_matrix_ndims(self):
+    return {"operator": 0, "preconditioner": 0}
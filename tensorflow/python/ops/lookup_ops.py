@@ -16,8 +16,11 @@
 # pylint: disable=g-bad-name
 import collections
 import functools
+import itertools
 import uuid
 
+import numpy as np
+
 from tensorflow.python.checkpoint import saveable_compat
 from tensorflow.python.eager import context
 from tensorflow.python.framework import constant_op
@@ -27,12 +30,18 @@ from tensorflow.python.framework import sparse_tensor
 from tensorflow.python.framework import tensor as tensor_lib
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import tensor_util
+from tensorflow.python.lib.io import file_io
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import array_ops_stack
+from tensorflow.python.ops import cond
+from tensorflow.python.ops import control_flow_assert
 from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import gen_array_ops
 from tensorflow.python.ops import gen_lookup_ops
 # Ensure lookup gradients are registered
 from tensorflow.python.ops import lookup_grad  # pylint: disable=unused-import
 from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import sort_ops
 from tensorflow.python.ops import string_ops
 # go/tf-wildcard-import
 # pylint: disable=wildcard-import
@@ -45,6 +54,7 @@ from tensorflow.python.trackable import resource
 from tensorflow.python.training.saver import BaseSaverBuilder
 from tensorflow.python.types import internal
 from tensorflow.python.util import compat as compat_util
+from tensorflow.python.util.compat import collections_abc
 from tensorflow.python.util.deprecation import deprecated
 from tensorflow.python.util.tf_export import tf_export
 
@@ -917,6 +927,484 @@ class TextFileIdTableInitializer(TextFileInitializer):
         name=name)
 
 
+def _parse_text_vocabulary_lines(filename, lines, line_numbers, key_dtype,
+                                 key_index, value_dtype, value_index, delimiter,
+                                 offset):
+  """Parses keys and values of lines of a text vocabulary file.
+
+  Follows the semantics of `TextFileInitializer`, so that a vocabulary can be
+  parsed in batches of lines with a few vectorized ops per batch.
+
+  Args:
+    filename: Scalar string `Tensor` with the name of the file, for errors.
+    lines: 1-D string `Tensor` of lines, without line breaks.
+    line_numbers: 1-D int64 `Tensor` of the zero-based line numbers of `lines`.
+    key_dtype: The key data type.
+    key_index: The `TextFileIndex` or column of the keys.
+    value_dtype: The value data type.
+    value_index: The `TextFileIndex` or column of the values.
+    delimiter: The delimiter to separate fields in a line.
+    offset: Number added to line numbers, and to int32 values.
+
+  Returns:
+    A tuple of `keys` and `values` tensors.
+
+  Raises:
+    InvalidArgumentError: If a line has fewer columns than `key_index` or
+      `value_index` need.
+  """
+  tokens = None
+  checks = []
+  max_index = max(key_index, value_index)
+  if max_index >= 0:
+    tokens = string_ops.string_split_v2(lines, sep=delimiter)
+    num_columns = math_ops.unsorted_segment_max(
+        tokens.indices[:, 1] + 1, tokens.indices[:, 0],
+        array_ops.size(lines, out_type=dtypes.int64))
+    is_short = math_ops.less(num_columns, max_index + 1)
+    checks.append(
+        control_flow_assert.Assert(
+            math_ops.logical_not(math_ops.reduce_any(is_short)), [
+                "Invalid number of columns in", filename, ": expected",
+                max_index + 1, "columns on lines",
+                array_ops.boolean_mask(line_numbers, is_short)
+            ]))
+  with ops.control_dependencies(checks):
+    keys = _text_vocabulary_column(lines, line_numbers, tokens, key_index,
+                                   key_dtype, offset)
+    values = _text_vocabulary_column(lines, line_numbers, tokens, value_index,
+                                     value_dtype, offset)
+  return keys, values
+
+
+def _text_vocabulary_column(lines, line_numbers, tokens, index, dtype, offset):
+  """Returns the keys or values of the lines (see `TextFileIndex`)."""
+  if index == TextFileIndex.LINE_NUMBER:
+    return line_numbers + offset
+  if index == TextFileIndex.WHOLE_LINE:
+    column = lines
+  else:
+    column = array_ops.boolean_mask(
+        tokens.values, math_ops.equal(tokens.indices[:, 1], index))
+  if dtype == dtypes.string:
+    return column
+  column = string_ops.string_to_number(column, out_type=dtype)
+  if dtype == dtypes.int32 and offset:
+    column += offset
+  return column
+
+
+# Number of lines parsed at once when converting a text vocabulary file.
+_TEXT_VOCABULARY_BATCH_SIZE = 65536
+
+# Layout of binary vocabulary files, with little-endian numbers:
+# * The magic string below.
+# * A header of int64 values: number of entries, key and value `DataType`s,
+#   and the positions of the lookup keys, key offsets, key data, value offsets
+#   and value data sections.
+# * The sections, each aligned to and padded to a multiple of
+#   `_BINARY_VOCABULARY_ALIGNMENT` bytes, so that they can be sliced out of a
+#   memory-mapped file without copies.
+# The entries are sorted by their int64 lookup key: the key itself for integer
+# keys, the fingerprint of the key for string keys. The lookup keys section
+# holds the sorted lookup keys, padded with the largest int64. Numeric keys or
+# values are stored as an array in their data section and have no offsets
+# section (position -1). String keys or values are stored as
+# `num_entries + 1` int64 offsets into their data section, which holds the
+# concatenated strings.
+_BINARY_VOCABULARY_MAGIC = b"TFVOCAB2"
+_BINARY_VOCABULARY_HEADER_SIZE = len(_BINARY_VOCABULARY_MAGIC) + 8 * 8
+_BINARY_VOCABULARY_ALIGNMENT = 64
+# `string_to_hash_bucket_fast` with this many buckets maps string keys to
+# non-negative int64 lookup keys.
+_STRING_KEY_HASH_BUCKETS = 2**63 - 1
+
+BinaryVocabulary = collections.namedtuple("BinaryVocabulary",
+                                          ["keys", "values"])
+
+_BinaryVocabularyHeader = collections.namedtuple("_BinaryVocabularyHeader", [
+    "size", "key_dtype", "value_dtype", "lookup_keys_position",
+    "key_offsets_position", "key_data_position", "value_offsets_position",
+    "value_data_position"
+])
+
+
+def _aligned(size):
+  """Rounds `size` up to a multiple of `_BINARY_VOCABULARY_ALIGNMENT`."""
+  return size + -size % _BINARY_VOCABULARY_ALIGNMENT
+
+
+def _binary_vocabulary_lookup_keys(keys, dtype):
+  """Returns the int64 lookup keys of a key `Tensor`."""
+  if dtype == dtypes.string:
+    return string_ops.string_to_hash_bucket_fast(keys,
+                                                 _STRING_KEY_HASH_BUCKETS)
+  if not dtype.is_integer:
+    raise TypeError("Binary vocabularies need string or integer keys, "
+                    f"received: {dtype}.")
+  return math_ops.cast(keys, dtypes.int64)
+
+
+def _binary_vocabulary_section(data, dtype):
+  """Returns the offsets (or None) and data sections for keys or values."""
+  if dtype == dtypes.string:
+    data = [compat_util.as_bytes(d) for d in data]
+    offsets = np.zeros(len(data) + 1, dtype="<i8")
+    np.cumsum([len(d) for d in data], out=offsets[1:])
+    return offsets.tobytes(), b"".join(data)
+  numpy_dtype = np.dtype(dtype.as_numpy_dtype).newbyteorder("<")
+  return None, np.asarray(data, dtype=numpy_dtype).tobytes()
+
+
+def write_binary_vocabulary(keys, values, output_filename, key_dtype=None,
+                            value_dtype=None):
+  """Writes keys and values to a binary vocabulary file.
+
+  Binary vocabulary files are memory-mapped by `MemmappedVocabularyTable` and
+  `read_binary_vocabulary`.
+
+  Args:
+    keys: A 1-D array-like or `Tensor` of unique string or integer keys.
+    values: A 1-D array-like or `Tensor` of values, of the same size as `keys`.
+    output_filename: Path of the file to write.
+    key_dtype: The key data type, inferred from `keys` if not given.
+    value_dtype: The value data type, inferred from `values` if not given.
+
+  Raises:
+    TypeError: If the keys are neither strings nor integers.
+    ValueError: If `keys` and `values` have different sizes, if `keys` is
+      empty, or if two keys have the same lookup key.
+  """
+  with context.eager_mode():
+    keys = ops.convert_to_tensor(keys, dtype=key_dtype)
+    values = ops.convert_to_tensor(values, dtype=value_dtype)
+    key_dtype, value_dtype = keys.dtype, values.dtype
+    lookup_keys = _binary_vocabulary_lookup_keys(keys, key_dtype)
+    lookup_keys = lookup_keys.numpy().reshape([-1])
+    keys, values = keys.numpy().reshape([-1]), values.numpy().reshape([-1])
+  if keys.size != values.size:
+    raise ValueError("`keys` and `values` must have the same size, received: "
+                     f"{keys.size} and {values.size}.")
+  if not keys.size:
+    raise ValueError("Binary vocabularies must not be empty.")
+
+  order = np.argsort(lookup_keys, kind="stable")
+  lookup_keys, keys, values = lookup_keys[order], keys[order], values[order]
+  duplicates = np.flatnonzero(lookup_keys[1:] == lookup_keys[:-1])
+  if duplicates.size:
+    raise ValueError(
+        "Keys of binary vocabularies must be unique, and string keys must "
+        "have distinct fingerprints. Received "
+        f"{keys[duplicates[0]]!r} and {keys[duplicates[0] + 1]!r}.")
+
+  padded_lookup_keys = np.full(
+      _aligned(lookup_keys.size * 8) // 8, np.iinfo(np.int64).max, dtype="<i8")
+  padded_lookup_keys[:lookup_keys.size] = lookup_keys
+  sections = [padded_lookup_keys.tobytes()]
+  sections.extend(_binary_vocabulary_section(keys, key_dtype))
+  sections.extend(_binary_vocabulary_section(values, value_dtype))
+
+  positions = []
+  position = _aligned(_BINARY_VOCABULARY_HEADER_SIZE)
+  for section in sections:
+    if section is None:
+      positions.append(-1)
+      continue
+    positions.append(position)
+    position += _aligned(len(section))
+
+  header = np.array(
+      [keys.size, key_dtype.as_datatype_enum, value_dtype.as_datatype_enum] +
+      positions,
+      dtype="<i8")
+  with file_io.FileIO(output_filename, "wb") as f:
+    f.write(_BINARY_VOCABULARY_MAGIC)
+    f.write(header.tobytes())
+    f.write(b"\0" * (-_BINARY_VOCABULARY_HEADER_SIZE %
+                     _BINARY_VOCABULARY_ALIGNMENT))
+    for section in sections:
+      if section is not None:
+        f.write(section)
+        f.write(b"\0" * (-len(section) % _BINARY_VOCABULARY_ALIGNMENT))
+
+
+def _text_vocabulary_lines(filename, vocab_size):
+  """Yields the lines of a text file, without line breaks."""
+  with file_io.FileIO(filename, "rb") as f:
+    for line_number, line in enumerate(f):
+      if vocab_size is not None and line_number >= vocab_size:
+        return
+      if line.endswith(b"\n"):
+        line = line[:-1]
+        if line.endswith(b"\r"):
+          line = line[:-1]
+      yield line
+
+
+def convert_text_vocabulary(filename,
+                            output_filename,
+                            key_dtype=dtypes.string,
+                            key_index=TextFileIndex.WHOLE_LINE,
+                            value_dtype=dtypes.int64,
+                            value_index=TextFileIndex.LINE_NUMBER,
+                            vocab_size=None,
+                            delimiter="\t",
+                            value_index_offset=0):
+  """Converts a text vocabulary file to the binary vocabulary format.
+
+  The text file is interpreted as by `TextFileInitializer` with the same
+  arguments, so that `MemmappedVocabularyTable(output_filename, key_dtype,
+  value_dtype, default_value)` looks up the same values as a table initialized
+  by that `TextFileInitializer`. The text file is streamed and parsed in
+  batches of lines.
+
+  Args:
+    filename: The text vocabulary file.
+    output_filename: Path of the binary vocabulary file to write.
+    key_dtype: See `TextFileInitializer`.
+    key_index: See `TextFileInitializer`.
+    value_dtype: See `TextFileInitializer`.
+    value_index: See `TextFileInitializer`.
+    vocab_size: See `TextFileInitializer`.
+    delimiter: See `TextFileInitializer`.
+    value_index_offset: See `TextFileInitializer`.
+
+  Raises:
+    InvalidArgumentError: If a line has fewer columns than `key_index` or
+      `value_index` need.
+    ValueError: If the file has fewer than `vocab_size` lines.
+  """
+  key_dtype = dtypes.as_dtype(key_dtype)
+  value_dtype = dtypes.as_dtype(value_dtype)
+  keys, values = [], []
+  line_number = 0
+  lines = _text_vocabulary_lines(filename, vocab_size)
+  with context.eager_mode():
+    while True:
+      batch = list(itertools.islice(lines, _TEXT_VOCABULARY_BATCH_SIZE))
+      if not batch:
+        break
+      batch_keys, batch_values = _parse_text_vocabulary_lines(
+          constant_op.constant(filename, dtype=dtypes.string),
+          constant_op.constant(batch, dtype=dtypes.string),
+          math_ops.range(
+              line_number, line_number + len(batch), dtype=dtypes.int64),
+          key_dtype, key_index, value_dtype, value_index, delimiter,
+          value_index_offset)
+      keys.append(batch_keys.numpy())
+      values.append(batch_values.numpy())
+      line_number += len(batch)
+  if vocab_size is not None and line_number < vocab_size:
+    raise ValueError(f"Invalid vocab_size in {filename}: expected "
+                     f"{vocab_size} lines, got {line_number}.")
+  write_binary_vocabulary(
+      np.concatenate(keys) if keys else [],
+      np.concatenate(values) if values else [], output_filename, key_dtype,
+      value_dtype)
+
+
+def _read_binary_vocabulary_header(filename):
+  """Returns the `_BinaryVocabularyHeader` of a binary vocabulary file."""
+  with file_io.FileIO(filename, "rb") as f:
+    content = f.read(_BINARY_VOCABULARY_HEADER_SIZE)
+  magic_size = len(_BINARY_VOCABULARY_MAGIC)
+  if (len(content) != _BINARY_VOCABULARY_HEADER_SIZE or
+      content[:magic_size] != _BINARY_VOCABULARY_MAGIC):
+    raise ValueError(f"{filename} is not a binary vocabulary file.")
+  header = [int(h) for h in np.frombuffer(content[magic_size:], dtype="<i8")]
+  header[1] = dtypes.as_dtype(header[1])
+  header[2] = dtypes.as_dtype(header[2])
+  return _BinaryVocabularyHeader(*header)
+
+
+class _MemmappedStrings(collections_abc.Sequence):
+  """Read-only sequence of the strings of a binary vocabulary section."""
+
+  def __init__(self, offsets, data):
+    self._offsets = offsets
+    self._data = data
+
+  def __len__(self):
+    return len(self._offsets) - 1
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(len(self)))]
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError(f"Index {index} out of range.")
+    return self._data[self._offsets[index]:self._offsets[index + 1]].tobytes()
+
+
+def read_binary_vocabulary(filename):
+  """Memory-maps the keys and values of a binary vocabulary file.
+
+  This is for Python consumers of the vocabulary. The file is mapped
+  read-only, so the operating system shares its pages between all processes
+  that read the same file.
+
+  Args:
+    filename: Path of a local binary vocabulary file.
+
+  Returns:
+    A `BinaryVocabulary` of `keys` and `values`, in the order of their lookup
+    keys. Numeric keys or values are numpy arrays backed by the mapped file,
+    string keys or values are sequences of `bytes`.
+
+  Raises:
+    ValueError: If the file is not a binary vocabulary file.
+  """
+  header = _read_binary_vocabulary_header(filename)
+  data = np.memmap(filename, dtype=np.uint8, mode="r")
+
+  def section(dtype, offsets_position, data_position):
+    if dtype == dtypes.string:
+      offsets = data[offsets_position:offsets_position +
+                     (header.size + 1) * 8].view("<i8")
+      return _MemmappedStrings(offsets, data[data_position:])
+    numpy_dtype = np.dtype(dtype.as_numpy_dtype).newbyteorder("<")
+    return data[data_position:data_position +
+                header.size * numpy_dtype.itemsize].view(numpy_dtype)
+
+  return BinaryVocabulary(
+      keys=section(header.key_dtype, header.key_offsets_position,
+                   header.key_data_position),
+      values=section(header.value_dtype, header.value_offsets_position,
+                     header.value_data_position))
+
+
+def _memmapped_section(data, position, size, dtype):
+  """Slices a section of a mapped binary vocabulary file without copies."""
+  # Slices whose bounds are aligned, reshapes and bitcasts alias their input.
+  section = array_ops.slice(data, [position], [_aligned(size * dtype.size)])
+  if dtype.size > 1:
+    section = array_ops.reshape(section, [-1, dtype.size])
+  return array_ops.bitcast(section, dtype)
+
+
+class MemmappedVocabularyTable(object):
+  """A read-only table backed by a memory-mapped binary vocabulary file.
+
+  Binary vocabulary files are written by `write_binary_vocabulary` or
+  `convert_text_vocabulary`. Instead of copying the vocabulary into a hash
+  table, the table maps the file with the `ImmutableConst` op and binary
+  searches its sorted lookup keys. Construction only reads the header of the
+  file, so it takes the same time for any vocabulary size, and the operating
+  system shares the mapped pages between all processes that use the same
+  file. Pages are read when lookups first touch them.
+
+  Lookups of string keys compare 64-bit fingerprints, which
+  `write_binary_vocabulary` checks to be distinct within the vocabulary.
+  Values must be numeric. The file must be on a local file system, must have
+  been written on a little-endian machine and must not change while it is
+  mapped. The table is not tracked for checkpoints or SavedModels.
+
+  Sample usage:
+
+  ```python
+  convert_text_vocabulary("vocab.txt", "vocab.bin")
+  table = MemmappedVocabularyTable("vocab.bin", tf.string, tf.int64, -1)
+  table.lookup(tf.constant(["emerson", "lake"]))
+  ```
+  """
+
+  def __init__(self, filename, key_dtype, value_dtype, default_value,
+               name=None):
+    """Constructs a table from a binary vocabulary file.
+
+    Args:
+      filename: Path of a local binary vocabulary file.
+      key_dtype: The `key` data type. Must match the file.
+      value_dtype: The `value` data type. Must match the file.
+      default_value: The value to use for keys missing from the vocabulary.
+      name: A name for the operation (optional).
+
+    Raises:
+      ValueError: If the file is not a binary vocabulary file of the given
+        data types, or if its values are not numeric.
+    """
+    key_dtype = dtypes.as_dtype(key_dtype)
+    value_dtype = dtypes.as_dtype(value_dtype)
+    header = _read_binary_vocabulary_header(filename)
+    if header.key_dtype != key_dtype or header.value_dtype != value_dtype:
+      raise ValueError(
+          f"{filename} has keys of type {header.key_dtype.name} and values of "
+          f"type {header.value_dtype.name}, but the table expects "
+          f"{key_dtype.name} and {value_dtype.name}.")
+    if value_dtype in (dtypes.string, dtypes.bool):
+      raise ValueError("MemmappedVocabularyTable needs numeric values, "
+                       f"received: {value_dtype}.")
+    self._key_dtype = key_dtype
+    self._value_dtype = value_dtype
+    self._size = header.size
+    self._name = name
+    file_size = file_io.stat(filename).length
+    with ops.init_scope():
+      with ops.name_scope(name, "memmapped_vocabulary_table"):
+        data = gen_array_ops.immutable_const(
+            dtype=dtypes.uint8,
+            shape=[file_size],
+            memory_region_name=filename)
+        self._lookup_keys = _memmapped_section(data,
+                                               header.lookup_keys_position,
+                                               header.size, dtypes.int64)
+        self._values = _memmapped_section(data, header.value_data_position,
+                                          header.size, value_dtype)
+        self._default_value = ops.convert_to_tensor(
+            default_value, dtype=value_dtype)
+
+  @property
+  def key_dtype(self):
+    """The table key dtype."""
+    return self._key_dtype
+
+  @property
+  def value_dtype(self):
+    """The table value dtype."""
+    return self._value_dtype
+
+  @property
+  def default_value(self):
+    """The default value of the table."""
+    return self._default_value
+
+  def size(self, name=None):
+    """Returns the number of elements in the table."""
+    with ops.name_scope(name, "memmapped_vocabulary_table_size"):
+      return constant_op.constant(self._size, dtype=dtypes.int64)
+
+  def lookup(self, keys, name=None):
+    """Looks up `keys` in the table, outputs the corresponding values.
+
+    The `default_value` is used for keys not present in the table.
+
+    Args:
+      keys: Keys to look up, a `Tensor` of any shape.
+      name: A name for the operation (optional).
+
+    Returns:
+      A `Tensor` of the same shape as `keys`, with the values of the table.
+
+    Raises:
+      TypeError: when `keys` do not match the table data type.
+    """
+    with ops.name_scope(name, "memmapped_vocabulary_table_lookup", [keys]):
+      keys = ops.convert_to_tensor(keys, dtype=self._key_dtype, name="keys")
+      lookup_keys = array_ops.reshape(
+          _binary_vocabulary_lookup_keys(keys, self._key_dtype), [-1])
+      index = array_ops.searchsorted(
+          self._lookup_keys, lookup_keys, out_type=dtypes.int64)
+      # Keys past the last entry are compared with the last entry, not with
+      # the padding of the lookup keys.
+      index = math_ops.minimum(index, self._size - 1)
+      found = math_ops.equal(
+          array_ops.gather(self._lookup_keys, index), lookup_keys)
+      values = array_ops.where_v2(found, array_ops.gather(self._values, index),
+                                  self._default_value)
+      return array_ops.reshape(values, array_ops.shape(keys))
+
+
 class HasherSpec(collections.namedtuple("HasherSpec", ["hasher", "key"])):
   """A structure for the spec of the hashing function to use for hash buckets.
 
@@ -1795,6 +2283,183 @@ def index_to_string_table_from_tensor(vocabulary_list,
     return StaticHashTableV1(init, default_value)
 
 
+HashTableStatistics = collections.namedtuple(
+    "HashTableStatistics", ["size", "hits", "misses", "evictions"])
+
+# Keys of the statistics table of `_EvictionState`.
+_TICK, _HITS, _MISSES, _EVICTIONS = 0, 1, 2, 3
+
+# Tables over capacity evict down to `capacity - capacity // 8` keys, so that
+# the access counters are sorted about once every `capacity // 8` new keys
+# rather than on every insert.
+_EVICTION_BATCH_DIVISOR = 8
+
+
+class _EvictionState(object):
+  """Access counters and statistics of a mutable table with a capacity.
+
+  For every key of the table, a companion `MutableHashTable` stores the tick
+  of its last access (LRU) or its number of accesses (LFU). When the table
+  grows beyond its capacity, the keys with the smallest counters are removed
+  until the table is down to a low watermark below the capacity, which
+  amortizes the cost of sorting the counters over many inserts. Counters and
+  statistics are only approximate when the table is updated concurrently.
+  """
+
+  def __init__(self, table, capacity, eviction_policy, name, checkpoint,
+               is_anonymous):
+    if capacity <= 0:
+      raise ValueError(f"`capacity` should be > 0, received: {capacity}")
+    if eviction_policy not in ("lru", "lfu"):
+      raise ValueError("`eviction_policy` should be 'lru' or 'lfu', "
+                       f"received: {eviction_policy}")
+    self.capacity = capacity
+    self.low_watermark = capacity - capacity // _EVICTION_BATCH_DIVISOR
+    self.eviction_policy = eviction_policy
+    # The companion tables are separate trackables, so they are checkpointed
+    # and exported to SavedModels like any other table.
+    self.access = table._track_trackable(  # pylint: disable=protected-access
+        MutableHashTable(
+            table.key_dtype,
+            dtypes.int64,
+            -1,
+            name="%s_access" % name,
+            checkpoint=checkpoint,
+            experimental_is_anonymous=is_anonymous), "_eviction_access")
+    self.statistics = table._track_trackable(  # pylint: disable=protected-access
+        MutableHashTable(
+            dtypes.int64,
+            dtypes.int64,
+            0,
+            name="%s_statistics" % name,
+            checkpoint=checkpoint,
+            experimental_is_anonymous=is_anonymous), "_eviction_statistics")
+
+  def _update_counters(self, keys, tick, found):
+    """Updates the counters of the unique `keys` accessed at `tick`.
+
+    Args:
+      keys: The accessed keys.
+      tick: The tick of the access.
+      found: If True, only counters of keys in the table are updated.
+
+    Returns:
+      The update op, and the number of found keys if `found` is True or the
+      unique keys otherwise.
+    """
+    unique_keys, _, counts = array_ops.unique_with_counts(
+        array_ops.reshape(keys, [-1]), out_idx=dtypes.int64)
+    access = self.access.lookup(unique_keys)
+    if found:
+      mask = access >= 0
+      result = math_ops.reduce_sum(array_ops.boolean_mask(counts, mask))
+      unique_keys = array_ops.boolean_mask(unique_keys, mask)
+      access = array_ops.boolean_mask(access, mask)
+      counts = array_ops.boolean_mask(counts, mask)
+    else:
+      result = unique_keys
+    if self.eviction_policy == "lru":
+      new_access = array_ops.fill(array_ops.shape(unique_keys), tick)
+    else:
+      new_access = math_ops.maximum(access, 0) + counts
+    return self.access.insert(unique_keys, new_access), result
+
+  def record_lookup(self, keys):
+    """Returns an op that records a lookup of `keys`."""
+    statistics_keys = constant_op.constant([_TICK, _HITS, _MISSES],
+                                           dtypes.int64)
+    statistics = self.statistics.lookup(statistics_keys)
+    tick = statistics[0] + 1
+    access_op, hits = self._update_counters(keys, tick, found=True)
+    misses = array_ops.size(keys, out_type=dtypes.int64) - hits
+    statistics_op = self.statistics.insert(
+        statistics_keys,
+        array_ops_stack.stack(
+            [tick, statistics[1] + hits, statistics[2] + misses]))
+    return control_flow_ops.group(access_op, statistics_op)
+
+  def record_insert(self, table, keys, insert_op):
+    """Returns an op that records an insert of `keys` and evicts keys."""
+    with ops.control_dependencies([insert_op]):
+      tick_key = constant_op.constant([_TICK], dtypes.int64)
+      tick = self.statistics.lookup(tick_key)[0] + 1
+      access_op, inserted = self._update_counters(keys, tick, found=False)
+      tick_op = self.statistics.insert(tick_key, array_ops.reshape(tick, [1]))
+    with ops.control_dependencies([access_op, tick_op]):
+      return self.evict(table, inserted)
+
+  def evict(self, table, inserted):
+    """Returns an op that evicts keys once `table` exceeds its capacity.
+
+    Keys are evicted down to `low_watermark`, but keys of the last insert are
+    only evicted as needed to fit the capacity.
+
+    Args:
+      table: The table to evict keys from.
+      inserted: Unique keys of the last insert, which are only evicted if the
+        insert alone exceeds the capacity. Otherwise new keys would always be
+        evicted first by the LFU policy.
+
+    Returns:
+      The eviction op.
+    """
+    size = table.size()
+
+    def evict_keys():
+      keys, access = self.access.export()
+      num_inserted = array_ops.size(inserted, out_type=dtypes.int64)
+      num_evicted = math_ops.maximum(
+          size - self.capacity,
+          math_ops.minimum(size - self.low_watermark, size - num_inserted))
+      num_candidates = num_evicted + num_inserted
+      candidates = array_ops.gather(
+          keys, sort_ops.argsort(access, stable=True)[:num_candidates])
+      # `setdiff1d` hashes its second argument and keeps the order of the
+      # first, so splitting the candidates is linear in their number.
+      others, _ = array_ops.setdiff1d(candidates, inserted)
+      inserted_candidates, _ = array_ops.setdiff1d(candidates, others)
+      evicted = array_ops.concat([others, inserted_candidates],
+                                 0)[:num_evicted]
+      evictions_key = constant_op.constant([_EVICTIONS], dtypes.int64)
+      evictions = self.statistics.lookup(evictions_key) + num_evicted
+      with ops.control_dependencies([
+          table.remove(evicted),
+          self.access.remove(evicted),
+          self.statistics.insert(evictions_key, evictions)
+      ]):
+        return array_ops.identity(num_evicted)
+
+    num_evicted = cond.cond(
+        size > self.capacity, evict_keys,
+        lambda: constant_op.constant(0, dtypes.int64))
+    return control_flow_ops.group(num_evicted)
+
+  def get_statistics(self, table):
+    values = self.statistics.lookup(
+        constant_op.constant([_HITS, _MISSES, _EVICTIONS], dtypes.int64))
+    return HashTableStatistics(
+        size=table.size(),
+        hits=values[0],
+        misses=values[1],
+        evictions=values[2])
+
+
+def _export_chunks(table, keys, chunk_size):
+  """Yields chunks of `keys` of `table` with their values."""
+  if not context.executing_eagerly():
+    raise RuntimeError("`export_chunks` is only supported in eager mode.")
+  if chunk_size <= 0:
+    raise ValueError(f"`chunk_size` should be > 0, received: {chunk_size}")
+  num_keys = int(array_ops.size(keys))
+  for start in range(0, num_keys, chunk_size):
+    chunk_keys = keys[start:start + chunk_size]
+    with ops.colocate_with(table.resource_handle):
+      # Reads the values without recording an access.
+      chunk_values = gen_lookup_ops.lookup_table_find_v2(
+          table.resource_handle, chunk_keys, table._default_value)  # pylint: disable=protected-access
+    yield chunk_keys, chunk_values
+
+
 @tf_export("lookup.experimental.MutableHashTable")
 @saveable_compat.legacy_saveable_name("table")
 class MutableHashTable(LookupInterface):
@@ -1824,6 +2489,25 @@ class MutableHashTable(LookupInterface):
   [b'a', b'b']
   >>> sorted(table.export()[1].numpy())
   [7, 8]
+
+  If a `capacity` is given, the table keeps at most `capacity` keys: once an
+  insert grows the table beyond it, the least recently used keys (or the least
+  frequently used keys with `eviction_policy="lfu"`) are removed. The access
+  counters are stored in a companion table and checkpointed with the table.
+
+  >>> table = tf.lookup.experimental.MutableHashTable(
+  ...     key_dtype=tf.int64, value_dtype=tf.int64, default_value=-1,
+  ...     capacity=2)
+  >>> table.insert(tf.constant([1, 2], dtype=tf.int64),
+  ...              tf.constant([10, 20], dtype=tf.int64))
+  >>> table.lookup(tf.constant([1], dtype=tf.int64)).numpy()
+  array([10])
+  >>> table.insert(tf.constant([3], dtype=tf.int64),
+  ...              tf.constant([30], dtype=tf.int64))
+  >>> table.lookup(tf.constant([1, 2, 3], dtype=tf.int64)).numpy()
+  array([10, -1, 30])
+  >>> int(table.statistics().evictions)
+  1
   """
 
   def __init__(self,
@@ -1832,7 +2516,9 @@ class MutableHashTable(LookupInterface):
                default_value,
                name="MutableHashTable",
                checkpoint=True,
-               experimental_is_anonymous=False):
+               experimental_is_anonymous=False,
+               capacity=None,
+               eviction_policy="lru"):
     """Creates an empty `MutableHashTable` object.
 
     Creates a table, the type of its keys and values are specified by key_dtype
@@ -1852,12 +2538,20 @@ class MutableHashTable(LookupInterface):
         be looked up by a name. When all resource handles pointing to
         that resource are gone, the resource will be deleted
         automatically.
+      capacity: Optional maximum number of keys in the table. When an insert
+        grows the table beyond `capacity`, keys are evicted according to
+        `eviction_policy` until about 1/8 of the capacity is free again, and
+        hit, miss and eviction counts are available from `statistics`.
+      eviction_policy: Either `"lru"` to evict the least recently used keys or
+        `"lfu"` to evict the least frequently used keys first. Only used if
+        `capacity` is set.
 
     Returns:
       A `MutableHashTable` object.
 
     Raises:
-      ValueError: If checkpoint is True and no name was specified.
+      ValueError: If checkpoint is True and no name was specified, or if
+        `capacity` or `eviction_policy` is invalid.
     """
     self._default_value = ops.convert_to_tensor(
         default_value, dtype=value_dtype)
@@ -1877,6 +2571,12 @@ class MutableHashTable(LookupInterface):
         self._shared_name = "table_%d" % (ops.uid(),)
     super(MutableHashTable, self).__init__(key_dtype, value_dtype)
     self._resource_handle = self._create_resource()
+    self._capacity = capacity
+    self._eviction_policy = eviction_policy
+    self._eviction = None
+    if capacity is not None:
+      self._eviction = _EvictionState(self, capacity, eviction_policy, name,
+                                      checkpoint, experimental_is_anonymous)
     if checkpoint:
       saveable = MutableHashTable._Saveable(self, name)
       if not context.executing_eagerly():
@@ -1962,6 +2662,8 @@ class MutableHashTable(LookupInterface):
     with ops.name_scope(name, "%s_lookup_table_remove" % self.name,
                         (self.resource_handle, keys, self._default_value)):
       op = gen_lookup_ops.lookup_table_remove_v2(self.resource_handle, keys)
+      if self._eviction is not None:
+        op = control_flow_ops.group(op, self._eviction.access.remove(keys))
 
     return op
 
@@ -2006,6 +2708,9 @@ class MutableHashTable(LookupInterface):
         values = gen_lookup_ops.lookup_table_find_v2(
             self.resource_handle, keys, dynamic_default_values
             if dynamic_default_values is not None else self._default_value)
+      if self._eviction is not None:
+        with ops.control_dependencies([self._eviction.record_lookup(keys)]):
+          values = array_ops.identity(values)
     return values
 
   def insert(self, keys, values, name=None):
@@ -2033,6 +2738,8 @@ class MutableHashTable(LookupInterface):
         # pylint: disable=protected-access
         op = gen_lookup_ops.lookup_table_insert_v2(self.resource_handle, keys,
                                                    values)
+      if self._eviction is not None:
+        op = self._eviction.record_insert(self, keys, op)
     return op
 
   def export(self, name=None):
@@ -2052,6 +2759,51 @@ class MutableHashTable(LookupInterface):
             self.resource_handle, self._key_dtype, self._value_dtype)
     return exported_keys, exported_values
 
+  def export_chunks(self, chunk_size):
+    """Yields the keys and values of the table in chunks.
+
+    Only the keys are exported at once; the values are read chunk by chunk, so
+    tables with large values can be written out without materializing all of
+    them. For tables with a `capacity`, the keys are read from the access
+    counters. Only supported in eager mode.
+
+    Args:
+      chunk_size: Maximum number of keys per chunk.
+
+    Yields:
+      Pairs of `keys` and `values` tensors.
+
+    Raises:
+      RuntimeError: If not executing eagerly.
+      ValueError: If `chunk_size` is not positive.
+    """
+    if self._eviction is not None:
+      keys = self._eviction.access.export()[0]
+    else:
+      keys = self.export()[0]
+    return _export_chunks(self, keys, chunk_size)
+
+  def statistics(self, name=None):
+    """Returns the size, hit, miss and eviction counts of the table.
+
+    Hits and misses count the keys passed to `lookup`. Only available for tables
+    with a `capacity`.
+
+    Args:
+      name: A name for the operation (optional).
+
+    Returns:
+      A `HashTableStatistics` of scalar int64 tensors.
+
+    Raises:
+      ValueError: If the table has no `capacity`.
+    """
+    if self._eviction is None:
+      raise ValueError("`statistics` requires a table with a `capacity`.")
+    with ops.name_scope(name, "%s_lookup_table_statistics" % self.name,
+                        [self.resource_handle]):
+      return self._eviction.get_statistics(self)
+
   def _serialize_to_tensors(self):
     """Implements checkpointing protocols for `Trackable`."""
     tensors = self.export()
@@ -2076,7 +2828,9 @@ class MutableHashTable(LookupInterface):
           self._default_value,
           self._name,
           self._checkpoint,
-          self._is_anonymous
+          self._is_anonymous,
+          self._capacity,
+          self._eviction_policy
       )
 
     # Copy values from `self` to copy of `self`
@@ -2153,7 +2907,9 @@ class DenseHashTable(LookupInterface):
                initial_num_buckets=None,
                name="MutableDenseHashTable",
                checkpoint=True,
-               experimental_is_anonymous=False):
+               experimental_is_anonymous=False,
+               capacity=None,
+               eviction_policy="lru"):
     """Creates an empty `DenseHashTable` object.
 
     Creates a table, the type of its keys and values are specified by key_dtype
@@ -2184,13 +2940,28 @@ class DenseHashTable(LookupInterface):
         be looked up by a name. When all resource handles pointing to
         that resource are gone, the resource will be deleted
         automatically.
+      capacity: Optional maximum number of keys in the table. When an insert
+        grows the table beyond `capacity`, keys are evicted according to
+        `eviction_policy` until about 1/8 of the capacity is free again, and
+        hit, miss and eviction counts are available from `statistics`.
+      eviction_policy: Either `"lru"` to evict the least recently used keys or
+        `"lfu"` to evict the least frequently used keys first. Only used if
+        `capacity` is set.
 
     Returns:
       A `DenseHashTable` object.
 
     Raises:
-      ValueError: If checkpoint is True and no name was specified.
+      ValueError: If checkpoint is True and no name was specified, or if
+        `capacity` or `eviction_policy` is invalid, or if `capacity` is set
+        for non-scalar keys.
     """
+    if capacity is not None:
+      key_shape = ops.convert_to_tensor(
+          empty_key, dtype=key_dtype).get_shape()
+      if key_shape.ndims != 0:
+        raise ValueError("`capacity` is only supported for scalar keys, but "
+                         f"`empty_key` has shape {key_shape}.")
     self._default_value = ops.convert_to_tensor(
         default_value, dtype=value_dtype, name="default_value")
     self._key_dtype = key_dtype
@@ -2214,6 +2985,12 @@ class DenseHashTable(LookupInterface):
         self._shared_name = "table_%d" % (ops.uid(),)
     super(DenseHashTable, self).__init__(key_dtype, value_dtype)
     self._resource_handle = self._create_resource()
+    self._capacity = capacity
+    self._eviction_policy = eviction_policy
+    self._eviction = None
+    if capacity is not None:
+      self._eviction = _EvictionState(self, capacity, eviction_policy, name,
+                                      checkpoint, experimental_is_anonymous)
     if checkpoint:
       saveable = DenseHashTable._Saveable(self, name)
       if not context.executing_eagerly():
@@ -2292,6 +3069,9 @@ class DenseHashTable(LookupInterface):
       with ops.colocate_with(self.resource_handle):
         values = gen_lookup_ops.lookup_table_find_v2(self.resource_handle, keys,
                                                      self._default_value)
+      if self._eviction is not None:
+        with ops.control_dependencies([self._eviction.record_lookup(keys)]):
+          values = array_ops.identity(values)
 
     return values
 
@@ -2320,6 +3100,8 @@ class DenseHashTable(LookupInterface):
       with ops.colocate_with(self.resource_handle):
         op = gen_lookup_ops.lookup_table_insert_v2(self.resource_handle, keys,
                                                    values)
+      if self._eviction is not None:
+        op = self._eviction.record_insert(self, keys, op)
       return op
 
   def insert(self, keys, values, name=None):
@@ -2365,6 +3147,8 @@ class DenseHashTable(LookupInterface):
                         (self.resource_handle, keys, self._default_value)):
       # pylint: disable=protected-access
       op = gen_lookup_ops.lookup_table_remove_v2(self.resource_handle, keys)
+      if self._eviction is not None:
+        op = control_flow_ops.group(op, self._eviction.access.remove(keys))
 
     return op
 
@@ -2404,6 +3188,57 @@ class DenseHashTable(LookupInterface):
 
     return exported_keys, exported_values
 
+  def export_chunks(self, chunk_size):
+    """Yields the keys and values of the table in chunks.
+
+    Only the keys are exported at once; the values are read chunk by chunk, so
+    tables with large values can be written out without materializing all of
+    them. For tables with a `capacity`, the keys are read from the access
+    counters. Only supported in eager mode.
+
+    Args:
+      chunk_size: Maximum number of keys per chunk.
+
+    Yields:
+      Pairs of `keys` and `values` tensors.
+
+    Raises:
+      RuntimeError: If not executing eagerly.
+      ValueError: If `chunk_size` is not positive.
+    """
+    if self._eviction is not None:
+      keys = self._eviction.access.export()[0]
+    else:
+      keys = self.export()[0]
+      # The export contains every bucket, including empty and deleted ones.
+      keys = array_ops.boolean_mask(
+          keys,
+          math_ops.logical_and(
+              math_ops.not_equal(keys, self._empty_key),
+              math_ops.not_equal(keys, self._deleted_key)))
+    return _export_chunks(self, keys, chunk_size)
+
+  def statistics(self, name=None):
+    """Returns the size, hit, miss and eviction counts of the table.
+
+    Hits and misses count the keys passed to `lookup`. Only available for tables
+    with a `capacity`.
+
+    Args:
+      name: A name for the operation (optional).
+
+    Returns:
+      A `HashTableStatistics` of scalar int64 tensors.
+
+    Raises:
+      ValueError: If the table has no `capacity`.
+    """
+    if self._eviction is None:
+      raise ValueError("`statistics` requires a table with a `capacity`.")
+    with ops.name_scope(name, "%s_lookup_table_statistics" % self.name,
+                        [self.resource_handle]):
+      return self._eviction.get_statistics(self)
+
   def _serialize_to_tensors(self):
     """Implements checkpointing interface in `Trackable`."""
     tensors = self.export()
@@ -2431,7 +3266,9 @@ class DenseHashTable(LookupInterface):
           self._initial_num_buckets,
           self._name,
           self._checkpoint,
-          self._is_anonymous
+          self._is_anonymous,
+          self._capacity,
+          self._eviction_policy
       )
 
     # Copy values from `self` to copy of `self`
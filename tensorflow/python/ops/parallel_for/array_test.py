@@ -277,6 +277,17 @@ class ArrayTest(PForTestCase):
 
     self._test_loop_fn(loop_fn, 3)
 
+  def test_mirror_pad(self):
+    x = random_ops.random_uniform([3, 4, 5])
+    padding = constant_op.constant([[1, 2], [3, 4]])
+
+    def loop_fn(i):
+      x1 = array_ops.gather(x, i)
+      return (array_ops.pad(x1, padding, mode="REFLECT"),
+              array_ops.pad(x1, padding, mode="SYMMETRIC"))
+
+    self._test_loop_fn(loop_fn, 3)
+
   def test_split(self):
     x = random_ops.random_uniform([3, 2, 3])
 
@@ -317,6 +328,25 @@ class ArrayTest(PForTestCase):
 
     self._test_loop_fn(loop_fn, 3)
 
+  def test_reverse_sequence(self):
+    x = random_ops.random_uniform([3, 4, 5, 2])
+    seq_lengths = constant_op.constant([[1, 5, 3, 0], [2, 2, 5, 4],
+                                        [5, 0, 1, 3]], dtype=dtypes.int64)
+
+    def loop_fn(i):
+      x1 = array_ops.gather(x, i)
+      lengths = array_ops.gather(seq_lengths, i)
+      return (array_ops.reverse_sequence(
+          x1, seq_lengths[0], seq_axis=1, batch_axis=0),
+              array_ops.reverse_sequence(
+                  x1, lengths, seq_axis=1, batch_axis=0),
+              array_ops.reverse_sequence(
+                  x1, lengths[:2], seq_axis=1, batch_axis=2),
+              array_ops.reverse_sequence(
+                  x, lengths[:3], seq_axis=2, batch_axis=0))
+
+    self._test_loop_fn(loop_fn, 3)
+
   def test_transpose(self):
     x = random_ops.random_uniform([3, 2, 3, 4])
 
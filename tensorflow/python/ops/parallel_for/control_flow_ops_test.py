@@ -50,6 +50,7 @@ from tensorflow.python.ops import control_flow_assert
 from tensorflow.python.ops import control_flow_v2_toggles
 from tensorflow.python.ops import data_flow_ops
 from tensorflow.python.ops import functional_ops
+from tensorflow.python.ops import gen_array_ops
 from tensorflow.python.ops import gen_list_ops
 from tensorflow.python.ops import gen_nn_ops
 from tensorflow.python.ops import gen_optional_ops
@@ -85,14 +86,14 @@ from tensorflow.python.util import nest
 class PForTest(PForTestCase):
 
   def test_op_conversion_fallback_to_while_loop(self):
-    # Note that we used top_k op for this test. If a converter gets defined for
-    # it, we will need to find another op for which a converter has not been
-    # defined.
+    # Note that we used nth_element op for this test. If a converter gets
+    # defined for it, we will need to find another op for which a converter has
+    # not been defined.
     x = random_ops.random_uniform([3, 2, 4])
 
     def loop_fn(i):
       x_i = array_ops.gather(x, i)
-      return nn.top_k(x_i)
+      return gen_nn_ops.nth_element(x_i, 1)
 
     with self.assertRaisesRegex(ValueError, "No pfor vectorization"):
       self._test_loop_fn(loop_fn, 3, fallback_to_while_loop=False)
@@ -357,7 +358,7 @@ class ReductionTest(PForTestCase):
 class BitwiseTest(PForTestCase):
 
   def test_unary_cwise(self):
-    for op in [bitwise_ops.invert]:
+    for op in [bitwise_ops.invert, bitwise_ops.population_count]:
       x = random_ops.random_uniform([7, 3, 5], maxval=10, dtype=dtypes.int32)
 
       # pylint: disable=cell-var-from-loop
@@ -789,6 +790,15 @@ class NNTest(PForTestCase):
 
     self._test_loop_fn(loop_fn, 3)
 
+  def test_top_k(self):
+    x = random_ops.random_uniform([3, 2, 4])
+
+    def loop_fn(i):
+      x_i = array_ops.gather(x, i)
+      return nn.top_k(x_i), nn.top_k(x_i, k=3, sorted=False)
+
+    self._test_loop_fn(loop_fn, 3)
+
   def test_softmax_cross_entropy_with_logits(self):
     with backprop.GradientTape(persistent=True) as g:
       logits = random_ops.random_uniform([3, 2, 4])
@@ -1574,6 +1584,25 @@ class TensorTest(PForTestCase):
 
     self._test_loop_fn(loop_fn, 5)
 
+  def test_loop_variant_scatter_reductions(self):
+    for op in [
+        gen_array_ops.tensor_scatter_add,
+        gen_array_ops.tensor_scatter_sub,
+        gen_array_ops.tensor_scatter_max,
+        gen_array_ops.tensor_scatter_min,
+    ]:
+
+      # pylint: disable=cell-var-from-loop
+      def loop_fn(i):
+        tensor = array_ops.fill([6, 2], i - 2)
+        indices = [[i], [i + 1], [i + 1], [0]]
+        updates = [[i, 1], [i - 10, 2], [3, i + 11], [4, -i]]
+        return op(tensor, indices, updates)
+
+      # pylint: enable=cell-var-from-loop
+
+      self._test_loop_fn(loop_fn, 5)
+
 
 class OptionalTest(PForTestCase):
 
@@ -2361,6 +2390,33 @@ class Benchmarks(test.Benchmark):
       self._run(output_reduction, 30, name="matmul_reduction")
       self._run(output_no_reduction, 30, name="matmul_no_reduction")
 
+  def benchmark_converter_gaps(self):
+    # Ops that used to be converted using a while_loop. The while_loop
+    # benchmarks correspond to the previous fallback conversion.
+    n = 256
+    with ops.Graph().as_default():
+      x = random_ops.random_uniform([n, 64, 128])
+      lengths = random_ops.random_uniform([n, 64], maxval=128,
+                                          dtype=dtypes.int64)
+      loop_fns = {
+          "top_k": lambda i: nn.top_k(array_ops.gather(x, i), k=8).values,
+          "l2_loss": lambda i: nn.l2_loss(array_ops.gather(x, i)),
+          "mirror_pad": lambda i: array_ops.pad(  # pylint: disable=g-long-lambda
+              array_ops.gather(x, i), [[2, 2], [2, 2]], mode="REFLECT"),
+          "reverse_sequence": lambda i: array_ops.reverse_sequence(  # pylint: disable=g-long-lambda
+              array_ops.gather(x, i), array_ops.gather(lengths, i),
+              seq_axis=1, batch_axis=0),
+          "cumulative_logsumexp": lambda i: math_ops.cumulative_logsumexp(  # pylint: disable=g-long-lambda
+              array_ops.gather(x, i), axis=1),
+      }
+      for name, loop_fn in loop_fns.items():
+        pfor_outputs = pfor_control_flow_ops.pfor(
+            loop_fn, n, fallback_to_while_loop=False)
+        while_outputs = pfor_control_flow_ops.for_loop(loop_fn, dtypes.float32,
+                                                       n)
+        self._run(pfor_outputs, 100, name=f"pfor_{name}")
+        self._run(while_outputs, 20, name=f"while_{name}")
+
 
 class SparseTest(PForTestCase):
 
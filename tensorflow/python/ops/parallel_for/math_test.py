@@ -352,6 +352,18 @@ class MathTest(PForTestCase, parameterized.TestCase):
             # pylint: enable=cell-var-from-loop
             self._test_loop_fn(loop_fn, 2)
 
+  def test_batch_matmul_output_type(self):
+    x = random_ops.random_uniform([2, 4, 3, 5], maxval=10, dtype=dtypes.int32)
+    y = random_ops.random_uniform([4, 5, 7], maxval=10, dtype=dtypes.int32)
+    x = math_ops.cast(x, dtypes.int8)
+    y = math_ops.cast(y, dtypes.int8)
+
+    def loop_fn(i):
+      a = array_ops.gather(x, i)
+      return math_ops.matmul(a, y, output_type=dtypes.int32)
+
+    self._test_loop_fn(loop_fn, 2)
+
   def test_reduction(self):
     x = random_ops.random_uniform([2, 3, 4, 5])
     for op in [
@@ -360,6 +372,7 @@ class MathTest(PForTestCase, parameterized.TestCase):
         math_ops.reduce_max,
         math_ops.reduce_min,
         math_ops.reduce_mean,
+        math_ops.reduce_euclidean_norm,
     ]:
       for axis in ([1], None, [0, 2], constant_op.constant([1], dtypes.int64)):
         for keepdims in (True, False):
@@ -452,6 +465,41 @@ class MathTest(PForTestCase, parameterized.TestCase):
 
           self._test_loop_fn(loop_fn, 2)
 
+  def test_cumulative_logsumexp(self):
+    x = random_ops.random_uniform([2, 3, 4, 5])
+    for axis in (1, -2, constant_op.constant(1, dtypes.int64)):
+      for exclusive in (True, False):
+        for reverse in (True, False):
+
+          # pylint: disable=cell-var-from-loop
+          def loop_fn(i):
+            a = array_ops.gather(x, i)
+            return math_ops.cumulative_logsumexp(
+                a, axis=axis, exclusive=exclusive, reverse=reverse)
+
+          # pylint: enable=cell-var-from-loop
+
+          self._test_loop_fn(loop_fn, 2)
+
+  def test_l2_loss(self):
+    x = random_ops.random_uniform([3, 4, 5])
+
+    def loop_fn(i):
+      a = array_ops.gather(x, i)
+      return nn.l2_loss(a), nn.l2_loss(a[0])
+
+    self._test_loop_fn(loop_fn, 3)
+
+  def test_next_after(self):
+    x = random_ops.random_uniform([3, 4])
+    y = random_ops.random_uniform([4])
+
+    def loop_fn(i):
+      a = array_ops.gather(x, i)
+      return math_ops.nextafter(a, y), math_ops.nextafter(y, a)
+
+    self._test_loop_fn(loop_fn, 3)
+
   def test_bias_add(self):
     for data_format in ("NCHW", "NHWC"):
       for stacked_value in (True, False):
@@ -16,9 +16,11 @@
 # pylint: disable=missing-docstring,g-direct-tensorflow-import
 
 import collections
+import contextlib
 import functools
 import string
 import sys
+import threading
 import traceback
 from typing import List
 
@@ -49,6 +51,7 @@ from tensorflow.python.ops import gen_array_ops
 from tensorflow.python.ops import gen_image_ops
 from tensorflow.python.ops import gen_linalg_ops
 from tensorflow.python.ops import gen_list_ops
+from tensorflow.python.ops import gen_logging_ops
 from tensorflow.python.ops import gen_math_ops
 from tensorflow.python.ops import gen_nn_ops
 from tensorflow.python.ops import gen_optional_ops
@@ -71,9 +74,15 @@ from tensorflow.python.ops import while_loop
 from tensorflow.python.platform import flags
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import compat
+from tensorflow.python.util import lazy_loader
 from tensorflow.python.util import nest
 from tensorflow.python.util import object_identity
 
+# Loaded lazily due to a circular dependency (pfor -> script_ops -> backprop ->
+# parallel_for.control_flow_ops -> pfor).
+script_ops = lazy_loader.LazyLoader(
+    "script_ops", globals(), "tensorflow.python.ops.script_ops")
+
 
 # TODO(agarwal): remove flag.
 flags.DEFINE_bool(
@@ -1126,6 +1135,157 @@ def _wrap_and_tile_variants(tensor, length):
   return wrap(tensor)
 
 
+FallbackRecord = collections.namedtuple(
+    "FallbackRecord",
+    ["index", "conversion", "op_type", "op_name", "root_cause", "loop_len"])
+FallbackRecord.__doc__ = """An op that was converted using a while_loop.
+
+Attributes:
+  index: Position of the record in `FallbackReport.records`. Keeps records of
+    identical ops apart.
+  conversion: Index of the `PFor` conversion, in order of recording, that
+    contained the op. Control flow inside the loop body is converted by nested
+    `PFor` objects, which get their own index.
+  op_type: Type of the op.
+  op_name: Name of the op in the loop body.
+  root_cause: Why the op could not be vectorized.
+  loop_len: Number of iterations run by the while_loop, or None if it is not
+    known statically.
+"""
+
+
+class FallbackReport:
+  """Ops that `pfor` converted using a while_loop while recording.
+
+  See `record_fallbacks`.
+  """
+
+  def __init__(self, measure_cost=False):
+    self._measure_cost = measure_cost
+    self._lock = threading.Lock()
+    self._records = []
+    self._conversions = object_identity.ObjectIdentityDictionary()
+    self._timings = collections.defaultdict(list)
+
+  @property
+  def measure_cost(self):
+    return self._measure_cost
+
+  @property
+  def records(self):
+    """List of `FallbackRecord`s in conversion order."""
+    with self._lock:
+      return list(self._records)
+
+  def counts_by_op_type(self):
+    """Returns a `collections.Counter` of fallbacks keyed by op type."""
+    return collections.Counter(r.op_type for r in self.records)
+
+  def iteration_cost(self, record):
+    """Mean seconds per iteration of the while_loop for `record`.
+
+    Only available with `measure_cost=True`, once the converted loop has run.
+
+    Args:
+      record: A `FallbackRecord` from `records`.
+
+    Returns:
+      A float, or None if no timings were collected for `record`.
+    """
+    with self._lock:
+      timings = self._timings.get(record.index)
+      if not timings:
+        return None
+      return sum(timings) / len(timings)
+
+  def _add_record(self, pfor_input, root_cause, iters):
+    with self._lock:
+      conversion = self._conversions.setdefault(pfor_input.pfor,
+                                                len(self._conversions))
+      index = len(self._records)
+      self._records.append(
+          FallbackRecord(index, conversion, pfor_input.op_type,
+                         pfor_input.op.name, root_cause,
+                         iters if isinstance(iters, int) else None))
+      return index
+
+  def _add_timing(self, index, elapsed, iters):
+    with self._lock:
+      self._timings[index].append(float(elapsed) / max(int(iters), 1))
+    return np.bool_(True)
+
+  def __str__(self):
+    lines = []
+    for i, record in enumerate(self.records):
+      loop_len = "?" if record.loop_len is None else record.loop_len
+      line = (f"[{record.conversion}] {record.op_name} ({record.op_type}): "
+              f"{loop_len} iterations")
+      with self._lock:
+        timings = self._timings.get(i)
+      if timings:
+        line += f", {sum(timings) / len(timings) * 1e6:.1f} us/iteration"
+      lines.append(f"{line}\n    {record.root_cause}")
+    return "\n".join(lines) or "No while_loop fallbacks."
+
+
+_fallback_reports = threading.local()
+
+
+@contextlib.contextmanager
+def record_fallbacks(measure_cost=False):
+  """Records the ops that `pfor` converts using a while_loop.
+
+  Example:
+
+  ```python
+  with record_fallbacks(measure_cost=True) as report:
+    y = vectorized_map(fn, x)
+  print(report.counts_by_op_type())
+  print(report)  # Ops, root causes and per-iteration costs.
+  ```
+
+  Recording applies to conversions done by the current thread. Since
+  `vectorized_map` and `pfor` trace a new function on each call in eager mode,
+  every call inside the block is recorded.
+
+  Args:
+    measure_cost: If True, the fallback while_loops are timed each time they
+      run and `FallbackReport.iteration_cost` reports the mean time per
+      iteration. This adds a host callback after each loop, so it should not be
+      used under XLA compilation or when benchmarking the loop itself.
+
+  Yields:
+    A `FallbackReport`.
+  """
+  report = FallbackReport(measure_cost=measure_cost)
+  stack = getattr(_fallback_reports, "stack", None)
+  if stack is None:
+    stack = _fallback_reports.stack = []
+  stack.append(report)
+  try:
+    yield report
+  finally:
+    stack.remove(report)
+
+
+def _active_fallback_reports():
+  return list(getattr(_fallback_reports, "stack", ()))
+
+
+def _record_fallback_cost(reports, outputs, start_time, iters):
+  """Reports the time taken to compute `outputs` to `reports`."""
+  with ops.control_dependencies(outputs):
+    elapsed = gen_logging_ops.timestamp() - start_time
+  callbacks = []
+  for report, index in reports:
+    callbacks.append(
+        script_ops.numpy_function(
+            functools.partial(report._add_timing, index),  # pylint: disable=protected-access
+            [elapsed, iters], dtypes.bool, stateful=True))
+  with ops.control_dependencies(callbacks):
+    return [array_ops.identity(x) for x in outputs]
+
+
 def _fallback_converter(pfor_input: _PforInput, root_cause="", warn=False):
   msg = ("Using a while_loop for converting "
          f"{pfor_input.op_type} cause {root_cause}")
@@ -1142,6 +1302,20 @@ def _fallback_converter(pfor_input: _PforInput, root_cause="", warn=False):
   else:
     iters = iter_vec[0]
 
+  timed_reports = []
+  for report in _active_fallback_reports():
+    index = report._add_record(  # pylint: disable=protected-access
+        pfor_input,
+        root_cause or "the converter does not support these inputs.", iters)
+    if report.measure_cost:
+      timed_reports.append((report, index))
+  loop_start = 0
+  if timed_reports:
+    with ops.control_dependencies([x.t for x in pfor_input.inputs]):
+      start_time = gen_logging_ops.timestamp()
+    with ops.control_dependencies([start_time]):
+      loop_start = array_ops.identity(0)
+
   def while_body(i, *ta_list):
     """Body of while loop."""
     inputs = [
@@ -1162,10 +1336,13 @@ def _fallback_converter(pfor_input: _PforInput, root_cause="", warn=False):
     return tuple([i + 1] + outputs)
 
   ta_list = while_loop.while_loop(
-      lambda i, *ta: i < iters, while_body, [0] +
+      lambda i, *ta: i < iters, while_body, [loop_start] +
       [tensor_array_ops.TensorArray(dtype, iters) for dtype in output_dtypes
       ])[1:]
-  return tuple([wrap(ta.stack(), True) for ta in ta_list])
+  outputs = [ta.stack() for ta in ta_list]
+  if timed_reports:
+    outputs = _record_fallback_cost(timed_reports, outputs, start_time, iters)
+  return tuple([wrap(x, True) for x in outputs])
 
 
 class PForConfig:
@@ -2228,6 +2405,25 @@ def _convert_softmax(pfor_input: _PforInput, op_type, op_func):
   return wrap(op_func(pfor_input.stacked_input(0)), True)
 
 
+@RegisterPFor("TopKV2")
+def _convert_top_k(pfor_input: _PforInput):
+  t = pfor_input.stacked_input(0)
+  k = pfor_input.unstacked_input(1)
+  values, indices = gen_nn_ops.top_kv2(
+      t,
+      k,
+      sorted=pfor_input.get_attr("sorted"),
+      index_type=pfor_input.get_attr("index_type"))
+  return [wrap(values, True), wrap(indices, True)]
+
+
+@RegisterPFor("L2Loss")
+def _convert_l2_loss(pfor_input: _PforInput):
+  t = pfor_input.stacked_input(0)
+  axis = math_ops.range(1, array_ops.rank(t))
+  return wrap(math_ops.reduce_sum(math_ops.square(t), axis=axis) / 2, True)
+
+
 # array_ops
 
 
@@ -2505,6 +2701,15 @@ def _convert_pad_v2(pfor_input: _PforInput):
   return wrap(array_ops.pad_v2(t, paddings, mode="CONSTANT"), True)
 
 
+@RegisterPFor("MirrorPad")
+def _convert_mirror_pad(pfor_input: _PforInput):
+  t = pfor_input.stacked_input(0)
+  paddings = pfor_input.unstacked_input(1)
+  paddings = array_ops.concat([[[0, 0]], paddings], 0)
+  mode = pfor_input.get_attr("mode")
+  return wrap(gen_array_ops.mirror_pad(t, paddings, mode=mode), True)
+
+
 @RegisterPFor("Split")
 def _convert_split(pfor_input: _PforInput):
   split_dim = pfor_input.unstacked_input(0)
@@ -2539,6 +2744,40 @@ def _convert_reverse(pfor_input: _PforInput):
   return wrap(gen_array_ops.reverse_v2(value, axis=new_axis), True)
 
 
+@RegisterPFor("ReverseSequence")
+def _convert_reverse_sequence(pfor_input: _PforInput):
+  pfor_input.stack_inputs([0])
+  t = pfor_input.stacked_input(0)
+  seq_lengths, seq_lengths_stacked, _ = pfor_input.input(1)
+  seq_dim = pfor_input.get_attr("seq_dim") + 1
+  batch_dim = pfor_input.get_attr("batch_dim") + 1
+  if not seq_lengths_stacked:
+    return wrap(
+        gen_array_ops.reverse_sequence(
+            t, seq_lengths, seq_dim=seq_dim, batch_dim=batch_dim), True)
+
+  # Each iteration has its own sequence lengths. Move the batch dimension next
+  # to the loop dimension and merge the two, so that a single op reverses all
+  # the sequences.
+  rank = t.shape.ndims
+  if rank is None:
+    raise ConversionNotImplementedError(
+        "ReverseSequence with loop variant `seq_lengths` requires the rank of "
+        "`input` to be known.")
+  perm = [0, batch_dim] + [i for i in range(1, rank) if i != batch_dim]
+  t = array_ops.transpose(t, perm)
+  t_shape = array_ops.shape(t)
+  t = array_ops.reshape(t, array_ops.concat([[-1], t_shape[2:]], axis=0))
+  output = gen_array_ops.reverse_sequence(
+      t,
+      array_ops.reshape(seq_lengths, [-1]),
+      seq_dim=perm.index(seq_dim) - 1,
+      batch_dim=0)
+  output = array_ops.reshape(output, t_shape)
+  return wrap(
+      array_ops.transpose(output, [perm.index(i) for i in range(rank)]), True)
+
+
 @RegisterPForWithArgs("Transpose", gen_array_ops.transpose)
 @RegisterPForWithArgs("ConjugateTranspose", gen_array_ops.conjugate_transpose)
 def _convert_transpose(pfor_input: _PforInput, _, op_func):
@@ -2872,6 +3111,20 @@ def _convert_batch_mat_mul_v2(pfor_input: _PforInput):
   return wrap(output, True)
 
 
+@RegisterPFor("BatchMatMulV3")
+def _convert_batch_mat_mul_v3(pfor_input: _PforInput):
+  pfor_input.expanddim_inputs_for_broadcast()
+  x = pfor_input.input(0)[0]
+  y = pfor_input.input(1)[0]
+  output = gen_math_ops.batch_mat_mul_v3(
+      x,
+      y,
+      Tout=pfor_input.get_attr("Tout"),
+      adj_x=pfor_input.get_attr("adj_x"),
+      adj_y=pfor_input.get_attr("adj_y"))
+  return wrap(output, True)
+
+
 @RegisterPForWithArgs("Sum", math_ops.reduce_sum)
 @RegisterPForWithArgs("Prod", math_ops.reduce_prod)
 @RegisterPForWithArgs("Max", math_ops.reduce_max)
@@ -2879,6 +3132,7 @@ def _convert_batch_mat_mul_v2(pfor_input: _PforInput):
 @RegisterPForWithArgs("Mean", math_ops.reduce_mean)
 @RegisterPForWithArgs("All", math_ops.reduce_all)
 @RegisterPForWithArgs("Any", math_ops.reduce_any)
+@RegisterPForWithArgs("EuclideanNorm", math_ops.reduce_euclidean_norm)
 def _convert_reduction(pfor_input: _PforInput, _, op_func):
   t = pfor_input.stacked_input(0)
   indices = pfor_input.unstacked_input(1)
@@ -2916,6 +3170,7 @@ def _convert_clip_by_value(pfor_input: _PforInput):
 
 @RegisterPForWithArgs("Cumsum", math_ops.cumsum)
 @RegisterPForWithArgs("Cumprod", math_ops.cumprod)
+@RegisterPForWithArgs("CumulativeLogsumexp", math_ops.cumulative_logsumexp)
 def _convert_cumfoo(pfor_input: _PforInput, _, op_func):
   t = pfor_input.stacked_input(0)
   axis = pfor_input.unstacked_input(1)
@@ -3146,7 +3401,9 @@ def _convert_cast(pfor_input: _PforInput):
 @RegisterPFor("MulNoNan")
 @RegisterPFor("Ndtri")
 @RegisterPFor("Neg")
+@RegisterPFor("NextAfter")
 @RegisterPFor("Polygamma")
+@RegisterPFor("PopulationCount")
 @RegisterPFor("Pow")
 @RegisterPFor("Real")
 @RegisterPFor("RealDiv")
@@ -4339,8 +4596,12 @@ def _convert_tensor_list_from_tensor(pfor_input: _PforInput):
   return wrap(_tile_variant(handle, pfor_input), True)
 
 
-@RegisterPFor("TensorScatterUpdate")
-def _convert_tensor_scatter_update(pfor_input: _PforInput):
+@RegisterPForWithArgs("TensorScatterUpdate", array_ops.tensor_scatter_nd_update)
+@RegisterPForWithArgs("TensorScatterAdd", gen_array_ops.tensor_scatter_add)
+@RegisterPForWithArgs("TensorScatterSub", gen_array_ops.tensor_scatter_sub)
+@RegisterPForWithArgs("TensorScatterMax", gen_array_ops.tensor_scatter_max)
+@RegisterPForWithArgs("TensorScatterMin", gen_array_ops.tensor_scatter_min)
+def _convert_tensor_scatter(pfor_input: _PforInput, _, op_func):
   pfor_input.stack_inputs([0, 1, 2])
   tensor = pfor_input.stacked_input(0)
   indices = pfor_input.stacked_input(1)
@@ -4365,7 +4626,7 @@ def _convert_tensor_scatter_update(pfor_input: _PforInput):
   # Insert the loop-identifying index.
   indices = array_ops.concat([meta_index, indices], axis=-1)
 
-  result = array_ops.tensor_scatter_nd_update(tensor, indices, updates)
+  result = op_func(tensor, indices, updates)
   return wrap(result, True)
 
 # StackV2 conversion is tricky since we don't have arrays of StackV2. So similar
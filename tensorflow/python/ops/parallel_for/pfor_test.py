@@ -17,7 +17,10 @@ from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import gen_nn_ops
+from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import random_ops
+from tensorflow.python.ops.parallel_for import control_flow_ops
 from tensorflow.python.ops.parallel_for import pfor
 from tensorflow.python.platform import test
 
@@ -73,5 +76,58 @@ class PForTest(test.TestCase):
     self.assertAllEqual(expected, actual)
 
 
+def _nth_element_loop_fn(x):
+
+  def loop_fn(i):
+    x_i = array_ops.gather(x, i)
+    # NthElement has no converter and falls back to a while_loop, while the
+    # other ops are vectorized.
+    return math_ops.exp(gen_nn_ops.nth_element(x_i, 1))
+
+  return loop_fn
+
+
+class RecordFallbacksTest(test.TestCase):
+
+  def test_records_fallbacks(self):
+    x = random_ops.random_uniform([3, 2, 4])
+    with pfor.record_fallbacks() as report:
+      y = control_flow_ops.pfor(_nth_element_loop_fn(x), 3)
+    control_flow_ops.pfor(_nth_element_loop_fn(x), 3)
+
+    self.assertAllClose(math_ops.exp(gen_nn_ops.nth_element(x, 1)), y)
+    self.assertEqual({"NthElement": 1}, report.counts_by_op_type())
+    record, = report.records
+    self.assertEqual(0, record.conversion)
+    self.assertEqual("NthElement", record.op_type)
+    self.assertEqual(3, record.loop_len)
+    self.assertIn("no registered converter", record.root_cause)
+    self.assertIsNone(report.iteration_cost(record))
+    self.assertIn("NthElement): 3 iterations", str(report))
+
+  def test_no_fallbacks(self):
+    x = random_ops.random_uniform([3, 2, 4])
+    with pfor.record_fallbacks() as report:
+      control_flow_ops.vectorized_map(math_ops.exp, x)
+    self.assertEmpty(report.records)
+    self.assertEqual("No while_loop fallbacks.", str(report))
+
+  def test_measure_cost(self):
+    x = random_ops.random_uniform([3, 2, 4])
+    with pfor.record_fallbacks(measure_cost=True) as outer:
+      with pfor.record_fallbacks() as inner:
+        y = control_flow_ops.pfor(_nth_element_loop_fn(x), 3)
+      control_flow_ops.pfor(_nth_element_loop_fn(x), 3)
+
+    self.assertAllClose(math_ops.exp(gen_nn_ops.nth_element(x, 1)), y)
+    self.assertLen(inner.records, 1)
+    self.assertEqual([0, 1], [r.conversion for r in outer.records])
+    self.assertEqual([0, 1], [r.index for r in outer.records])
+    for record in outer.records:
+      self.assertGreater(outer.iteration_cost(record), 0)
+    self.assertIn("us/iteration", str(outer))
+    self.assertNotIn("us/iteration", str(inner))
+
+
 if __name__ == '__main__':
   test.main()
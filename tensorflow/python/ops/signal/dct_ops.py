@@ -22,6 +22,7 @@ from tensorflow.python.framework import tensor_shape
 from tensorflow.python.ops import array_ops as _array_ops
 from tensorflow.python.ops import math_ops as _math_ops
 from tensorflow.python.ops.signal import fft_ops
+from tensorflow.python.ops.signal import util_ops
 from tensorflow.python.util import dispatch
 from tensorflow.python.util.tf_export import tf_export
 
@@ -97,6 +98,34 @@ def dct(input, type=2, n=None, axis=-1, norm=None, name=None):  # pylint: disabl
   return _dct_internal(input, type, n, axis, norm, name)
 
 
+def _dct_scale(axis_dim, dtype, sign):
+  """Returns the twiddle factors `2 * exp(sign * 1j * pi * k / (2 * N))`.
+
+  The factors are cached when the transform length `axis_dim` is static.
+
+  Args:
+    axis_dim: The length `N` of the transform. A Python int or a scalar
+      `Tensor`.
+    dtype: The real `DType` of the transformed signal.
+    sign: `-1.0` for the DCT-II and `1.0` for the DCT-III.
+
+  Returns:
+    A `[N]` complex `Tensor`.
+  """
+  def build():
+    axis_dim_float = _math_ops.cast(axis_dim, dtype)
+    zero = _ops.convert_to_tensor(0.0, dtype=dtype)
+    return 2.0 * _math_ops.exp(
+        _math_ops.complex(
+            zero, sign * _math_ops.range(axis_dim_float) * _math.pi * 0.5 /
+            axis_dim_float))
+
+  if isinstance(axis_dim, int):
+    return util_ops.cached_constant(
+        ("dct_scale", axis_dim, _dtypes.as_dtype(dtype), sign), build)
+  return build()
+
+
 def _dct_internal(input, type=2, n=None, axis=-1, norm=None, name=None):  # pylint: disable=redefined-builtin
   """Computes the 1D Discrete Cosine Transform (DCT) of `input`.
 
@@ -151,10 +180,7 @@ def _dct_internal(input, type=2, n=None, axis=-1, norm=None, name=None):  # pyli
       return dct1
 
     if type == 2:
-      scale = 2.0 * _math_ops.exp(
-          _math_ops.complex(
-              zero, -_math_ops.range(axis_dim_float) * _math.pi * 0.5 /
-              axis_dim_float))
+      scale = _dct_scale(axis_dim, input.dtype, -1.0)
 
       # TODO(rjryan): Benchmark performance and memory usage of the various
       # approaches to computing a DCT via the RFFT.
@@ -184,11 +210,7 @@ def _dct_internal(input, type=2, n=None, axis=-1, norm=None, name=None):  # pyli
         input *= weights
       else:
         input *= axis_dim_float
-      scale = 2.0 * _math_ops.exp(
-          _math_ops.complex(
-              zero,
-              _math_ops.range(axis_dim_float) * _math.pi * 0.5 /
-              axis_dim_float))
+      scale = _dct_scale(axis_dim, input.dtype, 1.0)
       dct3 = _math_ops.real(
           fft_ops.irfft(
               scale * _math_ops.complex(input, zero),
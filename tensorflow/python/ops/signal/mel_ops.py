@@ -14,13 +14,20 @@
 # ==============================================================================
 """mel conversion ops."""
 
+import numpy as np
+
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor
+from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
+from tensorflow.python.ops.signal import fft_ops
 from tensorflow.python.ops.signal import shape_ops
+from tensorflow.python.ops.signal import spectral_ops
+from tensorflow.python.ops.signal import util_ops
+from tensorflow.python.ops.signal import window_ops
 from tensorflow.python.util import dispatch
 from tensorflow.python.util.tf_export import tf_export
 
@@ -168,49 +175,173 @@ def linear_to_mel_weight_matrix(num_mel_bins=20,
     _validate_arguments(num_mel_bins, sample_rate,
                         lower_edge_hertz, upper_edge_hertz, dtype)
 
-    # This function can be constant folded by graph optimization since there are
-    # no Tensor inputs.
-    sample_rate = math_ops.cast(
-        sample_rate, dtype, name='sample_rate')
-    lower_edge_hertz = ops.convert_to_tensor(
-        lower_edge_hertz, dtype, name='lower_edge_hertz')
-    upper_edge_hertz = ops.convert_to_tensor(
-        upper_edge_hertz, dtype, name='upper_edge_hertz')
-    zero = ops.convert_to_tensor(0.0, dtype)
-
-    # HTK excludes the spectrogram DC bin.
-    bands_to_zero = 1
-    nyquist_hertz = sample_rate / 2.0
-    linear_frequencies = math_ops.linspace(
-        zero, nyquist_hertz, num_spectrogram_bins)[bands_to_zero:]
-    spectrogram_bins_mel = array_ops.expand_dims(
-        _hertz_to_mel(linear_frequencies), 1)
-
-    # Compute num_mel_bins triples of (lower_edge, center, upper_edge). The
-    # center of each band is the lower and upper edge of the adjacent bands.
-    # Accordingly, we divide [lower_edge_hertz, upper_edge_hertz] into
-    # num_mel_bins + 2 pieces.
-    band_edges_mel = shape_ops.frame(
-        math_ops.linspace(_hertz_to_mel(lower_edge_hertz),
-                          _hertz_to_mel(upper_edge_hertz),
-                          num_mel_bins + 2), frame_length=3, frame_step=1)
-
-    # Split the triples up and reshape them into [1, num_mel_bins] tensors.
-    lower_edge_mel, center_mel, upper_edge_mel = tuple(array_ops.reshape(
-        t, [1, num_mel_bins]) for t in array_ops.split(
-            band_edges_mel, 3, axis=1))
-
-    # Calculate lower and upper slopes for every spectrogram bin.
-    # Line segments are linear in the mel domain, not Hertz.
-    lower_slopes = (spectrogram_bins_mel - lower_edge_mel) / (
-        center_mel - lower_edge_mel)
-    upper_slopes = (upper_edge_mel - spectrogram_bins_mel) / (
-        upper_edge_mel - center_mel)
-
-    # Intersect the line segments with each other and zero.
-    mel_weights_matrix = math_ops.maximum(
-        zero, math_ops.minimum(lower_slopes, upper_slopes))
-
-    # Re-add the zeroed lower bins we sliced out above.
-    return array_ops.pad(
-        mel_weights_matrix, [[bands_to_zero, 0], [0, 0]], name=name)
+    key = _weight_matrix_cache_key(num_mel_bins, num_spectrogram_bins,
+                                   sample_rate, lower_edge_hertz,
+                                   upper_edge_hertz, dtype)
+    if key is None:
+      return _linear_to_mel_weight_matrix(num_mel_bins, num_spectrogram_bins,
+                                          sample_rate, lower_edge_hertz,
+                                          upper_edge_hertz, dtype, name)
+    # The matrix is built from the static values in `key`, since graph
+    # tensors can't be used in the eager context that builds cached values.
+    return util_ops.cached_constant(
+        key, lambda: _linear_to_mel_weight_matrix(*key[1:], name=None),
+        name=name)
+
+
+def _static_scalar(value):
+  """Returns `value` as a Python scalar, or None if it is not static."""
+  if isinstance(value, tensor.Tensor):
+    value = tensor_util.constant_value(value)
+  if value is None or np.ndim(value) != 0:
+    return None
+  return value.item() if isinstance(value, np.generic) else value
+
+
+def _weight_matrix_cache_key(num_mel_bins, num_spectrogram_bins, sample_rate,
+                             lower_edge_hertz, upper_edge_hertz, dtype):
+  """Returns the `cached_constant` key of a mel matrix, or None."""
+  values = tuple(_static_scalar(value) for value in (
+      num_mel_bins, num_spectrogram_bins, sample_rate, lower_edge_hertz,
+      upper_edge_hertz))
+  if any(value is None for value in values):
+    return None
+  num_mel_bins, num_spectrogram_bins, sample_rate, lower, upper = values
+  return ('linear_to_mel_weight_matrix', int(num_mel_bins),
+          int(num_spectrogram_bins), float(sample_rate), float(lower),
+          float(upper), dtypes.as_dtype(dtype))
+
+
+def _linear_to_mel_weight_matrix(num_mel_bins, num_spectrogram_bins,
+                                 sample_rate, lower_edge_hertz,
+                                 upper_edge_hertz, dtype, name):
+  """Builds the matrix of `linear_to_mel_weight_matrix` op by op."""
+  # This function can be constant folded by graph optimization since there are
+  # no Tensor inputs.
+  sample_rate = math_ops.cast(
+      sample_rate, dtype, name='sample_rate')
+  lower_edge_hertz = ops.convert_to_tensor(
+      lower_edge_hertz, dtype, name='lower_edge_hertz')
+  upper_edge_hertz = ops.convert_to_tensor(
+      upper_edge_hertz, dtype, name='upper_edge_hertz')
+  zero = ops.convert_to_tensor(0.0, dtype)
+
+  # HTK excludes the spectrogram DC bin.
+  bands_to_zero = 1
+  nyquist_hertz = sample_rate / 2.0
+  linear_frequencies = math_ops.linspace(
+      zero, nyquist_hertz, num_spectrogram_bins)[bands_to_zero:]
+  spectrogram_bins_mel = array_ops.expand_dims(
+      _hertz_to_mel(linear_frequencies), 1)
+
+  # Compute num_mel_bins triples of (lower_edge, center, upper_edge). The
+  # center of each band is the lower and upper edge of the adjacent bands.
+  # Accordingly, we divide [lower_edge_hertz, upper_edge_hertz] into
+  # num_mel_bins + 2 pieces.
+  band_edges_mel = shape_ops.frame(
+      math_ops.linspace(_hertz_to_mel(lower_edge_hertz),
+                        _hertz_to_mel(upper_edge_hertz),
+                        num_mel_bins + 2), frame_length=3, frame_step=1)
+
+  # Split the triples up and reshape them into [1, num_mel_bins] tensors.
+  lower_edge_mel, center_mel, upper_edge_mel = tuple(array_ops.reshape(
+      t, [1, num_mel_bins]) for t in array_ops.split(
+          band_edges_mel, 3, axis=1))
+
+  # Calculate lower and upper slopes for every spectrogram bin.
+  # Line segments are linear in the mel domain, not Hertz.
+  lower_slopes = (spectrogram_bins_mel - lower_edge_mel) / (
+      center_mel - lower_edge_mel)
+  upper_slopes = (upper_edge_mel - spectrogram_bins_mel) / (
+      upper_edge_mel - center_mel)
+
+  # Intersect the line segments with each other and zero.
+  mel_weights_matrix = math_ops.maximum(
+      zero, math_ops.minimum(lower_slopes, upper_slopes))
+
+  # Re-add the zeroed lower bins we sliced out above.
+  return array_ops.pad(
+      mel_weights_matrix, [[bands_to_zero, 0], [0, 0]], name=name)
+
+
+def log_mel_spectrogram(frames,
+                        sample_rate,
+                        num_mel_bins=80,
+                        fft_length=None,
+                        lower_edge_hertz=80.0,
+                        upper_edge_hertz=7600.0,
+                        window_fn=window_ops.hann_window,
+                        magnitude_power=1.0,
+                        log_offset=1e-6,
+                        name=None):
+  """Computes log-magnitude mel-scale spectrograms of framed signals.
+
+  Equivalent to windowing `frames`, taking the magnitude of their RFFT, warping
+  it with `linear_to_mel_weight_matrix` and taking a stabilized log, but reuses
+  the cached window and mel matrix across calls and traces, and applies the mel
+  matrix to all frames with a single matrix multiplication.
+
+  Args:
+    frames: A `[..., frame_length]` `float32`/`float64` `Tensor` of framed
+      signals, e.g. as returned by `tf.signal.frame`.
+    sample_rate: Samples per second of the framed signals.
+    num_mel_bins: Python int. How many bands in the resulting mel spectrum.
+    fft_length: An integer scalar `Tensor`. The size of the FFT to apply.
+      If not provided, uses the smallest power of 2 enclosing `frame_length`.
+    lower_edge_hertz: Python float. See `linear_to_mel_weight_matrix`.
+    upper_edge_hertz: Python float. See `linear_to_mel_weight_matrix`.
+    window_fn: See `tf.signal.stft`.
+    magnitude_power: The power the STFT magnitudes are raised to before the
+      mel warping, e.g. `2.0` for power spectrograms.
+    log_offset: Offset added to the mel spectrograms before taking the log.
+    name: An optional name for the operation.
+
+  Returns:
+    A `[..., num_mel_bins]` `Tensor` of log-magnitude mel-scale spectrograms.
+  """
+  with ops.name_scope(name, 'log_mel_spectrogram', [frames]):
+    frames = ops.convert_to_tensor(frames, name='frames')
+    frames.shape.with_rank_at_least(1)
+    frame_length = tensor_shape.dimension_value(frames.shape[-1])
+    if fft_length is None:
+      fft_length = spectral_ops._enclosing_power_of_two(  # pylint: disable=protected-access
+          ops.convert_to_tensor(
+              frame_length if frame_length is not None else
+              array_ops.shape(frames)[-1], name='frame_length'))
+    else:
+      fft_length = ops.convert_to_tensor(fft_length, name='fft_length')
+
+    if window_fn is not None:
+      dtype = frames.dtype
+      if frame_length is not None:
+        window = util_ops.cached_constant(
+            ('window', window_fn, frame_length, dtype),
+            lambda: window_fn(frame_length, dtype=dtype))
+      else:
+        window = window_fn(array_ops.shape(frames)[-1], dtype=dtype)
+      frames *= window
+
+    spectrograms = math_ops.abs(fft_ops.rfft(frames, [fft_length]))
+    if magnitude_power != 1.0:
+      spectrograms = math_ops.pow(spectrograms, magnitude_power)
+
+    fft_length_static = tensor_util.constant_value(fft_length)
+    if fft_length_static is not None:
+      num_spectrogram_bins = int(fft_length_static) // 2 + 1
+    else:
+      num_spectrogram_bins = fft_length // 2 + 1
+    mel_weights = linear_to_mel_weight_matrix(
+        num_mel_bins, num_spectrogram_bins, sample_rate, lower_edge_hertz,
+        upper_edge_hertz, dtype=spectrograms.dtype)
+
+    # Fold all leading dimensions into one for a single matmul.
+    mel_spectrograms = math_ops.matmul(
+        array_ops.reshape(spectrograms, [-1, num_spectrogram_bins]),
+        mel_weights)
+    mel_spectrograms = array_ops.reshape(
+        mel_spectrograms,
+        array_ops.concat(
+            [array_ops.shape(spectrograms)[:-1], [num_mel_bins]], 0))
+    mel_spectrograms.set_shape(spectrograms.shape[:-1].concatenate(
+        [num_mel_bins]))
+    return math_ops.log(mel_spectrograms + log_offset)
@@ -18,6 +18,8 @@ from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops.signal import dct_ops
+from tensorflow.python.ops.signal import spectral_ops
+from tensorflow.python.ops.signal import window_ops
 from tensorflow.python.util import dispatch
 from tensorflow.python.util.tf_export import tf_export
 
@@ -105,3 +107,50 @@ def mfccs_from_log_mel_spectrograms(log_mel_spectrograms, name=None):
     dct2 = dct_ops.dct(log_mel_spectrograms, type=2)
     return dct2 * math_ops.rsqrt(
         math_ops.cast(num_mel_bins, dct2.dtype) * 2.0)
+
+
+def streaming_mfccs(signals, state, frame_length, frame_step,
+                    linear_to_mel_weight_matrix, fft_length=None,
+                    window_fn=window_ops.hann_window, log_offset=1e-6,
+                    name=None):
+  """Computes MFCCs of a chunk of a signal that arrives incrementally.
+
+  Applies the pipeline from the `mfccs_from_log_mel_spectrograms` example
+  (magnitude STFT, mel warping, stabilized log and DCT) to the frames completed
+  by `signals`. Only the STFT needs samples of previous chunks; the remaining
+  steps act on each frame independently and are applied to the new frames
+  alone. Concatenating the outputs of all calls gives the MFCCs of the whole
+  signal.
+
+  Args:
+    signals: A `[..., samples]` `float32`/`float64` `Tensor` with the next
+      chunk of samples.
+    state: The state returned by the previous call, or `None` for the first
+      chunk.
+    frame_length: An integer scalar `Tensor`. The window length in samples.
+    frame_step: An integer scalar `Tensor`. The number of samples to step.
+    linear_to_mel_weight_matrix: A `[fft_unique_bins, num_mel_bins]` `Tensor`,
+      as returned by `tf.signal.linear_to_mel_weight_matrix`.
+    fft_length: An integer scalar `Tensor`. The size of the FFT to apply.
+    window_fn: See `tf.signal.stft`.
+    log_offset: Offset added to the mel spectrograms before taking the log.
+    name: An optional name for the operation.
+
+  Returns:
+    A tuple `(mfccs, state)`, where `mfccs` is a
+    `[..., new_frames, num_mel_bins]` `Tensor` and `state` is to be passed to
+    the next call, as returned by `spectral_ops.streaming_stft`.
+  """
+  with ops.name_scope(name, 'streaming_mfccs', [signals, state]):
+    stfts, state = spectral_ops.streaming_stft(
+        signals, state, frame_length, frame_step, fft_length=fft_length,
+        window_fn=window_fn)
+    spectrograms = math_ops.abs(stfts)
+    linear_to_mel_weight_matrix = ops.convert_to_tensor(
+        linear_to_mel_weight_matrix, dtype=spectrograms.dtype)
+    mel_spectrograms = math_ops.tensordot(
+        spectrograms, linear_to_mel_weight_matrix, 1)
+    mel_spectrograms.set_shape(spectrograms.shape[:-1].concatenate(
+        linear_to_mel_weight_matrix.shape[-1:]))
+    log_mel_spectrograms = math_ops.log(mel_spectrograms + log_offset)
+    return mfccs_from_log_mel_spectrograms(log_mel_spectrograms), state
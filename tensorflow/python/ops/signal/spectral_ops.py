@@ -92,6 +92,80 @@ def stft(signals, frame_length, frame_step, fft_length=None,
     return fft_ops.rfft(framed_signals, [fft_length])
 
 
+def streaming_stft(signals, state, frame_length, frame_step, fft_length=None,
+                   window_fn=window_ops.hann_window, name=None):
+  """Computes the STFT of a chunk of a signal that arrives incrementally.
+
+  `state` holds the samples of previous chunks that are needed by frames which
+  have not been emitted yet. Each call emits only the frames that lie entirely
+  within the samples seen so far, so concatenating the outputs of all calls
+  gives exactly the result of `stft(signals, ..., pad_end=False)` on the whole
+  signal:
+
+  ```python
+  state = None
+  for chunk in chunks:
+    stfts, state = streaming_stft(chunk, state, frame_length=400,
+                                  frame_step=160)
+  ```
+
+  Args:
+    signals: A `[..., samples]` `float32`/`float64` `Tensor` with the next
+      chunk of samples. Chunks may have any length, including zero.
+    state: The state returned by the previous call, or `None` for the first
+      chunk.
+    frame_length: An integer scalar `Tensor`. The window length in samples.
+    frame_step: An integer scalar `Tensor`. The number of samples to step. Must
+      not be larger than `frame_length`.
+    fft_length: An integer scalar `Tensor`. The size of the FFT to apply.
+      If not provided, uses the smallest power of 2 enclosing `frame_length`.
+    window_fn: See `stft`.
+    name: An optional name for the operation.
+
+  Returns:
+    A tuple `(stfts, state)`, where `stfts` is a
+    `[..., new_frames, fft_unique_bins]` `Tensor` of the frames completed by
+    `signals` and `state` is a `[..., carried_samples]` `Tensor` to pass to the
+    next call. `carried_samples` is always less than `frame_length`.
+
+  Raises:
+    ValueError: If `signals` is not at least rank 1, `frame_length` is
+      not scalar, `frame_step` is not scalar, or `frame_step` is statically
+      known to be larger than `frame_length`.
+  """
+  with ops.name_scope(name, 'streaming_stft', [signals, state, frame_length,
+                                               frame_step]):
+    signals = ops.convert_to_tensor(signals, name='signals')
+    signals.shape.with_rank_at_least(1)
+    frame_length = ops.convert_to_tensor(frame_length, name='frame_length')
+    frame_length.shape.assert_has_rank(0)
+    frame_step = ops.convert_to_tensor(frame_step, name='frame_step')
+    frame_step.shape.assert_has_rank(0)
+    frame_length_static = tensor_util.constant_value(frame_length)
+    frame_step_static = tensor_util.constant_value(frame_step)
+    if (frame_length_static is not None and frame_step_static is not None and
+        frame_step_static > frame_length_static):
+      # The carried samples always start at the next frame, which would lie
+      # past the samples seen so far.
+      raise ValueError('frame_step (%d) must not be larger than frame_length '
+                       '(%d).' % (frame_step_static, frame_length_static))
+
+    if state is None:
+      state = array_ops.zeros(
+          array_ops.concat([array_ops.shape(signals)[:-1], [0]], 0),
+          dtype=signals.dtype)
+    else:
+      state = ops.convert_to_tensor(state, dtype=signals.dtype, name='state')
+    samples = array_ops.concat([state, signals], -1)
+
+    num_samples = array_ops.shape(samples)[-1]
+    num_frames = math_ops.maximum(
+        0, 1 + (num_samples - frame_length) // frame_step)
+    stfts = stft(samples, frame_length, frame_step, fft_length=fft_length,
+                 window_fn=window_fn)
+    return stfts, samples[..., num_frames * frame_step:]
+
+
 @tf_export('signal.inverse_stft_window_fn')
 @dispatch.add_dispatch_support
 def inverse_stft_window_fn(frame_step,
@@ -14,10 +14,14 @@
 # ==============================================================================
 """Utility ops shared across tf.contrib.signal."""
 
+import collections
 import fractions  # gcd is here for Python versions < 3
 import math  # Get gcd here for Python versions >= 3
 import sys
+import threading
 
+from tensorflow.python.eager import context
+from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.ops import array_ops
@@ -67,3 +71,57 @@ def gcd(a, b, name=None):
     body = lambda a, b: [b, math_ops.mod(a, b)]
     a, b = while_loop.while_loop(cond, body, [a, b], back_prop=False)
     return a
+
+
+# Maximum number of tensors kept by `cached_constant`.
+_CONSTANT_CACHE_SIZE = 64
+_constant_cache = collections.OrderedDict()
+_constant_cache_lock = threading.Lock()
+
+
+def cached_constant(key, build_fn, name=None):
+  """Returns the `Tensor` built by `build_fn`, building it once per `key`.
+
+  Used for matrices such as mel filterbanks that only depend on Python values
+  and are otherwise rebuilt op by op on every call and in every trace.
+  `build_fn` is run eagerly on the first call with a given `key`, and the
+  result is kept in a process-wide cache of the `_CONSTANT_CACHE_SIZE` most
+  recently used tensors. While building a graph, the cached value is embedded
+  as a single constant.
+
+  If no eager context is available, as in TF1 graph mode, `build_fn` is called
+  in the current graph and nothing is cached.
+
+  Args:
+    key: A hashable value that, together with the `build_fn` code, uniquely
+      determines the result of `build_fn`.
+    build_fn: A callable without arguments that returns a `Tensor`.
+    name: An optional name for the returned constant in graph mode.
+
+  Returns:
+    A `Tensor`.
+  """
+  with ops.init_scope():
+    eager = context.executing_eagerly()
+    if eager:
+      with _constant_cache_lock:
+        value = _constant_cache.get(key)
+        if value is not None:
+          _constant_cache.move_to_end(key)
+      if value is None:
+        value = build_fn()
+        with _constant_cache_lock:
+          _constant_cache[key] = value
+          while len(_constant_cache) > _CONSTANT_CACHE_SIZE:
+            _constant_cache.popitem(last=False)
+  if not eager:
+    return build_fn()
+  if context.executing_eagerly():
+    return value
+  return constant_op.constant(value.numpy(), name=name)
+
+
+def clear_constant_cache():
+  """Removes all tensors cached by `cached_constant`."""
+  with _constant_cache_lock:
+    _constant_cache.clear()
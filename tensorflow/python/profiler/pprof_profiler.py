@@ -34,6 +34,10 @@ Sample usage:
   file for each device. These files can be passed to pprof for formatting.
   For e.g.:
      pprof -png --nodecount=100 --sample_index=1 output_dir/profile_output.pb.gz
+
+  Statistics of several steps can be aggregated by passing a list of
+  `RunMetadata` protos, and profile files written by several steps or workers
+  can be combined into one with `merge_profiles`.
 """
 from collections import defaultdict
 from collections import namedtuple
@@ -55,6 +59,17 @@ else:
 ProfileDatum = namedtuple('ProfileDatum', [
     'node_exec_stats', 'op_type', 'traceback'])
 
+# Types and units of the values stored in each sample, in order.
+_SAMPLE_TYPES = (
+    ('count', 'count'),
+    ('all_time', 'nanoseconds'),
+    ('op_time', 'nanoseconds'),
+)
+
+# Maximum number of entries of a repeated field held by each of the partial
+# `Profile` protos that a profile is written out as.
+_STREAMING_CHUNK_SIZE = 10000
+
 
 class StringTable(object):
   """Keeps track of strings to add to string_table in pprof proto."""
@@ -98,7 +113,11 @@ class StringTable(object):
 
 
 class Functions(object):
-  """Keeps track of `Function` protos for pprof profile."""
+  """Keeps track of `Function` protos for pprof profile.
+
+  Functions are stored as tuples of string table indices, and are only turned
+  into protos when the profile is emitted.
+  """
 
   def __init__(self, string_table):
     """Constructor.
@@ -108,8 +127,10 @@ class Functions(object):
     """
     self._string_table = string_table
     # Maps tuples in the form (file_path, function_name, start_line_number)
-    # to `Function` protos.
-    self._function_key_to_function = {}
+    # to function ids.
+    self._function_key_to_id = {}
+    # (name, filename, start_line) of each function, in the order of their ids.
+    self._functions = []
 
   def index_of(self, file_path, function_name, function_start_line):
     """Returns index of the function, adding the function if needed.
@@ -123,28 +144,34 @@ class Functions(object):
       Function index.
     """
     function_key = (file_path, function_name, function_start_line)
-    if function_key in self._function_key_to_function:
-      return self._function_key_to_function[function_key].id
-    else:
+    function_index = self._function_key_to_id.get(function_key)
+    if function_index is None:
       # Function indexes should start from 1
-      function_index = len(self._function_key_to_function) + 1
-      function = profile_pb2.Function()
-      function.id = function_index
-      function.name = self._string_table.index_of(function_name)
-      function.filename = self._string_table.index_of(file_path)
-      function.start_line = function_start_line
-      self._function_key_to_function[function_key] = function
-      return function_index
+      function_index = len(self._functions) + 1
+      self._functions.append((self._string_table.index_of(function_name),
+                              self._string_table.index_of(file_path),
+                              function_start_line))
+      self._function_key_to_id[function_key] = function_index
+    return function_index
 
   def function_protos(self):
-    """Returns list of `profile_pb2.Function` protos."""
-    return self._function_key_to_function.values()
+    """Yields `profile_pb2.Function` protos, in the order of their ids."""
+    for function_index, (name, filename, start_line) in enumerate(
+        self._functions, start=1):
+      function = profile_pb2.Function()
+      function.id = function_index
+      function.name = name
+      function.filename = filename
+      function.start_line = start_line
+      yield function
 
 
 class Locations(object):
   """Keeps track of `Location` protos for pprof profile.
 
-  `Locations` store information about function call locations.
+  `Locations` store information about function call locations. Each location
+  is stored as a tuple of `(function_id, line_number)` pairs, and is only
+  turned into a proto when the profile is emitted.
   """
 
   def __init__(self, functions):
@@ -155,8 +182,12 @@ class Locations(object):
     """
     self._functions = functions
     # Maps tuples in the form (file_path, called_function_name, line_number)
-    # to `Location` protos.
-    self._location_key_to_location = {}
+    # to location ids.
+    self._location_key_to_id = {}
+    # Maps the lines of locations added with `index_of_lines` to location ids.
+    self._lines_to_id = {}
+    # Lines of each location, in the order of their ids.
+    self._locations = []
 
   def index_of(
       self, file_path, line_number, called_function_name, called_file_path,
@@ -177,25 +208,45 @@ class Locations(object):
       Index of location.
     """
     location_key = (file_path, called_function_name, line_number)
-    if location_key in self._location_key_to_location:
-      location = self._location_key_to_location[location_key]
-      return location.id
-    else:
-      # Location indexes should start from 1
-      location_index = len(self._location_key_to_location) + 1
-      location = profile_pb2.Location()
-      location.id = location_index
-      self._location_key_to_location[location_key] = location
-
-      line = location.line.add()
-      line.function_id = self._functions.index_of(
+    location_index = self._location_key_to_id.get(location_key)
+    if location_index is None:
+      function_index = self._functions.index_of(
           called_file_path, called_function_name, called_function_start_line)
-      line.line = line_number
-      return location_index
+      location_index = self._add(((function_index, line_number),))
+      self._location_key_to_id[location_key] = location_index
+    return location_index
+
+  def index_of_lines(self, lines):
+    """Returns index of the location with the given lines, adding it if needed.
+
+    Args:
+      lines: Tuple of `(function_id, line_number)` pairs, as found in the
+        `line` field of a `profile_pb2.Location` proto.
+
+    Returns:
+      Index of location.
+    """
+    location_index = self._lines_to_id.get(lines)
+    if location_index is None:
+      location_index = self._add(lines)
+      self._lines_to_id[lines] = location_index
+    return location_index
+
+  def _add(self, lines):
+    self._locations.append(lines)
+    # Location indexes should start from 1
+    return len(self._locations)
 
   def location_protos(self):
-    """Returns list of `profile_pb2.Location` protos."""
-    return self._location_key_to_location.values()
+    """Yields `profile_pb2.Location` protos, in the order of their ids."""
+    for location_index, lines in enumerate(self._locations, start=1):
+      location = profile_pb2.Location()
+      location.id = location_index
+      for function_index, line_number in lines:
+        line = location.line.add()
+        line.function_id = function_index
+        line.line = line_number
+      yield location
 
 
 class Samples(object):
@@ -203,6 +254,10 @@ class Samples(object):
 
   Samples store the following statistics in order:
   count, all_time, op_time
+
+  Samples with the same locations and labels are aggregated into one. They are
+  stored as lists of values keyed by tuples of location ids and labels, and are
+  only turned into protos when the profile is emitted.
   """
 
   def __init__(self, string_table):
@@ -212,9 +267,15 @@ class Samples(object):
       string_table: A `StringTable` object.
     """
     self._string_table = string_table
+    # Maps (location_ids, labels) to the aggregated values of the sample.
+    # Labels are tuples of (key, str, num, num_unit).
+    self._sample_key_to_values = {}
     # TODO(annarev): figure out if location is unique for each node name.
     # If not, also key this dictionary based on location ids.
-    self._node_name_to_sample = {}
+    self._node_name_to_sample_key = {}
+
+  def __len__(self):
+    return len(self._sample_key_to_values)
 
   def add(self, datum, location_ids):
     """Adds a sample data point.
@@ -225,30 +286,124 @@ class Samples(object):
         sample.
     """
     node_name = datum.node_exec_stats.node_name
-    if node_name in self._node_name_to_sample:
-      sample = self._node_name_to_sample[node_name]
-      sample.location_id.extend(location_ids)
-    else:
-      sample = profile_pb2.Sample()
-      # Sample stores 3 values: count, all_time, op_time
-      sample.value.extend([0, 0, 0])
-
-      label = sample.label.add()
-      label.key = self._string_table.index_of('node_name')
-      label.str = self._string_table.index_of(node_name)
-      label = sample.label.add()
-      label.key = self._string_table.index_of('op_type')
-      label.str = self._string_table.index_of(datum.op_type)
-      self._node_name_to_sample[node_name] = sample
-    sample.value[0] += 1
-    sample.value[1] += datum.node_exec_stats.all_end_rel_micros
-    sample.value[2] += (
+    sample_key = self._node_name_to_sample_key.get(node_name)
+    if sample_key is None:
+      labels = (
+          (self._string_table.index_of('node_name'),
+           self._string_table.index_of(node_name), 0, 0),
+          (self._string_table.index_of('op_type'),
+           self._string_table.index_of(datum.op_type), 0, 0))
+      sample_key = (tuple(location_ids), labels)
+      self._node_name_to_sample_key[node_name] = sample_key
+    self._add_values(sample_key, (
+        1,
+        datum.node_exec_stats.all_end_rel_micros,
         datum.node_exec_stats.op_end_rel_micros -
-        datum.node_exec_stats.op_start_rel_micros)
+        datum.node_exec_stats.op_start_rel_micros))
+
+  def add_values(self, location_ids, labels, values):
+    """Adds values to the sample with the given locations and labels.
+
+    Args:
+      location_ids: List of numeric location ids for this sample.
+      labels: List of `(key, str, num, num_unit)` tuples, where `key`, `str`
+        and `num_unit` are string table indices.
+      values: List of values to add to the values of the sample.
+    """
+    self._add_values((tuple(location_ids), tuple(labels)), values)
+
+  def _add_values(self, sample_key, values):
+    sample_values = self._sample_key_to_values.get(sample_key)
+    if sample_values is None:
+      self._sample_key_to_values[sample_key] = list(values)
+    else:
+      for value_index, value in enumerate(values):
+        sample_values[value_index] += value
 
   def get_sample_protos(self):
-    """Returns list of `Sample` protos for pprof profile."""
-    return self._node_name_to_sample.values()
+    """Yields `Sample` protos for pprof profile."""
+    for (location_ids, labels), values in self._sample_key_to_values.items():
+      sample = profile_pb2.Sample()
+      sample.location_id.extend(location_ids)
+      sample.value.extend(values)
+      for key, str_index, num, num_unit in labels:
+        label = sample.label.add()
+        label.key = key
+        label.str = str_index
+        label.num = num
+        label.num_unit = num_unit
+      yield sample
+
+
+def _chunks(items, chunk_size):
+  """Splits an iterable into lists of at most `chunk_size` items."""
+  chunk = []
+  for item in items:
+    chunk.append(item)
+    if len(chunk) >= chunk_size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def _profile_chunks(sample_types, samples, functions, locations, string_table,
+                    comments):
+  """Yields partial `profile_pb2.Profile` protos that make up one profile.
+
+  Each yielded proto holds a bounded number of entries of one repeated field.
+  As repeated fields are concatenated when protos are merged, merging the
+  protos (or concatenating their serializations) gives the whole profile,
+  without ever holding all of it as protos.
+
+  Args:
+    sample_types: List of `(type, unit)` pairs of string table indices.
+    samples: A `Samples` object.
+    functions: A `Functions` object.
+    locations: A `Locations` object.
+    string_table: A `StringTable` object.
+    comments: List of comment strings. They are appended to the string table
+      of the profile without being added to `string_table`.
+
+  Yields:
+    `profile_pb2.Profile` protos.
+  """
+  pprof_profile = profile_pb2.Profile()
+  for type_index, unit_index in sample_types:
+    sample_type = pprof_profile.sample_type.add()
+    sample_type.type = type_index
+    sample_type.unit = unit_index
+  yield pprof_profile
+
+  for field_name, protos in (('sample', samples.get_sample_protos()),
+                             ('function', functions.function_protos()),
+                             ('location', locations.location_protos())):
+    for chunk in _chunks(protos, _STREAMING_CHUNK_SIZE):
+      pprof_profile = profile_pb2.Profile()
+      getattr(pprof_profile, field_name).extend(chunk)
+      yield pprof_profile
+
+  strings = string_table.string_table()
+  for begin in range(0, len(strings), _STREAMING_CHUNK_SIZE):
+    pprof_profile = profile_pb2.Profile()
+    pprof_profile.string_table.extend(
+        strings[begin:begin + _STREAMING_CHUNK_SIZE])
+    yield pprof_profile
+
+  if comments:
+    pprof_profile = profile_pb2.Profile()
+    pprof_profile.string_table.extend(comments)
+    pprof_profile.comment.extend(
+        range(len(strings), len(strings) + len(comments)))
+    yield pprof_profile
+
+
+def _write_profile(profile_file, profile_chunks):
+  """Writes a gzipped profile one partial `Profile` proto at a time."""
+  with gzip.open(profile_file, 'wb') as output_file:
+    print('Writing profile to %s...' % profile_file)
+    for pprof_profile in profile_chunks:
+      output_file.write(pprof_profile.SerializeToString())
 
 
 class PprofProfiler(object):
@@ -259,13 +414,21 @@ class PprofProfiler(object):
 
     Args:
       graph: A `Graph` instance.
-      run_metadata: A list of `RunMetadata` objects.
+      run_metadata: A `RunMetadata` proto, or a list of `RunMetadata` protos
+        from several steps. Statistics of the same device are aggregated over
+        all steps.
     """
     self._graph = graph
-    self._run_metadata = run_metadata
+    if isinstance(run_metadata, (list, tuple)):
+      self._run_metadata = list(run_metadata)
+    else:
+      self._run_metadata = [run_metadata]
     self._string_table = StringTable()
     self._functions = Functions(self._string_table)
     self._locations = Locations(self._functions)
+    # Maps node names to the location ids of their tracebacks, or to None for
+    # nodes without a traceback.
+    self._node_name_to_location_ids = {}
 
   def profile(self):
     """Generates pprof profiles.
@@ -275,88 +438,120 @@ class PprofProfiler(object):
       format.
     """
     profiles = {}
+    for device, profile_chunks in self._device_profile_chunks():
+      pprof_proto = profile_pb2.Profile()
+      for pprof_profile in profile_chunks:
+        pprof_proto.MergeFrom(pprof_profile)
+      profiles[device] = pprof_proto
+    return profiles
+
+  def write_profiles(self, output_file_template):
+    """Writes gzipped pprof profiles, streaming them to the files.
+
+    Args:
+      output_file_template: (string) Path of the profile files, with a `%s`
+        that is replaced by the device name.
+
+    Returns:
+      List of output files created.
+    """
+    profile_files = []
+    for device, profile_chunks in self._device_profile_chunks():
+      device_name = str(device).strip('/').translate(
+          maketrans('/:', '__'))
+      profile_file = output_file_template % device_name
+      profile_files.append(profile_file)
+      _write_profile(profile_file, profile_chunks)
+    return profile_files
+
+  def _device_profile_chunks(self):
+    """Aggregates the statistics and yields the profile of each device.
+
+    Yields:
+      Pairs of device name and generator of partial `profile_pb2.Profile`
+      protos, as returned by `_profile_chunks`.
+    """
     data_generator_func = self._get_profile_data_generator()
-    for device_index, device_stats in enumerate(
-        self._run_metadata.step_stats.dev_stats):
-      # Create profile
-      pprof_proto = self._get_pprof_proto(data_generator_func(device_stats))
-      if not pprof_proto.sample:
+    device_to_samples = {}
+    for run_metadata in self._run_metadata:
+      for device_stats in run_metadata.step_stats.dev_stats:
+        if device_stats.device not in device_to_samples:
+          device_to_samples[device_stats.device] = Samples(self._string_table)
+        self._add_samples(device_to_samples[device_stats.device],
+                          data_generator_func(device_stats))
+
+    sample_types = [
+        (self._string_table.index_of(sample_type),
+         self._string_table.index_of(unit))
+        for sample_type, unit in _SAMPLE_TYPES]
+    device_count = len(device_to_samples)
+    for device_index, (device, samples) in enumerate(
+        device_to_samples.items()):
+      if not samples:
         print(
             'Not enough data to create profile for device %s. Did you pass '
-            'RunMetadata to session.run call?' % device_stats.device)
+            'RunMetadata to session.run call?' % device)
         continue
       # Add device name comment
-      device_count = len(self._run_metadata.step_stats.dev_stats)
       device_description = (
-          'Device %d of %d: %s' %
-          (device_index + 1, device_count, device_stats.device))
-      device_description_str_index = self._string_table.next_index()
-      pprof_proto.string_table.append(device_description)
-      pprof_proto.comment.append(device_description_str_index)
-      profiles[device_stats.device] = pprof_proto
-    return profiles
+          'Device %d of %d: %s' % (device_index + 1, device_count, device))
+      yield device, _profile_chunks(
+          sample_types, samples, self._functions, self._locations,
+          self._string_table, [device_description])
 
-  def _get_pprof_proto(self, profile_datum_generator):
-    """Returns profile data in pprof proto format.
+  def _add_samples(self, samples, profile_datum_generator):
+    """Adds profile data to samples.
 
     Args:
+      samples: A `Samples` object.
       profile_datum_generator: Generator outputting `ProfileDatum` objects.
-
-    Returns:
-      A proto in pprof format.
     """
-    pprof_profile = profile_pb2.Profile()
-    samples = Samples(self._string_table)
-
     for datum in profile_datum_generator:
-      if not datum.traceback:
+      node_name = datum.node_exec_stats.node_name
+      if node_name not in self._node_name_to_location_ids:
+        self._node_name_to_location_ids[node_name] = (
+            self._get_location_ids(datum.traceback) if datum.traceback
+            else None)
+      location_ids = self._node_name_to_location_ids[node_name]
+      if location_ids is None:
         continue
-
-      stack_frame = datum.traceback[-1]
-      after_apply_op = False
-      location_ids = []
-
-      # We add locations from stack trace in bottom-up order.
-      for stack_frame_index in reversed(range(len(datum.traceback) - 1)):
-        prev_stack_frame = stack_frame
-        stack_frame = datum.traceback[stack_frame_index]
-
-        # Call at current frame calls function at previous frame.
-        prev_file_path = prev_stack_frame[0]
-        prev_function = prev_stack_frame[2]
-        prev_function_start_line = -1
-        curr_file_path = stack_frame[0]
-        curr_line_number = stack_frame[1]
-
-        # Skip all calls up to apply_op since they are the same for all ops.
-        if not after_apply_op:
-          if prev_function == 'apply_op':
-            after_apply_op = True
-          continue
-        location_index = self._locations.index_of(
-            curr_file_path, curr_line_number,
-            prev_function, prev_file_path, prev_function_start_line)
-        location_ids.append(location_index)
       samples.add(datum, location_ids)
 
-    sample_type_description = 'count'
-    sample_type = pprof_profile.sample_type.add()
-    sample_type.type = self._string_table.index_of(sample_type_description)
-    sample_type.unit = self._string_table.index_of('count')
-    sample_type_description = 'all_time'
-    sample_type = pprof_profile.sample_type.add()
-    sample_type.type = self._string_table.index_of(sample_type_description)
-    sample_type.unit = self._string_table.index_of('nanoseconds')
-    sample_type_description = 'op_time'
-    sample_type = pprof_profile.sample_type.add()
-    sample_type.type = self._string_table.index_of(sample_type_description)
-    sample_type.unit = self._string_table.index_of('nanoseconds')
+  def _get_location_ids(self, traceback):
+    """Returns the location ids of a traceback.
 
-    pprof_profile.string_table.extend(self._string_table.string_table())
-    pprof_profile.sample.extend(samples.get_sample_protos())
-    pprof_profile.function.extend(self._functions.function_protos())
-    pprof_profile.location.extend(self._locations.location_protos())
-    return pprof_profile
+    Args:
+      traceback: Non-empty traceback of a node.
+
+    Returns:
+      List of location ids, in bottom-up order.
+    """
+    stack_frame = traceback[-1]
+    after_apply_op = False
+    location_ids = []
+
+    # We add locations from stack trace in bottom-up order.
+    for stack_frame_index in reversed(range(len(traceback) - 1)):
+      prev_stack_frame = stack_frame
+      stack_frame = traceback[stack_frame_index]
+
+      # Call at current frame calls function at previous frame.
+      prev_file_path = prev_stack_frame[0]
+      prev_function = prev_stack_frame[2]
+      prev_function_start_line = -1
+      curr_file_path = stack_frame[0]
+      curr_line_number = stack_frame[1]
+
+      # Skip all calls up to apply_op since they are the same for all ops.
+      if not after_apply_op:
+        if prev_function == 'apply_op':
+          after_apply_op = True
+        continue
+      location_index = self._locations.index_of(
+          curr_file_path, curr_line_number,
+          prev_function, prev_file_path, prev_function_start_line)
+      location_ids.append(location_index)
+    return location_ids
 
   def _get_profile_data_generator(self):
     """Get function that generates `ProfileDatum` objects.
@@ -390,7 +585,8 @@ def get_profiles(graph, run_metadata):
 
   Args:
     graph: A `Graph` object.
-    run_metadata: A `RunMetadata` proto.
+    run_metadata: A `RunMetadata` proto, or a list of `RunMetadata` protos
+      whose statistics are aggregated.
 
   Returns:
     A dictionary mapping from device name to pprof proto for that device.
@@ -406,7 +602,8 @@ def profile(graph, run_metadata, output_dir=None):
 
   Args:
     graph: A `Graph` object.
-    run_metadata: A `RunMetadata` proto.
+    run_metadata: A `RunMetadata` proto, or a list of `RunMetadata` protos
+      whose statistics are aggregated.
     output_dir: (string) Directory to output pprof profile to.
       Profile files for each device will be stored in compressed
       serialized proto format. If output_dir is None, profile protos
@@ -416,26 +613,91 @@ def profile(graph, run_metadata, output_dir=None):
     List of output files created by this profile call.
     (Note: this list will be empty if output_dir is None)
   """
-  profiles = get_profiles(graph, run_metadata)
-  output_file_template = None
-  if output_dir:
-    if not os.path.isdir(output_dir):
-      os.makedirs(output_dir)
-    time_suffix = time.strftime('%Y%m%d%H%M%S')
-    output_file_template = os.path.join(
-        output_dir, '%s_' + time_suffix + '.pb.gz')
-
-  profile_files = []
-  for device, pprof_proto in profiles.items():
-    if output_file_template is None:
+  profiler = PprofProfiler(graph, run_metadata)
+  if not output_dir:
+    for pprof_proto in profiler.profile().values():
       print('No output directory specified, printing to stdout instead.')
       print(pprof_proto)
-    else:
-      device_name = str(device).strip('/').translate(
-          maketrans('/:', '__'))
-      profile_file = output_file_template % device_name
-      profile_files.append(profile_file)
-      with gzip.open(profile_file, 'w') as output_file:
-        print('Writing profile to %s...' % profile_file)
-        output_file.write(pprof_proto.SerializeToString())
-  return profile_files
+    return []
+
+  if not os.path.isdir(output_dir):
+    os.makedirs(output_dir)
+  time_suffix = time.strftime('%Y%m%d%H%M%S')
+  output_file_template = os.path.join(
+      output_dir, '%s_' + time_suffix + '.pb.gz')
+  return profiler.write_profiles(output_file_template)
+
+
+def merge_profiles(profile_files, output_file):
+  """Merges pprof profiles from several steps or workers into one profile.
+
+  Samples with the same locations and labels are aggregated by adding up their
+  values. Functions, locations and strings are deduplicated across profiles.
+  The input profiles are read one at a time, and the merged profile is
+  streamed to `output_file`.
+
+  Args:
+    profile_files: List of paths to gzipped pprof profiles, such as the ones
+      written by `profile`.
+    output_file: (string) Path to write the merged gzipped profile to.
+
+  Returns:
+    `output_file`.
+
+  Raises:
+    ValueError: If `profile_files` is empty, or if the profiles have different
+      sample types.
+  """
+  string_table = StringTable()
+  functions = Functions(string_table)
+  locations = Locations(functions)
+  samples = Samples(string_table)
+  sample_types = None
+  comments = []
+
+  for profile_file in profile_files:
+    pprof_proto = profile_pb2.Profile()
+    with gzip.open(profile_file, 'rb') as input_file:
+      pprof_proto.ParseFromString(input_file.read())
+    strings = pprof_proto.string_table
+
+    file_sample_types = [
+        (strings[sample_type.type], strings[sample_type.unit])
+        for sample_type in pprof_proto.sample_type]
+    if sample_types is None:
+      sample_types = file_sample_types
+    elif file_sample_types != sample_types:
+      raise ValueError(
+          'Cannot merge profiles with different sample types: %s in %s, '
+          'but %s in the previous profiles.' %
+          (file_sample_types, profile_file, sample_types))
+
+    function_ids = {}
+    for function in pprof_proto.function:
+      function_ids[function.id] = functions.index_of(
+          strings[function.filename], strings[function.name],
+          function.start_line)
+    location_ids = {}
+    for location in pprof_proto.location:
+      location_ids[location.id] = locations.index_of_lines(tuple(
+          (function_ids[line.function_id], line.line)
+          for line in location.line))
+    for sample in pprof_proto.sample:
+      samples.add_values(
+          [location_ids[location_id] for location_id in sample.location_id],
+          [(string_table.index_of(strings[label.key]),
+            string_table.index_of(strings[label.str]),
+            label.num,
+            string_table.index_of(strings[label.num_unit]))
+           for label in sample.label],
+          sample.value)
+    comments.extend(strings[comment] for comment in pprof_proto.comment)
+
+  if sample_types is None:
+    raise ValueError('No profiles to merge.')
+  sample_types = [
+      (string_table.index_of(sample_type), string_table.index_of(unit))
+      for sample_type, unit in sample_types]
+  _write_profile(output_file, _profile_chunks(
+      sample_types, samples, functions, locations, string_table, comments))
+  return output_file
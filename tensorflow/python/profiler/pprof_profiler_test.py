@@ -15,6 +15,7 @@
 """Tests for pprof_profiler."""
 
 import gzip
+import os
 
 from proto import profile_pb2
 from tensorflow.core.framework import step_stats_pb2
@@ -132,6 +133,114 @@ comment: 9
       profile.ParseFromString(profile_contents)
       self.assertEqual(expected_proto, str(profile))
 
+  def _makeGraph(self):
+    graph = test.mock.MagicMock()
+    op1 = test.mock.MagicMock()
+    op1.name = 'Add/123'
+    op1.traceback = [
+        ('a/main.py', 5, '<module>'), ('a/train.py', 9, 'train'),
+        ('a/model.py', 20, 'build'), ('a/op_def_library.py', 100, 'apply_op'),
+        ('a/ops.py', 50, 'create_op')]
+    op1.type = 'add'
+    graph.get_operations.return_value = [op1]
+    return graph
+
+  def _makeRunMetadata(self, device, num_executions):
+    run_metadata = config_pb2.RunMetadata()
+    device_stats = run_metadata.step_stats.dev_stats.add()
+    device_stats.device = device
+    for _ in range(num_executions):
+      device_stats.node_stats.add(
+          node_name='Add/123',
+          op_start_rel_micros=3,
+          op_end_rel_micros=5,
+          all_end_rel_micros=4)
+    return run_metadata
+
+  def testRepeatedNodeExecutionsShareOneSampleAndItsLocations(self):
+    profiles = pprof_profiler.get_profiles(
+        self._makeGraph(), self._makeRunMetadata('deviceA', 3))
+    profile = profiles['deviceA']
+    self.assertEqual(1, len(profile.sample))
+    self.assertEqual([3, 12, 6], list(profile.sample[0].value))
+    # One location per frame above apply_op, not one per execution.
+    self.assertEqual(2, len(profile.sample[0].location_id))
+    self.assertEqual(2, len(profile.location))
+    self.assertEqual(2, len(profile.function))
+
+  def testProfileAggregatesMultipleSteps(self):
+    run_metadata = [self._makeRunMetadata('deviceA', 1),
+                    self._makeRunMetadata('deviceA', 2)]
+    profiles = pprof_profiler.get_profiles(self._makeGraph(), run_metadata)
+    self.assertEqual(['deviceA'], list(profiles))
+    self.assertEqual(1, len(profiles['deviceA'].sample))
+    self.assertEqual([3, 12, 6], list(profiles['deviceA'].sample[0].value))
+
+  def testStreamedProfileFileMatchesProto(self):
+    graph = self._makeGraph()
+    run_metadata = self._makeRunMetadata('deviceA', 2)
+    expected_profile = pprof_profiler.get_profiles(
+        graph, run_metadata)['deviceA']
+    with test.mock.patch.object(pprof_profiler, '_STREAMING_CHUNK_SIZE', 1):
+      profile_files = pprof_profiler.profile(
+          graph, run_metadata, self.get_temp_dir())
+    self.assertEqual(1, len(profile_files))
+    with gzip.open(profile_files[0]) as profile_file:
+      profile = profile_pb2.Profile()
+      profile.ParseFromString(profile_file.read())
+    self.assertEqual(str(expected_profile), str(profile))
+
+  def testMergeProfiles(self):
+    graph = self._makeGraph()
+    profile_files = []
+    for worker, num_executions in (('worker0', 1), ('worker1', 2)):
+      profile_files.extend(pprof_profiler.profile(
+          graph, self._makeRunMetadata('/job:%s/cpu:0' % worker,
+                                       num_executions),
+          self.get_temp_dir()))
+    output_file = os.path.join(self.get_temp_dir(), 'merged.pb.gz')
+
+    self.assertEqual(
+        output_file, pprof_profiler.merge_profiles(profile_files, output_file))
+    with gzip.open(output_file) as profile_file:
+      profile = profile_pb2.Profile()
+      profile.ParseFromString(profile_file.read())
+    strings = profile.string_table
+    self.assertEqual(
+        [('count', 'count'), ('all_time', 'nanoseconds'),
+         ('op_time', 'nanoseconds')],
+        [(strings[sample_type.type], strings[sample_type.unit])
+         for sample_type in profile.sample_type])
+    self.assertEqual(1, len(profile.sample))
+    self.assertEqual([3, 12, 6], list(profile.sample[0].value))
+    self.assertEqual(
+        [('node_name', 'Add/123'), ('op_type', 'add')],
+        [(strings[label.key], strings[label.str])
+         for label in profile.sample[0].label])
+    self.assertEqual(2, len(profile.location))
+    self.assertEqual(
+        ['Device 1 of 1: /job:worker0/cpu:0',
+         'Device 1 of 1: /job:worker1/cpu:0'],
+        [strings[comment] for comment in profile.comment])
+
+  def testMergeProfilesWithDifferentSampleTypesRaisesError(self):
+    profile_files = pprof_profiler.profile(
+        self._makeGraph(), self._makeRunMetadata('deviceA', 1),
+        self.get_temp_dir())
+    other_profile = profile_pb2.Profile()
+    other_profile.string_table.extend(['', 'samples', 'count'])
+    sample_type = other_profile.sample_type.add()
+    sample_type.type = 1
+    sample_type.unit = 2
+    other_file = os.path.join(self.get_temp_dir(), 'other.pb.gz')
+    with gzip.open(other_file, 'wb') as f:
+      f.write(other_profile.SerializeToString())
+
+    with self.assertRaisesRegex(ValueError, 'different sample types'):
+      pprof_profiler.merge_profiles(
+          profile_files + [other_file],
+          os.path.join(self.get_temp_dir(), 'merged.pb.gz'))
+
   @test_util.run_v1_only('b/120545219')
   def testProfileWithWhileLoop(self):
     options = config_pb2.RunOptions()
@@ -22,6 +22,10 @@ The profiler has two modes:
 - Sampling Mode: start_server(). It will perform profiling after receiving a
                  profiling request.
 
+For continuous, low-overhead statistics of step time, input wait and
+`tf.function` calls in production, see `sampling_profiler.start()`, which
+samples `Trace` scopes without capturing a profile.
+
 NOTE: Only one active profiler session is allowed. Use of simultaneous
 Programmatic Mode and Sampling Mode is undefined and will likely fail.
 
@@ -0,0 +1,422 @@
+# Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Always-on statistical sampler of `Trace` scopes.
+
+Unlike the captures of `profiler_v2.start()`/`stop()`, which record every event
+for a short period of time, the sampling profiler is meant to stay enabled in
+production. It keeps rolling percentile histograms of a sample of the `Trace`
+scopes, and exports them through `tensorflow/python/eager/monitoring.py`
+gauges:
+
+  * `/tensorflow/profiler/sampling/step_time_us`: wall time of the scopes that
+    carry a `step_num`, e.g. `Trace("train", step_num=step, _r=1)`. Step scopes
+    are always timed, as they are long compared to the cost of timing them.
+  * `/tensorflow/profiler/sampling/input_wait_us`: time between the end of a
+    step scope and the start of the next one with the same name. In a
+    `for batch in dataset:` loop, this is dominated by waiting for input.
+  * `/tensorflow/profiler/sampling/scope_time_us`: wall time of the sampled
+    scopes. Each `tf.function` call is a scope named after the function.
+  * `/tensorflow/profiler/sampling/scope_host_time_us`: CPU time of the
+    calling thread in the sampled scopes, i.e. the Python and runtime host
+    time per `tf.function` call.
+  * `/tensorflow/profiler/sampling/tracing_count`: number of times each
+    `tf.function` has been traced, as of its last sampled call.
+  * `/tensorflow/profiler/sampling/overhead_ppm`: estimated time spent by
+    the sampler, in parts per million of wall time.
+
+The histogram gauges are labeled with the scope name and a percentile, such as
+"p99", and are updated each time a window of `window_seconds` elapses. The
+percentiles are computed over the last `num_windows` windows.
+
+Overhead budget: the sampler is designed to cost less than 1% of the run time.
+When it is not started, each `Trace` scope pays for a single check of a module
+variable. When it is started, a scope that is not sampled pays for one call to
+`random.random()`, and a sampled scope for reading two clocks twice and
+updating a few histogram buckets. Functions decorated with
+`trace.trace_wrapper`, such as `convert_to_tensor`, are never sampled.
+
+The overhead is the time spent in recording sampled scopes, measured directly,
+plus the cost of deciding whether to sample each scope, estimated by timing
+that decision when the sampler starts. If the overhead exceeds `max_overhead`
+over a window, the sampling probability is halved, down to
+`_MIN_SAMPLE_PROBABILITY`. It is raised back towards `sample_probability` once
+the overhead is well within the budget.
+
+Example usage:
+```python
+sampling_profiler.start(sample_probability=0.01)
+for step, batch in enumerate(dataset):
+  with trace.Trace("train", step_num=step, _r=1):
+    train_fn(batch)
+sampling_profiler.stop()
+```
+"""
+
+import math
+import random
+import threading
+import time
+
+from tensorflow.python.eager import monitoring
+from tensorflow.python.framework import errors
+from tensorflow.python.profiler import trace
+
+# Values are counted in buckets whose bounds grow by this factor, so that
+# percentiles have a relative error of at most 20%.
+_BUCKET_GROWTH_FACTOR = 1.2
+_LOG_BUCKET_GROWTH_FACTOR = math.log(_BUCKET_GROWTH_FACTOR)
+# Covers values from 1 microsecond to about 3 hours.
+_NUM_BUCKETS = 128
+
+# The sampling probability is never lowered below this value.
+_MIN_SAMPLE_PROBABILITY = 1e-4
+
+# Number of calls timed to estimate the cost of `_Sampler.begin`.
+_NUM_CALIBRATION_CALLS = 1000
+
+_step_time_gauge = monitoring.IntGauge(
+    '/tensorflow/profiler/sampling/step_time_us',
+    'Percentiles of the wall time of step scopes, in microseconds.',
+    'name', 'percentile')
+_input_wait_gauge = monitoring.IntGauge(
+    '/tensorflow/profiler/sampling/input_wait_us',
+    'Percentiles of the time between consecutive step scopes, in '
+    'microseconds.',
+    'name', 'percentile')
+_scope_time_gauge = monitoring.IntGauge(
+    '/tensorflow/profiler/sampling/scope_time_us',
+    'Percentiles of the wall time of sampled scopes, in microseconds.',
+    'name', 'percentile')
+_scope_host_time_gauge = monitoring.IntGauge(
+    '/tensorflow/profiler/sampling/scope_host_time_us',
+    'Percentiles of the CPU time of the calling thread in sampled scopes, in '
+    'microseconds.',
+    'name', 'percentile')
+_tracing_count_gauge = monitoring.IntGauge(
+    '/tensorflow/profiler/sampling/tracing_count',
+    'Number of times a tf.function has been traced, as of its last sampled '
+    'call.',
+    'name')
+_overhead_gauge = monitoring.IntGauge(
+    '/tensorflow/profiler/sampling/overhead_ppm',
+    'Time spent by the sampling profiler, in parts per million of wall time.')
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+class _RollingHistogram(object):
+  """Approximate percentiles of the values recorded over a rolling window.
+
+  The window is split into sub-windows. Starting a new sub-window drops the
+  oldest one, so memory stays bounded by `num_windows * _NUM_BUCKETS` counts no
+  matter how many values are recorded.
+  """
+
+  __slots__ = ['_windows', '_window_index']
+
+  def __init__(self, num_windows):
+    self._windows = [[0] * _NUM_BUCKETS for _ in range(num_windows)]
+    self._window_index = 0
+
+  def add(self, value_us):
+    if value_us < 1:
+      bucket = 0
+    else:
+      bucket = min(int(math.log(value_us) / _LOG_BUCKET_GROWTH_FACTOR) + 1,
+                   _NUM_BUCKETS - 1)
+    self._windows[self._window_index][bucket] += 1
+
+  def rotate(self):
+    """Starts a new sub-window, dropping the oldest one."""
+    self._window_index = (self._window_index + 1) % len(self._windows)
+    window = self._windows[self._window_index]
+    for bucket in range(_NUM_BUCKETS):
+      window[bucket] = 0
+
+  def percentile(self, percentile):
+    """Returns the upper bound of the bucket holding the given percentile.
+
+    Args:
+      percentile: A number in (0, 100].
+
+    Returns:
+      The percentile, in microseconds, or None if no value was recorded.
+    """
+    counts = [sum(bucket_counts) for bucket_counts in zip(*self._windows)]
+    total = sum(counts)
+    if not total:
+      return None
+    rank = total * percentile / 100.0
+    cumulative = 0
+    for bucket, count in enumerate(counts):
+      cumulative += count
+      if cumulative >= rank:
+        break
+    return int(math.ceil(_BUCKET_GROWTH_FACTOR**bucket))
+
+
+class _ScopeSample(object):
+  """Timing of one sampled `Trace` scope."""
+
+  __slots__ = ['_sampler', 'name', 'metadata', 'is_step', 'start_ns',
+               'start_thread_ns']
+
+  def __init__(self, sampler, name, metadata, is_step):
+    self._sampler = sampler
+    self.name = name
+    self.metadata = metadata
+    self.is_step = is_step
+    self.start_thread_ns = time.thread_time_ns()
+    self.start_ns = time.perf_counter_ns()
+
+  def end(self):
+    end_ns = time.perf_counter_ns()
+    end_thread_ns = time.thread_time_ns()
+    self._sampler.record(self, end_ns, end_thread_ns)
+
+
+class _Sampler(object):
+  """Samples `Trace` scopes and exports their statistics to gauges."""
+
+  def __init__(self, sample_probability, window_seconds, num_windows,
+               percentiles, max_overhead):
+    self._max_sample_probability = sample_probability
+    self._sample_probability = sample_probability
+    self._window_ns = int(window_seconds * 1e9)
+    self._num_windows = num_windows
+    self._percentiles = [(percentile, 'p%g' % percentile)
+                         for percentile in percentiles]
+    self._max_overhead = max_overhead
+    self._lock = threading.Lock()
+    self._histograms = {}
+    self._tracing_counts = {}
+    self._last_step_end_ns = {}
+    self._num_begins = 0
+    self._num_accounted_begins = 0
+    self._begin_ns, self._sample_ns = self._calibrate()
+    self._window_start_ns = time.perf_counter_ns()
+    self._window_overhead_ns = 0
+    self._start_ns = self._window_start_ns
+    self._total_overhead_ns = 0
+
+  def _calibrate(self):
+    """Estimates the cost of deciding to sample a scope and of sampling it.
+
+    Returns:
+      The mean time in nanoseconds of a `begin` call that does not sample the
+      scope, and the extra time taken to start a `_ScopeSample`.
+    """
+    sample_probability = self._sample_probability
+    self._sample_probability = 0.0
+    start_ns = time.perf_counter_ns()
+    for _ in range(_NUM_CALIBRATION_CALLS):
+      self.begin('', {})
+    begin_ns = (time.perf_counter_ns() - start_ns) / _NUM_CALIBRATION_CALLS
+    self._sample_probability = sample_probability
+    self._num_begins = 0
+
+    start_ns = time.perf_counter_ns()
+    for _ in range(_NUM_CALIBRATION_CALLS):
+      _ScopeSample(self, '', {}, False)
+    sample_ns = (time.perf_counter_ns() - start_ns) / _NUM_CALIBRATION_CALLS
+    return begin_ns, sample_ns
+
+  @property
+  def sample_probability(self):
+    return self._sample_probability
+
+  def begin(self, name, metadata):
+    """Called when a `Trace` scope starts.
+
+    Args:
+      name: Name of the scope.
+      metadata: Dict of the keyword arguments of the scope.
+
+    Returns:
+      A `_ScopeSample` whose `end()` must be called when the scope ends, or
+      None if the scope is not sampled.
+    """
+    # Not atomic, which at worst loses a few counts of the estimated overhead.
+    self._num_begins += 1
+    if 'step_num' in metadata:
+      return _ScopeSample(self, name, metadata, True)
+    if random.random() < self._sample_probability:
+      return _ScopeSample(self, name, metadata, False)
+    return None
+
+  def record(self, sample, end_ns, end_thread_ns):
+    """Records the statistics of a sampled scope that just ended."""
+    with self._lock:
+      if end_ns - self._window_start_ns >= self._window_ns:
+        self._end_windows(end_ns)
+
+      if sample.is_step:
+        self._add(_step_time_gauge, sample.name,
+                  (end_ns - sample.start_ns) / 1e3)
+        last_step_end_ns = self._last_step_end_ns.get(sample.name)
+        if last_step_end_ns is not None and sample.start_ns > last_step_end_ns:
+          self._add(_input_wait_gauge, sample.name,
+                    (sample.start_ns - last_step_end_ns) / 1e3)
+        self._last_step_end_ns[sample.name] = end_ns
+      else:
+        self._add(_scope_time_gauge, sample.name,
+                  (end_ns - sample.start_ns) / 1e3)
+        self._add(_scope_host_time_gauge, sample.name,
+                  (end_thread_ns - sample.start_thread_ns) / 1e3)
+        tracing_count = sample.metadata.get('tracing_count')
+        if tracing_count is not None:
+          self._tracing_counts[sample.name] = tracing_count
+
+      self._add_overhead(time.perf_counter_ns() - end_ns + self._sample_ns)
+
+  def _add_overhead(self, overhead_ns):
+    self._window_overhead_ns += overhead_ns
+    self._total_overhead_ns += overhead_ns
+
+  def _account_begins(self):
+    """Adds the estimated cost of the `begin` calls made since last time."""
+    num_begins = self._num_begins
+    self._add_overhead(
+        (num_begins - self._num_accounted_begins) * self._begin_ns)
+    self._num_accounted_begins = num_begins
+
+  def _add(self, gauge, name, value_us):
+    histogram = self._histograms.get((gauge, name))
+    if histogram is None:
+      histogram = _RollingHistogram(self._num_windows)
+      self._histograms[(gauge, name)] = histogram
+    histogram.add(value_us)
+
+  def _end_windows(self, now_ns):
+    """Exports the statistics and starts a new window."""
+    self._account_begins()
+    overhead = self._window_overhead_ns / max(now_ns - self._window_start_ns, 1)
+    if overhead > self._max_overhead:
+      self._sample_probability = max(self._sample_probability / 2,
+                                     _MIN_SAMPLE_PROBABILITY)
+    elif overhead < self._max_overhead / 4:
+      self._sample_probability = min(self._sample_probability * 2,
+                                     self._max_sample_probability)
+
+    self.export(now_ns)
+    num_elapsed_windows = min(
+        (now_ns - self._window_start_ns) // self._window_ns, self._num_windows)
+    for histogram in self._histograms.values():
+      for _ in range(num_elapsed_windows):
+        histogram.rotate()
+    self._window_start_ns += num_elapsed_windows * self._window_ns
+    if now_ns - self._window_start_ns >= self._window_ns:
+      # More windows than kept have elapsed since the last scope.
+      self._window_start_ns = now_ns
+    self._window_overhead_ns = 0
+
+  def export(self, now_ns=None):
+    """Sets the gauges to the current statistics."""
+    if now_ns is None:
+      now_ns = time.perf_counter_ns()
+    self._account_begins()
+    for (gauge, name), histogram in self._histograms.items():
+      for percentile, label in self._percentiles:
+        value = histogram.percentile(percentile)
+        if value is not None:
+          gauge.get_cell(name, label).set(value)
+    for name, tracing_count in self._tracing_counts.items():
+      _tracing_count_gauge.get_cell(name).set(int(tracing_count))
+    _overhead_gauge.get_cell().set(
+        int(1e6 * self._total_overhead_ns / max(now_ns - self._start_ns, 1)))
+
+  def flush(self):
+    with self._lock:
+      self.export()
+
+
+def start(sample_probability=0.01,
+          window_seconds=10,
+          num_windows=6,
+          percentiles=(50, 90, 99),
+          max_overhead=0.01):
+  """Starts sampling `Trace` scopes and exporting their statistics.
+
+  Args:
+    sample_probability: Probability with which each `Trace` scope without a
+      `step_num` is sampled. Step scopes are always recorded.
+    window_seconds: Interval, in seconds, at which the gauges are updated and
+      the oldest statistics are dropped.
+    num_windows: Number of windows of `window_seconds` over which the
+      percentiles are computed.
+    percentiles: Percentiles, in (0, 100], exported for each histogram.
+    max_overhead: Fraction of the wall time that the sampler may spend in
+      deciding which scopes to sample and in recording them before it lowers
+      the sampling probability.
+
+  Raises:
+    AlreadyExistsError: If the sampling profiler is already running.
+    ValueError: If any of the arguments is out of range.
+  """
+  global _sampler
+  if not 0 < sample_probability <= 1:
+    raise ValueError('sample_probability must be in (0, 1], but got %s.' %
+                     sample_probability)
+  if window_seconds <= 0:
+    raise ValueError('window_seconds must be positive, but got %s.' %
+                     window_seconds)
+  if num_windows < 1:
+    raise ValueError('num_windows must be at least 1, but got %s.' %
+                     num_windows)
+  for percentile in percentiles:
+    if not 0 < percentile <= 100:
+      raise ValueError('Percentiles must be in (0, 100], but got %s.' %
+                       percentile)
+  if not 0 < max_overhead < 1:
+    raise ValueError('max_overhead must be in (0, 1), but got %s.' %
+                     max_overhead)
+
+  with _sampler_lock:
+    if _sampler is not None:
+      raise errors.AlreadyExistsError(
+          None, None, 'Another sampling profiler is running.')
+    _sampler = _Sampler(sample_probability, window_seconds, num_windows,
+                        percentiles, max_overhead)
+    trace.sampler = _sampler
+
+
+def stop():
+  """Stops sampling, after setting the gauges to the latest statistics.
+
+  Raises:
+    UnavailableError: If the sampling profiler is not running.
+  """
+  global _sampler
+  with _sampler_lock:
+    if _sampler is None:
+      raise errors.UnavailableError(
+          None, None, 'No sampling profiler is running.')
+    trace.sampler = None
+    _sampler.flush()
+    _sampler = None
+
+
+def flush():
+  """Sets the gauges to the latest statistics without waiting for a window.
+
+  Raises:
+    UnavailableError: If the sampling profiler is not running.
+  """
+  with _sampler_lock:
+    if _sampler is None:
+      raise errors.UnavailableError(
+          None, None, 'No sampling profiler is running.')
+    _sampler.flush()
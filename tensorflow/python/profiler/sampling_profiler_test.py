@@ -0,0 +1,155 @@
+# Copyright 2026 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the sampling profiler."""
+
+import time
+
+from tensorflow.python.eager import def_function
+from tensorflow.python.eager import test
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import test_util
+from tensorflow.python.profiler import sampling_profiler
+from tensorflow.python.profiler import trace
+
+
+class SamplingProfilerTest(test_util.TensorFlowTestCase):
+
+  def tearDown(self):
+    if trace.sampler is not None:
+      sampling_profiler.stop()
+    super(SamplingProfilerTest, self).tearDown()
+
+  def testStartAndStopErrors(self):
+    sampling_profiler.start()
+    with self.assertRaises(errors.AlreadyExistsError):
+      sampling_profiler.start()
+    sampling_profiler.stop()
+    self.assertIsNone(trace.sampler)
+    with self.assertRaises(errors.UnavailableError):
+      sampling_profiler.stop()
+    with self.assertRaises(errors.UnavailableError):
+      sampling_profiler.flush()
+
+  def testInvalidArgumentsLeadToErrors(self):
+    with self.assertRaisesRegex(ValueError, 'sample_probability'):
+      sampling_profiler.start(sample_probability=0)
+    with self.assertRaisesRegex(ValueError, 'window_seconds'):
+      sampling_profiler.start(window_seconds=0)
+    with self.assertRaisesRegex(ValueError, 'num_windows'):
+      sampling_profiler.start(num_windows=0)
+    with self.assertRaisesRegex(ValueError, 'Percentiles'):
+      sampling_profiler.start(percentiles=(50, 101))
+    with self.assertRaisesRegex(ValueError, 'max_overhead'):
+      sampling_profiler.start(max_overhead=1)
+    self.assertIsNone(trace.sampler)
+
+  def testStepScopesExportStepTimeAndInputWait(self):
+    sampling_profiler.start(sample_probability=1e-3, window_seconds=3600)
+    for step in range(3):
+      time.sleep(0.002)
+      with trace.Trace('sampling_train', step_num=step, _r=1):
+        time.sleep(0.01)
+    sampling_profiler.flush()
+
+    step_time_us = sampling_profiler._step_time_gauge.get_cell(
+        'sampling_train', 'p50').value()
+    input_wait_us = sampling_profiler._input_wait_gauge.get_cell(
+        'sampling_train', 'p50').value()
+    self.assertGreaterEqual(step_time_us, 10000)
+    self.assertGreaterEqual(input_wait_us, 2000)
+    self.assertLess(input_wait_us, step_time_us)
+
+  def testFunctionCallsExportHostTimeAndTracingCount(self):
+
+    def sampling_double(x):
+      return x + x
+
+    double = def_function.function(sampling_double)
+    sampling_profiler.start(sample_probability=1.0, window_seconds=3600)
+    double(constant_op.constant(1))
+    double(constant_op.constant(2))
+    double(constant_op.constant(1.0))
+    sampling_profiler.stop()
+
+    self.assertEqual(
+        2,
+        sampling_profiler._tracing_count_gauge.get_cell(
+            'sampling_double').value())
+    self.assertGreater(
+        sampling_profiler._scope_time_gauge.get_cell(
+            'sampling_double', 'p99').value(), 0)
+    self.assertGreater(
+        sampling_profiler._scope_host_time_gauge.get_cell(
+            'sampling_double', 'p99').value(), 0)
+
+  def testRollingHistogramPercentilesAndRotation(self):
+    histogram = sampling_profiler._RollingHistogram(2)
+    self.assertIsNone(histogram.percentile(50))
+    for value_us in range(1, 1001):
+      histogram.add(value_us)
+    for percentile in (50, 90, 99):
+      self.assertAllInRange(
+          histogram.percentile(percentile), percentile * 10,
+          percentile * 10 * sampling_profiler._BUCKET_GROWTH_FACTOR + 1)
+
+    histogram.rotate()
+    histogram.add(5)
+    self.assertGreater(histogram.percentile(99), 500)
+    histogram.rotate()
+    self.assertLessEqual(histogram.percentile(99), 6)
+    histogram.rotate()
+    self.assertIsNone(histogram.percentile(50))
+
+  def testSampleProbabilityIsLoweredWhenOverBudget(self):
+    sampler = sampling_profiler._Sampler(
+        sample_probability=1.0, window_seconds=1e-9, num_windows=2,
+        percentiles=(50,), max_overhead=1e-9)
+    for _ in range(20):
+      sample = sampler.begin('sampling_op', {})
+      if sample is not None:
+        sample.end()
+    self.assertLess(sampler.sample_probability, 1.0)
+    self.assertGreaterEqual(sampler.sample_probability,
+                            sampling_profiler._MIN_SAMPLE_PROBABILITY)
+    self.assertGreater(sampling_profiler._overhead_gauge.get_cell().value(), 0)
+
+  def testUnsampledScopesCountTowardsOverhead(self):
+    sampler = sampling_profiler._Sampler(
+        sample_probability=1e-4, window_seconds=3600, num_windows=2,
+        percentiles=(50,), max_overhead=0.01)
+    self.assertGreater(sampler._begin_ns, 0)
+    for _ in range(1000):
+      sample = sampler.begin('sampling_op', {})
+      if sample is not None:
+        sample.end()
+    sampler.flush()
+    self.assertGreaterEqual(sampler._total_overhead_ns,
+                            1000 * sampler._begin_ns)
+
+  def testTraceWrapperIsNotSampled(self):
+
+    @trace.trace_wrapper('sampling_wrapped')
+    def wrapped():
+      return 1
+
+    sampling_profiler.start(sample_probability=1.0, window_seconds=3600)
+    with test.mock.patch.object(trace, 'Trace', autospec=True) as fake_trace:
+      self.assertEqual(1, wrapped())
+    fake_trace.assert_not_called()
+
+
+if __name__ == '__main__':
+  test.main()
@@ -23,6 +23,12 @@ from tensorflow.python.util.tf_export import tf_export
 # arrangement will reduce the number of calls through pybind11.
 enabled = False
 
+# This variable is set by sampling_profiler.start/stop(). When not None, `Trace`
+# scopes are reported to it, which samples them to keep statistics. Functions
+# decorated with `trace_wrapper` are not reported, as some of them, such as
+# `convert_to_tensor`, are too hot to sample.
+sampler = None
+
 
 @tf_export('profiler.experimental.Trace', v1=[])
 class Trace(object):
@@ -79,6 +85,12 @@ class Trace(object):
       self._traceme = _pywrap_traceme.TraceMe(name, **kwargs)
     else:
       self._traceme = None
+    # Read the global once, as sampling_profiler.stop() may reset it anytime.
+    current_sampler = sampler
+    if current_sampler is not None:
+      self._sample = current_sampler.begin(name, kwargs)
+    else:
+      self._sample = None
 
   def __enter__(self):
     # Starting the TraceMe clock here would require an extra Python->C++ call.
@@ -117,10 +129,14 @@ class Trace(object):
     """
     if self._traceme and kwargs:
       self._traceme.SetMetadata(**kwargs)
+    if self._sample is not None:
+      self._sample.metadata.update(kwargs)
 
   def __exit__(self, exc_type, exc_val, exc_tb):
     if self._traceme:
       self._traceme.Stop()
+    if self._sample is not None:
+      self._sample.end()
 
 
 def trace_wrapper(trace_name, **trace_kwargs):
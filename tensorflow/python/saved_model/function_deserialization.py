@@ -17,6 +17,8 @@
 import collections
 import pprint
 import re
+import threading
+import time
 
 from absl import logging
 
@@ -41,6 +43,7 @@ from tensorflow.python.util import compat
 from tensorflow.python.util import nest
 from tensorflow.python.util import tf_decorator
 from tensorflow.python.util import tf_inspect
+from tensorflow.python.util.compat import collections_abc
 
 
 def _is_tensor(t):
@@ -224,6 +227,37 @@ def setup_bare_concrete_function(saved_bare_concrete_function,
   return concrete_function
 
 
+class DeferredConcreteFunction(object):
+  """Placeholder for a bare `ConcreteFunction` that is set up on first use.
+
+  Used for signature functions when loading with
+  `LoadOptions(experimental_lazy_function_loading=True)`. Containers holding
+  one (e.g. the signature map) replace it with the result of `materialize`.
+  """
+
+  def __init__(self, setup_fn):
+    self._setup_fn = setup_fn
+    self._function = None
+    self._lock = threading.Lock()
+
+  def materialize(self):
+    """Sets up the function on the first call and returns it."""
+    if self._function is None:
+      with self._lock:
+        if self._function is None:
+          with ops.init_scope():
+            self._function = self._setup_fn()
+    return self._function
+
+  def __call__(self, *args, **kwargs):
+    return self.materialize()(*args, **kwargs)
+
+  def __repr__(self):
+    if self._function is None:
+      return "<DeferredConcreteFunction (not loaded)>"
+    return repr(self._function)
+
+
 class RestoredFunction(def_function.Function):
   """Wrapper class for a function that has been restored from saved state.
 
@@ -237,7 +271,12 @@ class RestoredFunction(def_function.Function):
         name,
         autograph=False,
         jit_compile=function_spec.jit_compile)
-    self.concrete_functions = concrete_functions
+    # `concrete_functions` is either a list or, for lazily loaded functions, a
+    # callable returning the list.
+    if callable(concrete_functions):
+      self._get_concrete_functions = concrete_functions
+    else:
+      self._get_concrete_functions = lambda: concrete_functions
     self._function_type = function_spec.function_type
     self._default_values = function_spec.default_values
 
@@ -259,6 +298,10 @@ class RestoredFunction(def_function.Function):
     # via `tf.config.run_functions_eagerly`.
     return False
 
+  @property
+  def concrete_functions(self):
+    return self._get_concrete_functions()
+
   def _list_all_concrete_functions(self):
     return self.concrete_functions
 
@@ -266,7 +309,7 @@ class RestoredFunction(def_function.Function):
     return self.concrete_functions
 
 
-def recreate_function(saved_function, concrete_functions):
+def recreate_function(saved_function, concrete_functions, lazy=False):
   """Creates a `Function` from a `SavedFunction`.
 
   Args:
@@ -274,6 +317,9 @@ def recreate_function(saved_function, concrete_functions):
     concrete_functions: map from function name to `ConcreteFunction`. As a side
       effect of this function, the `FunctionSpec` from `saved_function` is added
       to each `ConcreteFunction` in this map.
+    lazy: If True, the `ConcreteFunction`s are only looked up in
+      `concrete_functions` (and have their `FunctionSpec` set) the first time
+      the returned function is called or its concrete functions are listed.
 
   Returns:
     A `Function`.
@@ -294,6 +340,20 @@ def recreate_function(saved_function, concrete_functions):
   # argument that they expect to be ignored, we do it at deserialization.
   function_spec = _deserialize_function_spec_as_nonmethod(
       saved_function.function_spec)
+  resolved = {}
+
+  def get_concrete_functions():
+    """Looks up the concrete functions once, then returns the cached list."""
+    if "functions" not in resolved:
+      concrete_function_objects = []
+      for concrete_function_name in saved_function.concrete_functions:
+        concrete_function_objects.append(
+            concrete_functions[concrete_function_name])
+
+      for cf in concrete_function_objects:
+        set_preinitialized_function_spec(cf, function_spec)
+      resolved["functions"] = concrete_function_objects
+    return resolved["functions"]
 
   def restored_function_body(*args, **kwargs):
     """Calls a restored function or raises an error if no matching function."""
@@ -307,8 +367,7 @@ def recreate_function(saved_function, concrete_functions):
     # conversions. This allows one to pick a more specific trace in case there
     # was also a more expensive one that supported tensors.
     for allow_conversion in [False, True]:
-      for function_name in saved_function.concrete_functions:
-        function = concrete_functions[function_name]
+      for function in get_concrete_functions():
         if any([inp is None for inp in function.captured_inputs]):
           raise ValueError("Looks like you are trying to run a loaded "
                            "non-Keras model that was trained using "
@@ -326,8 +385,7 @@ def recreate_function(saved_function, concrete_functions):
           len(positional),
           "\n    * ".join(pprint.pformat(a) for a in positional))
 
-    for index, function_name in enumerate(saved_function.concrete_functions):
-      concrete_function = concrete_functions[function_name]
+    for index, concrete_function in enumerate(get_concrete_functions()):
       positional, keyword = concrete_function.structured_input_signature
       signature_descriptions.append(
           "Option {}:\n  {}\n  Keyword arguments: {}".format(
@@ -339,16 +397,12 @@ def recreate_function(saved_function, concrete_functions):
         f"following {len(saved_function.concrete_functions)} option(s):\n\n"
         f"{(chr(10)+chr(10)).join(signature_descriptions)}")
 
-  concrete_function_objects = []
-  for concrete_function_name in saved_function.concrete_functions:
-    concrete_function_objects.append(concrete_functions[concrete_function_name])
-
-  for cf in concrete_function_objects:
-    set_preinitialized_function_spec(cf, function_spec)
+  if not lazy:
+    get_concrete_functions()
 
   restored_function = RestoredFunction(restored_function_body,
                                        restored_function_body.__name__,
-                                       function_spec, concrete_function_objects)
+                                       function_spec, get_concrete_functions)
 
   return tf_decorator.make_decorator(
       restored_function_body,
@@ -359,7 +413,9 @@ def recreate_function(saved_function, concrete_functions):
 def load_function_def_library(library,
                               saved_object_graph=None,
                               load_shared_name_suffix=None,
-                              wrapper_function=None):
+                              wrapper_function=None,
+                              lazy=False,
+                              post_load_fn=None):
   """Load a set of functions as concrete functions without captured inputs.
 
   Functions names are manipulated during load such that they do not overlap
@@ -375,6 +431,10 @@ def load_function_def_library(library,
     load_shared_name_suffix: If specified, used to uniquify shared names.
       Otherwise, a unique name is generated.
     wrapper_function: An object that will be wrapped on newly created functions.
+    lazy: If True, return a `LazyFunctionLibrary` that only imports a function
+      (and the functions it depends on) the first time it is looked up.
+    post_load_fn: Optional callable invoked with `(original_name, function)`
+      right after each function has been imported.
 
   Returns:
     Map of original function names in the library to instances of
@@ -383,48 +443,146 @@ def load_function_def_library(library,
   Raises:
     ValueError: if functions dependencies have a cycle.
   """
-  library_function_names = set(fdef.signature.name for fdef in library.function)
-  functions = {}
-  renamed_functions = {}
-
-  # Our graph building code currently requires functions to be registered with
-  # some tf.Graph in order to import functions using the
-  # op-name-is-function-name calling convention. To avoid leaking memory into
-  # the global default graph when executing eagerly, we create a temporary
-  # Graph.
-  #
-  # TODO(b/205023033): Make this Graph creation unnecessary when executing
-  # eagerly by fixing function_def_to_graph_def.
-  if ops.executing_eagerly_outside_functions():
-    graph = ops.Graph()
-  else:
-    graph = ops.get_default_graph()
-
-  if load_shared_name_suffix is None:
-    load_shared_name_suffix = "_load_{}".format(ops.uid())
-
-  # Custom gradient functions must be re-registered under new UIDs.
-  library_gradient_names = {}  # Maps old op type to old function name
-  new_gradient_op_types = {}  # Maps old gradient op type to new op type.
-  gradients_to_register = {}  # Maps old function name to new op type
-  for gdef in library.registered_gradients:
-    if gdef.registered_op_type:
-      new_op_type = custom_gradient.generate_name()
-      old_op_type = compat.as_bytes(gdef.registered_op_type)
-
-      library_gradient_names[old_op_type] = gdef.gradient_func
-      new_gradient_op_types[old_op_type] = new_op_type
-      gradients_to_register[gdef.gradient_func] = new_op_type
-
-  function_deps = {}
-  for fdef in library.function:
-    function_deps[fdef.signature.name] = _list_function_deps(
-        fdef, library_function_names, library_gradient_names)
-
-  loaded_gradients = {}
-  for fdef in _sort_function_defs(library, function_deps):
-    orig_name = _fix_fdef_in_place(fdef, functions, load_shared_name_suffix,
-                                   new_gradient_op_types)
+  functions = LazyFunctionLibrary(library, saved_object_graph,
+                                  load_shared_name_suffix, wrapper_function,
+                                  post_load_fn)
+  if lazy:
+    return functions
+  return functions.load_all()
+
+
+class LazyFunctionLibrary(collections_abc.Mapping):
+  """Maps original function names to `ConcreteFunction`s imported on demand.
+
+  Importing a FunctionDef (`function_def_to_graph`) dominates the time spent
+  loading SavedModels with many functions. This mapping defers the import of
+  each function until it is looked up, importing its dependencies first so
+  that renamed function references and gradient registrations stay valid.
+
+  Lookups are thread safe, which allows remaining functions to be imported in
+  the background with `load_all` while they are also being looked up.
+  """
+
+  def __init__(self, library, saved_object_graph, load_shared_name_suffix,
+               wrapper_function, post_load_fn):
+    self._saved_object_graph = saved_object_graph
+    self._wrapper_function = wrapper_function
+    self._post_load_fn = post_load_fn
+    self._fdefs = {fdef.signature.name: fdef for fdef in library.function}
+    self._functions = {}
+    self._renamed_functions = {}
+    self._loaded_gradients = {}
+    self._lock = threading.RLock()
+    self.load_seconds = 0.
+
+    # Our graph building code currently requires functions to be registered
+    # with some tf.Graph in order to import functions using the
+    # op-name-is-function-name calling convention. To avoid leaking memory into
+    # the global default graph when executing eagerly, we create a temporary
+    # Graph.
+    #
+    # TODO(b/205023033): Make this Graph creation unnecessary when executing
+    # eagerly by fixing function_def_to_graph_def.
+    if ops.executing_eagerly_outside_functions():
+      self._graph = ops.Graph()
+    else:
+      self._graph = ops.get_default_graph()
+
+    if load_shared_name_suffix is None:
+      load_shared_name_suffix = "_load_{}".format(ops.uid())
+    self._load_shared_name_suffix = load_shared_name_suffix
+
+    # Custom gradient functions must be re-registered under new UIDs.
+    library_gradient_names = {}  # Maps old op type to old function name
+    self._new_gradient_op_types = {}  # Maps old gradient op type to new op type.
+    self._gradients_to_register = {}  # Maps old function name to new op type
+    for gdef in library.registered_gradients:
+      if gdef.registered_op_type:
+        new_op_type = custom_gradient.generate_name()
+        old_op_type = compat.as_bytes(gdef.registered_op_type)
+
+        library_gradient_names[old_op_type] = gdef.gradient_func
+        self._new_gradient_op_types[old_op_type] = new_op_type
+        self._gradients_to_register[gdef.gradient_func] = new_op_type
+
+    self._function_deps = {}
+    for fdef in library.function:
+      self._function_deps[fdef.signature.name] = _list_function_deps(
+          fdef, self._fdefs, library_gradient_names)
+    # Validates that there is no dependency cycle and fixes the import order
+    # used by `load_all`. Names are recorded up front because importing a
+    # FunctionDef renames it in place.
+    self._sorted_names = [
+        fdef.signature.name
+        for fdef in _sort_function_defs(library, self._function_deps)
+    ]
+
+  def __getitem__(self, name):
+    function = self._functions.get(name)
+    if function is not None:
+      return function
+    if name not in self._fdefs:
+      raise KeyError(name)
+    with self._lock:
+      if name not in self._functions:
+        start_time = time.time()
+        # Imported functions must not be traced into the caller's graph.
+        with ops.init_scope():
+          self._load_with_dependencies(name)
+        self.load_seconds += time.time() - start_time
+    return self._functions[name]
+
+  def __contains__(self, name):
+    return name in self._fdefs
+
+  def __iter__(self):
+    return iter(self._fdefs)
+
+  def __len__(self):
+    return len(self._fdefs)
+
+  def get_if_loaded(self, name):
+    """Returns the function if it has already been imported, else None."""
+    return self._functions.get(name)
+
+  def loaded_names(self):
+    """Returns the original names of the functions imported so far."""
+    return list(self._functions)
+
+  def load_all(self):
+    """Imports all remaining functions and returns the full name mapping."""
+    for name in self._sorted_names:
+      # The lock is taken per function so that concurrent lookups are not
+      # blocked until the whole library is imported.
+      with self._lock:
+        if name not in self._functions:
+          start_time = time.time()
+          self._load_one(self._fdefs[name])
+          self.load_seconds += time.time() - start_time
+    return dict(self._functions)
+
+  def _load_with_dependencies(self, name):
+    # Iterative post-order traversal, since dependency chains can be deeper
+    # than the Python recursion limit.
+    stack = [(name, False)]
+    while stack:
+      current, deps_loaded = stack.pop()
+      if current in self._functions:
+        continue
+      if deps_loaded:
+        self._load_one(self._fdefs[current])
+        continue
+      stack.append((current, True))
+      for dep in self._function_deps[current]:
+        if dep not in self._functions:
+          stack.append((dep, False))
+
+  def _load_one(self, fdef):
+    """Imports a single FunctionDef whose dependencies are all imported."""
+    functions = self._functions
+    orig_name = _fix_fdef_in_place(fdef, functions,
+                                   self._load_shared_name_suffix,
+                                   self._new_gradient_op_types)
 
     # Setup function signatures and outputs
     #
@@ -435,13 +593,13 @@ def load_function_def_library(library,
     # restore time, so we must instead pass them to the FuncGraph explicitly.
     structured_input_signature = None
     structured_outputs = None
-    if (saved_object_graph is not None and
-        orig_name in saved_object_graph.concrete_functions):
+    if (self._saved_object_graph is not None and
+        orig_name in self._saved_object_graph.concrete_functions):
       # TODO(b/204324043): Offload the deserialization of the protos to the
       # first class objects by passing the actual protos. This is blocked on
       # importing `nested_structure_coder` in function.py causing a circular
       # dependency.
-      proto = saved_object_graph.concrete_functions[orig_name]
+      proto = self._saved_object_graph.concrete_functions[orig_name]
       structured_input_signature = nested_structure_coder.decode_proto(
           proto.canonicalized_input_signature)
       structured_outputs = nested_structure_coder.decode_proto(
@@ -452,16 +610,17 @@ def load_function_def_library(library,
     # extra function definitions are a no-op since they already imported as a
     # function before and passed in explicitly (due to the topologic sort
     # import).
-    with graph.as_default():
+    with self._graph.as_default():
       func_graph = function_def_lib.function_def_to_graph(
           fdef,
           structured_input_signature=structured_input_signature,
           structured_outputs=structured_outputs)
     # Restores gradients for function-call ops (not the same as ops that use
     # custom gradients)
-    _restore_gradient_functions(func_graph, renamed_functions, loaded_gradients)
+    _restore_gradient_functions(func_graph, self._renamed_functions,
+                                self._loaded_gradients)
 
-    for dep in function_deps[orig_name]:
+    for dep in self._function_deps[orig_name]:
       functions[dep].add_to_graph(func_graph)
 
     # We do not initialize the new ConcreteFunction's function_spec and/or
@@ -481,24 +640,25 @@ def load_function_def_library(library,
     )
     func = function_lib.ConcreteFunction.from_func_graph(
         func_graph, function_type, attrs=fdef.attr)
-    if wrapper_function:
-      func = wrapper_function(func)
-    func.add_to_graph(graph)
+    if self._wrapper_function:
+      func = self._wrapper_function(func)
+    func.add_to_graph(self._graph)
 
     functions[orig_name] = func
-    renamed_functions[func.name] = func
+    self._renamed_functions[func.name] = func
     if any(op.type == "TRTEngineOp" for op in func_graph.get_operations()):
       # TODO(b/150708051): Remove this hack once TensorRT SavedModel integration
       # is fixed. Currently it's leaking memory to maintain bug compatibility
       # with previous behavior.
       func.add_to_graph(ops.get_default_graph())
 
-    if orig_name in gradients_to_register:
-      gradient_op_type = gradients_to_register[orig_name]
-      loaded_gradients[compat.as_bytes(gradient_op_type)] = func
+    if orig_name in self._gradients_to_register:
+      gradient_op_type = self._gradients_to_register[orig_name]
+      self._loaded_gradients[compat.as_bytes(gradient_op_type)] = func
       ops.RegisterGradient(gradient_op_type)(_gen_gradient_func(func))
 
-  return functions
+    if self._post_load_fn is not None:
+      self._post_load_fn(orig_name, func)
 
 
 def _gen_gradient_func(func):
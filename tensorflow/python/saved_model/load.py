@@ -15,9 +15,12 @@
 """Import a trackable object from a SavedModel."""
 
 import collections
+from concurrent import futures
 import functools
 import os
 import sys
+import threading
+import time
 
 from absl import logging
 
@@ -146,6 +149,21 @@ class _WrapperFunction(function.ConcreteFunction):
     return super()._call_flat(args, captured_inputs)
 
 
+# Per-thread timings of the most recent `load_partial` call.
+_last_load_timings = threading.local()
+
+
+def get_last_load_timings():
+  """Returns per-phase wall times of the last SavedModel load in this thread.
+
+  The result maps phase names ("parse_saved_model", "function_library",
+  "nodes", "checkpoint", "resource_initialization" and, with lazy function
+  loading, "lazy_function_loading") to seconds. Phases that do not apply to
+  the last load (e.g. for TF1 SavedModels) are omitted.
+  """
+  return dict(getattr(_last_load_timings, "value", {}))
+
+
 class Loader(object):
   """Helper class to load an object-based SavedModel."""
 
@@ -157,11 +175,21 @@ class Loader(object):
         node.name: node.attr for node in meta_graph.graph_def.node}
     self._proto = object_graph_proto
     self._export_dir = export_dir
+    # Wall time in seconds spent in each loading phase.
+    self.load_timings = {}
+    self._lazy_functions = save_options.experimental_lazy_function_loading
+    # Maps node ids to the objects recreated so far; filled by `_load_nodes`.
+    self._nodes_by_id = {}
+    start_time = time.time()
     self._concrete_functions = (
         function_deserialization.load_function_def_library(
             library=meta_graph.graph_def.library,
             saved_object_graph=self._proto,
-            wrapper_function=_WrapperFunction))
+            wrapper_function=_WrapperFunction,
+            lazy=self._lazy_functions,
+            post_load_fn=(self._on_function_loaded
+                          if self._lazy_functions else None)))
+    self.load_timings["function_library"] = time.time() - start_time
     # Store a set of all concrete functions that have been set up with
     # captures.
     self._restored_concrete_functions = set()
@@ -220,15 +248,81 @@ class Loader(object):
     # Order all nodes or filtered nodes using the dependencies.
     self._ordered_node_ids = self._generate_ordered_node_ids()
 
+    # Bare concrete functions that are only referenced from signature maps can
+    # be set up on first use when loading lazily.
+    self._deferred_bare_function_ids = (
+        self._find_signature_only_functions() if self._lazy_functions
+        else set())
+
+    start_time = time.time()
     self._load_all()
+    self.load_timings["nodes"] = time.time() - start_time
+
+    if (self._lazy_functions and
+        save_options.experimental_load_functions_in_background and
+        context.executing_eagerly()):
+      self._load_functions_in_background()
 
+    start_time = time.time()
     if not save_options.experimental_skip_checkpoint:
       self._restore_checkpoint()
+    self.load_timings["checkpoint"] = time.time() - start_time
+
+    start_time = time.time()
     for node in self._nodes:
       if isinstance(node, resource.CapturableResource):
         init_op = node._initialize()  # pylint: disable=protected-access
         if not context.executing_eagerly():
           ops.add_to_collection(ops.GraphKeys.TABLE_INITIALIZERS, init_op)
+    self.load_timings["resource_initialization"] = time.time() - start_time
+    if self._lazy_functions:
+      # Time spent deserializing functions on demand during the phases above.
+      self.load_timings["lazy_function_loading"] = (
+          self._concrete_functions.load_seconds)
+
+  def _find_signature_only_functions(self):
+    """Returns ids of bare concrete functions only held by signature maps."""
+    signature_children = set()
+    other_children = set()
+    for proto in self._proto.nodes:
+      is_signature_map = (proto.WhichOneof("kind") == "user_object" and
+                          proto.user_object.identifier == "signature_map")
+      for reference in proto.children:
+        if is_signature_map:
+          signature_children.add(reference.node_id)
+        else:
+          other_children.add(reference.node_id)
+    return {
+        node_id for node_id in signature_children - other_children
+        if self._proto.nodes[node_id].WhichOneof("kind") ==
+        "bare_concrete_function"
+    }
+
+  def _on_function_loaded(self, name, unused_function):
+    """Restores captures of a lazily deserialized concrete function."""
+    proto = self._proto.concrete_functions.get(name)
+    if proto is None:
+      return
+    # Functions deserialized while nodes are still being recreated may not have
+    # all their captured objects yet; `_setup_remaining_functions` covers them.
+    if all(self._nodes_by_id.get(node_id) is not None
+           for node_id in proto.bound_inputs):
+      self._setup_function_captures(name, self._nodes_by_id)
+
+  def _load_functions_in_background(self):
+    """Deserializes the remaining functions on a background thread."""
+    executor = futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="saved_model_function_loader")
+    future = executor.submit(self._concrete_functions.load_all)
+
+    def _log_failure(future):
+      # Failed functions are retried, and raise, on first use.
+      if future.exception() is not None:
+        logging.warning("Background function loading failed: %s",
+                        future.exception())
+
+    future.add_done_callback(_log_failure)
+    executor.shutdown(wait=False)
 
   def _convert_node_paths_to_ints(self):
     """Maps all string node paths in node_filters to the int node ids."""
@@ -386,7 +480,13 @@ class Loader(object):
         setattr(type(obj), "__call__", _call_attribute)
 
   def _setup_remaining_functions(self):
-    concrete_function_names = sorted(self._proto.concrete_functions.keys())
+    if self._lazy_functions:
+      # Functions not deserialized yet get their captures restored on load.
+      concrete_function_names = sorted(
+          name for name in self._concrete_functions.loaded_names()
+          if name in self._proto.concrete_functions)
+    else:
+      concrete_function_names = sorted(self._proto.concrete_functions.keys())
     for name in concrete_function_names:
       if name in self._restored_concrete_functions:
         continue
@@ -504,6 +604,7 @@ class Loader(object):
     # `node_setters` maps from node ids to setter functions
     # (same signature as setattr) for setting children.
     nodes, node_setters = self._initialize_loaded_nodes()
+    self._nodes_by_id = nodes
 
     # Figure out which objects are slot variables. These objects are created
     # with Optimizer.add_slot rather than _recreate_variable.
@@ -607,7 +708,13 @@ class Loader(object):
       node, func = key.split("@")
       new_func = ""
       if func in self._concrete_functions:
-        new_func = self._concrete_functions[func].function_def.signature.name
+        if self._lazy_functions:
+          concrete_function = self._concrete_functions.get_if_loaded(func)
+          if concrete_function is None:
+            continue
+        else:
+          concrete_function = self._concrete_functions[func]
+        new_func = concrete_function.function_def.signature.name
       output_debug_info.traces[node + "@" + new_func].CopyFrom(
           debug_info.traces[key])
     return output_debug_info
@@ -662,7 +769,8 @@ class Loader(object):
         "function": lambda: self._recreate_function(proto.function, deps),
         "bare_concrete_function": functools.partial(
             self._recreate_bare_concrete_function,
-            proto=proto.bare_concrete_function, dependencies=deps),
+            proto=proto.bare_concrete_function, dependencies=deps,
+            node_id=node_id),
         "variable": lambda: self._recreate_variable(proto.variable),
         "captured_tensor": functools.partial(
             self._get_tensor_from_fn, proto.captured_tensor),
@@ -718,9 +826,10 @@ class Loader(object):
 
   def _recreate_function(self, proto, dependencies):
     fn = function_deserialization.recreate_function(
-        proto, self._concrete_functions)
-    for name in proto.concrete_functions:
-      self._setup_function_captures(name, dependencies)
+        proto, self._concrete_functions, lazy=self._lazy_functions)
+    if not self._lazy_functions:
+      for name in proto.concrete_functions:
+        self._setup_function_captures(name, dependencies)
 
     # If the list of concrete functions associated with this polymorphic
     # restored function is identical to a list of concrete functions found in
@@ -756,7 +865,18 @@ class Loader(object):
 
     return fn, setattr
 
-  def _recreate_bare_concrete_function(self, proto, dependencies):
+  def _recreate_bare_concrete_function(self, proto, dependencies,
+                                       node_id=None):
+    if node_id in self._deferred_bare_function_ids:
+
+      def _setup():
+        fn = function_deserialization.setup_bare_concrete_function(
+            proto, self._concrete_functions)
+        self._setup_function_captures(proto.concrete_function_name,
+                                      self._nodes_by_id)
+        return fn
+
+      return function_deserialization.DeferredConcreteFunction(_setup), setattr
     fn = function_deserialization.setup_bare_concrete_function(
         proto, self._concrete_functions)
     self._setup_function_captures(proto.concrete_function_name, dependencies)
@@ -1004,6 +1124,33 @@ def load_partial(export_dir, filters, tags=None, options=None):
     options: `tf.saved_model.LoadOptions` object that specifies options for
       loading.
 
+  Returns:
+    A dictionary mapping node paths from the filter to loaded objects.
+  """
+  start_time = time.time()
+  saved_model_proto, debug_info = (
+      loader_impl.parse_saved_model_with_debug_info(export_dir))
+  load_timings = {"parse_saved_model": time.time() - start_time}
+  return _load_partial_from_proto(export_dir, saved_model_proto, debug_info,
+                                  filters, tags, options, load_timings)
+
+
+def _load_partial_from_proto(export_dir, saved_model_proto, debug_info,
+                             filters, tags, options, load_timings):
+  """Implements `load_partial` for an already parsed SavedModel.
+
+  Args:
+    export_dir: The SavedModel directory to load from.
+    saved_model_proto: The `SavedModel` proto read from `export_dir`. Function
+      definitions are renamed in place while loading, so the proto must not be
+      reused for another load.
+    debug_info: The `GraphDebugInfo` proto read from `export_dir`.
+    filters: See `load_partial`.
+    tags: See `load_partial`.
+    options: See `load_partial`.
+    load_timings: Dictionary of phase timings recorded so far, updated in
+      place.
+
   Returns:
     A dictionary mapping node paths from the filter to loaded objects.
   """
@@ -1012,8 +1159,6 @@ def load_partial(export_dir, filters, tags=None, options=None):
     # Supports e.g. tags=SERVING and tags=[SERVING]. Sets aren't considered
     # sequences for nest.flatten, so we put those through as-is.
     tags = nest.flatten(tags)
-  saved_model_proto, debug_info = (
-      loader_impl.parse_saved_model_with_debug_info(export_dir))
 
   loader = None
   if (len(saved_model_proto.meta_graphs) == 1 and
@@ -1049,6 +1194,7 @@ def load_partial(export_dir, filters, tags=None, options=None):
             "to the io_device such as '/job:localhost'.")
       root = loader.get(0)
       root.graph_debug_info = loader.adjust_debug_info_func_names(debug_info)
+    load_timings.update(loader.load_timings)
     root.tensorflow_version = meta_graph_def.meta_info_def.tensorflow_version
     root.tensorflow_git_version = (
         meta_graph_def.meta_info_def.tensorflow_git_version)
@@ -1102,6 +1248,10 @@ def load_partial(export_dir, filters, tags=None, options=None):
     logging.info("path_and_singleprint metric could not be logged. "
                  "Saved model loading will continue.")
 
+  _last_load_timings.value = load_timings
+  logging.vlog(1, "SavedModel load phase timings (seconds) for %s: %s",
+               export_dir, load_timings)
+
   if filters and loader is not None:
     return {node_id: loader.get(node_id) for node_id in filters}
   else:
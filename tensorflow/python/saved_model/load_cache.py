@@ -0,0 +1,397 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Process-wide cache of loaded SavedModels keyed by fingerprint.
+
+Model servers frequently load byte-identical SavedModels for different
+tenants. `LoadCache` identifies such SavedModels by their singleprint (see
+`fingerprinting_utils`) and returns the object loaded for the first of them
+to every caller, so repeated loads reuse its restored functions and
+variables instead of loading them again.
+
+Since the object is shared, its variables are made read-only: assigning to
+them raises an error. SavedModels whose functions modify variables cannot be
+shared safely and are loaded anew, without caching, on every call.
+"""
+
+import collections
+import hashlib
+import os
+import threading
+import time
+
+from absl import logging
+from google.protobuf import message
+
+from tensorflow.core.protobuf import saved_model_pb2
+from tensorflow.python.checkpoint import graph_view
+from tensorflow.python.checkpoint import util as checkpoint_util
+from tensorflow.python.framework import errors
+from tensorflow.python.lib.io import file_io
+from tensorflow.python.ops import variables
+from tensorflow.python.saved_model import fingerprinting_utils
+from tensorflow.python.saved_model import load
+from tensorflow.python.saved_model import load_options
+from tensorflow.python.saved_model import loader_impl
+from tensorflow.python.saved_model import path_helpers
+from tensorflow.python.saved_model.pywrap_saved_model import constants
+from tensorflow.python.util import nest
+
+
+_DEFAULT_MAX_BYTES = 1 << 30
+
+# Upper bound on the number of remembered export directories, whose file
+# statistics let repeated loads skip reading the SavedModel.
+_MAX_REMEMBERED_DIRS = 4096
+
+# Prefixes of op types that modify resource variables.
+_VARIABLE_WRITE_OP_PREFIXES = ("Assign", "ResourceApply",
+                               "ResourceSparseApply", "ResourceScatter",
+                               "ResourceStridedSliceAssign")
+
+_VARIABLE_WRITE_METHODS = ("assign", "assign_add", "assign_sub",
+                           "scatter_add", "scatter_sub", "scatter_max",
+                           "scatter_min", "scatter_mul", "scatter_div",
+                           "scatter_update", "batch_scatter_update",
+                           "scatter_nd_add", "scatter_nd_sub",
+                           "scatter_nd_update", "scatter_nd_max",
+                           "scatter_nd_min")
+
+LoadCacheStats = collections.namedtuple(
+    "LoadCacheStats",
+    ["hits", "misses", "evictions", "entries", "bytes", "max_bytes"])
+
+
+class _CacheEntry(object):
+  """A loaded SavedModel object and its estimated size."""
+
+  __slots__ = ("root", "nbytes")
+
+  def __init__(self, root, nbytes):
+    self.root = root
+    self.nbytes = nbytes
+
+
+def _options_key(options):
+  return tuple(getattr(options, name) for name in options.__slots__)
+
+
+def _tags_key(tags):
+  if tags is None:
+    return None
+  if not isinstance(tags, set):
+    tags = nest.flatten(tags)
+  return frozenset(tags)
+
+
+def _list_variables(root):
+  return [
+      obj
+      for obj in checkpoint_util.list_objects(graph_view.ObjectGraphView(root))
+      if isinstance(obj, variables.Variable)
+  ]
+
+
+def _variable_bytes(variables_list):
+  """Estimates the memory held by `variables_list`."""
+  total = 0
+  for variable in variables_list:
+    num_elements = variable.shape.num_elements()
+    if num_elements is not None:
+      total += num_elements * variable.dtype.size
+  return total
+
+
+def _writes_variables(saved_model_proto):
+  """Whether any function of the SavedModel may modify a variable."""
+  for meta_graph in saved_model_proto.meta_graphs:
+    for function in meta_graph.graph_def.library.function:
+      for node in function.node_def:
+        if node.op.startswith(_VARIABLE_WRITE_OP_PREFIXES):
+          return True
+  return False
+
+
+def _make_read_only(variables_list):
+  """Makes the Python mutation methods of `variables_list` raise."""
+
+  def read_only(name):
+    def raise_read_only(*args, **kwargs):
+      del args, kwargs
+      raise ValueError(
+          f"Variable {name} belongs to a SavedModel shared by `LoadCache` and "
+          "is read-only. Use `tf.saved_model.load` to load a copy that can be "
+          "modified.")
+    return raise_read_only
+
+  for variable in variables_list:
+    for method in _VARIABLE_WRITE_METHODS:
+      setattr(variable, method, read_only(variable.name))
+
+
+def _stat_key(export_dir):
+  """Returns the sizes and modification times of the SavedModel files."""
+  stats = []
+  for path in (
+      file_io.join(export_dir, constants.SAVED_MODEL_FILENAME_PB),
+      file_io.join(export_dir, constants.SAVED_MODEL_FILENAME_PBTXT),
+      file_io.join(export_dir, constants.FINGERPRINT_FILENAME),
+      path_helpers.get_variables_path(export_dir) + ".index"):
+    try:
+      stat = file_io.stat(path)
+    except errors.NotFoundError:
+      stats.append(None)
+    else:
+      stats.append((stat.length, stat.mtime_nsec))
+  return (export_dir, tuple(stats))
+
+
+def _model_key(export_dir):
+  """Returns a key identifying the contents of the SavedModel in `export_dir`.
+
+  The key is the singleprint when `fingerprint.pb` exists. Otherwise computing
+  the singleprint would parse `saved_model.pb`, so the key is a digest of
+  `saved_model.pb` and the variables index instead, and the `SavedModel` proto
+  parsed from the same bytes is returned for a miss to reuse.
+
+  Args:
+    export_dir: The SavedModel directory.
+
+  Returns:
+    A tuple of the key and the parsed `SavedModel` proto, or None if the proto
+    was not read.
+  """
+  try:
+    return ("singleprint",
+            fingerprinting_utils.singleprint_from_fingerprint_proto(
+                export_dir)), None
+  except ValueError:
+    pass
+  path = file_io.join(export_dir, constants.SAVED_MODEL_FILENAME_PB)
+  if not file_io.file_exists(path):
+    return ("singleprint",
+            fingerprinting_utils.singleprint_from_saved_model_proto(
+                export_dir)), None
+
+  content = file_io.read_file_to_string(path, binary_mode=True)
+  digest = hashlib.sha256(content)
+  index_path = path_helpers.get_variables_path(export_dir) + ".index"
+  if file_io.file_exists(index_path):
+    digest.update(file_io.read_file_to_string(index_path, binary_mode=True))
+  saved_model_proto = saved_model_pb2.SavedModel()
+  try:
+    saved_model_proto.ParseFromString(content)
+  except message.DecodeError as e:
+    raise IOError(f"Cannot parse file {path}: {e}.") from e
+  return ("sha256", digest.hexdigest()), saved_model_proto
+
+
+class LoadCache(object):
+  """Memory-bounded cache of loaded SavedModels keyed by fingerprint.
+
+  Entries are keyed by the SavedModel singleprint together with the `tags`
+  and the `tf.saved_model.LoadOptions` values, and are evicted in least
+  recently used order once the estimated memory of all entries exceeds
+  `max_bytes` (or their number exceeds `max_entries`). SavedModels without a
+  `fingerprint.pb` file are keyed by a digest of their contents instead.
+
+  The estimated size of an entry is the size of the serialized `SavedModel`
+  proto plus the size of all variables of the loaded object.
+
+  The key of an export directory is remembered together with the sizes and
+  modification times of its files, so loading the same directory again only
+  stats these files.
+
+  ```python
+  cache = load_cache.get_default_cache()
+  a = cache.load(path_a)
+  b = cache.load(path_b)  # Same model: `b is a`.
+  print(cache.stats())
+  ```
+
+  All methods are thread-safe. Concurrent misses for the same SavedModel may
+  both load it, in which case the result of the last load is kept.
+  """
+
+  def __init__(self, max_bytes=_DEFAULT_MAX_BYTES, max_entries=None):
+    """Creates a cache.
+
+    Args:
+      max_bytes: Upper bound on the estimated memory of all cached entries. An
+        entry larger than this bound is never cached.
+      max_entries: Optional upper bound on the number of cached entries.
+    """
+    if max_bytes <= 0:
+      raise ValueError(f"`max_bytes` must be positive, got {max_bytes}.")
+    if max_entries is not None and max_entries <= 0:
+      raise ValueError(
+          f"`max_entries` must be positive or None, got {max_entries}.")
+    self._max_bytes = max_bytes
+    self._max_entries = max_entries
+    self._entries = collections.OrderedDict()
+    self._model_keys = collections.OrderedDict()
+    self._nbytes = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self._lock = threading.Lock()
+
+  def load(self, export_dir, tags=None, options=None):
+    """Loads a SavedModel, or returns the object loaded for an identical one.
+
+    Args:
+      export_dir: The SavedModel directory to load from.
+      tags: See `tf.saved_model.load`.
+      options: See `tf.saved_model.load`.
+
+    Returns:
+      The loaded object, as returned by `tf.saved_model.load`. SavedModels
+      with the same fingerprint, tags and options return the same object,
+      whose variables are read-only.
+    """
+    if isinstance(export_dir, os.PathLike):
+      export_dir = os.fspath(export_dir)
+    options = options or load_options.LoadOptions()
+    stat_key = _stat_key(export_dir)
+    load_key = (_tags_key(tags), _options_key(options))
+
+    with self._lock:
+      model_key = self._model_keys.get(stat_key)
+      if model_key is not None:
+        self._model_keys.move_to_end(stat_key)
+        root = self._lookup((model_key,) + load_key)
+        if root is not None:
+          return root
+
+    saved_model_proto = None
+    if model_key is None:
+      model_key, saved_model_proto = _model_key(export_dir)
+      with self._lock:
+        self._remember(stat_key, model_key)
+        root = self._lookup((model_key,) + load_key)
+        if root is not None:
+          return root
+
+    with self._lock:
+      self._misses += 1
+    start_time = time.time()
+    if saved_model_proto is None:
+      saved_model_proto = loader_impl.parse_saved_model(export_dir)
+    debug_info = loader_impl.parse_debug_info(export_dir)
+    proto_bytes = saved_model_proto.ByteSize()
+    writes_variables = _writes_variables(saved_model_proto)
+    load_timings = {"parse_saved_model": time.time() - start_time}
+    root = load._load_partial_from_proto(  # pylint: disable=protected-access
+        export_dir, saved_model_proto, debug_info, None, tags, options,
+        load_timings)["root"]
+    if writes_variables:
+      logging.info(
+          "Not caching SavedModel %s, whose functions modify variables.",
+          export_dir)
+      return root
+    variables_list = _list_variables(root)
+    nbytes = proto_bytes + _variable_bytes(variables_list)
+    if nbytes > self._max_bytes:
+      logging.info(
+          "Not caching SavedModel of estimated size %d bytes, which exceeds "
+          "the cache limit of %d bytes.", nbytes, self._max_bytes)
+      return root
+    _make_read_only(variables_list)
+    self._insert((model_key,) + load_key, _CacheEntry(root, nbytes))
+    return root
+
+  def _lookup(self, key):
+    """Returns the cached object for `key` and counts a hit, or None."""
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    self._entries.move_to_end(key)
+    self._hits += 1
+    return entry.root
+
+  def _remember(self, stat_key, model_key):
+    self._model_keys[stat_key] = model_key
+    self._model_keys.move_to_end(stat_key)
+    while len(self._model_keys) > _MAX_REMEMBERED_DIRS:
+      self._model_keys.popitem(last=False)
+
+  def _insert(self, key, entry):
+    with self._lock:
+      previous = self._entries.pop(key, None)
+      if previous is not None:
+        self._nbytes -= previous.nbytes
+      self._entries[key] = entry
+      self._nbytes += entry.nbytes
+      while (self._nbytes > self._max_bytes or
+             (self._max_entries is not None and
+              len(self._entries) > self._max_entries)):
+        _, evicted = self._entries.popitem(last=False)
+        self._nbytes -= evicted.nbytes
+        self._evictions += 1
+
+  def evict(self, export_dir):
+    """Removes all entries for the SavedModel in `export_dir`.
+
+    Args:
+      export_dir: A SavedModel directory. Entries of all SavedModels with the
+        same fingerprint are removed.
+
+    Returns:
+      The number of removed entries.
+    """
+    if isinstance(export_dir, os.PathLike):
+      export_dir = os.fspath(export_dir)
+    stat_key = _stat_key(export_dir)
+    with self._lock:
+      model_key = self._model_keys.get(stat_key)
+    if model_key is None:
+      model_key, _ = _model_key(export_dir)
+    with self._lock:
+      keys = [key for key in self._entries if key[0] == model_key]
+      for key in keys:
+        self._nbytes -= self._entries.pop(key).nbytes
+      self._evictions += len(keys)
+    return len(keys)
+
+  def clear(self):
+    """Removes all entries. Statistics are kept."""
+    with self._lock:
+      self._evictions += len(self._entries)
+      self._entries.clear()
+      self._model_keys.clear()
+      self._nbytes = 0
+
+  def stats(self):
+    """Returns a `LoadCacheStats` snapshot of the cache statistics."""
+    with self._lock:
+      return LoadCacheStats(
+          hits=self._hits,
+          misses=self._misses,
+          evictions=self._evictions,
+          entries=len(self._entries),
+          bytes=self._nbytes,
+          max_bytes=self._max_bytes)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+  """Returns the process-wide `LoadCache`, creating it on first use."""
+  global _default_cache
+  with _default_cache_lock:
+    if _default_cache is None:
+      _default_cache = LoadCache()
+    return _default_cache
@@ -0,0 +1,207 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the fingerprint-keyed SavedModel load cache."""
+import os
+import shutil
+
+from tensorflow.core.config import flags
+from tensorflow.python.eager import context
+from tensorflow.python.eager import def_function
+from tensorflow.python.eager import test
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import tensor_spec
+from tensorflow.python.module import module
+from tensorflow.python.ops import variables
+from tensorflow.python.saved_model import fingerprinting_utils
+from tensorflow.python.saved_model import load_cache
+from tensorflow.python.saved_model import loader_impl
+from tensorflow.python.saved_model import save
+
+
+class LoadCacheTest(test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    flags.config().saved_model_fingerprinting.reset(True)
+
+  def _save_model(self, initial_value, name="saved_model",
+                  modifies_variables=False):
+    root = module.Module()
+    root.v = variables.Variable(initial_value)
+    root.f = def_function.function(
+        lambda x: root.v * x,
+        input_signature=[tensor_spec.TensorSpec(None, dtypes.float32)])
+    if modifies_variables:
+      root.increment = def_function.function(lambda: root.v.assign_add(1.))
+    save_dir = os.path.join(self.get_temp_dir(), name)
+    save.save(root, save_dir)
+    self.addCleanup(shutil.rmtree, save_dir)
+    return save_dir
+
+  def _copy_model(self, save_dir, name):
+    copy_dir = os.path.join(self.get_temp_dir(), name)
+    shutil.copytree(save_dir, copy_dir)
+    self.addCleanup(shutil.rmtree, copy_dir)
+    return copy_dir
+
+  def test_hits_return_same_object(self):
+    save_dir = self._save_model(2.)
+    copy_dir = self._copy_model(save_dir, "copy")
+    cache = load_cache.LoadCache()
+
+    first = cache.load(save_dir)
+    second = cache.load(copy_dir)
+
+    self.assertIs(first, second)
+    self.assertEqual(6., second.f(constant_op.constant(3.)).numpy())
+    stats = cache.stats()
+    self.assertEqual(1, stats.hits)
+    self.assertEqual(1, stats.misses)
+    self.assertEqual(1, stats.entries)
+    # The size estimate includes the shared variable.
+    self.assertGreater(stats.bytes, 4)
+
+  def test_hit_reuses_restored_functions(self):
+    save_dir = self._save_model(2.)
+    copy_dir = self._copy_model(save_dir, "copy")
+    cache = load_cache.LoadCache()
+
+    first = cache.load(save_dir)
+    function_names = set(context.context().list_function_names())
+    second = cache.load(copy_dir)
+
+    self.assertIs(first.f, second.f)
+    self.assertIs(first.f.concrete_functions[0],
+                  second.f.concrete_functions[0])
+    # No functions are restored again.
+    self.assertEqual(function_names,
+                     set(context.context().list_function_names()))
+    self.assertEqual(6., second.f(constant_op.constant(3.)).numpy())
+
+  def test_shared_variables_are_read_only(self):
+    save_dir = self._save_model(2.)
+    cache = load_cache.LoadCache()
+
+    loaded = cache.load(save_dir)
+
+    with self.assertRaisesRegex(ValueError, "read-only"):
+      loaded.v.assign(3.)
+    with self.assertRaisesRegex(ValueError, "read-only"):
+      loaded.v.assign_add(1.)
+    self.assertEqual(2., cache.load(save_dir).v.numpy())
+
+  def test_models_that_modify_variables_are_not_cached(self):
+    save_dir = self._save_model(2., modifies_variables=True)
+    cache = load_cache.LoadCache()
+
+    first = cache.load(save_dir)
+    second = cache.load(save_dir)
+
+    self.assertIsNot(first, second)
+    first.increment()
+    self.assertEqual(3., first.v.numpy())
+    self.assertEqual(2., second.v.numpy())
+    stats = cache.stats()
+    self.assertEqual(2, stats.misses)
+    self.assertEqual(0, stats.entries)
+
+  def test_repeated_loads_of_a_directory_only_stat_files(self):
+    save_dir = self._save_model(2.)
+    cache = load_cache.LoadCache()
+
+    with test.mock.patch.object(
+        load_cache, "_model_key", wraps=load_cache._model_key) as model_key:
+      first = cache.load(save_dir)
+      second = cache.load(save_dir)
+
+    self.assertIs(first, second)
+    model_key.assert_called_once()
+
+  def test_saved_model_without_fingerprint_is_parsed_once(self):
+    flags.config().saved_model_fingerprinting.reset(False)
+    save_dir = self._save_model(2.)
+    copy_dir = self._copy_model(save_dir, "copy")
+    cache = load_cache.LoadCache()
+
+    with test.mock.patch.object(
+        fingerprinting_utils, "singleprint_from_saved_model_proto"
+    ) as singleprint, test.mock.patch.object(
+        loader_impl, "parse_saved_model",
+        wraps=loader_impl.parse_saved_model) as parse_saved_model:
+      first = cache.load(save_dir)
+      second = cache.load(copy_dir)
+
+    self.assertIs(first, second)
+    singleprint.assert_not_called()
+    parse_saved_model.assert_not_called()
+    self.assertEqual(1, cache.stats().hits)
+
+  def test_eviction_by_entries(self):
+    dir_a = self._save_model(2., name="a")
+    dir_b = self._save_model([1., 2.], name="b")
+    cache = load_cache.LoadCache(max_entries=1)
+
+    cache.load(dir_a)
+    cache.load(dir_b)
+    cache.load(dir_a)
+
+    stats = cache.stats()
+    self.assertEqual(0, stats.hits)
+    self.assertEqual(3, stats.misses)
+    self.assertEqual(2, stats.evictions)
+    self.assertEqual(1, stats.entries)
+
+  def test_entries_larger_than_limit_are_not_cached(self):
+    save_dir = self._save_model(2.)
+    cache = load_cache.LoadCache(max_bytes=1)
+
+    first = cache.load(save_dir)
+    second = cache.load(save_dir)
+
+    self.assertIsNot(first, second)
+    stats = cache.stats()
+    self.assertEqual(0, stats.hits)
+    self.assertEqual(0, stats.entries)
+    self.assertEqual(0, stats.bytes)
+
+  def test_evict_and_clear(self):
+    dir_a = self._save_model(2., name="a")
+    dir_b = self._save_model([1., 2.], name="b")
+    cache = load_cache.LoadCache()
+    cache.load(dir_a)
+    cache.load(dir_b)
+
+    self.assertEqual(1, cache.evict(self._copy_model(dir_a, "copy")))
+    self.assertEqual(1, cache.stats().entries)
+    cache.clear()
+    stats = cache.stats()
+    self.assertEqual(0, stats.entries)
+    self.assertEqual(0, stats.bytes)
+    self.assertEqual(2, stats.evictions)
+
+  def test_invalid_limits(self):
+    with self.assertRaisesRegex(ValueError, "max_bytes"):
+      load_cache.LoadCache(max_bytes=0)
+    with self.assertRaisesRegex(ValueError, "max_entries"):
+      load_cache.LoadCache(max_entries=0)
+
+  def test_default_cache_is_process_wide(self):
+    self.assertIs(load_cache.get_default_cache(),
+                  load_cache.get_default_cache())
+
+
+if __name__ == "__main__":
+  test.main()
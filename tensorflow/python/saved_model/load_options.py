@@ -29,14 +29,18 @@ class LoadOptions(object):
   # Define object attributes in __slots__ for improved memory and performance.
   __slots__ = ("allow_partial_checkpoint", "experimental_io_device",
                "experimental_skip_checkpoint", "experimental_variable_policy",
-               "experimental_load_function_aliases")
+               "experimental_load_function_aliases",
+               "experimental_lazy_function_loading",
+               "experimental_load_functions_in_background")
 
   def __init__(self,
                allow_partial_checkpoint=False,
                experimental_io_device=None,
                experimental_skip_checkpoint=False,
                experimental_variable_policy=None,
-               experimental_load_function_aliases=False):
+               experimental_load_function_aliases=False,
+               experimental_lazy_function_loading=False,
+               experimental_load_functions_in_background=False):
     """Creates an object that stores options for SavedModel loading.
 
     *When to set `allow_partial_checkpoint=True`?*
@@ -108,6 +112,18 @@ class LoadOptions(object):
       experimental_load_function_aliases: bool. Defaults to `False`. If set to
         `True`, a `function_aliases` attribute will be added to the loaded
         SavedModel object.
+      experimental_lazy_function_loading: bool. Defaults to `False`. If set to
+        `True`, the concrete functions backing restored `tf.function`s and
+        signatures are only deserialized the first time they are called,
+        which reduces load time for SavedModels with many functions.
+        Functions needed to restore the checkpoint and initialize resources
+        are still deserialized during load. `graph_debug_info` then only
+        covers the functions deserialized during load.
+      experimental_load_functions_in_background: bool. Defaults to `False`.
+        Only used with `experimental_lazy_function_loading=True` when
+        executing eagerly. If set to `True`, the functions that have not been
+        deserialized yet are deserialized on a background thread, overlapping
+        with checkpoint restoration and continuing after `load` returns.
 
     Example:
 
@@ -123,3 +139,7 @@ class LoadOptions(object):
     self.experimental_variable_policy = (
         save_options.VariablePolicy.from_obj(experimental_variable_policy))
     self.experimental_load_function_aliases = experimental_load_function_aliases
+    self.experimental_lazy_function_loading = (
+        experimental_lazy_function_loading)
+    self.experimental_load_functions_in_background = (
+        experimental_load_functions_in_background)
@@ -66,6 +66,7 @@ from tensorflow.python.ops import variables
 from tensorflow.python.ops import while_loop
 from tensorflow.python.ops.ragged import ragged_factory_ops
 from tensorflow.python.ops.ragged import ragged_tensor
+from tensorflow.python.saved_model import function_deserialization
 from tensorflow.python.saved_model import load
 from tensorflow.python.saved_model import load_options
 from tensorflow.python.saved_model import loader_impl
@@ -3582,5 +3583,96 @@ class SavedModelLoadMemoryTests(test.TestCase, parameterized.TestCase):
     self.assertIn("GPU", loaded_on_gpu.table.device)
 
 
+class LazyFunctionLoadingTest(test.TestCase, parameterized.TestCase):
+
+  def _save_model(self):
+    root = autotrackable.AutoTrackable()
+    root.v = variables.Variable(2.)
+    root.table = lookup_ops.StaticHashTable(
+        lookup_ops.KeyValueTensorInitializer(["a", "b"], [1, 2]), -1)
+    root.f = def_function.function(
+        lambda x: root.v * x,
+        input_signature=[tensor_spec.TensorSpec(None, dtypes.float32)])
+    root.lookup = def_function.function(
+        root.table.lookup,
+        input_signature=[tensor_spec.TensorSpec(None, dtypes.string)])
+    signatures = {
+        "times_v": root.f.get_concrete_function(),
+        "lookup": def_function.function(
+            lambda key: {"value": root.table.lookup(key)},
+            input_signature=[tensor_spec.TensorSpec(None, dtypes.string)]),
+    }
+    path = os.path.join(self.get_temp_dir(), "saved_model")
+    save.save(root, path, signatures=signatures)
+    return path
+
+  @parameterized.named_parameters(
+      dict(testcase_name="Lazy", in_background=False),
+      dict(testcase_name="LazyInBackground", in_background=True))
+  def test_lazy_loading(self, in_background):
+    path = self._save_model()
+    options = load_options.LoadOptions(
+        experimental_lazy_function_loading=True,
+        experimental_load_functions_in_background=in_background)
+    imported = load.load(path, options=options)
+
+    self.assertEqual(2., self.evaluate(imported.v))
+    self.assertEqual(6., self.evaluate(imported.f(constant_op.constant(3.))))
+    self.assertEqual(2, self.evaluate(imported.lookup(constant_op.constant("b"))))
+    self.assertAllEqual(
+        {"output_0": 8.},
+        self.evaluate(imported.signatures["times_v"](constant_op.constant(4.))))
+    self.assertAllEqual(
+        {"value": 1},
+        self.evaluate(imported.signatures["lookup"](constant_op.constant("a"))))
+
+    # Captures of lazily loaded functions track the restored variable.
+    imported.v.assign(3.)
+    self.assertEqual(6., self.evaluate(imported.f(constant_op.constant(2.))))
+
+  def test_lazy_loading_defers_functions(self):
+    path = self._save_model()
+    imported = load.load(
+        path,
+        options=load_options.LoadOptions(
+            experimental_lazy_function_loading=True))
+    self.assertIsInstance(
+        imported.signatures._signatures["times_v"],  # pylint: disable=protected-access
+        function_deserialization.DeferredConcreteFunction)
+    concrete_function = imported.signatures["times_v"]
+    self.assertIsInstance(concrete_function, types_core.ConcreteFunction)
+    self.assertIs(concrete_function, imported.signatures["times_v"])
+
+  def test_resave_lazily_loaded(self):
+    path = self._save_model()
+    imported = load.load(
+        path,
+        options=load_options.LoadOptions(
+            experimental_lazy_function_loading=True))
+    second_path = os.path.join(self.get_temp_dir(), "resaved")
+    save.save(imported, second_path, signatures=imported.signatures)
+    reloaded = load.load(second_path)
+    self.assertEqual(6., self.evaluate(reloaded.f(constant_op.constant(3.))))
+    self.assertAllEqual(
+        {"output_0": 8.},
+        self.evaluate(reloaded.signatures["times_v"](constant_op.constant(4.))))
+
+  def test_load_timings(self):
+    path = self._save_model()
+    load.load(path)
+    timings = load.get_last_load_timings()
+    for phase in ("parse_saved_model", "function_library", "nodes",
+                  "checkpoint", "resource_initialization"):
+      self.assertIn(phase, timings)
+      self.assertGreaterEqual(timings[phase], 0.)
+    self.assertNotIn("lazy_function_loading", timings)
+
+    load.load(
+        path,
+        options=load_options.LoadOptions(
+            experimental_lazy_function_loading=True))
+    self.assertIn("lazy_function_loading", load.get_last_load_timings())
+
+
 if __name__ == "__main__":
   test.main()
@@ -56,8 +56,21 @@ def parse_saved_model_with_debug_info(export_dir):
     IOError: If the saved model file does not exist, or cannot be successfully
     parsed. Missing graph debug info file is fine.
   """
-  saved_model = parse_saved_model(export_dir)
+  return (parse_saved_model(export_dir), parse_debug_info(export_dir))
 
+
+def parse_debug_info(export_dir):
+  """Reads the graph debug info of a SavedModel.
+
+  Args:
+    export_dir: Directory containing the GraphDebugInfo file.
+
+  Returns:
+    A `GraphDebugInfo` protocol buffer, which is empty if the file is missing.
+
+  Raises:
+    IOError: If the graph debug info file cannot be parsed.
+  """
   debug_info_path = file_io.join(
       path_helpers.get_debug_dir(export_dir),
       constants.DEBUG_INFO_FILENAME_PB)
@@ -68,8 +81,7 @@ def parse_saved_model_with_debug_info(export_dir):
         debug_info.ParseFromString(debug_file.read())
       except message.DecodeError as e:
         raise IOError(f"Cannot parse file {debug_info_path}: {e}.")
-
-  return (saved_model, debug_info)
+  return debug_info
 
 
 @tf_export("__internal__.saved_model.parse_saved_model", v1=[])
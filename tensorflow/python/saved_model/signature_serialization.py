@@ -22,6 +22,7 @@ from tensorflow.python.eager.polymorphic_function import attributes
 from tensorflow.python.framework import composite_tensor
 from tensorflow.python.framework import tensor
 from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.saved_model import function_deserialization
 from tensorflow.python.saved_model import function_serialization
 from tensorflow.python.saved_model import revived_types
 from tensorflow.python.saved_model import signature_constants
@@ -299,7 +300,11 @@ class _SignatureMap(collections_abc.Mapping, base.Trackable):
     self._signatures[name] = concrete_function
 
   def __getitem__(self, key):
-    return self._signatures[key]
+    value = self._signatures[key]
+    if isinstance(value, function_deserialization.DeferredConcreteFunction):
+      value = value.materialize()
+      self._signatures[key] = value
+    return value
 
   def __iter__(self):
     return iter(self._signatures)
@@ -0,0 +1,274 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Python Merger for protos written by the Splitter.
+
+This is the Python counterpart of `merge.cc`. Chunk records are read from the
+riegeli file by `parallelism` readers concurrently, each reading a contiguous
+range of the file, and are then merged into the output message in the same
+order as the C++ Merger.
+"""
+
+from collections.abc import Sequence
+from concurrent import futures
+import os
+import time
+from typing import Optional, Union
+
+from absl import logging
+import riegeli
+
+from google.protobuf import descriptor
+from google.protobuf import message
+from tensorflow.python.lib.io import file_io
+from tensorflow.tools.proto_splitter import chunk_pb2
+
+
+def read_metadata(path: str) -> chunk_pb2.ChunkMetadata:
+  """Reads the ChunkMetadata from the end of a chunked proto (.cpb) file."""
+  with riegeli.RecordReader(file_io.FileIO(path, "rb")) as reader:
+    if not reader.check_file_format():
+      raise ValueError(f"{path} is not a riegeli file.")
+    reader.seek_back()
+    metadata = chunk_pb2.ChunkMetadata()
+    metadata.ParseFromString(reader.read_record())
+  return metadata
+
+
+def _read_chunk_range(path, chunks_info, indices):
+  records = []
+  with riegeli.RecordReader(file_io.FileIO(path, "rb")) as reader:
+    for i in indices:
+      reader.seek_numeric(chunks_info[i].offset)
+      records.append(reader.read_record())
+  return records
+
+
+def read_chunks(
+    path: str,
+    chunks_info: Sequence[chunk_pb2.ChunkInfo],
+    parallelism: Optional[int] = None,
+) -> list[bytes]:
+  """Reads all chunks of a chunked proto file.
+
+  Args:
+    path: Path to the .cpb file.
+    chunks_info: `ChunkMetadata.chunks` read from the file.
+    parallelism: Number of concurrent readers. Defaults to the number of CPUs.
+      Each reader opens the file separately and reads a contiguous range of
+      chunks, so decompression runs concurrently.
+
+  Returns:
+    A list with the serialized content of each chunk, indexed like
+    `chunks_info`.
+  """
+  parallelism = parallelism or os.cpu_count() or 1
+  by_offset = sorted(
+      range(len(chunks_info)), key=lambda i: chunks_info[i].offset
+  )
+  num_ranges = max(1, min(parallelism, len(by_offset)))
+  range_size = -(-len(by_offset) // num_ranges)
+  ranges = [
+      by_offset[start : start + range_size]
+      for start in range(0, len(by_offset), range_size)
+  ]
+
+  chunks = [None] * len(chunks_info)
+  if len(ranges) <= 1:
+    results = [_read_chunk_range(path, chunks_info, r) for r in ranges]
+  else:
+    with futures.ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+      results = list(
+          executor.map(
+              lambda r: _read_chunk_range(path, chunks_info, r), ranges
+          )
+      )
+  for indices, records in zip(ranges, results):
+    for i, record in zip(indices, records):
+      chunks[i] = record
+  return chunks
+
+
+def read(
+    file_prefix: str,
+    merged_message: message.Message,
+    parallelism: Optional[int] = None,
+) -> message.Message:
+  """Reads a proto written by `Splitter.write` into `merged_message`.
+
+  Args:
+    file_prefix: The prefix passed to `Splitter.write`. Either
+      `{file_prefix}.pb` or `{file_prefix}.cpb` is read.
+    merged_message: Message to merge the proto into.
+    parallelism: Number of concurrent chunk readers (see `read_chunks`).
+
+  Returns:
+    `merged_message`.
+  """
+  start_time = time.time()
+  pb_path = f"{file_prefix}.pb"
+  if file_io.file_exists(pb_path):
+    merged_message.ParseFromString(file_io.read_file_to_string(pb_path, True))
+    return merged_message
+
+  path = f"{file_prefix}.cpb"
+  metadata = read_metadata(path)
+  chunks = read_chunks(path, metadata.chunks, parallelism)
+  merge(chunks, metadata.message, merged_message)
+  logging.info(
+      "Finished reading and merging chunked proto, took %s seconds.",
+      time.time() - start_time,
+  )
+  return merged_message
+
+
+def merge(
+    chunks: Sequence[Union[message.Message, bytes]],
+    chunked_message: chunk_pb2.ChunkedMessage,
+    merged_message: message.Message,
+) -> message.Message:
+  """Merges chunks into `merged_message`.
+
+  Args:
+    chunks: Chunks as returned by `Splitter.split` or `read_chunks`.
+    chunked_message: The ChunkedMessage describing where chunks are merged.
+    merged_message: Message to merge the chunks into.
+
+  Returns:
+    `merged_message`.
+  """
+  if chunked_message.HasField("chunk_index"):
+    _merge_chunk(chunks[chunked_message.chunk_index], merged_message)
+
+  # Merge parent fields before nested fields, and earlier chunks of the same
+  # field first (see `Merger::ReadFields`).
+  for chunked_field in sorted(
+      chunked_message.chunked_fields, key=_chunked_field_order
+  ):
+    _merge_field(chunks, chunked_field, merged_message)
+  return merged_message
+
+
+def _chunked_field_order(chunked_field):
+  tags = []
+  for tag in chunked_field.field_tag:
+    kind = tag.WhichOneof("kind")
+    # Map keys are not ordered relative to each other.
+    tags.append(0 if kind == "map_key" else getattr(tag, kind))
+  return tuple(tags), chunked_field.message.chunk_index
+
+
+def _merge_chunk(chunk, merged_message):
+  if isinstance(chunk, message.Message):
+    merged_message.MergeFrom(chunk)
+  else:
+    merged_message.MergeFromString(chunk)
+
+
+def _chunk_bytes(chunk):
+  if isinstance(chunk, message.Message):
+    return chunk.SerializeToString()
+  return chunk
+
+
+def _group_field_tags(field_tags):
+  """Groups field numbers with the map key or list index that follows them."""
+  grouped = []
+  for tag in field_tags:
+    kind = tag.WhichOneof("kind")
+    if kind == "field":
+      grouped.append([tag.field, None])
+    elif not grouped or grouped[-1][1] is not None:
+      raise ValueError(f"Unexpected field tag: {field_tags}")
+    elif kind == "map_key":
+      map_key = tag.map_key
+      grouped[-1][1] = getattr(map_key, map_key.WhichOneof("type"))
+    else:
+      grouped[-1][1] = tag.index
+  return grouped
+
+
+def _merge_field(chunks, chunked_field, merged_message):
+  """Merges a single ChunkedField into `merged_message`."""
+  chunk = chunks[chunked_field.message.chunk_index]
+  if not chunked_field.field_tag:
+    # The chunk is a portion of the parent itself.
+    _merge_chunk(chunk, merged_message)
+    return
+
+  parent = merged_message
+  grouped = _group_field_tags(chunked_field.field_tag)
+  for depth, (field_number, key) in enumerate(grouped):
+    field_desc = parent.DESCRIPTOR.fields_by_number[field_number]
+    is_last = depth == len(grouped) - 1
+    field = getattr(parent, field_desc.name)
+    is_map = (
+        field_desc.message_type is not None
+        and field_desc.message_type.GetOptions().map_entry
+    )
+
+    if is_map:
+      value_desc = field_desc.message_type.fields_by_name["value"]
+      if value_desc.message_type is None:
+        if not is_last:
+          raise ValueError(f"Unexpected field tag: {chunked_field.field_tag}")
+        field[key] = _to_scalar(value_desc, _chunk_bytes(chunk))
+        return
+      parent = field[key]
+    elif field_desc.label == descriptor.FieldDescriptor.LABEL_REPEATED:
+      if key is None:
+        raise ValueError(
+            f"Missing index for repeated field: {chunked_field.field_tag}"
+        )
+      if field_desc.message_type is None:
+        if not is_last:
+          raise ValueError(f"Unexpected field tag: {chunked_field.field_tag}")
+        while len(field) <= key:
+          field.append(_to_scalar(field_desc, b""))
+        field[key] = _to_scalar(field_desc, _chunk_bytes(chunk))
+        return
+      while len(field) <= key:
+        field.add()
+      parent = field[key]
+    elif field_desc.message_type is not None:
+      parent = field
+    else:
+      if not is_last:
+        raise ValueError(f"Unexpected field tag: {chunked_field.field_tag}")
+      setattr(parent, field_desc.name,
+              _to_scalar(field_desc, _chunk_bytes(chunk)))
+      return
+
+  # The innermost field is a message.
+  merge(chunks, chunked_field.message, parent)
+
+
+_FIELD_DESC = descriptor.FieldDescriptor
+
+
+def _to_scalar(field_desc, chunk: bytes):
+  """Converts chunk bytes to a value of a non-message field."""
+  if field_desc.type == _FIELD_DESC.TYPE_BYTES:
+    return chunk
+  value = chunk.decode()
+  if field_desc.type == _FIELD_DESC.TYPE_STRING:
+    return value
+  if field_desc.cpp_type in (_FIELD_DESC.CPPTYPE_DOUBLE,
+                             _FIELD_DESC.CPPTYPE_FLOAT):
+    return float(value) if value else 0.
+  if field_desc.cpp_type == _FIELD_DESC.CPPTYPE_BOOL:
+    return value == "true"
+  if field_desc.cpp_type == _FIELD_DESC.CPPTYPE_ENUM:
+    return field_desc.enum_type.values_by_name[value].number if value else 0
+  return int(value) if value else 0
@@ -151,7 +151,10 @@ class ComposableSplitter(Splitter):
     return self._chunks, self._chunked_message
 
   def write(
-      self, file_prefix: str, writer_options: Optional[str] = None
+      self,
+      file_prefix: str,
+      writer_options: Optional[str] = None,
+      parallelism: Optional[int] = None,
   ) -> str:
     """Serializes a proto to disk.
 
@@ -165,6 +168,12 @@ class ComposableSplitter(Splitter):
       writer_options: Optional writer options to pass to the riegeli writer. See
         https://github.com/google/riegeli/blob/master/doc/record_writer_options.md
         for options.
+      parallelism: Optional number of background threads of the riegeli
+        writer. If greater than 1, chunks are streamed to the writer as they
+        are serialized and are compressed and written by its C++ threads, which
+        run without holding the GIL. This is ignored if `writer_options`
+        already sets `parallelism`. Chunks are serialized in the calling
+        thread, since serializing Python protos holds the GIL.
 
     Returns:
       The actual filepath the proto is written to. The filepath will be
@@ -190,6 +199,8 @@ class ComposableSplitter(Splitter):
       return path
 
     path = f"{file_prefix}.cpb"
+    if parallelism is not None and parallelism > 1:
+      writer_options = _add_writer_parallelism(writer_options, parallelism)
     writer_kwargs = {}
     if writer_options is not None:
       writer_kwargs["options"] = writer_options
@@ -289,3 +300,27 @@ class ComposableSplitter(Splitter):
 
     self._add_chunk_order = [id(chunk) for chunk in self._chunks]
     self._fix_chunk_order = False
+
+
+def _add_writer_parallelism(
+    writer_options: Optional[str], parallelism: int
+) -> str:
+  """Sets `parallelism` in riegeli writer options unless they already do.
+
+  Args:
+    writer_options: Comma-separated riegeli writer options, each either a key
+      or a `key:value` pair.
+    parallelism: Number of background threads of the writer.
+
+  Returns:
+    The updated writer options.
+  """
+  options = [
+      option.strip()
+      for option in (writer_options or "").split(",")
+      if option.strip()
+  ]
+  keys = [option.split(":", 1)[0].strip() for option in options]
+  if "parallelism" not in keys:
+    options.append(f"parallelism:{parallelism}")
+  return ",".join(options)
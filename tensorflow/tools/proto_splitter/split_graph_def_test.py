@@ -16,6 +16,8 @@
 """Tests for GraphDef splitter."""
 
 import itertools
+import os
+import time
 
 from google.protobuf import message
 from google.protobuf import text_format
@@ -24,6 +26,7 @@ from tensorflow.core.framework import graph_pb2
 from tensorflow.python.platform import test
 from tensorflow.tools.proto_splitter import chunk_pb2
 from tensorflow.tools.proto_splitter import constants
+from tensorflow.tools.proto_splitter import merge
 from tensorflow.tools.proto_splitter import split_graph_def
 from tensorflow.tools.proto_splitter import util
 from tensorflow.tools.proto_splitter.python import test_util
@@ -289,6 +292,93 @@ class GraphDefSplitterTest(test.TestCase):
     self.assertLen(chunks, 4)
     self._assert_chunk_sizes(chunks, max_size)
 
+  def testMergeRoundTrip(self):
+    sizes = [50, 50, 1000, 50, 50, 50]
+    fn1 = [50, 50, 50]
+    fn2 = [50]
+    max_size = 200
+    constants.debug_set_max_size(max_size)
+
+    graph_def = self._make_graph_def_with_constant_nodes(
+        sizes, fn1=fn1, fn2=fn2
+    )
+    s = split_graph_def.GraphDefSplitter(self._copy_graph(graph_def))
+    chunks, chunked_message = s.split()
+    self.assertGreater(len(chunks), 1)
+
+    merged = merge.merge(chunks, chunked_message, graph_pb2.GraphDef())
+    self.assertProtoEquals(graph_def, merged)
+
+  def testWriteAndReadParallel(self):
+    sizes = [50, 50, 1000, 50, 50, 50]
+    max_size = 200
+    constants.debug_set_max_size(max_size)
+
+    graph_def = self._make_graph_def_with_constant_nodes(sizes, fn1=[50, 50])
+    path = os.path.join(self.create_tempdir(), "graph_def")
+    split_graph_def.GraphDefSplitter(self._copy_graph(graph_def)).write(
+        path, parallelism=4
+    )
+
+    for parallelism in (1, 4):
+      merged = merge.read(path, graph_pb2.GraphDef(), parallelism=parallelism)
+      self.assertProtoEquals(graph_def, merged)
+
+
+class GraphDefSplitterBenchmark(test.Benchmark):
+  """Benchmarks writing and reading chunked GraphDefs."""
+
+  def _make_graph_def(self, num_nodes, node_size):
+    return test_util.make_graph_def_with_constant_nodes(
+        [node_size] * num_nodes
+    )
+
+  def _benchmark(self, name, num_nodes, node_size, max_size, parallelism):
+    constants.debug_set_max_size(max_size)
+    graph_def = self._make_graph_def(num_nodes, node_size)
+    path = os.path.join(test.get_temp_dir(), name)
+
+    graph_def_copy = graph_pb2.GraphDef()
+    graph_def_copy.CopyFrom(graph_def)
+    start = time.time()
+    split_graph_def.GraphDefSplitter(graph_def_copy).write(
+        path, parallelism=parallelism
+    )
+    write_time = time.time() - start
+
+    start = time.time()
+    merge.read(path, graph_pb2.GraphDef(), parallelism=parallelism)
+    read_time = time.time() - start
+
+    self.report_benchmark(
+        name=f"{name}_write", iters=1, wall_time=write_time,
+        extras={"total_bytes": graph_def.ByteSize()},
+    )
+    self.report_benchmark(
+        name=f"{name}_read", iters=1, wall_time=read_time,
+        extras={"total_bytes": graph_def.ByteSize()},
+    )
+
+  def benchmarkLargeConstants(self):
+    for parallelism in (1, 8):
+      self._benchmark(
+          f"large_constants_parallelism_{parallelism}",
+          num_nodes=64,
+          node_size=8 << 20,
+          max_size=16 << 20,
+          parallelism=parallelism,
+      )
+
+  def benchmarkManySmallNodes(self):
+    for parallelism in (1, 8):
+      self._benchmark(
+          f"many_small_nodes_parallelism_{parallelism}",
+          num_nodes=100000,
+          node_size=1000,
+          max_size=4 << 20,
+          parallelism=parallelism,
+      )
+
 
 if __name__ == "__main__":
   test.main()
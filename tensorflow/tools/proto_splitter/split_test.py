@@ -25,6 +25,7 @@ import riegeli
 
 from tensorflow.python.platform import test
 from tensorflow.tools.proto_splitter import chunk_pb2
+from tensorflow.tools.proto_splitter import merge
 from tensorflow.tools.proto_splitter import split
 from tensorflow.tools.proto_splitter.testdata import test_message_pb2
 
@@ -103,6 +104,55 @@ class SplitRepeatedStringTest(test.TestCase):
         reader.seek_numeric(chunk_info.offset)
         self.assertEqual(expected_data, reader.read_record())
 
+  def testWriteParallel(self):
+    data = [_random_string(5), _random_string(10), _random_string(15)]
+    sequential_path = os.path.join(self.create_tempdir(), "sequential")
+    RepeatedStringSplitter(
+        test_message_pb2.RepeatedString(strings=data)
+    ).write(sequential_path)
+    parallel_path = os.path.join(self.create_tempdir(), "parallel")
+    returned_path = RepeatedStringSplitter(
+        test_message_pb2.RepeatedString(strings=data)
+    ).write(parallel_path, parallelism=2)
+    self.assertEqual(returned_path, f"{parallel_path}.cpb")
+
+    sequential_metadata = merge.read_metadata(f"{sequential_path}.cpb")
+    parallel_metadata = merge.read_metadata(f"{parallel_path}.cpb")
+    self.assertProtoEquals(
+        sequential_metadata.message, parallel_metadata.message
+    )
+    self.assertEqual(
+        data,
+        merge.read_chunks(
+            f"{parallel_path}.cpb", parallel_metadata.chunks, parallelism=2
+        ),
+    )
+
+    merged = merge.read(
+        parallel_path, test_message_pb2.RepeatedString(), parallelism=2
+    )
+    self.assertProtoEquals(
+        test_message_pb2.RepeatedString(strings=data), merged
+    )
+
+  def testAddWriterParallelism(self):
+    self.assertEqual(
+        "parallelism:4", split._add_writer_parallelism(None, 4)
+    )
+    self.assertEqual(
+        "brotli:6,transpose,parallelism:4",
+        split._add_writer_parallelism("brotli:6, transpose", 4),
+    )
+    self.assertEqual(
+        "zstd,parallelism:2",
+        split._add_writer_parallelism("zstd,parallelism:2", 4),
+    )
+    # Keys that merely contain "parallelism" do not count.
+    self.assertEqual(
+        "max_parallelism:2,parallelism:4",
+        split._add_writer_parallelism("max_parallelism:2", 4),
+    )
+
   def test_child_splitter(self):
     proto = test_message_pb2.RepeatedRepeatedString(
         rs=[